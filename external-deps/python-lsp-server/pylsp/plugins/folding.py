@@ -3,7 +3,6 @@
 
 import re
 
-import parso
 import parso.python.tree as tree_nodes
 
 from pylsp import hookimpl
@@ -14,9 +13,8 @@
 
 @hookimpl
 def pylsp_folding_range(document):
-    program = document.source + "\n"
-    lines = program.splitlines()
-    tree = parso.parse(program)
+    lines = document.source.splitlines()
+    tree = document.parso_tree
     ranges = __compute_folding_ranges(tree, lines)
 
     results = []
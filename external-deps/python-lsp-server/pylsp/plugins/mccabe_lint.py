@@ -1,7 +1,6 @@
 # Copyright 2017-2020 Palantir Technologies, Inc.
 # Copyright 2021- Python Language Server Contributors.
 
-import ast
 import logging
 
 import mccabe
@@ -23,7 +22,7 @@ def pylsp_lint(config, workspace, document):
         log.debug("Running mccabe lint with threshold: %s", threshold)
 
         try:
-            tree = compile(document.source, document.path, "exec", ast.PyCF_ONLY_AST)
+            tree = document.ast_tree
         except SyntaxError:
             # We'll let the other linters point this one out
             return None
@@ -1,7 +1,7 @@
 # Copyright 2017-2020 Palantir Technologies, Inc.
 # Copyright 2021- Python Language Server Contributors.
 
-from pyflakes import api as pyflakes_api
+from pyflakes import checker as pyflakes_checker
 from pyflakes import messages
 
 from pylsp import hookimpl, lsp
@@ -25,9 +25,22 @@
 def pylsp_lint(workspace, document):
     with workspace.report_progress("lint: pyflakes"):
         reporter = PyflakesDiagnosticReport(document.lines)
-        pyflakes_api.check(
-            document.source.encode("utf-8"), document.path, reporter=reporter
-        )
+
+        # Reuse the ast shared by all plugins instead of letting
+        # pyflakes.api.check parse the source again.
+        try:
+            tree = document.ast_tree
+        except SyntaxError as e:
+            reporter.syntaxError(document.path, e.args[0], e.lineno, e.offset, e.text)
+            return reporter.diagnostics
+        except Exception:
+            reporter.unexpectedError(document.path, "problem decoding source")
+            return reporter.diagnostics
+
+        w = pyflakes_checker.Checker(tree, filename=document.path)
+        w.messages.sort(key=lambda m: m.lineno)
+        for message in w.messages:
+            reporter.flake(message)
         return reporter.diagnostics
 
 
@@ -6,7 +6,9 @@
 import socketserver
 import sys
 import threading
+import time
 import uuid
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
 from functools import partial
 from typing import Any
 
@@ -28,6 +30,7 @@
 
 
 LINT_DEBOUNCE_S = 0.5  # 500 ms
+LINT_MAX_WORKERS = 8
 PARENT_PROCESS_WATCH_INTERVAL = 10  # 10 s
 MAX_WORKERS = 64
 PYTHON_FILE_EXTENSIONS = (".py", ".pyi")
@@ -171,6 +174,20 @@ async def run_server():
         asyncio.run(run_server())
 
 
+class _LintRun:
+    """Linters running in parallel for a given version of a document."""
+
+    def __init__(self, doc_version) -> None:
+        self.doc_version = doc_version
+        self.futures = {}
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        for future in self.futures:
+            future.cancel()
+
+
 class PythonLSPServer(MethodDispatcher):
     """Implementation of the Microsoft VSCode Language Server Protocol
     https://github.com/Microsoft/language-server-protocol/blob/master/versions/protocol-1-x.md
@@ -211,6 +228,14 @@ def __init__(
         self._dispatchers = []
         self._shutdown = False
 
+        # Every pylsp_lint implementation runs as an independent task
+        self._lint_executor = ThreadPoolExecutor(
+            max_workers=LINT_MAX_WORKERS, thread_name_prefix="pylsp-lint"
+        )
+        self._lint_lock = threading.Lock()
+        self._lint_runs = {}
+        self._lint_results = {}
+
     def start(self) -> None:
         """Entry point for the server."""
         self._jsonrpc_stream_reader.listen(self._endpoint.consume)
@@ -254,6 +279,7 @@ def m_invalid_request_after_shutdown(self, **_kwargs):
         }
 
     def m_exit(self, **_kwargs) -> None:
+        self._lint_executor.shutdown(wait=False, cancel_futures=True)
         self._endpoint.shutdown()
         if self._jsonrpc_stream_reader is not None:
             self._jsonrpc_stream_reader.close()
@@ -469,11 +495,102 @@ def lint(self, doc_uri, is_saved) -> None:
     def _lint_text_document(
         self, doc_uri, workspace, is_saved, doc_version=None
     ) -> None:
-        workspace.publish_diagnostics(
-            doc_uri,
-            flatten(self._hook("pylsp_lint", doc_uri, is_saved=is_saved)),
-            doc_version,
-        )
+        """
+        Lint a text document.
+
+        Linters run in parallel and diagnostics are published every time one
+        of them finishes. Linters still running keep the diagnostics they
+        reported in their previous run, so they don't flicker in the client.
+        """
+        hook_impls = self.config.plugin_manager.subset_hook_caller(
+            "pylsp_lint", self.config.disabled_plugins
+        ).get_hookimpls()
+
+        # Hook wrappers need to run around the other implementations, so leave
+        # that case to pluggy.
+        if any(
+            impl.hookwrapper or getattr(impl, "wrapper", False) for impl in hook_impls
+        ):
+            workspace.publish_diagnostics(
+                doc_uri,
+                flatten(self._hook("pylsp_lint", doc_uri, is_saved=is_saved)),
+                doc_version,
+            )
+            return
+
+        hook_kwargs = {
+            "config": self.config,
+            "workspace": workspace,
+            "document": workspace.get_document(doc_uri),
+            "is_saved": is_saved,
+        }
+
+        # Pluggy calls implementations in reverse registration order
+        hook_impls = list(reversed(hook_impls))
+        linters = [impl.plugin_name for impl in hook_impls]
+
+        run = _LintRun(doc_version)
+        self._cancel_lint(doc_uri)
+        with self._lint_lock:
+            self._lint_runs[doc_uri] = run
+            previous = self._lint_results.get(doc_uri, {})
+
+        for impl in hook_impls:
+            future = self._lint_executor.submit(self._run_linter, impl, hook_kwargs)
+            run.futures[future] = impl.plugin_name
+
+        if not run.futures:
+            workspace.publish_diagnostics(doc_uri, [], doc_version)
+
+        results = {}
+        metrics = {}
+        for future in as_completed(run.futures):
+            if run.cancelled:
+                return
+
+            try:
+                diagnostics, elapsed_ms = future.result()
+            except CancelledError:
+                return
+
+            linter = run.futures[future]
+            results[linter] = diagnostics
+            metrics[linter] = elapsed_ms
+
+            workspace.publish_diagnostics(
+                doc_uri,
+                flatten(results.get(name, previous.get(name, [])) for name in linters),
+                doc_version,
+            )
+
+        with self._lint_lock:
+            if self._lint_runs.get(doc_uri) is run:
+                del self._lint_runs[doc_uri]
+            self._lint_results[doc_uri] = results
+
+        if self.config.settings().get("lint", {}).get("metrics"):
+            workspace.publish_lint_metrics(doc_uri, metrics, doc_version)
+
+    @staticmethod
+    def _run_linter(hook_impl, hook_kwargs):
+        """Run a single pylsp_lint implementation and time it."""
+        start = time.perf_counter()
+        try:
+            diagnostics = hook_impl.function(
+                *[hook_kwargs[arg] for arg in hook_impl.argnames]
+            )
+        except Exception:
+            log.exception("Failed to run linter %s", hook_impl.plugin_name)
+            diagnostics = None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return diagnostics or [], elapsed_ms
+
+    def _cancel_lint(self, doc_uri) -> None:
+        """Cancel linters still running for an outdated version of a document."""
+        with self._lint_lock:
+            run = self._lint_runs.pop(doc_uri, None)
+        if run is not None:
+            run.cancel()
 
     def _lint_notebook_document(self, notebook_document, workspace) -> None:
         """
@@ -670,6 +787,9 @@ def m_notebook_document__did_change(
         self.lint(notebookDocument["uri"], is_saved=True)
 
     def m_text_document__did_close(self, textDocument=None, **_kwargs) -> None:
+        self._cancel_lint(textDocument["uri"])
+        with self._lint_lock:
+            self._lint_results.pop(textDocument["uri"], None)
         workspace = self._match_uri_to_workspace(textDocument["uri"])
         workspace.publish_diagnostics(textDocument["uri"], [])
         workspace.rm_document(textDocument["uri"])
@@ -687,6 +807,8 @@ def m_text_document__did_open(self, textDocument=None, **_kwargs) -> None:
     def m_text_document__did_change(
         self, contentChanges=None, textDocument=None, **_kwargs
     ) -> None:
+        # Results for the previous version are not useful anymore
+        self._cancel_lint(textDocument["uri"])
         workspace = self._match_uri_to_workspace(textDocument["uri"])
         for change in contentChanges:
             workspace.update_document(
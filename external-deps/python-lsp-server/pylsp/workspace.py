@@ -1,11 +1,14 @@
 # Copyright 2017-2020 Palantir Technologies, Inc.
 # Copyright 2021- Python Language Server Contributors.
 
+import ast
 import functools
 import io
+import itertools
 import logging
 import os
 import re
+import tokenize
 import uuid
 from collections.abc import Generator
 from contextlib import contextmanager
@@ -13,6 +16,7 @@
 from typing import Callable, Optional
 
 import jedi
+import parso
 
 from . import _utils, lsp, uris
 
@@ -38,6 +42,7 @@ def wrapper(self, *args, **kwargs):
 
 class Workspace:
     M_PUBLISH_DIAGNOSTICS = "textDocument/publishDiagnostics"
+    M_LINT_METRICS = "pylsp/lintMetrics"
     M_PROGRESS = "$/progress"
     M_INITIALIZE_PROGRESS = "window/workDoneProgress/create"
     M_APPLY_EDIT = "workspace/applyEdit"
@@ -192,6 +197,26 @@ def publish_diagnostics(self, doc_uri, diagnostics, doc_version=None) -> None:
             params=params,
         )
 
+    def publish_lint_metrics(self, doc_uri, metrics, doc_version=None) -> None:
+        """
+        Send the time (in ms) each linter took for the last run on a document.
+
+        This is a pylsp extension to the protocol, only sent when the
+        `pylsp.lint.metrics` setting is enabled.
+        """
+        params = {
+            "uri": doc_uri,
+            "metrics": metrics,
+        }
+
+        if doc_version:
+            params["version"] = doc_version
+
+        self._endpoint.notify(
+            self.M_LINT_METRICS,
+            params=params,
+        )
+
     @contextmanager
     def report_progress(
         self,
@@ -418,6 +443,12 @@ def __init__(
         self._rope_project_builder = rope_project_builder
         self._lock = RLock()
 
+        # Parse results shared by all plugins, valid for a single version of
+        # the source (see _cached).
+        self._cache = {}
+        self._cache_source = None
+        self._cache_version = None
+
     def __str__(self):
         return str(self.uri)
 
@@ -428,10 +459,77 @@ def _rope_resource(self, rope_config):
             self._rope_project_builder(rope_config), self.path
         )
 
-    @property
     @lock
+    def _cached(self, key, compute):
+        """
+        Return the result of ``compute(source)`` for the current document version.
+
+        Results (and the exceptions raised while computing them, e.g. a
+        SyntaxError) are kept until either the version or the source changes, so
+        that plugins running for the same edit share a single parse. Cached
+        objects must be treated as read-only by callers.
+        """
+        source = self.source
+        if self._cache_source is not source or self._cache_version != self.version:
+            self._cache = {}
+            self._cache_source = source
+            self._cache_version = self.version
+
+        if key not in self._cache:
+            try:
+                self._cache[key] = (compute(source), None)
+            except Exception as e:
+                self._cache[key] = (None, e)
+
+        value, error = self._cache[key]
+        if error is not None:
+            raise error
+        return value
+
+    @property
     def lines(self):
-        return self.source.splitlines(True)
+        return self._cached("lines", lambda source: source.splitlines(True))
+
+    @property
+    def line_offsets(self):
+        """Offset at which every line starts, plus the length of the source."""
+
+        return self._cached(
+            "line_offsets",
+            lambda source: list(
+                itertools.accumulate(map(len, source.splitlines(True)), initial=0)
+            ),
+        )
+
+    @property
+    def ast_tree(self):
+        """Python ast of the document. Raises SyntaxError if it can't be parsed."""
+        return self._cached(
+            "ast_tree", lambda source: ast.parse(source, filename=self.path)
+        )
+
+    @property
+    def tokens(self):
+        """List of tokenize tokens of the document."""
+        return self._cached(
+            "tokens",
+            lambda source: list(tokenize.generate_tokens(io.StringIO(source).readline)),
+        )
+
+    @property
+    def parso_tree(self):
+        """
+        Parso module of the document.
+
+        Parso's diff cache is used, so only the parts of the previous tree
+        affected by an edit are re-parsed.
+        """
+        return self._cached(
+            "parso_tree",
+            lambda source: parso.load_grammar().parse(
+                source, path=self.path, diff_cache=True, cache=False
+            ),
+        )
 
     @property
     @lock
@@ -491,7 +589,8 @@ def apply_change(self, change):
 
     def offset_at_position(self, position):
         """Return the byte-offset pointed at by the given position."""
-        return position["character"] + len("".join(self.lines[: position["line"]]))
+        offsets = self.line_offsets
+        return position["character"] + offsets[min(position["line"], len(offsets) - 1)]
 
     def word_at_position(self, position):
         """Get the word under the cursor returning the start and end positions."""
@@ -1,6 +1,8 @@
 # Copyright 2017-2020 Palantir Technologies, Inc.
 # Copyright 2021- Python Language Server Contributors.
 
+import pytest
+
 from pylsp.workspace import Document
 from test.fixtures import DOC, DOC_URI
 
@@ -103,3 +105,25 @@ def test_document_end_of_file_edit(workspace) -> None:
         "print 'b'\n",
         "o",
     ]
+
+
+def test_document_parse_cache(workspace) -> None:
+    doc = Document("file:///uri", workspace, "import os\n", version=1)
+    assert doc.lines is doc.lines
+    assert doc.ast_tree is doc.ast_tree
+    assert doc.parso_tree is doc.parso_tree
+    assert doc.line_offsets == [0, 10]
+
+    doc.apply_change({"text": "import os\nimport sys\n"})
+    doc.version = 2
+    assert doc.lines == ["import os\n", "import sys\n"]
+    assert len(doc.ast_tree.body) == 2
+    assert len(doc.parso_tree.children) == 3
+    assert doc.line_offsets == [0, 10, 21]
+
+
+def test_document_parse_cache_syntax_error(workspace) -> None:
+    doc = Document("file:///uri", workspace, "def f(:\n")
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            doc.ast_tree
@@ -0,0 +1,105 @@
+# Copyright 2021- Python Language Server Contributors.
+
+import threading
+from unittest.mock import patch
+
+from pylsp import hookimpl
+from test.fixtures import DOC, DOC_URI
+
+
+class SlowLinter:
+    """Linter that waits until it's released by the test."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+
+    @hookimpl
+    def pylsp_lint(self, document):
+        self.release.wait(5)
+        return [
+            {
+                "source": "slow",
+                "range": {
+                    "start": {"line": 0, "character": 0},
+                    "end": {"line": 0, "character": 1},
+                },
+                "message": "Slow diagnostic",
+                "severity": 2,
+            }
+        ]
+
+
+def _published_diagnostics(mock_notify):
+    return [
+        call.kwargs["params"]["diagnostics"]
+        for call in mock_notify.call_args_list
+        if call.args[0] == "textDocument/publishDiagnostics"
+    ]
+
+
+def test_lint_publishes_partial_results(pylsp) -> None:
+    slow_linter = SlowLinter()
+    pylsp.config.plugin_manager.register(slow_linter, name="slow")
+    pylsp.workspace.put_document(DOC_URI, DOC, version=1)
+
+    with patch.object(pylsp.workspace._endpoint, "notify") as mock_notify:
+        thread = threading.Thread(
+            target=pylsp._lint_text_document,
+            args=(DOC_URI, pylsp.workspace, True, 1),
+        )
+        thread.start()
+
+        # Diagnostics from the fast linters are published first
+        while not any(_published_diagnostics(mock_notify)):
+            thread.join(0.05)
+        assert all(
+            diag["source"] != "slow"
+            for diags in _published_diagnostics(mock_notify)
+            for diag in diags
+        )
+
+        slow_linter.release.set()
+        thread.join()
+
+    final = _published_diagnostics(mock_notify)[-1]
+    assert {"slow", "pyflakes"} <= {diag["source"] for diag in final}
+
+
+def test_lint_cancelled_by_new_version(pylsp) -> None:
+    slow_linter = SlowLinter()
+    pylsp.config.plugin_manager.register(slow_linter, name="slow")
+    pylsp.workspace.put_document(DOC_URI, DOC, version=1)
+
+    with patch.object(pylsp.workspace._endpoint, "notify") as mock_notify:
+        thread = threading.Thread(
+            target=pylsp._lint_text_document,
+            args=(DOC_URI, pylsp.workspace, True, 1),
+        )
+        thread.start()
+        while DOC_URI not in pylsp._lint_runs:
+            thread.join(0.05)
+
+        pylsp._cancel_lint(DOC_URI)
+        slow_linter.release.set()
+        thread.join()
+
+    # Nothing gets published after the run was cancelled
+    assert all(
+        diag["source"] != "slow"
+        for diags in _published_diagnostics(mock_notify)
+        for diag in diags
+    )
+
+
+def test_lint_metrics(pylsp) -> None:
+    pylsp.config.update({"lint": {"metrics": True}})
+    pylsp.workspace.put_document(DOC_URI, DOC, version=1)
+
+    with patch.object(pylsp.workspace._endpoint, "notify") as mock_notify:
+        pylsp._lint_text_document(DOC_URI, pylsp.workspace, True, 1)
+
+    assert mock_notify.call_args.args[0] == "pylsp/lintMetrics"
+    params = mock_notify.call_args.kwargs["params"]
+    assert params["uri"] == DOC_URI
+    assert params["version"] == 1
+    assert params["metrics"]["pyflakes"] >= 0
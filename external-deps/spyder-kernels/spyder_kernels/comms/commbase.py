@@ -27,6 +27,9 @@
       side of the comm.
     - If the `_wait_reply` is implemented, remote_call can be called with
       `blocking=True`, which will wait for a reply sent by the other side.
+    - The `remote_call_batch` method sends several calls in a single message,
+      which are run one after the other by the other side. Their return
+      values are sent back in a single reply as a list.
 
 The messages exchanged are:
     - Function call (spyder_msg_type = 'remote_call'):
@@ -51,6 +54,7 @@
            }
         - The buffer contains the return value if it is bytes
 """
+from contextlib import contextmanager
 import logging
 import sys
 import uuid
@@ -198,10 +202,14 @@ def __init__(self):
         self._reply_inbox = {}
         self._reply_waitlist = {}
 
+        # Results shared by the calls of a batch
+        self.batch_cache = None
+
         self._register_message_handler(
             'remote_call', self._handle_remote_call)
         self._register_message_handler(
             'remote_call_reply', self._handle_remote_call_reply)
+        self.register_call_handler('_batch_call', self._handle_batch_call)
 
     def get_comm_id_list(self, comm_id=None):
         """Get a list of comms id."""
@@ -256,6 +264,59 @@ def remote_call(self, comm_id=None, callback=None, **settings):
         """Get a handler for remote calls."""
         return RemoteCallFactory(self, comm_id, callback, **settings)
 
+    def remote_call_batch(self, calls, comm_id=None, callback=None,
+                          **settings):
+        """
+        Send several remote calls in a single message.
+
+        The calls are run one after the other by the other side, which sends
+        back their return values in a single reply. If one of them fails,
+        the following ones are not run and the error is sent back instead.
+
+        Parameters
+        ----------
+        calls : list
+            List of (call_name, args, kwargs) tuples. The args, kwargs and
+            return values have to be JSON-serializable.
+        comm_id : str or None
+            The comm to send the calls to.
+        callback : callback
+            A function called with the list of return values.
+        settings : dict
+            The same settings as remote_call.
+
+        Returns
+        -------
+        The list of return values if the calls are blocking.
+        """
+        calls = [
+            [call_name, list(args), dict(kwargs)]
+            for call_name, args, kwargs in calls
+        ]
+        return self.remote_call(
+            comm_id=comm_id, callback=callback, **settings
+        )._batch_call(calls)
+
+    @contextmanager
+    def batch_context(self):
+        """
+        Share results between calls in the context through batch_cache.
+
+        Handlers can save in batch_cache, if it's not None, the results they
+        compute that other calls in the same batch can reuse. The cache is
+        cleared when the batch ends.
+        """
+        if self.batch_cache is not None:
+            # Nested batch, reuse the cache of the outer one
+            yield
+            return
+
+        self.batch_cache = {}
+        try:
+            yield
+        finally:
+            self.batch_cache = None
+
     # ---- Private -----
     def _send_message(
         self, spyder_msg_type, content=None, comm_id=None, buffers=None
@@ -370,6 +431,14 @@ def _handle_remote_call(self, msg, buffers):
                 msg_dict['call_name'], msg_dict['call_id'])
             self._set_call_return_value(msg_dict, exc_infos, is_error=True)
 
+    def _handle_batch_call(self, calls):
+        """Run the calls of a batch and return their return values."""
+        with self.batch_context():
+            return [
+                self._remote_callback(call_name, call_args, call_kwargs)
+                for call_name, call_args, call_kwargs in calls
+            ]
+
     def _remote_callback(self, call_name, call_args, call_kwargs):
         """Call the callback function for the remote call."""
         if call_name in self._remote_call_handlers:
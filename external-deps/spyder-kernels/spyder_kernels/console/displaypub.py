@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2009- Spyder Kernels Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder_kernels/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+"""
+Custom Spyder display publisher class.
+"""
+
+# Standard library imports
+from binascii import a2b_base64
+import logging
+
+# Third-party imports
+from ipykernel.zmqshell import ZMQDisplayPublisher
+
+# Local imports
+from spyder_kernels.comms.commbase import CommError
+
+
+logger = logging.getLogger(__name__)
+
+# Formats of the figures that can be sent to the frontend, in the order in
+# which they are chosen.
+FIGURE_FORMATS = ['image/svg+xml', 'image/png', 'image/jpeg']
+
+
+def get_figure_data(data):
+    """
+    Get the format and the raw bytes of the figure in a mime-bundle dict.
+
+    Return (None, None) if it doesn't contain a figure.
+    """
+    for fmt in FIGURE_FORMATS:
+        if fmt in data:
+            break
+    else:
+        return None, None
+
+    fig = data[fmt]
+    if isinstance(fig, str):
+        if fmt == 'image/svg+xml':
+            fig = fig.encode('utf-8')
+        else:
+            # Images that are already base64 encoded
+            fig = a2b_base64(fig)
+    return fmt, fig
+
+
+class SpyderDisplayPublisher(ZMQDisplayPublisher):
+    """
+    Subclass of ZMQDisplayPublisher that can send figures to the frontend.
+
+    If binary_figures is True, figures are sent to the Plots pane as binary
+    buffers of a comm message, which avoids encoding them in base64 in a
+    display message. The frontend enables it when it doesn't need to show
+    figures in the console.
+    """
+
+    binary_figures = False
+
+    def publish(self, data, metadata=None, transient=None, update=False):
+        """Publish a display message or send a figure to the frontend."""
+        if self.binary_figures and not update and self._send_figure(data):
+            return
+
+        super().publish(
+            data, metadata=metadata, transient=transient, update=update
+        )
+
+    def _send_figure(self, data):
+        """Send a figure in binary form. Return whether it was sent."""
+        fmt, fig = get_figure_data(data)
+        if fig is None:
+            return False
+
+        # Keep the figure after the output that was printed before it
+        self._flush_streams()
+        try:
+            self.shell.kernel.frontend_call(
+                blocking=False
+            ).show_inline_figure(fig, fmt)
+        except CommError:
+            logger.debug("Figure could not be sent in binary form")
+            return False
+        return True
@@ -46,11 +46,12 @@
     PythonEnvInfo,
     PythonEnvType,
 )
-from spyder_kernels.utils.iofuncs import iofunctions
+from spyder_kernels.utils.iofuncs import iofunctions, load_text
 from spyder_kernels.utils.mpl import automatic_backend, MPL_BACKENDS_TO_SPYDER
 from spyder_kernels.utils.nsview import (
     get_remote_data, make_remote_view, get_size)
 from spyder_kernels.utils.style import create_pygments_dict, create_style_class
+from spyder_kernels.console.outstream import TTYOutStream
 from spyder_kernels.console.shell import SpyderShell
 from spyder_kernels.comms.utils import WriteContext
 
@@ -133,7 +134,7 @@ def frontend_call(self, blocking=False, broadcast=True,
     def get_state(self):
         """"get current state to send to the frontend"""
         state = {}
-        with WriteContext("get_state"):
+        with WriteContext("get_state"), self.frontend_comm.batch_context():
             if self._cwd_initialised:
                 state["cwd"] = self.get_cwd()
             state["namespace_view"] = self.get_namespace_view()
@@ -334,8 +335,8 @@ def get_namespace_view(self, frame=None):
 
         settings = self.namespace_view_settings
         if settings:
-            ns = self.shell._get_current_namespace(frame=frame)
-            view = make_remote_view(ns, settings, EXCLUDED_NAMES)
+            data = self._get_editable_data(frame=frame)
+            view = make_remote_view(data, settings, filtered=True)
             return view
         else:
             return None
@@ -348,9 +349,7 @@ def get_var_properties(self):
         """
         settings = self.namespace_view_settings
         if settings:
-            ns = self.shell._get_current_namespace()
-            data = get_remote_data(ns, settings, mode='editable',
-                                   more_excluded_names=EXCLUDED_NAMES)
+            data = self._get_editable_data()
 
             properties = {}
             for name, value in list(data.items()):
@@ -449,6 +448,31 @@ def load_data(self, filename, ext, overwrite=False):
 
         return None
 
+    @comm_handler
+    def import_text_data(self, filename, varname, options):
+        """
+        Load data from a text file into varname.
+
+        The file is parsed in chunks and the progress is sent to the frontend
+        with 'update_import_progress'. options are passed to
+        spyder_kernels.utils.iofuncs.load_text.
+        """
+        def progress_callback(fraction):
+            self.frontend_call(blocking=False).update_import_progress(
+                filename, fraction)
+
+        try:
+            data = load_text(
+                filename, progress_callback=progress_callback, **options)
+        except ImportError:
+            raise
+        except Exception as error:
+            return str(error)
+
+        ns = self.shell._get_reference_namespace(varname)
+        ns[varname] = data
+        return None
+
     @comm_handler
     def save_namespace(self, filename):
         """Save namespace into filename"""
@@ -643,6 +667,21 @@ def set_autocall(self, autocall):
         """Enable/Disable autocall funtionality."""
         self._set_config_option('ZMQInteractiveShell.autocall', autocall)
 
+    def set_output_limits(self, limits):
+        """
+        Set the maximum rates of output sent to the frontend.
+
+        limits is a dictionary with the maximum number of lines and bytes
+        per second in 'max_lines_rate' and 'max_bytes_rate'. Output above
+        them is saved to a file instead.
+        """
+        for stream in (sys.stdout, sys.stderr):
+            if isinstance(stream, TTYOutStream):
+                stream.governor.set_limits(
+                    max_lines_rate=limits.get('max_lines_rate'),
+                    max_bytes_rate=limits.get('max_bytes_rate')
+                )
+
     # --- Additional methods
     @comm_handler
     def set_configuration(self, conf):
@@ -658,6 +697,8 @@ def set_configuration(self, conf):
                 self.publish_state()
             elif key == "pdb":
                 self.shell.set_pdb_configuration(value)
+            elif key == "profiler":
+                self.shell.profiler_conf.update(value)
             elif key == "faulthandler":
                 if value:
                     ret[key] = self.enable_faulthandler()
@@ -690,6 +731,10 @@ def set_configuration(self, conf):
                     self._load_wurlitzer()
             elif key == "autoreload_magic":
                 self._autoreload_magic(value)
+            elif key == "output_limits":
+                self.set_output_limits(value)
+            elif key == "binary_figures":
+                self.shell.display_pub.binary_figures = value
         return ret
 
     def set_color_scheme(self, color_scheme):
@@ -891,6 +936,27 @@ def get_pythonenv_info(self):
 
     # -- Private API ---------------------------------------------------
     # --- For the Variable Explorer
+    def _get_editable_data(self, frame=None):
+        """
+        Get the variables of the current namespace shown in the Variable
+        Explorer.
+
+        They are shared between the calls of a batch, so the namespace is
+        filtered only once.
+        """
+        cache = self.frontend_comm.batch_cache
+        key = ("editable_data", id(frame))
+        if cache is not None and key in cache:
+            return cache[key]
+
+        ns = self.shell._get_current_namespace(frame=frame)
+        data = get_remote_data(ns, self.namespace_view_settings,
+                               mode='editable',
+                               more_excluded_names=EXCLUDED_NAMES)
+        if cache is not None:
+            cache[key] = data
+        return data
+
     def _get_len(self, var):
         """Return sequence length"""
         try:
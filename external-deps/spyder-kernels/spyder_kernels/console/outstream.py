@@ -9,12 +9,263 @@
 """
 Custom Spyder Outstream class.
 """
+import atexit
 import os
+import shutil
 import sys
+import tempfile
+import time
 
 from ipykernel.iostream import OutStream
 
 
+# Default maximum number of lines and bytes per second sent to the frontend.
+# Output is not limited unless the frontend sets limits.
+DEFAULT_MAX_LINES_RATE = 0
+DEFAULT_MAX_BYTES_RATE = 0
+
+# Seconds between the summaries of the output that was not sent
+SUMMARY_INTERVAL = 1
+
+# Maximum size of each file where output that was not sent is saved, and
+# number of files to keep.
+MAX_SPILL_FILE_SIZE = 10_000_000
+SPILL_FILE_COUNT = 5
+
+
+class OutputGovernor:
+    """
+    Limit the rate at which output is sent to the frontend.
+
+    Output above the limits is saved to rotating files instead, and
+    summaries with the number of lines that were not sent are returned
+    periodically. The summaries have the same format as IPython tracebacks,
+    so the frontend can open the file where the output was saved. The files
+    are removed when the governor is closed or the kernel exits.
+
+    Parameters
+    ----------
+    name: str
+        Name of the stream, used for the files where output is saved.
+    max_lines_rate: int
+        Maximum number of lines per second. If 0, there's no limit.
+    max_bytes_rate: int
+        Maximum number of characters per second. If 0, there's no limit.
+    """
+
+    def __init__(self, name, max_lines_rate=DEFAULT_MAX_LINES_RATE,
+                 max_bytes_rate=DEFAULT_MAX_BYTES_RATE):
+        self.name = name
+        self.max_lines_rate = max_lines_rate
+        self.max_bytes_rate = max_bytes_rate
+
+        # Allowances of lines and bytes, refilled at the maximum rates up to
+        # one second of output.
+        self._lines_allowance = max_lines_rate
+        self._bytes_allowance = max_bytes_rate
+        self._last_time = time.monotonic()
+
+        # Output not sent since the last summary
+        self._elided_lines = 0
+        self._elided_filename = None
+        self._elided_start = None
+        self._last_summary_time = 0
+
+        # Current file where output is saved
+        self._spill_dir = None
+        self._spill_file = None
+        self._spill_filename = None
+        self._spill_lines = 0
+        self._spill_files = []
+
+    # ---- Public API
+    # -------------------------------------------------------------------------
+    @property
+    def enabled(self):
+        """Whether output is limited."""
+        return self.max_lines_rate > 0 or self.max_bytes_rate > 0
+
+    @property
+    def has_elided_output(self):
+        """Whether there is output that was not sent since the last summary."""
+        return self._elided_lines > 0
+
+    def set_limits(self, max_lines_rate=None, max_bytes_rate=None):
+        """
+        Set the maximum rates. Pass 0 to disable a limit.
+
+        Limits that were disabled start with a full second of allowance.
+        """
+        if max_lines_rate is not None:
+            if self.max_lines_rate > 0:
+                self._lines_allowance = min(
+                    self._lines_allowance, max_lines_rate
+                )
+            else:
+                self._lines_allowance = max_lines_rate
+            self.max_lines_rate = max_lines_rate
+        if max_bytes_rate is not None:
+            if self.max_bytes_rate > 0:
+                self._bytes_allowance = min(
+                    self._bytes_allowance, max_bytes_rate
+                )
+            else:
+                self._bytes_allowance = max_bytes_rate
+            self.max_bytes_rate = max_bytes_rate
+
+    def filter(self, data):
+        """
+        Get the part of data that can be sent and save the rest to a file.
+
+        Once output is saved to a file, new output keeps being saved until a
+        summary is sent, so what the frontend shows doesn't have gaps that
+        are not explained by a summary.
+        """
+        if not self.enabled or not data:
+            return data
+
+        self._refill()
+        if self._elided_lines:
+            cut = 0
+        else:
+            cut = self._get_cut(data)
+
+        sent, spilled = data[:cut], data[cut:]
+        self._lines_allowance -= sent.count("\n")
+        self._bytes_allowance -= len(sent)
+
+        if spilled:
+            self._spill(spilled)
+        return sent
+
+    def get_summary(self, force=False):
+        """
+        Get a summary of the output that was not sent, if it's time to send
+        one.
+
+        Summaries are sent every SUMMARY_INTERVAL seconds while output is
+        being saved to a file, or when force is True.
+        """
+        if not self._elided_lines:
+            return None
+
+        now = time.monotonic()
+        if not force and now - self._last_summary_time < SUMMARY_INTERVAL:
+            return None
+        self._last_summary_time = now
+
+        summary = (
+            "\n[{} lines of output were not shown to keep the console "
+            "responsive. They were saved to:]\nFile {}:{}\n".format(
+                self._elided_lines, self._elided_filename, self._elided_start)
+        )
+        self._elided_lines = 0
+        self._elided_filename = None
+        self._elided_start = None
+        if self._spill_file is not None:
+            self._spill_file.flush()
+        return summary
+
+    def close(self):
+        """Close and remove the files where output is saved."""
+        self._close_spill_file()
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+            self._spill_files = []
+
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _close_spill_file(self):
+        """Close the current file where output is saved."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def _refill(self):
+        """Refill the allowances according to the time since last refill."""
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        self._last_time = now
+
+        if self.max_lines_rate > 0:
+            self._lines_allowance = min(
+                self._lines_allowance + elapsed * self.max_lines_rate,
+                self.max_lines_rate
+            )
+        else:
+            self._lines_allowance = float("inf")
+
+        if self.max_bytes_rate > 0:
+            self._bytes_allowance = min(
+                self._bytes_allowance + elapsed * self.max_bytes_rate,
+                self.max_bytes_rate
+            )
+        else:
+            self._bytes_allowance = float("inf")
+
+    def _get_cut(self, data):
+        """Get the length of the start of data that can be sent."""
+        if (
+            len(data) <= self._bytes_allowance
+            and data.count("\n") <= self._lines_allowance
+        ):
+            return len(data)
+
+        # Only send whole lines
+        max_length = int(max(min(self._bytes_allowance, len(data)), 0))
+        max_lines = int(max(min(self._lines_allowance, len(data)), 0))
+        cut = 0
+        for __ in range(max_lines):
+            end = data.find("\n", cut, max_length)
+            if end == -1:
+                break
+            cut = end + 1
+        return cut
+
+    def _spill(self, data):
+        """Save data that was not sent to a file."""
+        if (
+            self._spill_file is None
+            or self._spill_file.tell() > MAX_SPILL_FILE_SIZE
+        ):
+            self._rotate()
+
+        if self._elided_start is None:
+            self._elided_filename = self._spill_filename
+            self._elided_start = self._spill_lines + 1
+
+        self._spill_file.write(data)
+        lines = data.count("\n")
+        self._spill_lines += lines
+        self._elided_lines += max(lines, 1)
+
+    def _rotate(self):
+        """Start a new file to save output, removing the oldest ones."""
+        self._close_spill_file()
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="spyder-output-")
+
+            # Streams are not always closed before the kernel exits
+            atexit.register(self.close)
+
+        self._spill_filename = os.path.join(
+            self._spill_dir,
+            "{}-{}.log".format(self.name, len(self._spill_files) + 1)
+        )
+        self._spill_file = open(
+            self._spill_filename, "w", encoding="utf-8", errors="replace"
+        )
+        self._spill_lines = 0
+
+        self._spill_files.append(self._spill_filename)
+        for filename in self._spill_files[:-SPILL_FILE_COUNT]:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
 class TTYOutStream(OutStream):
     """Subclass of OutStream that represents a TTY."""
 
@@ -22,6 +273,14 @@ def __init__(self, session, pub_thread, name, pipe=None, echo=None, *,
                  watchfd=True):
         super().__init__(session, pub_thread, name, pipe,
                          echo=echo, watchfd=watchfd, isatty=True)
+        self.governor = OutputGovernor(name)
+
+        # Parent of the output summarized by the governor
+        self._summary_parent = None
+
+    def close(self):
+        super().close()
+        self.governor.close()
 
     def _flush(self):
         """This is where the actual send happens.
@@ -42,7 +301,9 @@ def _flush(self):
                 if self.echo is not sys.__stderr__:
                     print(f"Flush failed: {e}", file=sys.__stderr__)
 
+        flushed = False
         for parent, data in self._flush_buffers():
+            flushed = True
             # Messages that will not be printed to the console. This allows us
             # to deal with issues such as spyder-ide/spyder#22181
             filter_messages = ["Parent poll failed."]
@@ -50,23 +311,51 @@ def _flush(self):
             if data and not any(
                 [message in data for message in filter_messages]
             ):
-                # FIXME: this disables Session's fork-safe check,
-                # since pub_thread is itself fork-safe.
-                # There should be a better way to do this.
-                self.session.pid = os.getpid()
-                content = {"name": self.name, "text": data}
-                msg = self.session.msg("stream", content, parent=parent)
-
-                # Each transform either returns a new
-                # message or None. If None is returned,
-                # the message has been 'used' and we return.
-                for hook in self._hooks:
-                    msg = hook(msg)
-                    if msg is None:
-                        return
-
-                self.session.send(
-                    self.pub_thread,
-                    msg,
-                    ident=self.topic,
+                # Limit the output sent to the frontend
+                data = self.governor.filter(data)
+                if self.governor.has_elided_output:
+                    self._summary_parent = parent
+                    summary = self.governor.get_summary()
+                    if summary is not None:
+                        data += summary
+
+                if data and not self._send_stream(parent, data):
+                    return
+
+        if self.governor.has_elided_output:
+            if flushed:
+                # Flush again to send a summary if there's no more output
+                self._schedule_flush()
+            else:
+                self._send_stream(
+                    self._summary_parent,
+                    self.governor.get_summary(force=True)
                 )
+
+    def _send_stream(self, parent, data):
+        """
+        Send data in a stream message.
+
+        Return False if a hook used the message.
+        """
+        # FIXME: this disables Session's fork-safe check,
+        # since pub_thread is itself fork-safe.
+        # There should be a better way to do this.
+        self.session.pid = os.getpid()
+        content = {"name": self.name, "text": data}
+        msg = self.session.msg("stream", content, parent=parent)
+
+        # Each transform either returns a new
+        # message or None. If None is returned,
+        # the message has been 'used' and we return.
+        for hook in self._hooks:
+            msg = hook(msg)
+            if msg is None:
+                return False
+
+        self.session.send(
+            self.pub_thread,
+            msg,
+            ident=self.topic,
+        )
+        return True
@@ -26,6 +26,7 @@
 from ipykernel.zmqshell import ZMQInteractiveShell
 from IPython.core import release as ipython_release
 from packaging.version import parse as parse_version
+from traitlets import Type
 
 
 # Local imports
@@ -34,6 +35,7 @@
 from spyder_kernels.customize.code_runner import SpyderCodeRunner
 from spyder_kernels.comms.commbase import stacksummary_to_json
 from spyder_kernels.comms.decorators import comm_handler
+from spyder_kernels.console.displaypub import SpyderDisplayPublisher
 from spyder_kernels.utils.mpl import automatic_backend
 
 
@@ -43,6 +45,8 @@
 class SpyderShell(ZMQInteractiveShell):
     """Spyder shell."""
 
+    display_pub_class = Type(SpyderDisplayPublisher)
+
     PDB_CONF_KEYS = [
         'pdb_ignore_lib',
         'pdb_execute_events',
@@ -64,6 +68,10 @@ def __init__(self, *args, **kwargs):
         self.update_gui_frontend = False
         self._spyder_theme = 'dark'
 
+        # Profiler configuration sent by the frontend. Possible keys are
+        # "sampling" (bool) and "sampling_interval" (in milliseconds).
+        self.profiler_conf = {}
+
         # Substrings of the directory where Spyder-kernels is installed
         self._package_locations = [
             # When the package is properly installed
@@ -33,6 +33,8 @@
 
 # Local imports
 from spyder_kernels.comms.commbase import CommBase
+from spyder_kernels.console.displaypub import get_figure_data
+from spyder_kernels.console.outstream import OutputGovernor
 from spyder_kernels.customize.spyderpdb import SpyderPdb
 from spyder_kernels.utils.iofuncs import iofunctions
 from spyder_kernels.utils.pythonenv import PythonEnvType
@@ -336,6 +338,37 @@ def test_get_var_properties(kernel):
     assert "'array_ndim': None" in var_properties
 
 
+def test_batch_call_shares_namespace(kernel):
+    """
+    Test that the namespace is filtered only once for the namespace view and
+    the variable properties when they are requested in the same batch.
+    """
+    asyncio.run(kernel.do_execute('a = 1', True))
+
+    filtered_data = []
+    get_editable_data = kernel._get_editable_data
+
+    def count_editable_data(*args, **kwargs):
+        data = get_editable_data(*args, **kwargs)
+        filtered_data.append(data)
+        return data
+
+    kernel._get_editable_data = count_editable_data
+    try:
+        nsview, var_properties = kernel.frontend_comm._handle_batch_call([
+            ("get_namespace_view", [], {}),
+            ("get_var_properties", [], {}),
+        ])
+    finally:
+        del kernel._get_editable_data
+
+    assert 'a' in nsview
+    assert 'a' in var_properties
+    assert len(filtered_data) == 2
+    assert filtered_data[0] is filtered_data[1]
+    assert kernel.frontend_comm.batch_cache is None
+
+
 def test_get_value(kernel):
     """Test getting the value of a variable."""
     name = 'a'
@@ -476,6 +509,22 @@ def test_save_namespace(kernel):
     assert not osp.isfile(namespace_file)
 
 
+def test_import_text_data(kernel, tmpdir):
+    """Test importing data from a text file."""
+    text_file = tmpdir.join('data.csv')
+    text_file.write("# header\n1,2\n3,4\n")
+
+    error = kernel.import_text_data(
+        str(text_file), 'data', {'as_type': 'list', 'transpose': True})
+    assert error is None
+    assert kernel.get_value('data') == [[1, 3], [2, 4]]
+
+    # Errors are returned as messages
+    error = kernel.import_text_data(
+        str(tmpdir.join('missing.csv')), 'data', {})
+    assert 'missing.csv' in error
+
+
 # --- For the Help plugin
 def test_is_defined(kernel):
     """Test method to tell if object is defined."""
@@ -1512,5 +1561,95 @@ def test_disable_pkg_managers(kernel, capsys, prefix):
     assert kernel.shell._disable_pkg_managers_msg[2:] == captured.out[1:-1]
 
 
+def test_output_governor():
+    """Test that output above the maximum rate is saved to a file."""
+    governor = OutputGovernor("stdout", max_lines_rate=10)
+    data = "".join(f"{i}\n" for i in range(100))
+
+    # Only whole lines up to the limit are sent
+    assert governor.filter(data) == "".join(f"{i}\n" for i in range(10))
+    assert governor.has_elided_output
+
+    # New output is saved until a summary is sent
+    assert governor.filter("a\n") == ""
+
+    summary = governor.get_summary(force=True)
+    assert "91 lines" in summary
+    filename, line = summary.splitlines()[-1][len("File "):].rsplit(":", 1)
+    assert line == "1"
+    with open(filename) as f:
+        assert f.read().splitlines()[:2] == ["10", "11"]
+    assert not governor.has_elided_output
+
+    # Files are removed when the governor is closed
+    governor.close()
+    assert not os.path.exists(os.path.dirname(filename))
+
+    # Output is not limited by default
+    assert not OutputGovernor("stdout").enabled
+
+    # Nothing is saved without limits
+    governor = OutputGovernor("stdout", max_lines_rate=0, max_bytes_rate=0)
+    assert governor.filter(data) == data
+    assert not governor.has_elided_output
+
+    # Setting both limits to 0 disables them, even for large output
+    governor = OutputGovernor("stdout", max_lines_rate=10)
+    governor.set_limits(max_lines_rate=0, max_bytes_rate=0)
+    assert not governor.enabled
+    data = "x" * 99 + "\n"
+    data = data * 6100
+    assert governor.filter(data) == data
+    assert not governor.has_elided_output
+
+    # And limits can be enabled again
+    governor.set_limits(max_lines_rate=10, max_bytes_rate=1000)
+    assert governor.enabled
+    assert len(governor.filter(data)) == 1000
+    governor.close()
+
+
+def test_binary_figures(kernel, mocker):
+    """Test that figures are sent to the frontend as binary buffers."""
+    png = b'\x89PNG\r\n\x1a\n'
+    svg = '<svg></svg>'
+
+    # Figures are decoded from base64 and SVGs encoded to bytes
+    assert get_figure_data({'image/png': 'iVBORw0KGgo='}) == (
+        'image/png', png)
+    assert get_figure_data({'image/svg+xml': svg, 'image/png': png}) == (
+        'image/svg+xml', svg.encode('utf-8'))
+    assert get_figure_data({'text/plain': 'text'}) == (None, None)
+
+    display_pub = kernel.shell.display_pub
+    frontend_call = mocker.patch.object(
+        display_pub.shell.kernel, 'frontend_call')
+    send = mocker.patch.object(display_pub.session, 'send')
+
+    def count_display_messages():
+        return len([
+            call for call in send.call_args_list
+            if call.args[1]['msg_type'] == 'display_data'
+        ])
+
+    # Figures go in display messages by default
+    display_pub.publish({'image/png': png, 'text/plain': 'Figure'})
+    assert not frontend_call.called
+    assert count_display_messages() == 1
+
+    # Figures are sent through the comm and other data is still published
+    kernel.set_configuration({'binary_figures': True})
+    try:
+        display_pub.publish({'image/png': png, 'text/plain': 'Figure'})
+        frontend_call.return_value.show_inline_figure.assert_called_once_with(
+            png, 'image/png')
+        assert count_display_messages() == 1
+
+        display_pub.publish({'text/plain': 'Text'})
+        assert count_display_messages() == 2
+    finally:
+        kernel.set_configuration({'binary_figures': False})
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -12,6 +12,8 @@
 # Standard library imports
 import ast
 import bdb
+import builtins
+from collections import OrderedDict
 from contextlib import contextmanager
 import cProfile
 from functools import partial
@@ -42,22 +44,44 @@
 
 # Local imports
 from spyder_kernels.comms.frontendcomm import CommError, frontend_request
+from spyder_kernels.customize import (
+    line_profiler, memory_profiler, sampling_profiler
+)
 from spyder_kernels.customize.namespace_manager import NamespaceManager
 from spyder_kernels.customize.spyderpdb import SpyderPdb
 from spyder_kernels.customize.umr import UserModuleReloader
 from spyder_kernels.customize.utils import (
     capture_last_Expr, canonic, create_pathlist, exec_encapsulate_locals
 )
+from spyder_kernels.utils.misc import get_text_hash
 
 
 # For logging
 logger = logging.getLogger(__name__)
 
+# Maximum number of files and cells whose parsed code is kept
+CODE_CACHE_SIZE = 32
+
+
+def profile_with_context(*args, sampling_interval=None, memory=False,
+                         **kwargs):
+    """
+    Show a nice message when profiling is interrupted.
+
+    If sampling_interval (in seconds) is given, the sampling profiler is used
+    instead of cProfile. If memory is True, the memory profiler is used.
+    """
+    if memory:
+        runctx = memory_profiler.runctx
+    elif sampling_interval is None:
+        runctx = cProfile.runctx
+    else:
+        runctx = partial(
+            sampling_profiler.runctx, interval=sampling_interval
+        )
 
-def profile_with_context(*args, **kwargs):
-    """Show a nice message when profiling is interrupted."""
     try:
-        cProfile.runctx(*args, **kwargs)
+        runctx(*args, **kwargs)
     except KeyboardInterrupt:
         print("\nProfiling was interrupted")
 
@@ -149,6 +173,23 @@ def runcell_arguments(func):
     return func
 
 
+class ParsedCode:
+    """Code of a file or cell, parsed and transformed to be executed."""
+
+    __slots__ = (
+        "code_ast", "code_object", "has_global", "capture_last_expression"
+    )
+
+    def __init__(self, code_ast, has_global, capture_last_expression):
+        self.code_ast = code_ast
+        self.has_global = has_global
+        self.capture_last_expression = capture_last_expression
+
+        # Compiled the first time it's needed, because it can't be used when
+        # locals are encapsulated.
+        self.code_object = None
+
+
 @magics_class
 class SpyderCodeRunner(Magics):
     """
@@ -159,6 +200,12 @@ def __init__(self, *args, **kwargs):
 
         self.show_global_msg = True
         self.show_invalid_syntax_msg = True
+
+        # Parsed code by filename, code and transform flags, and hash and
+        # text of the last version of each file sent by the frontend, so
+        # unchanged files and cells don't need to be sent and parsed again.
+        self._code_cache = OrderedDict()
+        self._file_code_cache = OrderedDict()
         self.umr = UserModuleReloader(
             namelist=os.environ.get("SPY_UMR_NAMELIST", None),
             shell=self.shell,
@@ -217,7 +264,29 @@ def profilefile(self, line, local_ns=None):
             self.profilefile, line, local_ns
         )
 
-        with self._profile_exec() as prof_exec:
+        with self._profile_exec(args.filename) as prof_exec:
+            self._exec_file(
+                filename=args.filename,
+                canonic_filename=args.canonic_filename,
+                wdir=args.wdir,
+                current_namespace=args.current_namespace,
+                args=args.args,
+                exec_fun=prof_exec,
+                post_mortem=args.post_mortem,
+                context_globals=args.namespace,
+                context_locals=local_ns,
+            )
+
+    @runfile_arguments
+    @needs_local_scope
+    @line_magic
+    def memprofilefile(self, line, local_ns=None):
+        """Profile the memory allocated by a file."""
+        args, local_ns = self._parse_runfile_argstring(
+            self.memprofilefile, line, local_ns
+        )
+
+        with self._profile_exec(memory=True) as prof_exec:
             self._exec_file(
                 filename=args.filename,
                 canonic_filename=args.canonic_filename,
@@ -275,7 +344,25 @@ def profilecell(self, line, local_ns=None):
         """Profile a code cell."""
         args = self._parse_runcell_argstring(self.profilecell, line)
 
-        with self._profile_exec() as prof_exec:
+        with self._profile_exec(args.filename) as prof_exec:
+            return self._exec_cell(
+                cell_id=args.cell_id,
+                filename=args.filename,
+                canonic_filename=args.canonic_filename,
+                exec_fun=prof_exec,
+                post_mortem=args.post_mortem,
+                context_globals=self.shell.user_ns,
+                context_locals=local_ns,
+            )
+
+    @runcell_arguments
+    @needs_local_scope
+    @line_magic
+    def memprofilecell(self, line, local_ns=None):
+        """Profile the memory allocated by a code cell."""
+        args = self._parse_runcell_argstring(self.memprofilecell, line)
+
+        with self._profile_exec(memory=True) as prof_exec:
             return self._exec_cell(
                 cell_id=args.cell_id,
                 filename=args.filename,
@@ -297,6 +384,17 @@ def profile(self, line, cell=None, local_ns=None):
         with self._profile_exec() as prof_exec:
             return prof_exec(line, self.shell.user_ns, local_ns)
 
+    @no_var_expand
+    @needs_local_scope
+    @line_cell_magic
+    def memprofile(self, line, cell=None, local_ns=None):
+        """Profile the memory allocated by the given line."""
+        if cell is not None:
+            line += "\n" + cell
+
+        with self._profile_exec(memory=True) as prof_exec:
+            return prof_exec(line, self.shell.user_ns, local_ns)
+
     @contextmanager
     def _debugger_exec(self, filename, continue_if_has_breakpoints):
         """Get an exec function to use for debugging."""
@@ -319,8 +417,14 @@ def debug_exec(code, glob=None, loc=None):
             yield debug_exec
 
     @contextmanager
-    def _profile_exec(self):
-        """Get an exec function for profiling."""
+    def _profile_exec(self, filename=None, memory=False):
+        """
+        Get an exec function for profiling.
+
+        If filename is given and line profiling was requested by the
+        frontend, the lines of filename are profiled instead of its functions.
+        If memory is True, the memory allocated by the code is profiled.
+        """
         # Request the frontend to adjust the UI when profiling is started
         try:
             frontend_request(blocking=False).start_profiling()
@@ -329,6 +433,15 @@ def _profile_exec(self):
                 "Could not request to start profiling to the frontend."
             )
 
+        if (
+            filename is not None
+            and not memory
+            and self.shell.profiler_conf.get("line_profiling", False)
+        ):
+            with self._line_profile_exec(filename) as line_prof_exec:
+                yield line_prof_exec
+            return
+
         tmp_dir = None
         if sys.platform.startswith('linux'):
             # Do not use /tmp for temporary files
@@ -347,6 +460,13 @@ def _profile_exec(self):
             # Get a file to save the results
             profile_filename = os.path.join(tempdir, "profile.prof")
 
+            # Use the sampling profiler if requested by the frontend
+            sampling_interval = None
+            if not memory and self.shell.profiler_conf.get("sampling", False):
+                sampling_interval = self.shell.profiler_conf.get(
+                    "sampling_interval", 10
+                ) / 1000
+
             try:
                 if self.shell.is_debugging():
                     def prof_exec(code, glob=None, loc=None):
@@ -355,14 +475,21 @@ def prof_exec(code, glob=None, loc=None):
                         necessary for profiling.
                         """
                         return sys.call_tracing(
-                            profile_with_context,
+                            partial(
+                                profile_with_context,
+                                sampling_interval=sampling_interval,
+                                memory=memory,
+                            ),
                             (code, glob, loc, profile_filename),
                         )
 
                     yield prof_exec
                 else:
                     yield partial(
-                        profile_with_context, filename=profile_filename
+                        profile_with_context,
+                        filename=profile_filename,
+                        sampling_interval=sampling_interval,
+                        memory=memory,
                     )
             finally:
                 # Reset tracing function
@@ -374,14 +501,61 @@ def prof_exec(code, glob=None, loc=None):
                         profile_result = f.read()
 
                     try:
-                        frontend_request(blocking=False).show_profile_file(
-                            profile_result, create_pathlist()
-                        )
+                        request = frontend_request(blocking=False)
+                        if memory:
+                            request.show_memory_profile_file(
+                                profile_result, create_pathlist()
+                            )
+                        else:
+                            request.show_profile_file(
+                                profile_result, create_pathlist()
+                            )
                     except CommError:
                         logger.debug(
                             "Could not send profile result to the frontend."
                         )
 
+    @contextmanager
+    def _line_profile_exec(self, filename):
+        """Get an exec function for line profiling."""
+        profiler = line_profiler.LineProfiler()
+
+        def line_prof_exec(code, glob=None, loc=None):
+            try:
+                profiler.runctx(code, glob, loc)
+            except KeyboardInterrupt:
+                print("\nProfiling was interrupted")
+
+        # Reset the tracing function in case we are debugging
+        trace_fun = sys.gettrace()
+        sys.settrace(None)
+
+        try:
+            if self.shell.is_debugging():
+                def debug_line_prof_exec(code, glob=None, loc=None):
+                    """
+                    If we are debugging (tracing), call_tracing is necessary
+                    for profiling.
+                    """
+                    return sys.call_tracing(line_prof_exec, (code, glob, loc))
+
+                yield debug_line_prof_exec
+            else:
+                yield line_prof_exec
+        finally:
+            # Reset tracing function
+            sys.settrace(trace_fun)
+
+            # Send result to frontend
+            try:
+                frontend_request(blocking=False).show_line_profile(
+                    filename, profiler.get_stats()
+                )
+            except CommError:
+                logger.debug(
+                    "Could not send line profile result to the frontend."
+                )
+
     def _exec_file(
         self,
         filename=None,
@@ -552,9 +726,7 @@ def _get_file_code(self, filename, save_all=True, raise_exception=False):
         """Retrieve the content of a file."""
         # Get code from spyder
         try:
-            return frontend_request(blocking=True).get_file_code(
-                filename, save_all=save_all
-            )
+            return self._request_file_code(filename, save_all)
         except Exception:
             # Maybe this is a local file
             try:
@@ -569,6 +741,45 @@ def _get_file_code(self, filename, save_all=True, raise_exception=False):
             # Finally return None
             return None
 
+    def _request_file_code(self, filename, save_all):
+        """
+        Request the content of a file to the frontend.
+
+        If the file didn't change since it was last requested, the frontend
+        only confirms it and the text is taken from the cache.
+        """
+        cached = self._file_code_cache.get(filename)
+        if cached is not None:
+            text_hash, file_code = cached
+            try:
+                new_file_code = frontend_request(blocking=True).get_file_code(
+                    filename, save_all=save_all, known_hash=text_hash
+                )
+            except CommError:
+                raise
+            except Exception:
+                # The frontend doesn't support known_hash
+                new_file_code = frontend_request(blocking=True).get_file_code(
+                    filename, save_all=save_all
+                )
+
+            if new_file_code is None:
+                self._file_code_cache.move_to_end(filename)
+                return file_code
+        else:
+            new_file_code = frontend_request(blocking=True).get_file_code(
+                filename, save_all=save_all
+            )
+
+        if isinstance(new_file_code, str):
+            self._file_code_cache[filename] = (
+                get_text_hash(new_file_code), new_file_code
+            )
+            self._file_code_cache.move_to_end(filename)
+            if len(self._file_code_cache) > CODE_CACHE_SIZE:
+                self._file_code_cache.popitem(last=False)
+        return new_file_code
+
     def _exec_code(
         self,
         code,
@@ -584,61 +795,50 @@ def _exec_code(
         if exec_fun is None:
             exec_fun = exec
 
-        is_ipython = os.path.splitext(filename)[1] == ".ipy"
         try:
-            if not is_ipython:
-                # TODO: Remove the try-except and let the SyntaxError raise
-                # because there should't be IPython code in a Python file.
-                try:
-                    ast_code = ast.parse(
-                        self._transform_cell(code, indent_only=True)
-                    )
-                except SyntaxError as e:
-                    try:
-                        ast_code = ast.parse(self._transform_cell(code))
-                    except SyntaxError:
-                        raise e from None
-                    else:
-                        if self.show_invalid_syntax_msg:
-                            print(
-                                "\nWARNING: This is not valid Python code. "
-                                "If you want to use IPython magics, "
-                                "flexible indentation, and prompt removal, "
-                                "we recommend that you save this file with the "
-                                ".ipy extension.\n"
-                            )
-                            self.show_invalid_syntax_msg = False
-            else:
-                ast_code = ast.parse(self._transform_cell(code))
+            parsed_code = self._parse_code(
+                code, filename, capture_last_expression
+            )
 
             # Print warning for global
-            if global_warning and self.show_global_msg:
-                has_global = any(
-                    isinstance(node, ast.Global) for node in ast.walk(ast_code)
+            if (
+                global_warning
+                and self.show_global_msg
+                and parsed_code.has_global
+            ):
+                print(
+                    "\nWARNING: This file contains a global statement, "
+                    "but it is run in an empty namespace. "
+                    "Consider using the "
+                    "'Run in console's namespace instead of an empty one' "
+                    "option, that you can find in the menu 'Run > "
+                    "Configuration per file', if you want to capture the "
+                    "namespace.\n"
                 )
-                if has_global:
-                    print(
-                        "\nWARNING: This file contains a global statement, "
-                        "but it is run in an empty namespace. "
-                        "Consider using the "
-                        "'Run in console's namespace instead of an empty one' "
-                        "option, that you can find in the menu 'Run > "
-                        "Configuration per file', if you want to capture the "
-                        "namespace.\n"
-                    )
-                    self.show_global_msg = False
-
-            if code.rstrip()[-1:] == ";":
-                # Supress output with ;
-                capture_last_expression = False
+                self.show_global_msg = False
 
+            capture_last_expression = parsed_code.capture_last_expression
             if capture_last_expression:
-                ast_code, capture_last_expression = capture_last_Expr(
-                    ast_code, "_spyder_out", ns_globals
-                )
+                # Needed by the code that captures the last expression
+                ns_globals["__spyder_builtins__"] = builtins
+
+            # The compiled code can only be reused if locals are not
+            # encapsulated by exec_encapsulate_locals.
+            code_object = None
+            if ns_locals is None or ns_locals is ns_globals:
+                if parsed_code.code_object is None:
+                    parsed_code.code_object = compile(
+                        parsed_code.code_ast, filename, "exec"
+                    )
+                code_object = parsed_code.code_object
 
             exec_encapsulate_locals(
-                ast_code, ns_globals, ns_locals, exec_fun, filename
+                parsed_code.code_ast,
+                ns_globals,
+                ns_locals,
+                exec_fun,
+                filename,
+                code_object=code_object,
             )
 
             if capture_last_expression:
@@ -662,6 +862,64 @@ def _exec_code(
         finally:
             __tracebackhide__ = "__pdb_exit__"
 
+    def _parse_code(self, code, filename, capture_last_expression):
+        """
+        Parse and transform code to execute it.
+
+        Results are cached, so running the same file or cell again doesn't
+        parse it again.
+        """
+        cache_key = (filename, code, capture_last_expression)
+        parsed_code = self._code_cache.get(cache_key)
+        if parsed_code is not None:
+            self._code_cache.move_to_end(cache_key)
+            return parsed_code
+
+        is_ipython = os.path.splitext(filename)[1] == ".ipy"
+        if not is_ipython:
+            # TODO: Remove the try-except and let the SyntaxError raise
+            # because there should't be IPython code in a Python file.
+            try:
+                code_ast = ast.parse(
+                    self._transform_cell(code, indent_only=True)
+                )
+            except SyntaxError as e:
+                try:
+                    code_ast = ast.parse(self._transform_cell(code))
+                except SyntaxError:
+                    raise e from None
+                else:
+                    if self.show_invalid_syntax_msg:
+                        print(
+                            "\nWARNING: This is not valid Python code. "
+                            "If you want to use IPython magics, "
+                            "flexible indentation, and prompt removal, "
+                            "we recommend that you save this file with the "
+                            ".ipy extension.\n"
+                        )
+                        self.show_invalid_syntax_msg = False
+        else:
+            code_ast = ast.parse(self._transform_cell(code))
+
+        has_global = any(
+            isinstance(node, ast.Global) for node in ast.walk(code_ast)
+        )
+
+        if code.rstrip()[-1:] == ";":
+            # Supress output with ;
+            capture_last_expression = False
+
+        if capture_last_expression:
+            code_ast, capture_last_expression = capture_last_Expr(
+                code_ast, "_spyder_out", {}
+            )
+
+        parsed_code = ParsedCode(code_ast, has_global, capture_last_expression)
+        self._code_cache[cache_key] = parsed_code
+        if len(self._code_cache) > CODE_CACHE_SIZE:
+            self._code_cache.popitem(last=False)
+        return parsed_code
+
     def _count_leading_empty_lines(self, cell):
         """Count the number of leading empty cells."""
         lines = cell.splitlines(keepends=True)
@@ -0,0 +1,239 @@
+#
+# Copyright (c) 2009- Spyder Kernels Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder_kernels/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+"""
+Profiler that measures the time spent in each line of a file or cell.
+
+Only the code being profiled (and the functions defined by it) is
+instrumented, so calls to other modules run at full speed. On Python 3.12+
+this uses sys.monitoring LINE events, and sys.settrace on older versions.
+"""
+
+# Standard library imports
+import inspect
+import sys
+import time
+
+
+# Events used on Python 3.12+
+if hasattr(sys, "monitoring"):
+    _EVENTS = sys.monitoring.events
+    LOCAL_EVENTS = (
+        _EVENTS.PY_START
+        | _EVENTS.PY_RESUME
+        | _EVENTS.PY_RETURN
+        | _EVENTS.PY_YIELD
+        | _EVENTS.LINE
+    )
+else:
+    LOCAL_EVENTS = None
+
+
+def get_code_objects(code):
+    """Get code and the code objects nested in it (functions, classes)."""
+    codes = []
+    pending = [code]
+    while pending:
+        code = pending.pop()
+        codes.append(code)
+        pending.extend(
+            const for const in code.co_consts if inspect.iscode(const)
+        )
+    return codes
+
+
+def get_namespace_code_objects(namespace, filename):
+    """Get code objects of the functions in namespace defined in filename."""
+    functions = []
+    for value in list(namespace.values()):
+        if inspect.isclass(value):
+            for attribute in list(vars(value).values()):
+                if isinstance(attribute, (staticmethod, classmethod)):
+                    attribute = attribute.__func__
+                elif isinstance(attribute, property):
+                    functions.extend([
+                        attribute.fget, attribute.fset, attribute.fdel
+                    ])
+                    continue
+                functions.append(attribute)
+        else:
+            functions.append(value)
+
+    codes = []
+    for function in functions:
+        code = getattr(inspect.unwrap(function), "__code__", None)
+        if inspect.iscode(code) and code.co_filename == filename:
+            codes.extend(get_code_objects(code))
+    return codes
+
+
+class LineProfiler:
+    """
+    Profiler that measures the number of hits and time of each line.
+
+    The time of a line includes the time spent in the functions it calls.
+    """
+
+    def __init__(self):
+        self.filename = None
+
+        # Number of hits and time by line number
+        self.stats = {}
+
+        self._codes = set()
+
+        # Stack of [code, line, start time] for the running code objects
+        self._stack = []
+        self._tool_id = None
+
+    # ---- Public API
+    # -------------------------------------------------------------------------
+    def runctx(self, cmd, globals, locals):
+        """Profile the execution of cmd, like cProfile.Profile.runctx."""
+        if isinstance(cmd, str):
+            cmd = compile(cmd, "<string>", "exec")
+
+        self.filename = cmd.co_filename
+        self._codes.update(get_code_objects(cmd))
+
+        # Functions defined by previous runs of the file or other cells
+        self._codes.update(
+            get_namespace_code_objects(globals, self.filename)
+        )
+        if locals is not None and locals is not globals:
+            self._codes.update(
+                get_namespace_code_objects(locals, self.filename)
+            )
+
+        self.enable()
+        try:
+            exec(cmd, globals, locals)
+        finally:
+            self.disable()
+        return self
+
+    def enable(self):
+        """Start collecting line events."""
+        self._stack = []
+        if LOCAL_EVENTS is not None and self._enable_monitoring():
+            return
+        sys.settrace(self._trace)
+
+    def disable(self):
+        """Stop collecting line events."""
+        if self._tool_id is not None:
+            monitoring = sys.monitoring
+            for code in self._codes:
+                monitoring.set_local_events(self._tool_id, code, 0)
+            monitoring.register_callback(
+                self._tool_id, _EVENTS.PY_UNWIND, None
+            )
+            monitoring.set_events(self._tool_id, 0)
+            monitoring.free_tool_id(self._tool_id)
+            self._tool_id = None
+        else:
+            sys.settrace(None)
+
+        # Account the time of the lines still running
+        now = time.perf_counter()
+        while self._stack:
+            self._end_line(self._stack.pop(), now)
+
+    def get_stats(self):
+        """Get the number of hits and time by line number."""
+        return {line: tuple(values) for line, values in self.stats.items()}
+
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _enable_monitoring(self):
+        """Use sys.monitoring to get events. Return False if not possible."""
+        monitoring = sys.monitoring
+        for tool_id in range(monitoring.PROFILER_ID, 6):
+            if monitoring.get_tool(tool_id) is None:
+                break
+        else:
+            return False
+
+        monitoring.use_tool_id(tool_id, "Spyder line profiler")
+        self._tool_id = tool_id
+
+        callbacks = {
+            _EVENTS.PY_START: self._on_start,
+            _EVENTS.PY_RESUME: self._on_start,
+            _EVENTS.PY_RETURN: self._on_return,
+            _EVENTS.PY_YIELD: self._on_return,
+            _EVENTS.PY_UNWIND: self._on_unwind,
+            _EVENTS.LINE: self._on_line,
+        }
+        for event, callback in callbacks.items():
+            monitoring.register_callback(tool_id, event, callback)
+
+        for code in self._codes:
+            monitoring.set_local_events(tool_id, code, LOCAL_EVENTS)
+
+        # Unwinding can't be enabled for specific code objects
+        monitoring.set_events(tool_id, _EVENTS.PY_UNWIND)
+        return True
+
+    def _start_line(self, entry, line, now):
+        """Start timing line for a stack entry."""
+        self._end_line(entry, now)
+        entry[1] = line
+        entry[2] = now
+
+        values = self.stats.get(line)
+        if values is None:
+            values = self.stats[line] = [0, 0.0]
+        values[0] += 1
+
+    def _end_line(self, entry, now):
+        """Add the time of the current line of a stack entry."""
+        line = entry[1]
+        if line is not None:
+            self.stats[line][1] += now - entry[2]
+            entry[1] = None
+
+    # ---- sys.monitoring callbacks
+    def _on_start(self, code, offset):
+        self._stack.append([code, None, time.perf_counter()])
+
+    def _on_return(self, code, offset, value):
+        now = time.perf_counter()
+        if self._stack and self._stack[-1][0] is code:
+            self._end_line(self._stack.pop(), now)
+
+    def _on_unwind(self, code, offset, exception):
+        if code in self._codes:
+            self._on_return(code, offset, None)
+
+    def _on_line(self, code, line):
+        now = time.perf_counter()
+        if not self._stack or self._stack[-1][0] is not code:
+            self._stack.append([code, None, now])
+        self._start_line(self._stack[-1], line, now)
+
+    # ---- sys.settrace callbacks
+    def _trace(self, frame, event, arg):
+        if event == "call" and frame.f_code in self._codes:
+            self._stack.append([frame.f_code, None, time.perf_counter()])
+            return self._trace_lines
+        return None
+
+    def _trace_lines(self, frame, event, arg):
+        if event == "line":
+            now = time.perf_counter()
+            self._start_line(self._stack[-1], frame.f_lineno, now)
+        elif event == "return":
+            self._on_return(frame.f_code, None, arg)
+        return self._trace_lines
+
+
+def runctx(statement, globals, locals):
+    """Run statement under the line profiler and return it."""
+    profiler = LineProfiler()
+    profiler.runctx(statement, globals, locals)
+    return profiler
@@ -0,0 +1,168 @@
+#
+# Copyright (c) 2009- Spyder Kernels Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder_kernels/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+"""
+Memory profiler that finds where the memory retained by some code was
+allocated.
+
+Code is run under tracemalloc and the snapshots taken before and after it are
+compared. Results are saved in the format used by cProfile, grouped by the
+lines in the traceback of each allocation, so they can be loaded with pstats.
+The tracebacks are saved after them, like the stacks of the sampling profiler.
+In that case, the number of calls is the number of memory blocks and times
+are sizes in bytes.
+"""
+
+# Standard library imports
+from collections import defaultdict
+import linecache
+import tracemalloc
+
+# Local imports
+from spyder_kernels.customize.sampling_profiler import (
+    dump_stats_and_stacks,
+    stacks_to_stats,
+)
+
+
+# Maximum number of frames saved in the traceback of each allocation
+DEFAULT_NFRAMES = 64
+
+# Key of the lines in tracebacks that don't reach the profiled code
+TRUNCATED_KEY = ("~", 0, "<truncated traceback>")
+
+
+def label(frame):
+    """Get the key used in stats for a tracemalloc frame."""
+    line = linecache.getline(frame.filename, frame.lineno).strip()
+    return (frame.filename, frame.lineno, line or "<line>")
+
+
+class MemoryProfiler:
+    """
+    Profiler that compares the memory allocated before and after some code.
+
+    Parameters
+    ----------
+    nframes: int
+        Maximum number of frames saved in the traceback of each allocation.
+        It's only used if tracemalloc is not already tracing.
+    """
+
+    def __init__(self, nframes=DEFAULT_NFRAMES):
+        self.nframes = nframes
+        self.stats = {}
+
+        # Number of memory blocks and size by traceback of pstats keys, from
+        # the most recent frame to the oldest one.
+        self.stacks = {}
+
+        # Peak size of the memory traced while running the code, in bytes
+        self.peak = 0
+
+        self._differences = []
+        self._traceback_limit = nframes
+        self._filename = "<string>"
+
+    # ---- Public API
+    # -------------------------------------------------------------------------
+    def runctx(self, cmd, globals, locals):
+        """Profile the execution of cmd, like cProfile.Profile.runctx."""
+        self._filename = getattr(cmd, "co_filename", "<string>")
+
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(self.nframes)
+        tracemalloc.reset_peak()
+
+        before = tracemalloc.take_snapshot()
+        try:
+            exec(cmd, globals, locals)
+        finally:
+            after = tracemalloc.take_snapshot()
+            self.peak = tracemalloc.get_traced_memory()[1]
+            self._traceback_limit = tracemalloc.get_traceback_limit()
+            if not was_tracing:
+                tracemalloc.stop()
+
+            # Remove the memory used by tracemalloc itself
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            self._differences = after.filter_traces(filters).compare_to(
+                before.filter_traces(filters), "traceback"
+            )
+        return self
+
+    def create_stats(self):
+        """
+        Compute stats in the format used by pstats from the snapshots.
+
+        Only memory that was allocated and not freed by the profiled code is
+        taken into account. Lines at the top level of the code are called
+        by a module key, like with cProfile.
+        """
+        module_key = (self._filename, 0, "<module>")
+        stacks = defaultdict(lambda: [0, 0.0])
+        for difference in self._differences:
+            if difference.size_diff <= 0:
+                continue
+
+            # Frames from the most recent one to the oldest one
+            frames = list(reversed(difference.traceback))
+            stack = []
+            for frame in frames:
+                if frame.filename == __file__:
+                    # Frames above this one are not part of the profiled code
+                    break
+
+                # Comprehensions and lambdas run in their own frame, but
+                # they are part of the line that calls them.
+                key = label(frame)
+                if not stack or stack[-1] != key:
+                    stack.append(key)
+            else:
+                # Skip allocations done by other threads, unless the
+                # traceback was truncated.
+                if len(frames) < self._traceback_limit:
+                    continue
+                stack.append(TRUNCATED_KEY)
+
+            if not stack:
+                continue
+            stack.append(module_key)
+
+            values = stacks[tuple(stack)]
+            values[0] += max(difference.count_diff, 0)
+            values[1] += difference.size_diff
+
+        self.stats = stacks_to_stats(stacks)
+        self.stacks = {
+            stack: tuple(values) for stack, values in stacks.items()
+        }
+
+    def dump_stats(self, filename):
+        """
+        Save stats to filename, like cProfile.Profile.dump_stats.
+
+        The stacks are saved after the stats, so pstats ignores them.
+        """
+        self.create_stats()
+        dump_stats_and_stacks(filename, self.stats, self.stacks)
+
+
+def runctx(statement, globals, locals, filename=None):
+    """
+    Run statement under the memory profiler, like cProfile.runctx.
+
+    Results are saved to filename, if given.
+    """
+    profiler = MemoryProfiler()
+    try:
+        profiler.runctx(statement, globals, locals)
+    finally:
+        if filename is not None:
+            profiler.dump_stats(filename)
+    return profiler
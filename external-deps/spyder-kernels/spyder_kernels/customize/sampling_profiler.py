@@ -0,0 +1,240 @@
+#
+# Copyright (c) 2009- Spyder Kernels Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder_kernels/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+"""
+Statistical profiler that samples the stack of a running thread.
+
+Contrary to cProfile, it doesn't trace every function call, so its overhead
+is low and doesn't depend on the number of calls done by the profiled code.
+Its results are saved in the same format used by cProfile, so they can be
+loaded with pstats. The sampled stacks are saved after them, for tools that
+can show whole stacks, like flame graphs.
+"""
+
+# Standard library imports
+from collections import defaultdict
+import marshal
+import sys
+import threading
+import time
+
+
+# Default time between samples
+DEFAULT_INTERVAL = 0.01  # seconds
+
+
+def label(code):
+    """Get the key used by pstats for a code object."""
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def stacks_to_stats(stacks):
+    """
+    Compute stats in the format used by pstats from weighted stacks.
+
+    Parameters
+    ----------
+    stacks: dict
+        Number of calls and weight by stack of pstats keys, from the
+        innermost frame to the outermost one. The weight of a stack is the
+        local value of its innermost function and is added to the cumulative
+        value of all its functions.
+    """
+    # Values are [calls, primitive calls, local value, cumulative value,
+    # callers], where callers has the same values for each caller.
+    stats = {}
+
+    def add(values, calls, local_value, cumulative_value):
+        values[0] += calls
+        values[1] += calls
+        values[2] += local_value
+        values[3] += cumulative_value
+
+    for functions, (calls, weight) in stacks.items():
+        seen = set()
+        seen_calls = set()
+        for i, func in enumerate(functions):
+            local_value = weight if i == 0 else 0.0
+
+            # Recursive functions are only counted once per stack
+            if func not in seen:
+                seen.add(func)
+                if func not in stats:
+                    stats[func] = [0, 0, 0.0, 0.0, {}]
+                add(stats[func], calls, local_value, weight)
+
+            if i + 1 < len(functions):
+                caller = functions[i + 1]
+                if (caller, func) in seen_calls:
+                    continue
+                seen_calls.add((caller, func))
+                callers = stats[func][4]
+                if caller not in callers:
+                    callers[caller] = [0, 0, 0.0, 0.0]
+                add(callers[caller], calls, local_value, weight)
+
+    return {
+        func: (
+            cc, nc, tt, ct,
+            {caller: tuple(values) for caller, values in callers.items()}
+        )
+        for func, (cc, nc, tt, ct, callers) in stats.items()
+    }
+
+
+def dump_stats_and_stacks(filename, stats, stacks):
+    """Save stats, in the format used by pstats, and stacks to filename."""
+    with open(filename, "wb") as f:
+        marshal.dump(stats, f)
+        marshal.dump(stacks, f)
+
+
+class SamplingProfiler:
+    """
+    Profiler that samples the stack of a thread at regular intervals.
+
+    Samples are taken from a background thread with sys._current_frames, so
+    the profiled thread is never traced. Each sample is weighted by the time
+    elapsed since the previous one.
+
+    Parameters
+    ----------
+    interval: float
+        Time between samples, in seconds.
+    thread_id: int, optional
+        Identifier of the thread to profile. By default, the thread that
+        calls start.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stats = {}
+
+        # Number of samples and time by stack of pstats keys, from the
+        # innermost frame to the outermost one.
+        self.stacks = {}
+
+        # Total time and number of samples by stack of code objects, from
+        # the innermost frame to the outermost one.
+        self._stacks = defaultdict(lambda: [0, 0.0])
+        self._base_frame = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # ---- Public API
+    # -------------------------------------------------------------------------
+    def start(self):
+        """Start sampling."""
+        if self._thread is not None:
+            return
+
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._sample_loop,
+            name="Spyder sampling profiler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling."""
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def runctx(self, cmd, globals, locals):
+        """Profile the execution of cmd, like cProfile.Profile.runctx."""
+        # Frames above this one are not part of the profiled code
+        self._base_frame = sys._getframe()
+        self.thread_id = threading.get_ident()
+        self.start()
+        try:
+            exec(cmd, globals, locals)
+        finally:
+            self.stop()
+            self._base_frame = None
+        return self
+
+    def create_stats(self):
+        """
+        Compute stats in the format used by pstats from the samples.
+
+        For each function, the number of calls is the number of samples in
+        which it was found.
+        """
+        stacks = defaultdict(lambda: [0, 0.0])
+        for stack, (samples, weight) in self._stacks.items():
+            values = stacks[tuple(label(code) for code in stack)]
+            values[0] += samples
+            values[1] += weight
+        self.stats = stacks_to_stats(stacks)
+        self.stacks = {
+            stack: tuple(values) for stack, values in stacks.items()
+        }
+
+    def dump_stats(self, filename):
+        """
+        Save stats to filename, like cProfile.Profile.dump_stats.
+
+        The stacks are saved after the stats, so pstats ignores them.
+        """
+        self.create_stats()
+        dump_stats_and_stacks(filename, self.stats, self.stacks)
+
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _sample_loop(self):
+        """Take samples until stopped."""
+        last_time = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            now = time.perf_counter()
+            self._take_sample(now - last_time)
+            last_time = now
+
+    def _take_sample(self, weight):
+        """Add the current stack of the profiled thread to the samples."""
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None and frame is not self._base_frame:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+
+        # Skip samples taken when the profiled code is not running, i.e. the
+        # base frame was not found or the profiler is stopping.
+        if (
+            not stack
+            or (self._base_frame is not None and frame is None)
+            or stack[-1].co_filename == __file__
+        ):
+            return
+
+        values = self._stacks[tuple(stack)]
+        values[0] += 1
+        values[1] += weight
+
+
+def runctx(statement, globals, locals, filename=None,
+           interval=DEFAULT_INTERVAL):
+    """
+    Run statement under the sampling profiler, like cProfile.runctx.
+
+    Results are saved to filename, if given.
+    """
+    profiler = SamplingProfiler(interval=interval)
+    try:
+        profiler.runctx(statement, globals, locals)
+    finally:
+        if filename is not None:
+            profiler.dump_stats(filename)
+    return profiler
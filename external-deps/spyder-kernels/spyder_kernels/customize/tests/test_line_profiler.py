@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2009- Spyder Kernels Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder_kernels/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+from spyder_kernels.customize.line_profiler import runctx
+
+
+CODE = """
+import json, time
+
+def busy():
+    end = time.perf_counter() + 0.1
+    while time.perf_counter() < end:
+        pass
+
+def main():
+    for i in range(2):
+        busy()
+    json.dumps([])
+
+main()
+"""
+
+
+def test_line_profiler(tmp_path):
+    """Test that the line profiler only measures the lines of the code."""
+    filename = str(tmp_path / "script.py")
+    code = compile(CODE, filename, "exec")
+    namespace = {}
+    stats = runctx(code, namespace, namespace).get_stats()
+
+    # Lines of other modules are not included
+    assert max(stats) == CODE.count("\n")
+
+    # Hits and time by line
+    assert stats[11][0] == 2
+    assert stats[11][1] > 0.2
+    assert stats[14][1] >= stats[11][1]
+    assert stats[6][0] > 2
+
+    # Functions defined by previous runs are also profiled
+    code = compile("busy()", filename, "exec")
+    stats = runctx(code, namespace, namespace).get_stats()
+    assert set(stats) == {1, 5, 6, 7}
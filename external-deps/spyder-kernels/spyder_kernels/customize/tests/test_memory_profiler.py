@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2009- Spyder Kernels Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder_kernels/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+import marshal
+import pstats
+
+from spyder_kernels.customize.memory_profiler import runctx
+
+
+CODE = """
+def allocate():
+    return [0] * 1000000
+
+def main():
+    return allocate()
+
+data = main()
+temporary = [0] * 1000000
+del temporary
+"""
+
+
+def test_memory_profiler(tmp_path):
+    """Test that the memory profiler saves results readable by pstats."""
+    filename = str(tmp_path / "profile.prof")
+    script = str(tmp_path / "script.py")
+    with open(script, "w") as f:
+        f.write(CODE)
+
+    namespace = {}
+    profiler = runctx(
+        compile(CODE, script, "exec"), namespace, namespace,
+        filename=filename
+    )
+    assert profiler.peak >= 2 * 8 * 1000000
+
+    stats = pstats.Stats(filename).stats
+    lines = {
+        func[1]: values for func, values in stats.items()
+        if func[0] == script
+    }
+
+    # Only memory that is still allocated is included
+    assert 9 not in lines
+
+    # The size is local to the line that allocated it and cumulative for the
+    # lines in its traceback.
+    calls, __, local_size, cumulative_size, callers = lines[3]
+    assert calls >= 1
+    assert local_size >= 8 * 1000000
+    assert lines[6][2] == 0
+    assert lines[6][3] == cumulative_size
+    assert lines[8][3] >= cumulative_size
+    assert [func[1] for func in callers] == [6]
+
+    # Lines at the top level are called by the module
+    assert list(lines[8][4]) == [(script, 0, "<module>")]
+    assert lines[0][3] >= lines[8][3]
+    assert stats[(script, 3, "return [0] * 1000000")]
+
+    # Tracebacks are saved after the stats
+    with open(filename, "rb") as f:
+        marshal.load(f)
+        stacks = marshal.load(f)
+    assert stacks == profiler.stacks
+    assert any(
+        [func[1] for func in stack if func[0] == script] == [3, 6, 8, 0]
+        for stack in stacks
+    )
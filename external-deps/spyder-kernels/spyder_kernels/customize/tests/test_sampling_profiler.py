@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2009- Spyder Kernels Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder_kernels/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+import marshal
+import pstats
+
+import pytest
+
+from spyder_kernels.customize.sampling_profiler import runctx
+
+
+CODE = """
+import time
+
+def busy():
+    end = time.perf_counter() + 0.2
+    while time.perf_counter() < end:
+        pass
+
+def main():
+    busy()
+
+main()
+"""
+
+
+def test_sampling_profiler(tmp_path):
+    """Test that the sampling profiler saves results readable by pstats."""
+    filename = str(tmp_path / "profile.prof")
+    namespace = {}
+    runctx(CODE, namespace, namespace, filename=filename, interval=0.005)
+
+    stats = pstats.Stats(filename).stats
+    functions = {func[2]: values for func, values in stats.items()}
+
+    # Frames outside the profiled code are not included
+    assert set(functions) == {"<module>", "main", "busy"}
+
+    # Local time is spent in busy and cumulative time includes its callers
+    calls, __, local_time, cumulative_time, callers = functions["busy"]
+    assert calls > 0
+    assert local_time > 0.1
+    assert functions["main"][2] == 0
+    assert functions["main"][3] == cumulative_time
+    assert [func[2] for func in callers] == ["main"]
+
+    # The sampled stacks are saved after the stats
+    with open(filename, "rb") as f:
+        marshal.load(f)
+        stacks = marshal.load(f)
+    assert {
+        tuple(func[2] for func in stack) for stack in stacks
+    } <= {("busy", "main", "<module>"), ("main", "<module>"), ("<module>",)}
+    assert sum(weight for __, weight in stacks.values()) == pytest.approx(
+        functions["<module>"][3]
+    )
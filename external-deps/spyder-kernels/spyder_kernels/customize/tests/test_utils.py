@@ -6,10 +6,13 @@
 # (see spyder_kernels/__init__.py for details)
 # -----------------------------------------------------------------------------
 
+import ast
 import os
 import sys
 
-from spyder_kernels.customize.utils import create_pathlist
+from spyder_kernels.customize.utils import (
+    create_pathlist, exec_encapsulate_locals
+)
 
 
 def test_user_sitepackages_in_pathlist():
@@ -22,3 +25,26 @@ def test_user_sitepackages_in_pathlist():
         user_path = 'Roaming'
 
     assert any([user_path in path for path in create_pathlist()])
+
+
+def test_exec_encapsulate_locals_code_object():
+    """
+    Test that a compiled code object is reused unless locals need to be
+    encapsulated.
+    """
+    code_ast = ast.parse("x = y + 1")
+    code_object = compile("x = y + 2", "<stdin>", "exec")
+
+    namespace = {"y": 1}
+    exec_encapsulate_locals(
+        code_ast, namespace, None, code_object=code_object
+    )
+    assert namespace["x"] == 3
+
+    # The code object can't be used with encapsulated locals
+    globals_ns = {}
+    locals_ns = {"y": 1}
+    exec_encapsulate_locals(
+        code_ast, globals_ns, locals_ns, code_object=code_object
+    )
+    assert locals_ns["x"] == 2
@@ -130,11 +130,14 @@ def capture_last_Expr(code_ast, out_varname, global_ns):
 
 
 def exec_encapsulate_locals(
-    code_ast, globals, locals, exec_fun=None, filename=None
+    code_ast, globals, locals, exec_fun=None, filename=None, code_object=None
 ):
     """
     Execute by encapsulating locals if needed.
 
+    If locals don't need to be encapsulated and code_object is given, it's
+    executed instead of compiling code_ast again.
+
     Notes
     ----- 
     * In general, the dict returned by locals() might or might not be modified.
@@ -206,7 +209,9 @@ def exec_encapsulate_locals(
             exec_fun = exec
         if filename is None:
             filename = "<stdin>"
-        exec_fun(compile(code_ast, filename, "exec"), globals, None)
+        if use_locals_hack or code_object is None:
+            code_object = compile(code_ast, filename, "exec")
+        exec_fun(code_object, globals, None)
     finally:
         if use_locals_hack:
             # Cleanup code
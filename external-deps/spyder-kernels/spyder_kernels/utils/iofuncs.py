@@ -264,6 +264,101 @@ def load_json(filename):
         return None, str(err)
 
 
+# ---- For text files
+# -----------------------------------------------------------------------------
+# Number of rows parsed at a time when loading text files
+TEXT_CHUNK_SIZE = 100_000
+
+
+def load_text(source, as_type="array", colsep=",", rowsep="\n", skiprows=0,
+              comments="#", transpose=False, encoding="utf-8",
+              chunksize=TEXT_CHUNK_SIZE, progress_callback=None):
+    """
+    Load delimited data from a text file.
+
+    Rows are parsed in chunks with the C parser of pandas, so large files are
+    loaded without creating a Python object for each value of the file.
+
+    Parameters
+    ----------
+    source: str or file-like
+        Name of the file or file-like object to read.
+    as_type: str
+        Type of the data to return: 'array', 'list', 'dataframe' or 'text'.
+    colsep: str or None
+        Column separator. If None, columns are separated by whitespace.
+    rowsep: str
+        Row separator. It must be a single character, unless it's an EOL.
+    skiprows: int
+        Number of rows to skip at the start of the file.
+    comments: str
+        Character that starts comments.
+    transpose: bool
+        Whether to transpose the data.
+    encoding: str
+        Encoding of the file.
+    chunksize: int
+        Number of rows parsed at a time.
+    progress_callback: callable, optional
+        Function called with the fraction of the file that was read after
+        each chunk. It's only used if source is a file name.
+    """
+    if as_type == "text":
+        if isinstance(source, str):
+            with open(source, encoding=encoding, newline="") as f:
+                return f.read()
+        return source.read()
+
+    if pd.read_csv is FakeObject:
+        raise ImportError("No module named 'pandas'")
+
+    kwargs = dict(
+        sep=r"\s+" if colsep is None else colsep,
+        header=0 if as_type == "dataframe" else None,
+        skiprows=skiprows,
+        comment=comments or None,
+        skip_blank_lines=True,
+        chunksize=chunksize,
+    )
+    if rowsep not in ("\n", "\r\n"):
+        kwargs["lineterminator"] = rowsep
+
+    if isinstance(source, str):
+        size = osp.getsize(source)
+        fid = open(source, "rb")
+        kwargs["encoding"] = encoding
+    else:
+        size = 0
+        fid = source
+
+    chunks = []
+    try:
+        with pd.read_csv(fid, **kwargs) as reader:
+            for chunk in reader:
+                if as_type != "dataframe":
+                    chunk = chunk.to_numpy()
+                chunks.append(chunk)
+                if progress_callback is not None and size:
+                    progress_callback(min(fid.tell() / size, 1))
+    finally:
+        if fid is not source:
+            fid.close()
+
+    if as_type == "dataframe":
+        data = pd.concat(chunks, ignore_index=True)
+        return data.T if transpose else data
+
+    data = np.concatenate(chunks)
+    if transpose:
+        data = data.T
+
+    # Remove dimensions with a single row or column
+    data = np.squeeze(data)
+    if as_type == "list":
+        return data.tolist()
+    return data
+
+
 # ---- For Spydata files
 # -----------------------------------------------------------------------------
 def save_dictionary(data, filename):
@@ -8,6 +8,7 @@
 
 """Miscellaneous utilities"""
 
+import hashlib
 import re
 
 from functools import lru_cache
@@ -48,3 +49,13 @@ def fix_reference_name(name, blacklist=None):
             index += 1
         name = get_new_name(index)
     return name
+
+
+def get_text_hash(text):
+    """
+    Get a hash of text that is stable across processes.
+
+    This is used to check if the code of a file changed between the kernel
+    and the frontend without sending it again.
+    """
+    return hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
@@ -718,13 +718,18 @@ def get_remote_data(data, settings, mode, more_excluded_names=None):
         excluded_names=excluded_names, filter_on=settings['filter_on'])
 
 
-def make_remote_view(data, settings, more_excluded_names=None):
+def make_remote_view(data, settings, more_excluded_names=None,
+                     filtered=False):
     """
     Make a remote view of dictionary *data*
     -> globals explorer
+
+    If *filtered* is True, *data* was already filtered with get_remote_data
+    in 'editable' mode.
     """
-    data = get_remote_data(data, settings, mode='editable',
-                           more_excluded_names=more_excluded_names)
+    if not filtered:
+        data = get_remote_data(data, settings, mode='editable',
+                               more_excluded_names=more_excluded_names)
     remote = {}
     for key, value in list(data.items()):
         view = value_to_display(value, minmax=settings['minmax'])
@@ -366,5 +366,33 @@ def test_load_dicom_files():
     assert data[0]['data'].shape == (512, 512)
 
 
+def test_load_text(tmp_path):
+    """Check that text files are loaded in chunks with the right shape."""
+    text_file = tmp_path / "data.csv"
+    text_file.write_text(
+        "# comment\n" + "".join(f"{i},{i / 2},a\n" for i in range(10))
+    )
+
+    fractions = []
+    data = iofuncs.load_text(
+        str(text_file), chunksize=3, progress_callback=fractions.append)
+    assert data.shape == (10, 3)
+    assert data[9, 0] == 9 and data[9, 1] == 4.5 and data[9, 2] == 'a'
+    assert len(fractions) == 4 and fractions[-1] == 1
+
+    data = iofuncs.load_text(
+        str(text_file), as_type="list", transpose=True, skiprows=1)
+    assert data[0] == list(range(10))
+
+    # Single columns are returned as 1D data
+    data = iofuncs.load_text(io.StringIO("1;2;3;"), rowsep=";")
+    assert data.tolist() == [1, 2, 3]
+
+    data = iofuncs.load_text(
+        io.StringIO("x y\n1 2\n3 4\n"), as_type="dataframe", colsep=None)
+    assert list(data.columns) == ["x", "y"]
+    assert data["y"].tolist() == [2, 4]
+
+
 if __name__ == "__main__":
     pytest.main()
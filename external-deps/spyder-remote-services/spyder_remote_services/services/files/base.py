@@ -4,7 +4,10 @@
 from contextlib import contextmanager
 import datetime
 import errno
+import functools
+import hashlib
 from http import HTTPStatus
+import itertools
 import os
 from pathlib import Path
 from shutil import copy, copy2, rmtree
@@ -18,12 +21,26 @@
 import orjson
 from tornado.websocket import WebSocketHandler
 
-from spyder_remote_services.services.files.compression import ZipStream, MemberFile, CompressionType
+from spyder_remote_services.services.files import delta as _delta
+from spyder_remote_services.services.files.compression import (
+    COMPRESSED_SUFFIXES,
+    CompressionType,
+    MemberFile,
+    ZipStream,
+)
 
 if typing.TYPE_CHECKING:
     from io import FileIO
 
 
+# Binary frames starting with this byte carry raw file data instead of JSON
+STREAM_DATA_PREFIX = b"\x00"
+STREAM_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+# Number of threads used to compress members ahead when zipping directories
+ZIP_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
 class FileWebSocketHandler(WebSocketHandler):
     """
     WebSocket handler for opening files and streaming data.
@@ -42,6 +59,20 @@ class FileWebSocketHandler(WebSocketHandler):
         "error": {"message": "error message",  (required)
                   "traceback": ["line1", "line2", ...]  (optional)}  # if an error occurred  (optional)
       }
+
+    Files opened in binary mode can also be transferred in chunks, without
+    base64 encoding, using data frames: binary frames made of
+    STREAM_DATA_PREFIX followed by the raw bytes of the chunk.
+      - "read_stream" replies with {"offset": ..., "size": ...}, then sends
+        the file from offset as data frames and finishes with
+        {"checksum": ...}, the sha256 of the whole file.
+      - "write_stream" truncates the file to offset and replies with
+        {"offset": ...}. The data frames sent afterwards by the client are
+        appended to the file until "end_write_stream" is received with the
+        checksum of the whole file.
+      - "stream_checksum" gives the size and sha256 of the file, so clients
+        can resume an interrupted transfer when both ends have the same
+        first bytes.
     """
 
     LOCK_TIMEOUT = 100  # seconds
@@ -62,6 +93,8 @@ async def open(self):
         self.encoding = self.get_argument("encoding", default="utf-8")
 
         self.file: FileIO = None
+        self._write_stream_hash = None
+        self._checksum_cache = None
         try:
             self.path = self._load_path(path)
 
@@ -93,8 +126,15 @@ def on_close(self):
 
     async def on_message(self, raw_message):
         """Handle incoming messages."""
-        self.log.debug("Received message: %s", raw_message)
         try:
+            if (
+                isinstance(raw_message, bytes)
+                and raw_message[:1] == STREAM_DATA_PREFIX
+            ):
+                await self._handle_data_frame(raw_message)
+                return
+
+            self.log.debug("Received message: %s", raw_message)
             await self.handle_message(raw_message)
         except Exception as e:
             self.log.exception("Error handling message")
@@ -252,6 +292,43 @@ def _load_path(self, path_str: str) -> Path:
         """Convert path string to a Path object."""
         return Path(path_str).expanduser()
 
+    def _check_binary_mode(self):
+        """Streams are only supported for files opened in binary mode."""
+        if "b" not in self.mode:
+            raise ValueError("Streams require a file opened in binary mode")
+
+    def _hash_prefix(self, size: int | None = None):
+        """Get the sha256 object and size of the first size bytes of the file."""
+        hasher = hashlib.sha256()
+        self.file.seek(0)
+        read = 0
+        while size is None or read < size:
+            n = STREAM_CHUNK_SIZE if size is None else min(STREAM_CHUNK_SIZE, size - read)
+            chunk = self.file.read(n)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            read += len(chunk)
+        return hasher, read
+
+    async def _hash_prefix_in_thread(self, size: int | None = None):
+        """
+        Run _hash_prefix in a thread, so hashing big files doesn't block the
+        event loop of the server.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._hash_prefix, size)
+
+    async def _handle_data_frame(self, raw_message: bytes):
+        """Append the data of a data frame to the current write stream."""
+        if self._write_stream_hash is None:
+            await self._send_msg_error("No write stream in progress")
+            return
+
+        data = memoryview(raw_message)[1:]
+        self.file.write(data)
+        self._write_stream_hash.update(data)
+
     # ----------------------------------------------------------------
     # File Operation
     # ----------------------------------------------------------------
@@ -307,6 +384,88 @@ async def _handle_writable(self) -> bool:
         """Check if the file is writable."""
         return self.file.writable()
 
+    # ----------------------------------------------------------------
+    # Chunked transfers
+    # ----------------------------------------------------------------
+    async def _handle_stream_checksum(self) -> dict:
+        """Get the size and sha256 checksum of the file."""
+        self._check_binary_mode()
+        hasher, size = await self._hash_prefix_in_thread()
+        # Kept in case a write stream is resumed at this offset
+        self._checksum_cache = (size, hasher)
+        return {"size": size, "checksum": hasher.hexdigest()}
+
+    async def _handle_read_stream(
+        self,
+        offset: int = 0,
+        checksum: str | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> dict:
+        """
+        Send the file from offset as data frames.
+
+        The transfer restarts from the beginning if checksum doesn't match the
+        one of the first offset bytes of the file.
+        """
+        self._check_binary_mode()
+        hasher = hashlib.sha256()
+        if offset:
+            prefix_hash, read = await self._hash_prefix_in_thread(offset)
+            if read == offset and prefix_hash.hexdigest() == checksum:
+                hasher = prefix_hash
+            else:
+                offset = 0
+
+        self.file.seek(offset)
+        size = os.fstat(self.file.fileno()).st_size
+        await self._send_json(
+            HTTPStatus.OK, data={"offset": offset, "size": size},
+        )
+
+        while chunk := self.file.read(chunk_size):
+            hasher.update(chunk)
+            await self.write_message(STREAM_DATA_PREFIX + chunk, binary=True)
+
+        return {"checksum": hasher.hexdigest()}
+
+    async def _handle_write_stream(self, offset: int = 0) -> dict:
+        """Start appending data frames to the file from offset."""
+        self._check_binary_mode()
+        if self._checksum_cache and self._checksum_cache[0] == offset:
+            hasher = self._checksum_cache[1]
+        else:
+            hasher, read = await self._hash_prefix_in_thread(offset)
+            if read != offset:
+                hasher, offset = hashlib.sha256(), 0
+
+        self._checksum_cache = None
+        self.file.seek(offset)
+        self.file.truncate(offset)
+        self._write_stream_hash = hasher
+        return {"offset": offset}
+
+    async def _handle_end_write_stream(
+        self, checksum: str, mtime: float | None = None
+    ) -> dict:
+        """
+        Finish the current write stream, checking the file checksum.
+
+        If mtime is given, it's set as the modification time of the file.
+        """
+        if self._write_stream_hash is None:
+            raise ValueError("No write stream in progress")
+
+        hasher, self._write_stream_hash = self._write_stream_hash, None
+        self.file.flush()
+        if hasher.hexdigest() != checksum:
+            raise ValueError(
+                "Checksum mismatch: the file was modified during the transfer"
+            )
+
+        if mtime is not None:
+            os.utime(self.file.name, (mtime, mtime))
+        return {"size": self.file.tell(), "checksum": checksum}
+
 
 class FilesRESTMixin:
     """
@@ -316,12 +475,16 @@ class FilesRESTMixin:
         - fs_ls(path_str, detail=True)
         - fs_info(path_str)
         - fs_exists(path_str)
+        - fs_stat_many(path_strs)
+        - fs_exists_many(path_strs)
         - fs_isfile(path_str)
         - fs_isdir(path_str)
         - fs_mkdir(path_str, create_parents=True, exist_ok=False)
         - fs_rmdir(path_str)
         - fs_rm_file(path_str, missing_ok=False)
         - fs_touch(path_str, truncate=True)
+        - fs_signature(path_str, block_size=None)
+        - fs_patch(path_str, delta, block_size, checksum, mtime=None)
     """
 
     def _info_for_path(self, path: Path) -> dict:
@@ -331,6 +494,21 @@ def _info_for_path(self, path: Path) -> dict:
         if link:
             # If it's a link, stat the target
             out = path.stat(follow_symlinks=True)
+        return self._info_from_stat(str(path), out, link)
+
+    def _info_for_entry(self, entry: os.DirEntry) -> dict:
+        """Get fsspec-like info about a scandir entry, reusing its stat."""
+        out = entry.stat(follow_symlinks=False)
+        link = stat.S_ISLNK(out.st_mode)
+        if link:
+            try:
+                out = entry.stat(follow_symlinks=True)
+            except FileNotFoundError:
+                # Broken link, keep the info of the link itself
+                pass
+        return self._info_from_stat(entry.path, out, link)
+
+    def _info_from_stat(self, path_str: str, out: os.stat_result, link: bool) -> dict:
         size = out.st_size
         if stat.S_ISDIR(out.st_mode):
             t = "directory"
@@ -339,7 +517,7 @@ def _info_for_path(self, path: Path) -> dict:
         else:
             t = "other"
         result = {
-            "name": str(path),
+            "name": path_str,
             "size": size,
             "type": t,
             "created": out.st_ctime,
@@ -348,7 +526,7 @@ def _info_for_path(self, path: Path) -> dict:
         for field in ["mode", "uid", "gid", "mtime", "ino", "nlink"]:
             result[field] = getattr(out, f"st_{field}", None)
         if link:
-            result["destination"] = str(path.resolve())
+            result["destination"] = os.path.realpath(path_str)
 
         return result
 
@@ -377,12 +555,14 @@ def fs_ls(self, path_str: str, detail: bool = True):
                 yield str(path)
             return
 
-        # Otherwise, it's a directory
-        for p in path.glob("*"):
-            if detail:
-                yield self._info_for_path(p)
-            else:
-                yield str(p)
+        # Otherwise, it's a directory. scandir gives the type of each entry
+        # without extra syscalls, so only one stat is needed per entry.
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if detail:
+                    yield self._info_for_entry(entry)
+                else:
+                    yield entry.path
 
     def fs_info(self, path_str: str):
         """Get info about a single path, like fsspec.info()."""
@@ -394,6 +574,32 @@ def fs_exists(self, path_str: str) -> bool:
         path = self._load_path(path_str)
         return path.exists()
 
+    def fs_stat_many(self, path_strs: list[str]) -> list[dict]:
+        """
+        Get info about several paths at once.
+
+        Paths that can't be accessed get an entry with the errno, strerror
+        and filename of the error instead.
+        """
+        results = []
+        for path_str in path_strs:
+            try:
+                results.append(self._info_for_path(self._load_path(path_str)))
+            except OSError as e:
+                results.append({
+                    "name": path_str,
+                    "error": {
+                        "errno": e.errno,
+                        "strerror": e.strerror,
+                        "filename": e.filename,
+                    },
+                })
+        return results
+
+    def fs_exists_many(self, path_strs: list[str]) -> list[bool]:
+        """Like fs_exists() for several paths at once."""
+        return [self._load_path(path_str).exists() for path_str in path_strs]
+
     def fs_isfile(self, path_str: str) -> bool:
         """Like fsspec.isfile()."""
         path = self._load_path(path_str)
@@ -461,6 +667,108 @@ def fs_move(self, src_str: str, dst_str: str):
         src.rename(dst)
         return {"success": True}
 
+    def fs_signature(self, path_str: str, block_size: int | None = None):
+        """
+        Get the block signatures of a file for a delta transfer.
+
+        If block_size is not given, it's chosen from the size of the file.
+        """
+        path = self._load_path(path_str)
+        try:
+            with path.open("rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                block_size = block_size or _delta.block_size_for(size)
+                blocks = _delta.block_signatures(f, block_size)
+        except FileNotFoundError:
+            return {"exists": False, "size": 0, "block_size": block_size or 0, "blocks": []}
+        return {"exists": True, "size": size, "block_size": block_size, "blocks": blocks}
+
+    def fs_patch(
+        self,
+        path_str: str,
+        delta: list,
+        block_size: int,
+        checksum: str,
+        mtime: float | None = None,
+    ):
+        """
+        Rebuild a file from its current content and a delta.
+
+        The new content is written next to the file and only replaces it if
+        its sha256 matches checksum. Otherwise, e.g. because the file changed
+        after its signature was computed, nothing is modified and success is
+        False.
+        """
+        path = self._load_path(path_str)
+        tmp_path = path.parent / f".{path.name}.spyder.sync"
+        try:
+            old_file = path.open("rb")
+        except FileNotFoundError:
+            old_file = None
+
+        try:
+            with tmp_path.open("wb") as out:
+                result = _delta.apply_delta(old_file, delta, block_size, out)
+            if result != checksum:
+                tmp_path.unlink()
+                return {"success": False}
+            if old_file is not None:
+                os.chmod(tmp_path, stat.S_IMODE(os.fstat(old_file.fileno()).st_mode))
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        finally:
+            if old_file is not None:
+                old_file.close()
+
+        if mtime is not None:
+            os.utime(tmp_path, (mtime, mtime))
+        os.replace(tmp_path, path)
+        return {"success": True}
+
+    def _walk_files(self, path: Path) -> typing.Iterator[MemberFile]:
+        """
+        Walk a directory tree lazily, yielding a member for each file.
+
+        Files are not opened here, and the stat done by scandir for each
+        entry is reused for the member metadata.
+        """
+        dirs = [path]
+        while dirs:
+            current = dirs.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                # Skip directories that can't be read, like glob does
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(Path(entry.path))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+
+                name = os.path.relpath(entry.path, path)
+                yield MemberFile(
+                    name=name,
+                    modified_at=datetime.datetime.fromtimestamp(st.st_mtime),
+                    data=functools.partial(open, entry.path, "rb"),
+                    mode=0x7777 & st.st_mode,
+                    size=st.st_size,
+                    method=(
+                        CompressionType.NO_COMPRESSION_DATA_DESCRIPTOR_64
+                        if os.path.splitext(name)[1].lower()
+                        in COMPRESSED_SUFFIXES
+                        else CompressionType.ZIP_64
+                    ),
+                )
+
     @contextmanager
     def fs_zip_dir(
         self,
@@ -471,31 +779,18 @@ def fs_zip_dir(
         """Stream compressed directory content."""
         path = self._load_path(path_str)
 
-        zip_files = []
-        for p in path.glob("**/*"):
-            if p.is_file():
-                arcname = p.relative_to(path)
-                zip_files.append(
-                    MemberFile(
-                        name=str(arcname),
-                        modified_at=datetime.datetime.fromtimestamp(p.stat().st_mtime),
-                        data=p.open("rb"),
-                        mode=0x7777 & p.stat().st_mode,
-                        size=p.stat().st_size,
-                        method=CompressionType.ZIP_64,
-                    )
-                )
-
+        zip_files = self._walk_files(path)
+        first = next(zip_files, None)
         try:
-            if not zip_files:
+            if first is None:
                 yield None
             else:
-                yield ZipStream(zip_files,
+                yield ZipStream(itertools.chain([first], zip_files),
                     get_compressobj=lambda: zlib.compressobj(
                         wbits=-zlib.MAX_WBITS, level=compression,
                     ),
                     chunk_size=chunk_size,
+                    max_workers=ZIP_MAX_WORKERS,
                 )
         finally:
-            for f in zip_files:
-                f.data.close()
+            zip_files.close()
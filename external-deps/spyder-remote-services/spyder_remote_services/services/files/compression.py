@@ -1,7 +1,10 @@
 from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 import enum
+import logging
 from struct import Struct
 from typing import (
     Any,
@@ -11,12 +14,29 @@
     Generator,
     Iterable,
     Iterator,
+    NamedTuple,
+    Optional,
     Tuple,
     Type,
+    Union,
 )
 import zlib
 
 
+logger = logging.getLogger(__name__)
+
+# Suffixes of formats whose data is already compressed, so deflating them
+# again only costs CPU time.
+COMPRESSED_SUFFIXES = frozenset({
+    ".7z", ".apk", ".avif", ".bz2", ".docx", ".egg", ".flac", ".gif",
+    ".gz", ".heic", ".jar", ".jpeg", ".jpg", ".lz", ".lz4", ".lzma",
+    ".m4a", ".m4v", ".mkv", ".mov", ".mp3", ".mp4", ".npz", ".odp",
+    ".ods", ".odt", ".ogg", ".opus", ".parquet", ".png", ".pptx", ".rar",
+    ".tbz", ".tgz", ".txz", ".webm", ".webp", ".whl", ".xlsx", ".xz",
+    ".zip", ".zst",
+})
+
+
 class CompressionType(enum.Enum):
     ZIP_64 = enum.auto()
     ZIP_32 = enum.auto()
@@ -24,19 +44,46 @@ class CompressionType(enum.Enum):
     NO_COMPRESSION_BUFFERED_64 = enum.auto()
     NO_COMPRESSION_STREAMED_32 = enum.auto()
     NO_COMPRESSION_STREAMED_64 = enum.auto()
+    NO_COMPRESSION_DATA_DESCRIPTOR_32 = enum.auto()
+    NO_COMPRESSION_DATA_DESCRIPTOR_64 = enum.auto()
 
 
 @dataclass(frozen=True)
 class MemberFile:
+    """
+    File to add to a zip stream.
+
+    `data` can be an open binary file, or a callable that opens it. In the
+    latter case the file is only opened when the member is reached and is
+    closed right after it has been written.
+    """
     name: str
     modified_at: datetime
     mode: int
     method: CompressionType
-    data: BinaryIO
+    data: Union[BinaryIO, Callable[[], BinaryIO]]
     size: int = 0
     crc32: int = 0
 
 
+class CompressedData(NamedTuple):
+    """Data of a member that was compressed ahead of time."""
+    chunks: Tuple[bytes, ...]
+    uncompressed_size: int
+    compressed_size: int
+    crc_32: int
+
+
+class _StoredCompressor:
+    """Compressor-like object that leaves data as is."""
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
 class ZipStream:
     local_header_signature = b"PK\x03\x04"
     local_header_struct = Struct("<HHH4sIIIHH")
@@ -76,6 +123,8 @@ class ZipStream:
         CompressionType.NO_COMPRESSION_BUFFERED_32: 0,
         CompressionType.NO_COMPRESSION_STREAMED_64: 0,
         CompressionType.NO_COMPRESSION_STREAMED_32: 0,
+        CompressionType.NO_COMPRESSION_DATA_DESCRIPTOR_64: 0,
+        CompressionType.NO_COMPRESSION_DATA_DESCRIPTOR_32: 0,
     }
 
     def __init__(
@@ -87,12 +136,29 @@ def __init__(
         ),
         extended_timestamps: bool = True,
         auto_upgrade_central_directory: bool = True,
+        max_workers: int = 0,
+        max_prefetch_size: int = 4 * 1024 * 1024,
     ):
+        """
+        Parameters
+        ----------
+        files : Iterable[MemberFile]
+            Files to add. They are consumed lazily, so this can be a
+            generator.
+        max_workers : int
+            If non zero, the next `max_workers` members are compressed in
+            a thread pool while the current one is being sent.
+        max_prefetch_size : int
+            Members bigger than this are not compressed ahead of time but
+            streamed, to bound the memory used by the thread pool.
+        """
         self.files = files
         self.chunk_size = chunk_size
         self.get_compressobj = get_compressobj
         self.extended_timestamps = extended_timestamps
         self.auto_upgrade_central_directory = auto_upgrade_central_directory
+        self.max_workers = max_workers
+        self.max_prefetch_size = max_prefetch_size
 
         self.offset = 0
         self.central_directory: Deque[Tuple[bytes, bytes, bytes]] = deque()
@@ -107,6 +173,8 @@ def __init__(
             CompressionType.NO_COMPRESSION_BUFFERED_32: self._no_compression_32_local_header_and_data,
             CompressionType.NO_COMPRESSION_STREAMED_64: self._no_compression_streamed_64_local_header_and_data,
             CompressionType.NO_COMPRESSION_STREAMED_32: self._no_compression_streamed_32_local_header_and_data,
+            CompressionType.NO_COMPRESSION_DATA_DESCRIPTOR_64: self._zip_64_local_header_and_data,
+            CompressionType.NO_COMPRESSION_DATA_DESCRIPTOR_32: self._zip_32_local_header_and_data,
         }
 
     def __iter__(self) -> Iterator[bytes]:
@@ -153,8 +221,105 @@ def _raise_if_beyond(
         if offset > maximum:
             raise exception_class()
 
+    @contextmanager
+    def _open_member(self, memberfile: MemberFile) -> Iterator[BinaryIO]:
+        """Open the data of a member if needed, closing it when done."""
+        if not callable(memberfile.data):
+            yield memberfile.data
+            return
+
+        data = memberfile.data()
+        try:
+            yield data
+        finally:
+            data.close()
+
+    @contextmanager
+    def _member_chunks(
+        self, memberfile: MemberFile, compressed: Optional[CompressedData]
+    ) -> Iterator[Union[Iterable[bytes], CompressedData]]:
+        if compressed is not None:
+            yield compressed
+            return
+
+        with self._open_member(memberfile) as data:
+            yield self.io_to_chunks(data)
+
+    def _can_prefetch(self, memberfile: MemberFile) -> bool:
+        return (
+            self.raw_compression[memberfile.method] == 8
+            and memberfile.size <= self.max_prefetch_size
+        )
+
+    def _prefetch(self, memberfile: MemberFile) -> CompressedData:
+        """Read and compress a whole member, in a worker thread."""
+        chunks = []
+        with self._open_member(memberfile) as data:
+            compressed = self._compress(
+                self.io_to_chunks(data),
+                self.get_compressobj(),
+                0xFFFFFFFFFFFFFFFF,
+                0xFFFFFFFFFFFFFFFF,
+            )
+            try:
+                while True:
+                    chunks.append(next(compressed))
+            except StopIteration as e:
+                return CompressedData(tuple(chunks), *e.value)
+
+    def _members(
+        self,
+    ) -> Iterator[Tuple[MemberFile, Optional[CompressedData]]]:
+        """
+        Iterate over members, compressing the next ones in a thread pool.
+
+        zlib releases the GIL while compressing, so this overlaps reading
+        and compressing later members with sending the current one.
+        """
+        if not self.max_workers:
+            for memberfile in self.files:
+                yield memberfile, None
+            return
+
+        files = iter(self.files)
+        pending: Deque[Tuple[MemberFile, Optional[Future]]] = deque()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        def submit_next() -> None:
+            memberfile = next(files, None)
+            if memberfile is None:
+                return
+            future = (
+                executor.submit(self._prefetch, memberfile)
+                if self._can_prefetch(memberfile)
+                else None
+            )
+            pending.append((memberfile, future))
+
+        try:
+            for __ in range(self.max_workers + 1):
+                submit_next()
+
+            while pending:
+                memberfile, future = pending.popleft()
+                submit_next()
+                try:
+                    compressed = future.result() if future else None
+                except OSError as error:
+                    # Removed after it was listed or unreadable
+                    logger.warning("Skipping %s: %s", memberfile.name, error)
+                    continue
+                yield memberfile, compressed
+        finally:
+            # Futures are cancelled by hand because cancel_futures needs
+            # Python 3.9
+            for __, future in pending:
+                if future is not None:
+                    future.cancel()
+            executor.shutdown(wait=False)
+
     def get_zipped_chunks_uneven(self) -> Iterable[bytes]:
-        for memberfile in self.files:
+        for memberfile, compressed in self._members():
             name_encoded = memberfile.name.encode("utf-8")
             self._raise_if_beyond(
                 len(name_encoded),
@@ -187,21 +352,32 @@ def get_zipped_chunks_uneven(self) -> Iterable[bytes]:
             compression = self.raw_compression[memberfile.method]
             crc_32_mask = 0xFFFFFFFF
 
-            (
-                central_directory_header_entry,
-                name_encoded,
-                extra,
-            ) = yield from self.data_func_map[memberfile.method](
-                compression,
-                name_encoded,
-                mod_at_ms_dos,
-                mod_at_unix_extra,
-                external_attr,
-                memberfile.size,
-                memberfile.crc32,
-                crc_32_mask,
-                self.io_to_chunks(memberfile.data),
-            )
+            with ExitStack() as stack:
+                try:
+                    chunks = stack.enter_context(
+                        self._member_chunks(memberfile, compressed)
+                    )
+                except OSError as error:
+                    # Removed after it was listed or unreadable, so nothing
+                    # was written for it yet.
+                    logger.warning("Skipping %s: %s", memberfile.name, error)
+                    continue
+
+                (
+                    central_directory_header_entry,
+                    name_encoded,
+                    extra,
+                ) = yield from self.data_func_map[memberfile.method](
+                    compression,
+                    name_encoded,
+                    mod_at_ms_dos,
+                    mod_at_unix_extra,
+                    external_attr,
+                    memberfile.size,
+                    memberfile.crc32,
+                    crc_32_mask,
+                    chunks,
+                )
             self.central_directory_size += (
                 len(self.central_directory_header_signature)
                 + len(central_directory_header_entry)
@@ -227,6 +403,7 @@ def get_zipped_chunks_uneven(self) -> Iterable[bytes]:
                     CompressionType.ZIP_64,
                     CompressionType.NO_COMPRESSION_BUFFERED_64,
                     CompressionType.NO_COMPRESSION_STREAMED_64,
+                    CompressionType.NO_COMPRESSION_DATA_DESCRIPTOR_64,
                 )
             )
 
@@ -346,15 +523,53 @@ def write_zip64_end_of_central_directory(self) -> Iterable[bytes]:
         )
 
     def _zip_data(
+        self,
+        chunks: Union[Iterable[bytes], CompressedData],
+        compression: int,
+        max_uncompressed_size: int,
+        max_compressed_size: int,
+    ) -> Generator[bytes, None, Tuple[int, int, int]]:
+        if isinstance(chunks, CompressedData):
+            self._raise_if_beyond(
+                chunks.uncompressed_size,
+                maximum=max_uncompressed_size,
+                exception_class=UncompressedSizeOverflowError,
+            )
+            self._raise_if_beyond(
+                chunks.compressed_size,
+                maximum=max_compressed_size,
+                exception_class=CompressedSizeOverflowError,
+            )
+            for chunk in chunks.chunks:
+                yield from self.write_chunk(chunk)
+            return (
+                chunks.uncompressed_size,
+                chunks.compressed_size,
+                chunks.crc_32,
+            )
+
+        compressed = self._compress(
+            chunks,
+            self.get_compressobj() if compression else _StoredCompressor(),
+            max_uncompressed_size,
+            max_compressed_size,
+        )
+        try:
+            while True:
+                yield from self.write_chunk(next(compressed))
+        except StopIteration as e:
+            return e.value
+
+    def _compress(
         self,
         chunks: Iterable[bytes],
+        compress_obj: "zlib._Compress",
         max_uncompressed_size: int,
         max_compressed_size: int,
     ) -> Generator[bytes, None, Tuple[int, int, int]]:
         uncompressed_size = 0
         compressed_size = 0
         crc_32 = zlib.crc32(b"")
-        compress_obj = self.get_compressobj()
         for chunk in chunks:
             uncompressed_size += len(chunk)
 
@@ -374,7 +589,8 @@ def _zip_data(
                 exception_class=CompressedSizeOverflowError,
             )
 
-            yield from self.write_chunk(compressed_chunk)
+            if compressed_chunk:
+                yield compressed_chunk
 
         compressed_chunk = compress_obj.flush()
         compressed_size += len(compressed_chunk)
@@ -385,7 +601,8 @@ def _zip_data(
             exception_class=CompressedSizeOverflowError,
         )
 
-        yield from self.write_chunk(compressed_chunk)
+        if compressed_chunk:
+            yield compressed_chunk
 
         return uncompressed_size, compressed_size, crc_32
 
@@ -443,7 +660,7 @@ def _zip_64_local_header_and_data(
             raw_compressed_size,
             crc_32,
         ) = yield from self._zip_data(
-            chunks, 0xFFFFFFFFFFFFFFFF, 0xFFFFFFFFFFFFFFFF
+            chunks, compression, 0xFFFFFFFFFFFFFFFF, 0xFFFFFFFFFFFFFFFF
         )
 
         compressed_size = raw_compressed_size
@@ -536,7 +753,9 @@ def _zip_32_local_header_and_data(
             uncompressed_size,
             raw_compressed_size,
             crc_32,
-        ) = yield from self._zip_data(chunks, 0xFFFFFFFF, 0xFFFFFFFF)
+        ) = yield from self._zip_data(
+            chunks, compression, 0xFFFFFFFF, 0xFFFFFFFF
+        )
 
         compressed_size = raw_compressed_size
 
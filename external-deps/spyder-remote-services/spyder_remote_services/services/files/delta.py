@@ -0,0 +1,79 @@
+"""
+Block signatures and patching for rsync-like delta transfers.
+
+The receiver (the server) splits its copy of a file in blocks and sends, for
+each of them, a weak checksum (adler32) and a strong hash (blake2b). The
+sender slides a window over its own copy, rolling the weak checksum one byte
+at a time, and replies with a delta: a list of operations that are either
+``[start, count]`` (copy ``count`` blocks starting at block ``start`` of the
+old file) or a base64 string with literal data.
+"""
+
+from __future__ import annotations
+import base64
+import hashlib
+import math
+import typing
+import zlib
+
+if typing.TYPE_CHECKING:
+    from typing import BinaryIO
+
+
+MIN_BLOCK_SIZE = 1024
+MAX_BLOCK_SIZE = 64 * 1024
+
+
+def block_size_for(size: int) -> int:
+    """Pick a block size for a file, like rsync does (about sqrt(size))."""
+    block_size = 1 << max(0, math.isqrt(size).bit_length() - 1)
+    return min(MAX_BLOCK_SIZE, max(MIN_BLOCK_SIZE, block_size))
+
+
+def strong_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def block_signatures(file: BinaryIO, block_size: int) -> list[list]:
+    """Get the [weak, strong] signature of each block of a file."""
+    signatures = []
+    while block := file.read(block_size):
+        signatures.append([zlib.adler32(block), strong_hash(block)])
+    return signatures
+
+
+def apply_delta(
+    old_file: BinaryIO | None,
+    delta: list,
+    block_size: int,
+    out: BinaryIO,
+) -> str:
+    """
+    Write the file described by delta to out.
+
+    Returns
+    -------
+    str
+        The sha256 of the data written.
+    """
+    hasher = hashlib.sha256()
+    for op in delta:
+        if isinstance(op, str):
+            data = base64.b64decode(op)
+            hasher.update(data)
+            out.write(data)
+            continue
+
+        start, count = op
+        if old_file is None:
+            raise ValueError("Delta refers to blocks of a missing file")
+        old_file.seek(start * block_size)
+        remaining = count * block_size
+        while remaining > 0:
+            data = old_file.read(min(remaining, MAX_BLOCK_SIZE))
+            if not data:
+                break
+            hasher.update(data)
+            out.write(data)
+            remaining -= len(data)
+    return hasher.hexdigest()
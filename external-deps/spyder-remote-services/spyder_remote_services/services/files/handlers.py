@@ -92,6 +92,39 @@ def get_path_argument(self, name: str) -> str:
             )
         return match.group("path")
 
+    def get_path_list_argument(self, name: str) -> list[str]:
+        """Get a list of paths from the JSON body of the request.
+
+        Args
+        ----
+            name (str): Key of the list in the JSON body.
+
+        Returns
+        -------
+            list[str]: The paths.
+
+        Raises
+        ------
+            HTTPError: If the list is missing or any path is invalid.
+        """
+        body = self.get_json_body() or {}
+        paths = body.get(name)
+        if not isinstance(paths, list):
+            raise web.HTTPError(
+                HTTPStatus.BAD_REQUEST,
+                reason=f"Missing {name} argument",
+            )
+        result = []
+        for path in paths:
+            match = re.match(_path_regex, path) if isinstance(path, str) else None
+            if not match:
+                raise web.HTTPError(
+                    HTTPStatus.BAD_REQUEST,
+                    reason=f"Invalid path in {name} argument",
+                )
+            result.append(match.group("path"))
+        return result
+
     def write_json(self, data, status=200):
         self.set_status(status)
         self.set_header("Content-Type", "application/json")
@@ -181,6 +214,22 @@ def get(self):
         self.write_json({"exists": result})
 
 
+class StatManyHandler(BaseFSHandler):
+    @web.authenticated
+    @authorized
+    def post(self):
+        result = self.fs_stat_many(self.get_path_list_argument("paths"))
+        self.write_json(result)
+
+
+class ExistsManyHandler(BaseFSHandler):
+    @web.authenticated
+    @authorized
+    def post(self):
+        result = self.fs_exists_many(self.get_path_list_argument("paths"))
+        self.write_json(result)
+
+
 class IsFileHandler(BaseFSHandler):
     @web.authenticated
     @authorized
@@ -260,6 +309,37 @@ def post(self):
         self.write_json(result)
 
 
+class SignatureHandler(BaseFSHandler):
+    @web.authenticated
+    @authorized
+    def get(self):
+        path = self.get_path_argument("path")
+        block_size = int(self.get_argument("block_size", "0"))
+        result = self.fs_signature(path, block_size=block_size or None)
+        self.write_json(result)
+
+
+class PatchHandler(BaseFSHandler):
+    @web.authenticated
+    @authorized
+    def post(self):
+        path = self.get_path_argument("path")
+        body = self.get_json_body() or {}
+        try:
+            delta = body["delta"]
+            block_size = int(body["block_size"])
+            checksum = body["checksum"]
+        except (KeyError, TypeError, ValueError):
+            raise web.HTTPError(
+                HTTPStatus.BAD_REQUEST,
+                reason="Missing or invalid delta, block_size or checksum",
+            )
+        result = self.fs_patch(
+            path, delta, block_size, checksum, mtime=body.get("mtime")
+        )
+        self.write_json(result)
+
+
 class ZipHandler(BaseFSHandler):
     @web.authenticated
     @authorized
@@ -290,6 +370,8 @@ def post(self):
     (r"/fs/ls", LsHandler),                  # GET
     (r"/fs/info", InfoHandler),              # GET
     (r"/fs/exists", ExistsHandler),          # GET
+    (r"/fs/stat_many", StatManyHandler),     # POST
+    (r"/fs/exists_many", ExistsManyHandler), # POST
     (r"/fs/isfile", IsFileHandler),          # GET
     (r"/fs/isdir", IsDirHandler),            # GET
     (r"/fs/mkdir", MkdirHandler),            # POST
@@ -299,4 +381,6 @@ def post(self):
     (r"/fs/copy", CopyHandler),              # POST
     (r"/fs/move", MoveHandler),
     (r"/fs/zip", ZipHandler),              # POST
+    (r"/fs/signature", SignatureHandler),    # GET
+    (r"/fs/patch", PatchHandler),            # POST
 ]
@@ -0,0 +1,189 @@
+"""Tests for streaming directories as zip files."""
+
+from datetime import datetime
+import io
+import os
+import zipfile
+
+import pytest
+
+from spyder_remote_services.services.files.base import FilesRESTMixin
+from spyder_remote_services.services.files.compression import (
+    CompressionType,
+    MemberFile,
+    ZipStream,
+)
+
+
+def unzip(chunks):
+    """Read the members of a zip file, checking their CRC."""
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+        assert zip_file.testzip() is None
+        return {
+            info.filename: (zip_file.read(info), info.compress_type)
+            for info in zip_file.infolist()
+        }
+
+
+def make_member(name, content, method=CompressionType.ZIP_64, opened=None):
+    """Create a member whose data is opened lazily."""
+
+    def open_data():
+        if opened is not None:
+            opened.append(name)
+        return io.BytesIO(content)
+
+    return MemberFile(
+        name=name,
+        modified_at=datetime(2024, 1, 1),
+        mode=0o644,
+        method=method,
+        data=open_data,
+        size=len(content),
+    )
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    """Directory with compressible and already compressed files."""
+    files = {
+        "a.py": b"print('Hello')\n" * 100,
+        os.path.join("pkg", "b.txt"): b"Hello, world!\n" * 1000,
+        os.path.join("pkg", "image.png"): os.urandom(5000),
+        "empty.txt": b"",
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return tmp_path, files
+
+
+def test_members_opened_lazily():
+    """Members are only opened when they are reached, one at a time."""
+    opened = []
+    # Data that can't be compressed, so each member spans several chunks
+    contents = {f"{i}.bin": os.urandom(5000) for i in range(5)}
+    members = (
+        make_member(name, content, opened=opened)
+        for name, content in contents.items()
+    )
+    stream = iter(ZipStream(members, chunk_size=1024))
+    assert opened == []
+
+    first_chunk = next(stream)
+    assert opened == ["0.bin"]
+
+    unzipped = unzip([first_chunk] + list(stream))
+    assert opened == list(contents)
+    assert {name: data for name, (data, __) in unzipped.items()} == contents
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        CompressionType.NO_COMPRESSION_DATA_DESCRIPTOR_32,
+        CompressionType.NO_COMPRESSION_DATA_DESCRIPTOR_64,
+    ],
+)
+def test_stored_members(method):
+    """Members can be stored uncompressed, with a data descriptor."""
+    contents = {"image.png": os.urandom(100_000), "archive.zip": b""}
+    members = [
+        make_member(name, content, method=method)
+        for name, content in contents.items()
+    ]
+
+    unzipped = unzip(ZipStream(members, chunk_size=4096))
+    assert unzipped == {
+        name: (content, zipfile.ZIP_STORED)
+        for name, content in contents.items()
+    }
+
+
+@pytest.mark.parametrize("max_workers", [0, 1, 3])
+def test_prefetched_members(max_workers):
+    """Members compressed in a thread pool give the same zip file."""
+    contents = {f"{i}.txt": os.urandom(i * 100) * 10 for i in range(10)}
+    contents["big.txt"] = b"x" * 100_000
+    contents["image.png"] = os.urandom(1000)
+    members = [
+        make_member(
+            name,
+            content,
+            method=(
+                CompressionType.NO_COMPRESSION_DATA_DESCRIPTOR_64
+                if name.endswith(".png")
+                else CompressionType.ZIP_64
+            ),
+        )
+        for name, content in contents.items()
+    ]
+
+    # big.txt is bigger than max_prefetch_size, so it's streamed
+    stream = ZipStream(
+        members,
+        chunk_size=1024,
+        max_workers=max_workers,
+        max_prefetch_size=50_000,
+    )
+    unzipped = unzip(stream)
+    assert {name: data for name, (data, __) in unzipped.items()} == contents
+    assert unzipped["image.png"][1] == zipfile.ZIP_STORED
+    assert unzipped["big.txt"][1] == zipfile.ZIP_DEFLATED
+
+
+def test_zip_dir(source_dir):
+    """Directories are zipped with compressed files stored as they are."""
+    path, files = source_dir
+    with FilesRESTMixin().fs_zip_dir(str(path), chunk_size=1024) as stream:
+        unzipped = unzip(stream)
+
+    assert {name: data for name, (data, __) in unzipped.items()} == files
+    assert unzipped[os.path.join("pkg", "image.png")][1] == zipfile.ZIP_STORED
+    assert unzipped["a.py"][1] == zipfile.ZIP_DEFLATED
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+@pytest.mark.parametrize(
+    "removed", ["a.py", os.path.join("pkg", "image.png")]
+)
+def test_zip_dir_removed_file(source_dir, removed, max_workers):
+    """Files removed after the directory is walked are left out."""
+    path, files = source_dir
+    members = list(FilesRESTMixin()._walk_files(path))
+    assert len(members) == len(files)
+    (path / removed).unlink()
+
+    unzipped = unzip(
+        ZipStream(members, chunk_size=1024, max_workers=max_workers)
+    )
+    del files[removed]
+    assert {name: data for name, (data, __) in unzipped.items()} == files
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+def test_unreadable_member(max_workers):
+    """Members that can't be opened are left out."""
+    contents = {"a.txt": b"a" * 1000, "b.txt": b"b" * 1000}
+
+    def open_data():
+        raise PermissionError("Permission denied")
+
+    members = [
+        make_member("a.txt", contents["a.txt"]),
+        MemberFile(
+            name="secret.txt",
+            modified_at=datetime(2024, 1, 1),
+            mode=0o600,
+            method=CompressionType.ZIP_64,
+            data=open_data,
+            size=1000,
+        ),
+        make_member("b.txt", contents["b.txt"]),
+    ]
+
+    unzipped = unzip(
+        ZipStream(members, chunk_size=1024, max_workers=max_workers)
+    )
+    assert {name: data for name, (data, __) in unzipped.items()} == contents
@@ -31,6 +31,11 @@
         'pylsp': {
             'configurationSources': [
                 "pycodestyle", "pyflakes"],
+            # Report how long each linter takes (shown in the LSP status
+            # widget tooltip)
+            'lint': {
+                'metrics': True
+            },
             'plugins': {
                 'pycodestyle': {
                     'enabled': False,
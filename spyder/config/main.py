@@ -163,6 +163,7 @@
               'ask_before_closing': False,
               'show_reset_namespace_warning': True,
               'buffer_size': 5000,
+              'output_rate_limit': 0,
               'pylab': True,
               'pylab/autoload': False,
               'pylab/backend': 'inline',
@@ -396,6 +397,12 @@
               'enable': True,
               'switch_to_plugin': True,
               'n_slow_children': 15,
+              'sampling': False,
+              'sampling_interval': 10,
+              'show_flame_graph': False,
+              'flame_graph_icicle': False,
+              'line_profiling': False,
+              'memory_profiling': False,
               }),
             ('pylint',
              {
@@ -603,6 +603,8 @@ class CompletionRequestTypes:
     DOCUMENT_RENAME = 'textDocument/rename'
     # Spyder extensions to LSP
     DOCUMENT_CURSOR_EVENT = 'textDocument/cursorEvent'
+    # PyLSP extensions to LSP
+    LINT_METRICS = 'pylsp/lintMetrics'
 
 # -------------------- LINTING RESPONSE RELATED VALUES ------------------------
 
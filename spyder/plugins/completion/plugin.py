@@ -16,6 +16,7 @@
 import inspect
 import logging
 import sys
+import time
 from typing import List, Union
 import weakref
 
@@ -34,6 +35,7 @@
                                            COMPLETION_ENTRYPOINT)
 from spyder.plugins.completion.confpage import CompletionConfigPage
 from spyder.plugins.completion.container import CompletionContainer
+from spyder.plugins.completion.sessions import CompletionSessionCache
 
 # See compatibility note on `group` keyword:
 # https://docs.python.org/3/library/importlib.metadata.html#entry-points
@@ -229,6 +231,9 @@ def __init__(self, parent, configuration=None):
         # Timeout limit for a response to be received
         self.wait_for_ms = self.get_conf('completions_wait_for_ms')
 
+        # Completions gathered for the words being completed in each file
+        self.completion_sessions = CompletionSessionCache()
+
         # Save application menus to create if/when MainMenu is available.
         self.application_menus_to_create = []
 
@@ -1005,6 +1010,23 @@ def send_request(self, language: str, req_type: str, req: dict):
                 **kwargs: request-specific parameters
             }
         """
+        start_time = time.perf_counter()
+        session = None
+
+        if req_type in (CompletionRequestTypes.DOCUMENT_DID_OPEN,
+                        CompletionRequestTypes.DOCUMENT_DID_CHANGE):
+            self.completion_sessions.update_document(
+                req['file'], req['version'], req['text'], req['offset'])
+        elif req_type == CompletionRequestTypes.DOCUMENT_DID_CLOSE:
+            self.completion_sessions.close_document(req['file'])
+        elif req_type == CompletionRequestTypes.DOCUMENT_COMPLETION:
+            completions = self.completion_sessions.get_completions(req)
+            if completions is not None:
+                self.reply_from_session(
+                    req['response_instance'], completions, start_time)
+                return
+            session = self.completion_sessions.start_session(req)
+
         req_id = self.req_id
         self.req_id += 1
 
@@ -1014,6 +1036,8 @@ def send_request(self, language: str, req_type: str, req: dict):
             'response_instance': weakref.ref(req['response_instance']),
             'sources': {},
             'timed_out': False,
+            'completion_session': session,
+            'start_time': start_time,
         }
 
         # Check if there are two or more slow completion providers
@@ -1262,6 +1286,22 @@ def gather_and_reply(self, request_responses: dict):
 
         if req_type == CompletionRequestTypes.DOCUMENT_COMPLETION:
             responses = self.gather_completions(req_id_responses)
+
+            # Only save complete results to answer follow-up requests
+            session = request_responses['completion_session']
+            providers = self.available_providers_for_language(
+                request_responses['language'].lower())
+            if session is not None and all(
+                    source in req_id_responses for source in providers):
+                self.completion_sessions.set_completions(
+                    session, responses['params'])
+
+            logger.debug(
+                "Completion plugin: Completions gathered in {0:.1f} ms, "
+                "session hit rate: {1:.0%}".format(
+                    (time.perf_counter() - request_responses['start_time'])
+                    * 1000,
+                    self.completion_sessions.hit_rate))
         else:
             responses = self.gather_responses(req_type, req_id_responses)
 
@@ -1273,6 +1313,34 @@ def gather_and_reply(self, request_responses: dict):
             # removed before the response can be processed.
             pass
 
+    def reply_from_session(self, response_instance, completions: list,
+                           start_time: float):
+        """
+        Send completions filtered from a completion session to the
+        CodeEditor instance that requested them.
+        """
+        response_instance = weakref.ref(response_instance)
+
+        def reply():
+            logger.debug(
+                "Completion plugin: Completions taken from session in "
+                "{0:.1f} ms, session hit rate: {1:.0%}".format(
+                    (time.perf_counter() - start_time) * 1000,
+                    self.completion_sessions.hit_rate))
+            try:
+                instance = response_instance()
+                if instance:
+                    instance.handle_response(
+                        CompletionRequestTypes.DOCUMENT_COMPLETION,
+                        {'params': completions})
+            except RuntimeError:
+                # This is triggered when a codeeditor instance has been
+                # removed before the response can be processed.
+                pass
+
+        # Reply after the request is sent, like providers do
+        QTimer.singleShot(0, reply)
+
     def gather_completions(self, req_id_responses: dict):
         """Gather completion responses from providers."""
         priorities = self.source_priority[
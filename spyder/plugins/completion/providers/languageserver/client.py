@@ -73,6 +73,10 @@ class LSPClient(QObject, LSPMethodProviderMixIn, SpyderConfigurationAccessor):
     #  server went down
     sig_went_down = Signal(str)
 
+    #: Signal to report the time (in ms) taken by each linter in the
+    #  last lint run of the server.
+    sig_lint_metrics = Signal(dict, str)
+
     def __init__(self, parent,
                  server_settings={},
                  folder=getcwd_or_home(),
@@ -256,6 +256,13 @@ def update_status(self, language, status):
         self.sig_call_statusbar.emit(
             LSPStatusWidget.ID, 'update_status', (language, status), {})
 
+    def update_lint_metrics(self, metrics, language):
+        """
+        Show the time taken by each linter in the status bar widget.
+        """
+        self.sig_call_statusbar.emit(
+            LSPStatusWidget.ID, 'set_lint_metrics', (language, metrics), {})
+
     def on_initialize(self, options, language):
         """
         Update the status bar widget on client initilization.
@@ -526,6 +533,7 @@ def register_client_instance(self, instance):
         instance.sig_went_down.connect(self.handle_lsp_down)
         instance.sig_initialize.connect(self.on_initialize)
         instance.sig_server_error.connect(self.report_server_error)
+        instance.sig_lint_metrics.connect(self.update_lint_metrics)
         instance.sig_initialize.connect(
             self.sig_language_completions_available)
 
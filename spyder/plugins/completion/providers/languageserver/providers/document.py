@@ -44,6 +44,12 @@ def process_document_diagnostics(self, response, *args):
         else:
             logger.debug("Received diagnostics for file not open: " + uri)
 
+    @handles(CompletionRequestTypes.LINT_METRICS)
+    def process_lint_metrics(self, response, *args):
+        """Handle the time taken by each linter in the server."""
+        logger.debug("Received lint metrics: %r" % response)
+        self.sig_lint_metrics.emit(response['metrics'], self.language)
+
     @send_notification(method=CompletionRequestTypes.DOCUMENT_DID_CHANGE)
     def document_changed(self, params):
         params = {
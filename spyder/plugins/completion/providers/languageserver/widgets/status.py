@@ -119,6 +119,26 @@ def set_status(self, lsp_language=None, status=None):
         if lsp_language is not None:
             self.set_value(self.STATUS.format(lsp_language.capitalize()))
 
+    def set_lint_metrics(self, lsp_language, metrics):
+        """Show the time taken by each linter in the tooltip."""
+        if (self.current_language is None or
+                self.current_language.lower() != lsp_language):
+            return
+
+        lines = [
+            "{}: {:.0f} ms".format(linter, elapsed)
+            for linter, elapsed in sorted(
+                metrics.items(), key=lambda item: item[1], reverse=True)
+        ]
+        if lines:
+            self.tooltip = (
+                self.BASE_TOOLTIP + "\n\n" + _("Last lint run:") + "\n" +
+                "\n".join(lines)
+            )
+        else:
+            self.tooltip = self.BASE_TOOLTIP
+        self.update_tooltip()
+
     def get_tooltip(self):
         """Reimplementation to get a dynamic tooltip."""
         return self.tooltip
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Cache of the completions gathered for the word being completed in a file.
+
+When users keep typing the same identifier, the completions gathered for its
+start contain all the ones valid for the longer word, so follow-up requests
+can be answered by filtering them instead of asking providers again.
+"""
+
+# Local imports
+from spyder.utils.sourcecode import normalize_eols
+
+
+def is_word_continuation(text):
+    """Check if text only has characters that can continue an identifier."""
+    return all(char == '_' or char.isalnum() for char in text)
+
+
+class CompletionSession:
+    """
+    Completions gathered for a word being completed in a file.
+
+    Parameters
+    ----------
+    filename: str
+        File where the word is.
+    start: int
+        Offset of the start of the word.
+    word: str
+        Word that was completed.
+    version: int
+        Version of the file when the word was completed.
+    before: str
+        Text of the file before the word.
+    after: str
+        Text of the file after the cursor.
+    """
+
+    def __init__(self, filename, start, word, version, before, after):
+        self.filename = filename
+        self.start = start
+        self.word = word
+        self.version = version
+        self.before = before
+        self.after = after
+
+        # Completions gathered from providers. None while they are requested.
+        self.completions = None
+
+    def is_continued_by(self, text, offset):
+        """
+        Check if text is the one of the session after typing more
+        characters of the word, with the cursor at offset.
+        """
+        if offset < self.start + len(self.word):
+            return False
+
+        word = text[self.start:offset]
+        return (
+            word.startswith(self.word)
+            and is_word_continuation(word[len(self.word):])
+            and text[:self.start] == self.before
+            and text[offset:] == self.after
+        )
+
+
+class CompletionSessionCache:
+    """
+    Cache of completion sessions, one per file.
+
+    The text of files is tracked with the didOpen and didChange requests
+    sent to providers. A session is kept only while every change to its file
+    adds characters to the word being completed, so the version of the file
+    it applies to is always known.
+
+    Offsets are cursor positions, which count each end of line as a single
+    character, so files are saved with their end of lines normalized.
+    Requests without a version, like the ones of files whose text is
+    transformed before sending it to providers, don't start sessions.
+    """
+
+    def __init__(self):
+        # Last text of each file, with its version
+        self._documents = {}
+
+        # Session of each file
+        self._sessions = {}
+
+        # Number of completion requests answered from a session or not
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        """Fraction of completion requests answered from a session."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+
+    def update_document(self, filename, version, text, offset):
+        """
+        Save the text of a file and remove its session if the text doesn't
+        continue it.
+        """
+        if '\r' in text:
+            text = normalize_eols(text)
+
+        session = self._sessions.get(filename)
+        if session is not None:
+            if session.is_continued_by(text, offset):
+                session.version = version
+            else:
+                del self._sessions[filename]
+
+        self._documents[filename] = (version, text)
+
+    def close_document(self, filename):
+        """Remove the text and session of a file."""
+        self._documents.pop(filename, None)
+        self._sessions.pop(filename, None)
+
+    def start_session(self, params):
+        """
+        Start a session for a completion request that is sent to providers.
+
+        Return None if the text of the file at the time of the request is
+        not known.
+        """
+        filename = params['file']
+        self._sessions.pop(filename, None)
+
+        version = params.get('version')
+        document = self._documents.get(filename)
+        if version is None or document is None or document[0] != version:
+            return None
+
+        text = document[1]
+        word = params.get('current_word') or ''
+        offset = params['offset']
+        start = offset - len(word)
+        if start < 0 or text[start:offset] != word:
+            return None
+
+        session = CompletionSession(
+            filename, start, word, version, text[:start], text[offset:]
+        )
+        self._sessions[filename] = session
+        return session
+
+    def set_completions(self, session, completions):
+        """Save the completions gathered for a session."""
+        if self._sessions.get(session.filename) is session:
+            # Completions with a textEdit are left out because their range
+            # is only valid for the original request.
+            session.completions = [
+                dict(completion) for completion in completions
+                if 'textEdit' not in completion
+            ]
+
+    def get_completions(self, params):
+        """
+        Get the completions for a request from the session of its file.
+
+        Return None if the request can't be answered from it.
+        """
+        completions = self._get_completions(params)
+        if completions is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return completions
+
+    def _get_completions(self, params):
+        session = self._sessions.get(params['file'])
+        if session is None or session.completions is None:
+            return None
+
+        word = params.get('current_word') or ''
+        if (
+            params.get('version') != session.version
+            or params['offset'] - len(word) != session.start
+            or not word.startswith(session.word)
+        ):
+            return None
+
+        # Filter completions like CompletionWidget does. Copies are returned
+        # because editors modify them.
+        word = word.lower()
+        return [
+            dict(completion) for completion in session.completions
+            if not completion.get('filterText')
+            or str(completion['filterText']).lower().startswith(word)
+        ]
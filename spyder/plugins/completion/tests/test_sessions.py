@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Copyright © Spyder Project Contributors
+#
+# Licensed under the terms of the MIT License
+# ----------------------------------------------------------------------------
+
+"""Tests for the completion sessions cache."""
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.completion.sessions import CompletionSessionCache
+
+
+TEXT = "import os\n\nos.pa\nprint(1)\n"
+
+
+def completion(label):
+    return {
+        'label': label,
+        'insertText': label,
+        'filterText': label,
+        'sortText': (0, label),
+    }
+
+
+def request(word, offset, version):
+    return {
+        'file': 'test.py',
+        'offset': offset,
+        'current_word': word,
+        'version': version,
+    }
+
+
+@pytest.fixture
+def sessions():
+    """Cache with a session for 'os.pa' whose completions are gathered."""
+    cache = CompletionSessionCache()
+    offset = TEXT.index('pa') + 2
+    cache.update_document('test.py', 1, TEXT, offset)
+
+    session = cache.start_session(request('pa', offset, 1))
+    assert session is not None
+    cache.set_completions(
+        session,
+        [completion('path'), completion('pardir'), completion('pathsep'),
+         dict(completion('pipe'), textEdit={'newText': 'pipe'})]
+    )
+    return cache
+
+
+def test_session_hit(sessions):
+    """Check that typing more characters of a word is answered locally."""
+    offset = TEXT.index('pa') + 3
+    text = TEXT[:offset - 1] + 't' + TEXT[offset - 1:]
+    sessions.update_document('test.py', 2, text, offset)
+
+    completions = sessions.get_completions(request('pat', offset, 2))
+    assert [c['label'] for c in completions] == ['path', 'pathsep']
+    assert sessions.hits == 1
+    assert sessions.misses == 0
+
+    # Requests for an old version of the file are not answered
+    completions = sessions.get_completions(request('pa', offset - 1, 1))
+    assert completions is None
+
+    # Going back to the word of the session keeps it
+    sessions.update_document('test.py', 3, TEXT, offset - 1)
+    completions = sessions.get_completions(request('pa', offset - 1, 3))
+    assert [c['label'] for c in completions] == ['path', 'pardir', 'pathsep']
+    assert sessions.hit_rate == pytest.approx(2 / 3)
+
+
+def test_session_copies(sessions):
+    """Check that completions can be modified without changing the cache."""
+    offset = TEXT.index('pa') + 2
+    completions = sessions.get_completions(request('pa', offset, 1))
+    assert [c['label'] for c in completions] == ['path', 'pardir', 'pathsep']
+
+    completions[0]['insertText'] = 'changed'
+    completions = sessions.get_completions(request('pa', offset, 1))
+    assert completions[0]['insertText'] == 'path'
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        # Characters that don't continue the word
+        lambda text, pos: (text[:pos] + '.' + text[pos:], pos + 1),
+        # Changes to the text before the word
+        lambda text, pos: ('#' + text, pos + 1),
+        # Changes to the text after the cursor
+        lambda text, pos: (text + 'x = 1\n', pos),
+        # Deleting characters of the word
+        lambda text, pos: (text[:pos - 1] + text[pos:], pos - 1),
+    ]
+)
+def test_session_invalidated(sessions, edit):
+    """Check that sessions are removed when the context changes."""
+    offset = TEXT.index('pa') + 2
+    text, offset = edit(TEXT, offset)
+    sessions.update_document('test.py', 2, text, offset)
+
+    params = request('pa', TEXT.index('pa') + 2, 2)
+    assert sessions.get_completions(params) is None
+    assert sessions.misses == 1
+
+
+def test_session_unknown_document():
+    """Check that no session is started for files whose text is unknown."""
+    sessions = CompletionSessionCache()
+    assert sessions.start_session(request('pa', 5, 1)) is None
+
+    # Or when the request is for a different version of the file
+    sessions.update_document('test.py', 2, TEXT, 5)
+    assert sessions.start_session(request('pa', 5, 1)) is None
+
+    # Or when the word is not in the text
+    assert sessions.start_session(request('pa', 5, 2)) is None
+
+    sessions.close_document('test.py')
+    assert sessions.start_session(
+        request('pa', TEXT.index('pa') + 2, 2)) is None
+
+
+def test_session_crlf():
+    """Check that sessions work in files with Windows end of lines."""
+    sessions = CompletionSessionCache()
+    text = TEXT.replace('\n', '\r\n')
+
+    # Offsets are cursor positions, which count \r\n as a single character
+    offset = TEXT.index('pa') + 2
+    sessions.update_document('test.py', 1, text, offset)
+    session = sessions.start_session(request('pa', offset, 1))
+    assert session is not None
+    sessions.set_completions(session, [completion('path')])
+
+    offset += 1
+    text = text.replace('os.pa', 'os.pat')
+    sessions.update_document('test.py', 2, text, offset)
+    completions = sessions.get_completions(request('pat', offset, 2))
+    assert [c['label'] for c in completions] == ['path']
+
+
+def test_session_without_version():
+    """Check that requests without a version don't start sessions."""
+    sessions = CompletionSessionCache()
+    offset = TEXT.index('pa') + 2
+    sessions.update_document('test.py', 1, TEXT, offset)
+
+    params = request('pa', offset, 1)
+    del params['version']
+    assert sessions.start_session(params) is None
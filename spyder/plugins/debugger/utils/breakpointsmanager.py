@@ -166,6 +166,7 @@ def toogle_breakpoint(
             else:
                 self._breakpoint_blocks[block.blockNumber()] = block
         block.setUserData(data)
+        self.editor.scrollflagarea.add_flagged_blocks([block])
         self.editor.sig_flags_changed.emit()
         self.breakpoints_changed()
 
@@ -660,13 +660,15 @@ def interrupt_and_debug(self):
         # Enter the debugger
         sw = widget.shellwidget
         if sw._executing:
-            sw.call_kernel(
-                interrupt=True, callback=widget.show_pdb_preview
-                ).get_current_frames(
-                    ignore_internal_threads=True
-                )
-
-            sw.call_kernel(interrupt=True).request_pdb_stop()
+            sw.call_kernel_batch(
+                [
+                    ("get_current_frames", (),
+                     {"ignore_internal_threads": True}),
+                    ("request_pdb_stop", (), {}),
+                ],
+                interrupt=True,
+                callback=lambda results: widget.show_pdb_preview(results[0])
+            )
             return
 
     def capture_frames(self):
@@ -14,7 +14,7 @@
 import sys
 
 # Third party imports
-from qtpy.QtCore import QSize, Qt, QThread
+from qtpy.QtCore import QSize, Qt
 from qtpy.QtGui import QColor, QCursor, QPainter
 from qtpy.QtWidgets import QApplication, QStyle, QStyleOptionSlider
 from superqt.utils import qdebounced
@@ -60,17 +60,18 @@ def __init__(self):
         self._slider_range_brush = QColor(Qt.gray)
         self._slider_range_brush.setAlphaF(.5)
 
-        # Dictionary with flag lists
+        # Dictionary with flag lists. Each list has the flagged blocks sorted
+        # by their line number.
         self._dict_flag_list = {}
 
+        # Blocks that had their flags changed (i.e. code analysis results,
+        # todos or breakpoints), indexed by their user data. This way flag
+        # lists can be updated without going through the whole document.
+        self._flagged_blocks = {}
+
         # Keep track if todo markers are enabled.
         self.todo_enabled = True
 
-        # Thread to update flags on it.
-        self._update_flags_thread = QThread(None)
-        self._update_flags_thread.run = self._update_flags
-        self._update_flags_thread.finished.connect(self.update)
-
     def on_install(self, editor):
         """Manages install setup of the pane."""
         super().on_install(editor)
@@ -106,11 +107,6 @@ def slider(self):
         """This property holds whether the vertical scrollbar is visible."""
         return self.editor.verticalScrollBar().isVisible()
 
-    def closeEvent(self, event):
-        self._update_flags_thread.quit()
-        self._update_flags_thread.wait()
-        super().closeEvent(event)
-
     def sizeHint(self):
         """Override Qt method"""
         return QSize(self.WIDTH, 0)
@@ -124,49 +120,65 @@ def update_flag_colors(self, color_dict):
             self._facecolors[name] = QColor(color)
             self._edgecolors[name] = self._facecolors[name].darker(120)
 
+    def add_flagged_blocks(self, blocks):
+        """
+        Add blocks whose flags changed to the ones tracked by this panel.
+
+        This needs to be called after changing the code analysis results,
+        todo or breakpoint of the user data of a block, so that it's taken
+        into account the next time flags are updated.
+        """
+        for block in blocks:
+            data = block.userData()
+            if data:
+                self._flagged_blocks[data] = block
+
+    def share_flagged_blocks(self, other):
+        """Track the same blocks as other, e.g. for cloned editors."""
+        self._flagged_blocks = other._flagged_blocks
+
     @qdebounced(timeout=REFRESH_RATE)
     def update_flags(self):
-        """Update flags list in a thread."""
+        """Update flags list."""
         logger.debug("Updating current flags")
 
-        self._dict_flag_list = {
+        dict_flag_list = {
             'error': [],
             'warning': [],
             'todo': [],
             'breakpoint': [],
         }
 
-        # Run this computation in a different thread to prevent freezing
-        # the interface
-        if not self._update_flags_thread.isRunning():
-            self._update_flags_thread.start()
+        for data, block in list(self._flagged_blocks.items()):
+            # Forget blocks that were removed or don't have flags anymore
+            if not is_block_safe(block) or block.userData() is not data:
+                flag_type = None
+            else:
+                flag_type = self._get_flag_type(data)
 
-    def _update_flags(self):
-        """Update flags list."""
-        editor = self.editor
-        block = editor.document().firstBlock()
-        while block.isValid():
-            # Parse all lines in the file looking for something to flag.
-            data = block.userData()
-            if data:
-                if data.code_analysis:
-                    for _, _, severity, _ in data.code_analysis:
-                        if severity == DiagnosticSeverity.ERROR:
-                            flag_type = 'error'
-                            break
-                    else:
-                        flag_type = 'warning'
-                elif data.todo:
-                    flag_type = 'todo'
-                elif data.breakpoint:
-                    flag_type = 'breakpoint'
-                else:
-                    flag_type = None
-
-                if flag_type is not None:
-                    self._dict_flag_list[flag_type].append(block)
-
-            block = block.next()
+            if flag_type is None:
+                del self._flagged_blocks[data]
+            else:
+                dict_flag_list[flag_type].append(block)
+
+        for flag_list in dict_flag_list.values():
+            flag_list.sort(key=lambda block: block.blockNumber())
+
+        self._dict_flag_list = dict_flag_list
+        self.update()
+
+    def _get_flag_type(self, data):
+        """Get the type of flag to paint for a block with the given data."""
+        if data.code_analysis:
+            for _, _, severity, _ in data.code_analysis:
+                if severity == DiagnosticSeverity.ERROR:
+                    return 'error'
+            return 'warning'
+        elif data.todo:
+            return 'todo'
+        elif data.breakpoint:
+            return 'breakpoint'
+        return None
 
     def paintEvent(self, event):
         """
@@ -220,12 +232,9 @@ def paintEvent(self, event):
         last_y_pos = self.value_to_position(
             last_line + 0.5, scale_factor, offset) - self.FLAGS_DY / 2
 
-        # Compute the height of a line and of a flag in lines.
+        # Compute the height of a line in pixels.
         line_height = last_y_pos - first_y_pos
-        if line_height > 0:
-            flag_height_lines = rect_h * last_line / line_height
-        else:
-            flag_height_lines = 0
+        line_scale = line_height / last_line if last_line > 0 else 0
 
         # All the lists of block numbers for flags
         dict_flag_lists = {
@@ -268,19 +277,20 @@ def paintEvent(self, event):
             else:
                 # Many lines
                 if len(dict_flag_lists[flag_type]) < MAX_FLAGS:
-                    # If the file is too long, do not freeze the editor
-                    next_line = 0
-                    for block in dict_flag_lists[flag_type]:
-                        if not is_block_safe(block):
-                            continue
-                        block_line = block.firstLineNumber()
-                        # block_line = -1 if invalid
-                        if block_line < next_line:
-                            # Don't print flags on top of flags
-                            continue
-                        next_line = block_line + flag_height_lines / 2
-                        frac = block_line / last_line
-                        rect_y = ceil(first_y_pos + frac * line_height)
+                    # If the file is too long, do not freeze the editor.
+                    # Map lines to pixel positions in a single pass, so that
+                    # flags on top of flags are only painted once.
+                    lines = [
+                        block.firstLineNumber()
+                        for block in dict_flag_lists[flag_type]
+                        if is_block_safe(block)
+                    ]
+                    rect_ys = {
+                        ceil(first_y_pos + line * line_scale)
+                        for line in lines
+                        if line >= 0
+                    }
+                    for rect_y in sorted(rect_ys):
                         painter.drawRect(rect_x, rect_y, rect_w, rect_h)
 
         # Paint the slider range
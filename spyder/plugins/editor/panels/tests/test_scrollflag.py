@@ -148,6 +148,44 @@ def test_flag_painting(editor_bot, qtbot):
         editor.setTextCursor(cursor)
 
 
+def test_flags_update(editor_bot, qtbot):
+    """
+    Test that flag lists are updated from the blocks whose flags changed and
+    that they follow those blocks when lines are added before them.
+    """
+    editor = editor_bot
+    editor.filename = "file.py"
+    editor.breakpoints_manager = BreakpointsManager(editor)
+    sfa = editor.scrollflagarea
+    editor.show()
+    editor.set_text(long_code)
+
+    def flag_lines(flag_type):
+        return [block.blockNumber() for block in sfa._dict_flag_list[flag_type]]
+
+    editor.process_todo([["TODO", 8], ["TODO", 3]])
+    editor.breakpoints_manager.toogle_breakpoint(line_number=5)
+    sfa.update_flags()
+    sfa.update_flags.flush()
+
+    assert flag_lines('todo') == [2, 7]
+    assert flag_lines('breakpoint') == [4]
+
+    # Add a line at the beginning of the file
+    cursor = editor.textCursor()
+    cursor.setPosition(0)
+    cursor.insertText("Line0\n")
+
+    # Remove todos
+    editor.process_todo([])
+    sfa.update_flags()
+    sfa.update_flags.flush()
+
+    assert flag_lines('todo') == []
+    assert flag_lines('breakpoint') == [5]
+    assert len(sfa._flagged_blocks) == 1
+
+
 def test_range_indicator_visible_on_hover_only(editor_bot, qtbot):
     """Test that the slider range indicator is visible only when hovering
     over the scrollflag area when the editor vertical scrollbar is visible.
@@ -16,6 +16,9 @@
 <https://github.com/pyQode/pyqode.core/blob/master/pyqode/core/managers/decorations.py>
 """
 
+# Standard library imports
+from bisect import bisect_left, bisect_right
+
 # Third party imports
 from qtpy.QtCore import QObject, QTimer, Slot
 from qtpy.QtGui import QTextCharFormat
@@ -28,6 +31,10 @@
 # introduces a lot of sluggishness in the editor.
 UPDATE_TIMEOUT = 15  # milliseconds
 
+# Decorations that span more blocks than this are not put in the block index
+# of DecorationsIndex, so they don't slow down lookups of the rest.
+MAX_INDEXED_SPAN = 50
+
 
 def order_function(sel):
     end = sel.cursor.selectionEnd()
@@ -35,6 +42,75 @@ def order_function(sel):
     return sel.draw_order, -(end - start)
 
 
+class DecorationsIndex:
+    """
+    Decorations of a key indexed by the range of blocks they span.
+
+    Decorations are kept sorted by their first block, so the ones that
+    overlap a range of blocks can be found with a binary search instead of
+    going through all of them.
+
+    Block numbers are computed when decorations are added, so the index
+    has to be rebuilt after the document changes.
+    """
+
+    def __init__(self, decorations=()):
+        # Sorted list of first blocks and the decorations starting there
+        self._starts = []
+        self._entries = []
+
+        # Largest number of blocks spanned by an indexed decoration, to know
+        # how far before the first visible block we need to look.
+        self._max_span = 0
+
+        # Decorations that are always visible
+        self._always_visible = []
+
+        # Decorations spanning more than MAX_INDEXED_SPAN blocks
+        self._long = []
+
+        for decoration in decorations:
+            self.insert(decoration)
+
+    def insert(self, decoration):
+        """Add a decoration to the index."""
+        if decoration.kind == 'current_cell':
+            self._always_visible.append(decoration)
+            return
+
+        cursor = decoration.cursor
+        document = cursor.document()
+        start = document.findBlock(cursor.selectionStart()).blockNumber()
+        end = max(
+            start,
+            document.findBlock(cursor.selectionEnd()).blockNumber()
+        )
+
+        if end - start > MAX_INDEXED_SPAN:
+            self._long.append((start, end, decoration))
+            return
+
+        # Keep insertion order for decorations that start in the same block
+        position = bisect_right(self._starts, start)
+        self._starts.insert(position, start)
+        self._entries.insert(position, (end, decoration))
+        self._max_span = max(self._max_span, end - start)
+
+    def visible(self, first, last):
+        """Get the decorations that overlap blocks first to last."""
+        visible = list(self._always_visible)
+        for start, end, decoration in self._long:
+            if start <= last and end >= first:
+                visible.append(decoration)
+
+        begin = bisect_left(self._starts, first - self._max_span)
+        stop = bisect_right(self._starts, last)
+        for end, decoration in self._entries[begin:stop]:
+            if end >= first:
+                visible.append(decoration)
+        return visible
+
+
 class TextDecorationsManager(Manager, QObject):
     """
     Manages the collection of TextDecoration that have been set on the editor
@@ -44,6 +120,11 @@ def __init__(self, editor):
         super().__init__(editor)
         self._decorations = {"misc": []}
 
+        # Block indexes of decorations per key. They are built when needed
+        # and are valid for the document state saved in _indexes_state.
+        self._indexes = {}
+        self._indexes_state = None
+
         # Timer to not constantly update decorations.
         self.update_timer = QTimer(self)
         self.update_timer.setSingleShot(True)
@@ -70,14 +151,23 @@ def add(self, decorations, key="misc"):
         added = 0
 
         if isinstance(decorations, list):
-            not_repeated = set(decorations) - set(current_decorations)
-            current_decorations.extend(list(not_repeated))
+            not_repeated = list(set(decorations) - set(current_decorations))
+            current_decorations.extend(not_repeated)
             self._decorations[key] = current_decorations
             added = len(not_repeated)
         elif decorations not in current_decorations:
+            not_repeated = [decorations]
             self._decorations[key].append(decorations)
             added = 1
 
+        # Add new decorations to the index of their key, if it exists
+        if added > 0 and key in self._indexes:
+            try:
+                for decoration in not_repeated:
+                    self._indexes[key].insert(decoration)
+            except RuntimeError:
+                self._indexes.pop(key)
+
         if added > 0:
             self.update()
         return added
@@ -85,6 +175,7 @@ def add(self, decorations, key="misc"):
     def add_key(self, key, decorations):
         """Add decorations to key."""
         self._decorations[key] = decorations
+        self._indexes.pop(key, None)
         self.update()
 
     def remove(self, decoration, key="misc"):
@@ -99,6 +190,7 @@ def remove(self, decoration, key="misc"):
         """
         try:
             self._decorations[key].remove(decoration)
+            self._indexes.pop(key, None)
             self.update()
             return True
         except (ValueError, KeyError):
@@ -108,6 +200,7 @@ def remove_key(self, key):
         """Remove key"""
         try:
             del self._decorations[key]
+            self._indexes.pop(key, None)
             self.update()
         except KeyError:
             pass
@@ -119,6 +212,7 @@ def get(self, key, default=None):
     def clear(self):
         """Removes all text decoration from the editor."""
         self._decorations = {"misc": []}
+        self._indexes = {}
         self.update()
 
     def update(self):
@@ -148,36 +242,51 @@ def _update(self):
             # Get the current visible block numbers
             first, last = editor.get_buffer_block_numbers()
 
-            # Update visible decorations
+            # Get visible decorations. Decorations that span several blocks
+            # are visible if any of them is, which is required to update
+            # extra selections from the point an initial selection was made.
+            # Fixes spyder-ide/spyder#14282
             visible_decorations = []
-            for decoration in self._sorted_decorations():
-                need_update_sel = False
-                cursor = decoration.cursor
-                sel_start = cursor.selectionStart()
-                # This is required to update extra selections from the point
-                # an initial selection was made.
-                # Fixes spyder-ide/spyder#14282
-                if sel_start is not None:
-                    doc = cursor.document()
-                    block_nb_start = doc.findBlock(sel_start).blockNumber()
-                    need_update_sel = first <= block_nb_start <= last
-
-                block_nb = decoration.cursor.block().blockNumber()
-                if (first <= block_nb <= last or need_update_sel or
-                        decoration.kind == 'current_cell'):
-                    visible_decorations.append(decoration)
-                    try:
-                        decoration.format.setFont(
-                            font, QTextCharFormat.FontPropertiesSpecifiedOnly)
-                    except (TypeError, AttributeError):  # Qt < 5.3
-                        decoration.format.setFontFamily(font.family())
-                        decoration.format.setFontPointSize(font.pointSize())
+            for key in self._decorations:
+                visible_decorations.extend(
+                    self._get_index(key).visible(first, last)
+                )
+            visible_decorations.sort(key=order_function)
+
+            for decoration in visible_decorations:
+                try:
+                    decoration.format.setFont(
+                        font, QTextCharFormat.FontPropertiesSpecifiedOnly)
+                except (TypeError, AttributeError):  # Qt < 5.3
+                    decoration.format.setFontFamily(font.family())
+                    decoration.format.setFontPointSize(font.pointSize())
 
             editor.setExtraSelections(visible_decorations)
         except RuntimeError:
             # This is needed to fix spyder-ide/spyder#9173.
             return
 
+    def _get_index(self, key):
+        """
+        Get the block index of the decorations of key.
+
+        Indexes are rebuilt when the document changed since they were built,
+        because that can move decorations to other blocks. Otherwise they
+        are reused, so updating decorations while scrolling only costs a
+        binary search per key.
+        """
+        document = self.editor.document()
+        state = (document, document.revision(), document.blockCount())
+        if state != self._indexes_state:
+            self._indexes = {}
+            self._indexes_state = state
+
+        index = self._indexes.get(key)
+        if index is None:
+            index = DecorationsIndex(self._decorations[key])
+            self._indexes[key] = index
+        return index
+
     def __iter__(self):
         return iter(self._decorations)
 
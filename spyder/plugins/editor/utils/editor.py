@@ -81,6 +81,7 @@ def __init__(self, editor, color=None, selection_start=None,
         self.bookmarks = []
         self.code_analysis = []
         self.todo = ''
+        self.line_profile = None
         self.color = color
         self.oedata = None
         self.import_statement = None
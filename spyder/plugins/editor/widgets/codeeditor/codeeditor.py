@@ -435,6 +435,12 @@ def __init__(self, parent=None):
             lambda value: self.hide_calltip()
         )
 
+        # Highlight blocks that become visible before the highlighter
+        # reaches them in large files
+        self.verticalScrollBar().valueChanged.connect(
+            lambda value: self._highlight_visible_blocks()
+        )
+
         # QTextEdit + LSPMixin
         self.textChanged.connect(self._schedule_document_did_change)
 
@@ -702,6 +708,7 @@ def set_as_clone(self, editor):
         self.eol_chars = editor.eol_chars
         self._apply_highlighter_color_scheme()
         self.highlighter.sig_font_changed.connect(self.sync_font)
+        self.scrollflagarea.share_flagged_blocks(editor.scrollflagarea)
 
     # ---- Widget setup and options
     # -------------------------------------------------------------------------
@@ -1891,8 +1898,15 @@ def set_color_scheme(self, color_scheme):
         else:
             self.unhighlight_current_line()
 
+    def _highlight_visible_blocks(self):
+        """Highlight visible blocks the highlighter left for later."""
+        if self.highlighter is not None:
+            self.highlighter.highlight_visible_blocks()
+
     def set_text(self, text):
         """Set the text of the editor"""
+        if self.highlighter is not None:
+            self.highlighter.restart_sliced_highlighting()
         self.setPlainText(text)
         self.set_eol_chars(text=text)
 
@@ -2425,6 +2439,7 @@ def process_todo(self, todo_results):
         for data in self.blockuserdata_list():
             data.todo = ''
 
+        blocks = []
         for message, line_number in todo_results:
             block = self.document().findBlockByNumber(line_number - 1)
             data = block.userData()
@@ -2432,6 +2447,8 @@ def process_todo(self, todo_results):
                 data = BlockUserData(self)
             data.todo = message
             block.setUserData(data)
+            blocks.append(block)
+        self.scrollflagarea.add_flagged_blocks(blocks)
         self.sig_flags_changed.emit()
 
     # ---- Comments/Indentation
@@ -168,6 +168,7 @@ def __init__(self, *args, **kwargs):
         self.update_diagnostics_thread.finished.connect(
             self.finish_code_analysis)
         self._diagnostics = []
+        self._diagnostics_blocks = []
 
         # Text diffs across versions
         self.differ = diff_match_patch()
@@ -563,6 +564,11 @@ def underline_errors(self):
 
     def finish_code_analysis(self):
         """Finish processing code analysis results."""
+        # This is done here because the scrollflag area can't be modified
+        # from the diagnostics thread
+        self.scrollflagarea.add_flagged_blocks(self._diagnostics_blocks)
+        self._diagnostics_blocks = []
+
         self.linenumberarea.update()
         if self.underline_errors_enabled:
             self.underline_errors()
@@ -591,6 +597,8 @@ def _process_code_analysis(self, underline):
         document = self.document()
         if underline:
             first_block, last_block = self.get_buffer_block_numbers()
+        else:
+            diagnostics_blocks = []
 
         for diagnostic in self._diagnostics:
             if self.is_ipython() and (
@@ -649,6 +657,10 @@ def _process_code_analysis(self, underline):
                         (source, code, severity, message)
                     )
                 block.setUserData(data)
+                diagnostics_blocks.append(block)
+
+        if not underline:
+            self._diagnostics_blocks = diagnostics_blocks
 
     # ---- Completion
     # -------------------------------------------------------------------------
@@ -669,6 +681,14 @@ def do_completion(self, automatic=False):
             "selection_end": cursor.selectionEnd(),
             "current_word": current_word,
         }
+
+        # The completion plugin reuses completions for the same version of
+        # the text. That's not possible for IPython files because the text
+        # sent for them is transformed, so its offsets don't match the
+        # cursor position.
+        if not self.is_ipython():
+            params["version"] = self.text_version
+
         self.completion_args = (self.textCursor().position(), automatic)
         return params
 
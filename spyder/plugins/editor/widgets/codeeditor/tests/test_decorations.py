@@ -95,6 +95,42 @@ def test_decorations(codeeditor, qtbot):
     assert decorations[0].kind == 'current_cell'
 
 
+def test_decorations_index(codeeditor, qtbot):
+    """Test that only decorations in the visible blocks are painted."""
+    editor = codeeditor
+    editor.resize(640, 480)
+    editor.set_text("some_variable = 1\n" * 2000)
+
+    selections = []
+    for block_number in range(0, 2000, 2):
+        cursor = QTextCursor(
+            editor.document().findBlockByNumber(block_number)
+        )
+        cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+        selections.append(editor.get_selection(cursor))
+    editor.set_extra_selections('test', selections)
+
+    def painted_blocks():
+        editor.decorations._update()
+        return sorted(
+            selection.cursor.blockNumber()
+            for selection in editor.extraSelections()
+            if selection.cursor.selectedText() == "some_variable = 1"
+        )
+
+    editor.go_to_line(1000)
+    first, last = editor.get_buffer_block_numbers()
+    expected = [n for n in range(first, last + 1) if n % 2 == 0]
+    assert painted_blocks() == expected
+
+    # Decorations move with the text after the document changes
+    cursor = QTextCursor(editor.document())
+    cursor.insertText("\n")
+    first, last = editor.get_buffer_block_numbers()
+    expected = [n for n in range(first, last + 1) if n % 2 == 1]
+    assert painted_blocks() == expected
+
+
 @flaky(max_runs=10)
 @pytest.mark.skipif(PYQT6, reason="Fails with PyQt6")
 @pytest.mark.skipif(
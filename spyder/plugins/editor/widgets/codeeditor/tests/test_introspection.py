@@ -1155,6 +1155,60 @@ def test_file_completions(filename, mock_completions_codeeditor, qtbot):
     assert code_editor.get_text_with_eol() == f"'{filename}'"
 
 
+@pytest.mark.order(1)
+def test_completion_list_filtering(mock_completions_codeeditor, qtbot):
+    """
+    Test that long completion lists are filtered while typing and that only
+    the visible completions are rendered.
+    """
+    code_editor, mock_response = mock_completions_codeeditor
+    completion = code_editor.completion_widget
+
+    labels = [f'aa{i}' for i in range(1000)] + ['ab', 'Abc']
+    mock_response.side_effect = lambda lang, method, params: {'params': [
+        {
+            'label': label,
+            'kind': CompletionItemKind.VARIABLE,
+            'sortText': (0, label),
+            'insertText': label,
+            'data': {'doc_uri': path_as_uri(__file__)},
+            'detail': '',
+            'documentation': '',
+            'filterText': label,
+            'insertTextFormat': 1,
+            'provider': 'LSP',
+            'resolve': True
+        }
+        for label in labels
+    ]} if method == CompletionRequestTypes.DOCUMENT_COMPLETION else None
+
+    with qtbot.waitSignal(completion.sig_show_completions,
+                          timeout=10000):
+        qtbot.keyClicks(code_editor, "a")
+
+    assert completion.count() == len(labels)
+    assert len(completion.completion_model._html) < len(labels)
+
+    # Typing narrows the list, ignoring case
+    qtbot.keyClicks(completion, 'b')
+    assert completion.count() == 2
+    qtbot.keyClicks(completion, 'c')
+    assert completion.count() == 1
+    assert completion.item(0).data(Qt.UserRole)['label'] == 'Abc'
+
+    # Removing characters widens it again
+    qtbot.keyPress(completion, Qt.Key_Backspace)
+    assert completion.count() == 2
+    qtbot.keyPress(completion, Qt.Key_Backspace)
+    assert completion.count() == len(labels)
+
+    # Insert the current completion
+    completion.setCurrentRow(completion.count() - 1)
+    qtbot.keyPress(completion, Qt.Key_Tab)
+    qtbot.wait(500)
+    assert code_editor.toPlainText() == 'Abc'
+
+
 @pytest.mark.order(1)
 @pytest.mark.parametrize(
     "directory",
@@ -11,9 +11,16 @@
 import sys
 
 # Third psrty imports
-from qtpy.QtCore import QPoint, Qt, Signal, Slot
+from qtpy.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QPoint,
+    Qt,
+    Signal,
+    Slot,
+)
 from qtpy.QtGui import QFontMetrics, QFocusEvent
-from qtpy.QtWidgets import QListWidget, QListWidgetItem, QToolTip
+from qtpy.QtWidgets import QAbstractItemView, QListView, QToolTip
 
 # Local imports
 from spyder.api.config.mixins import SpyderConfigurationAccessor
@@ -28,7 +35,161 @@
 COMPLETION_DELTA_FOR_SCROLLBAR = 7 if sys.platform.startswith("linux") else 0
 
 
-class CompletionWidget(QListWidget, SpyderConfigurationAccessor):
+class CompletionModel(QAbstractListModel):
+    """
+    Model with the completions that match the word being completed.
+
+    The lowercase keys used to filter completions are computed once per
+    list, and when the word being completed grows only the current matches
+    are filtered again. The HTML used to display completions is generated
+    only for the rows that are painted.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.completion_widget = parent
+        self.completions = []
+        self.is_internal_console = False
+
+        # Lowercase filter text of each completion, or None if it matches any
+        # word, and whether the completion has a textEdit.
+        self._keys = []
+        self._text_edits = []
+
+        # Indexes of the completions that match the current filter
+        self._matches = []
+        self._filter = None
+
+        # HTML of the completions, by their index
+        self._html = {}
+        self._item_size = (COMPLETION_ITEM_HEIGHT, COMPLETION_ITEM_WIDTH)
+
+    # ---- Qt methods
+    # -------------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._matches)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._matches):
+            return None
+
+        i = self._matches[index.row()]
+        completion = self.completions[i]
+
+        if role == Qt.DisplayRole:
+            if i not in self._html:
+                self._html[i] = self._get_html(completion)
+            return self._html[i]
+        elif role == Qt.UserRole:
+            if self.is_internal_console:
+                return completion[0]
+            return completion
+        elif self.is_internal_console:
+            return None
+        elif role == Qt.DecorationRole:
+            return self.completion_widget.get_item_icon(completion)
+        elif role == Qt.AccessibleTextRole:
+            # Data for accessible readers using item label and type
+            # See spyder-ide/spyder#17047 and
+            # https://doc.qt.io/qt-5/qt.html#ItemDataRole-enum
+            item_type = self.completion_widget.get_item_type(completion)
+            return f"{completion['label']} {item_type}"
+
+        return None
+
+    # ---- Public API
+    # -------------------------------------------------------------------------
+    def set_completions(self, completions, is_internal_console):
+        """Set the completions of the model, without filtering them."""
+        self.beginResetModel()
+        self.completions = completions
+        self.is_internal_console = is_internal_console
+
+        if is_internal_console:
+            self._keys = [
+                str(completion[0]).lower() if completion[0] else None
+                for completion in completions
+            ]
+            self._text_edits = [False] * len(completions)
+        else:
+            self._keys = [
+                (
+                    str(completion['filterText']).lower()
+                    if completion['filterText'] else None
+                )
+                for completion in completions
+            ]
+            self._text_edits = [
+                'textEdit' in completion for completion in completions
+            ]
+
+        self._matches = list(range(len(completions)))
+        self._filter = None
+        self._html = {}
+        self.endResetModel()
+
+    def set_item_size(self, height, width):
+        """Set the size used by the HTML of completions."""
+        if (height, width) != self._item_size:
+            self._item_size = (height, width)
+            self._html = {}
+
+    def filter(self, current_word, include_text_edits=True):
+        """
+        Show only the completions that can complete current_word.
+
+        Completions with a textEdit are left out if include_text_edits is
+        False.
+        """
+        word = str(current_word).lower() if current_word else ''
+
+        # A longer word can only match a subset of the current matches
+        if (
+            self._filter is not None
+            and word.startswith(self._filter[0])
+            and (self._filter[1] or not include_text_edits)
+        ):
+            candidates = self._matches
+        else:
+            candidates = range(len(self.completions))
+
+        keys = self._keys
+        text_edits = self._text_edits
+        matches = [
+            i for i in candidates
+            if (include_text_edits or not text_edits[i])
+            and (not word or keys[i] is None or keys[i].startswith(word))
+        ]
+
+        self._filter = (word, include_text_edits)
+        if matches != self._matches:
+            self.beginResetModel()
+            self._matches = matches
+            self.endResetModel()
+
+    def clear(self):
+        """Remove all completions."""
+        self.set_completions([], self.is_internal_console)
+
+    def completion(self, row):
+        """Get the completion displayed in row."""
+        return self.completions[self._matches[row]]
+
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _get_html(self, completion):
+        """Get the HTML used to display a completion."""
+        height, width = self._item_size
+        if self.is_internal_console:
+            return self.completion_widget.get_html_item_representation(
+                completion[0], '', height=height, width=width)
+        return self.completion_widget.get_item_html(
+            completion, height=height, width=width)
+
+
+class CompletionWidget(QListView, SpyderConfigurationAccessor):
     """Completion list widget."""
 
     ITEM_TYPE_MAP = {
@@ -56,6 +217,9 @@ class CompletionWidget(QListWidget, SpyderConfigurationAccessor):
 
     sig_show_completions = Signal(object)
 
+    # Signal with the current row, like the one of QListWidget
+    currentRowChanged = Signal(int)
+
     # Signal with the info about the current completion item documentation
     # str: completion name
     # str: completion signature/documentation,
@@ -67,8 +231,13 @@ def __init__(self, parent, ancestor):
         self.textedit = parent
         self._language = None
         self.setWindowFlags(Qt.SubWindow | Qt.FramelessWindowHint)
+
+        self.completion_model = CompletionModel(self)
+        self.setModel(self.completion_model)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+
         self.hide()
-        self.itemActivated.connect(self.item_selected)
+        self.activated.connect(self.item_selected)
         self.currentRowChanged.connect(self.row_changed)
         self.is_internal_console = False
         self.completion_list = None
@@ -76,10 +245,11 @@ def __init__(self, parent, ancestor):
         self.automatic = False
         self.current_selected_item_label = None
         self.current_selected_item_point = None
-        self.display_index = []
 
-        # Setup item rendering
+        # Setup item rendering. All items have the same size, so only the
+        # visible ones are rendered.
         self.setItemDelegate(HTMLDelegate(self, margin=3))
+        self.setUniformItemSizes(True)
         self.setMinimumWidth(COMPLETION_ITEM_WIDTH)
 
         # Initial item height and width
@@ -97,6 +267,28 @@ def is_empty(self):
             return True
         return False
 
+    def count(self):
+        """Number of completions that are displayed."""
+        return self.completion_model.rowCount()
+
+    def item(self, row):
+        """Get the index of the completion in row, or None if there's none."""
+        index = self.completion_model.index(row)
+        return index if index.isValid() else None
+
+    def currentItem(self):
+        """Get the index of the current completion, or None if there's none."""
+        index = self.currentIndex()
+        return index if index.isValid() else None
+
+    def currentRow(self):
+        """Get the current row, or -1 if there's none."""
+        return self.currentIndex().row()
+
+    def setCurrentRow(self, row):
+        """Set the current row."""
+        self.setCurrentIndex(self.completion_model.index(row))
+
     def show_list(self, completion_list, position, automatic):
         """Show list corresponding to position."""
         self.current_selected_item_label = None
@@ -125,6 +317,8 @@ def show_list(self, completion_list, position, automatic):
         if not isinstance(completion_list[0], dict):
             self.is_internal_console = True
         self.completion_list = completion_list
+        self.completion_model.set_completions(
+            completion_list, self.is_internal_console)
 
         # Check everything is in order
         self.update_current(new=True)
@@ -185,9 +379,6 @@ def update_list(self, current_word, new=True):
 
         If no items are left on the list the autocompletion should stop
         """
-        self.clear()
-
-        self.display_index = []
         height = self.item_height
 
         # This heuristics tells us if the amount of items is taller than the
@@ -206,30 +397,8 @@ def update_list(self, current_word, new=True):
             # right border.
             width = COMPLETION_ITEM_WIDTH + COMPLETION_DELTA_FOR_SCROLLBAR
 
-        for i, completion in enumerate(self.completion_list):
-            if not self.is_internal_console:
-                if not new and 'textEdit' in completion:
-                    continue
-                completion_label = completion['filterText']
-            else:
-                completion_label = completion[0]
-
-            if not self.check_can_complete(completion_label, current_word):
-                continue
-            item = QListWidgetItem()
-
-            if not self.is_internal_console:
-                self.set_item_display(
-                    item, completion, height=height, width=width)
-                item.setData(Qt.UserRole, completion)
-            else:
-                completion_text = self.get_html_item_representation(
-                    completion_label, '', height=height, width=width)
-                item.setData(Qt.UserRole, completion_label)
-                item.setText(completion_text)
-
-            self.addItem(item)
-            self.display_index.append(i)
+        self.completion_model.set_item_size(height, width)
+        self.completion_model.filter(current_word, include_text_edits=new)
 
         if self.count() == 0:
             self.hide()
@@ -239,9 +408,17 @@ def _get_cached_icon(self, name):
             self.ICON_MAP[name] = ima.icon(name)
         return self.ICON_MAP[name]
 
-    def set_item_display(self, item_widget, item_info, height, width):
-        """Set item text & icons using the info available."""
-        item_type = self.ITEM_TYPE_MAP.get(item_info['kind'], 'no_match')
+    def get_item_type(self, item_info):
+        """Get the name of the type of a completion."""
+        return self.ITEM_TYPE_MAP.get(item_info['kind'], 'no_match')
+
+    def get_item_icon(self, item_info):
+        """Get the icon of the type of a completion."""
+        return self._get_cached_icon(self.get_item_type(item_info))
+
+    def get_item_html(self, item_info, height, width):
+        """Get the HTML used to display a completion."""
+        item_type = self.get_item_type(item_info)
         item_label = item_info['label']
         icon_provider = ("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0l"
                          "EQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII=")
@@ -256,19 +433,11 @@ def set_item_display(self, item_widget, item_info, height, width):
             icon_provider = ima.base64_from_icon_obj(
                 icon_provider, icon_width, icon_height)
 
-        item_text = self.get_html_item_representation(
+        return self.get_html_item_representation(
             item_label, item_type, icon_provider=icon_provider,
             img_height=img_height, img_width=img_width, height=height,
             width=width)
 
-        item_widget.setText(item_text)
-        item_widget.setIcon(self._get_cached_icon(item_type))
-
-        # Set data for accessible readers using item label and type
-        # See spyder-ide/spyder#17047 and
-        # https://doc.qt.io/qt-5/qt.html#ItemDataRole-enum
-        item_widget.setData(Qt.AccessibleTextRole, f"{item_label} {item_type}")
-
     def get_html_item_representation(self, item_completion, item_type,
                                      icon_provider=None,
                                      img_height=0,
@@ -318,7 +487,7 @@ def hide(self, focus_to_parent=True):
         """Override Qt method."""
         self.completion_position = None
         self.completion_list = None
-        self.clear()
+        self.completion_model.clear()
 
         # Used to control when to give focus to its parent.
         # This is necessary to have a better fix than the initially
@@ -335,7 +504,7 @@ def hide(self, focus_to_parent=True):
             # time, which can generate odd UX situations.
             tooltip._hide()
 
-        QListWidget.hide(self)
+        QListView.hide(self)
         QToolTip.hideText()
 
     def keyPressEvent(self, event):
@@ -385,7 +554,7 @@ def keyPressEvent(self, event):
             elif key == Qt.Key_Down and self.currentRow() == self.count()-1:
                 self.setCurrentRow(0)
             else:
-                QListWidget.keyPressEvent(self, event)
+                QListView.keyPressEvent(self, event)
         elif key in (Qt.Key_Home, Qt.Key_End):
             # This allows users to easily move to the beginning/end of the
             # current line when this widget is visible.
@@ -421,7 +590,7 @@ def keyPressEvent(self, event):
             self.textedit.keyPressEvent(event)
         else:
             self.hide()
-            QListWidget.keyPressEvent(self, event)
+            QListView.keyPressEvent(self, event)
 
     def is_up_to_date(self, item=None):
         """
@@ -551,11 +720,11 @@ def request_completion_hint(self, row=None):
             return
         if row is None:
             row = self.currentRow()
-        if row < 0 or len(self.completion_list) <= row:
+        if row < 0 or self.count() <= row:
             return
 
-        item = self.completion_list[row]
-        if 'point' not in item:
+        item = self.completion_model.completion(row)
+        if not isinstance(item, dict) or 'point' not in item:
             return
 
         self.current_selected_item_label = item['label']
@@ -584,6 +753,11 @@ def augment_completion_info(self, item):
                 item['documentation'],
                 self.current_selected_item_point)
 
+    def currentChanged(self, current, previous):
+        """Override Qt method to emit currentRowChanged."""
+        super().currentChanged(current, previous)
+        self.currentRowChanged.emit(current.row())
+
     @Slot(int)
     def row_changed(self, row):
         """Actions to take when the row has changed."""
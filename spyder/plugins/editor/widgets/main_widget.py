@@ -29,6 +29,7 @@
 from qtpy.QtPrintSupport import QAbstractPrintDialog, QPrintDialog, QPrinter
 from qtpy.QtWidgets import (QAction, QActionGroup, QApplication, QDialog,
                             QSplitter, QVBoxLayout, QWidget)
+from spyder_kernels.utils.misc import get_text_hash
 
 # Local imports
 from spyder.api.config.decorators import on_conf_change
@@ -2593,11 +2594,12 @@ def handle_current_filename(self):
         """Get the current filename."""
         return self._get_editorstack().get_current_finfo().filename
 
-    def handle_get_file_code(self, filename, save_all=True):
+    def handle_get_file_code(self, filename, save_all=True, known_hash=None):
         """
-        Return the bytes that compose the file.
+        Return the text of the file.
 
-        Bytes are returned instead of str to support non utf-8 files.
+        If known_hash is given and it's the hash of the current text, None is
+        returned instead, so the kernel can use the text it already has.
         """
         editorstack = self._get_editorstack()
         if save_all and self.get_conf('save_all_before_run', section="run"):
@@ -2607,9 +2609,12 @@ def handle_get_file_code(self, filename, save_all=True):
         if editor is None:
             # Load it from file instead
             text, _enc = encoding.read(filename)
-            return text
+        else:
+            text = editor.toPlainText()
 
-        return editor.toPlainText()
+        if known_hash is not None and get_text_hash(text) == known_hash:
+            return None
+        return text
 
     # ---- Run/debug files
     # -------------------------------------------------------------------------
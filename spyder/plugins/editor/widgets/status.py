@@ -13,7 +13,7 @@
 from spyder.api.widgets.status import StatusBarWidget
 from spyder.api.translations import _
 from spyder.utils.workers import WorkerManager
-from spyder.utils.vcs import get_git_refs
+from spyder.utils.vcs import git_state_cache
 
 
 class ReadWriteStatus(StatusBarWidget):
@@ -91,6 +91,8 @@ def closeEvent(self, event):
 
     def update_vcs_state(self, idx, fname, fname2):
         """Update vcs status."""
+        # The saved file could have changed the status of the repository
+        git_state_cache.invalidate_status(fname)
         self.update_vcs(fname, None)
 
     def update_vcs(self, fname, index, force=False):
@@ -113,7 +115,13 @@ def update_vcs(self, fname, index, force=False):
 
     def get_git_refs(self, fname):
         """Get Git active branch, state, branches (plus tags)."""
-        return get_git_refs(osp.dirname(fname))
+        root = git_state_cache.get_root(osp.dirname(fname))
+        if root is None:
+            return [], '', []
+
+        refs, branch = git_state_cache.get_refs(root)
+        files_modified = list(git_state_cache.get_status(root))
+        return refs, branch, files_modified
 
     def process_git_data(self, worker, output, error):
         """Receive data from git and update gui."""
@@ -300,6 +300,8 @@ def on_close(self, cancelable=False):
 
             self._file_managers = {}
 
+        self.get_widget().treewidget.vcs_status.close()
+
     # ---- Public API
     # ------------------------------------------------------------------------
     def chdir(self, directory, emit=True, server_id=None):
@@ -32,7 +32,7 @@
     Signal,
     Slot,
 )
-from qtpy.QtGui import QClipboard, QDrag
+from qtpy.QtGui import QClipboard, QColor, QDrag, QPalette
 from qtpy.QtWidgets import (
     QAbstractItemView,
     QApplication,
@@ -61,9 +61,11 @@
 from spyder.api.widgets.mixins import SpyderWidgetMixin
 from spyder.config.base import get_home_dir
 from spyder.plugins.explorer.widgets.utils import (
-    create_script, fixpath, IconProvider, show_in_external_file_explorer)
+    create_script, fixpath, IconProvider, show_in_external_file_explorer,
+    VCSStatusSnapshot)
 from spyder.utils import encoding
 from spyder.utils.icon_manager import ima
+from spyder.utils.palette import SpyderPalette
 from spyder.utils import misc, programs, vcs
 from spyder.utils.misc import getcwd_or_home
 from spyder.utils.qthelpers import (
@@ -168,10 +170,24 @@ class DirViewItemDelegate(QStyledItemDelegate):
     def __init__(self, parent):
         super().__init__(parent)
         self._project_dir = ""
+        self._vcs_status = None
 
     def set_project_dir(self, project_dir):
         self._project_dir = project_dir
 
+    def set_vcs_status(self, vcs_status):
+        """Set the VCSStatusSnapshot used to color items."""
+        self._vcs_status = vcs_status
+
+    def get_vcs_status_color(self, status):
+        """Return the color for items with the given VCS status."""
+        # Conflicts are checked first because some of them contain an A
+        if 'U' in status or status in ('AA', 'DD'):
+            return SpyderPalette.COLOR_ERROR_2
+        elif status == '??' or 'A' in status:
+            return SpyderPalette.COLOR_SUCCESS_2
+        return SpyderPalette.COLOR_WARN_2
+
     def initStyleOption(self, option, index):
         """
         To change the item icon when expanding a folder.
@@ -204,6 +220,26 @@ def initStyleOption(self, option, index):
                 elif (option.state & QStyle.State_Open):
                     option.icon = ima.icon("DirOpenIcon")
 
+            # Color items whose VCS status changed
+            if (
+                index.column() == 0
+                and self._vcs_status is not None
+                and self._vcs_status.root is not None
+            ):
+                if isinstance(model, QSortFilterProxyModel):
+                    path = model.sourceModel().filePath(
+                        model.mapToSource(index)
+                    )
+                else:
+                    path = model.filePath(index)
+
+                status = self._vcs_status.get_status(osp.normpath(path))
+                if status is not None:
+                    option.palette.setColor(
+                        QPalette.Text,
+                        QColor(self.get_vcs_status_color(status))
+                    )
+
 
 # ---- Widgets
 # ----------------------------------------------------------------------------
@@ -402,6 +438,11 @@ def __init__(self, parent=None):
         self.setStyle(self._style)
         self.setItemDelegate(DirViewItemDelegate(self))
 
+        # VCS status of the files shown
+        self.vcs_status = VCSStatusSnapshot(self)
+        self.vcs_status.sig_updated.connect(self.viewport().update)
+        self.itemDelegate().set_vcs_status(self.vcs_status)
+
         # Setup
         self.setup_fs_model()
         self.setSelectionMode(
@@ -1920,6 +1961,7 @@ def set_current_folder(self, folder):
         index = self.fsmodel.setRootPath(folder)
         self.__last_folder = folder
         self.setRootIndex(index)
+        self.vcs_status.set_root_path(folder)
         return index
 
     def get_current_folder(self):
@@ -6,13 +6,14 @@
 
 from __future__ import annotations
 import asyncio
+from collections import OrderedDict
 from enum import Enum
 import fnmatch
 import functools
-import io
 import logging
 import os
 import posixpath
+import time
 from datetime import datetime
 
 from aiohttp.client_exceptions import ClientResponseError
@@ -30,6 +31,7 @@
     QInputDialog,
     QMessageBox,
     QLineEdit,
+    QProgressBar,
     QTreeView,
     QVBoxLayout,
     QWidget,
@@ -62,6 +64,13 @@
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of directory listings kept in memory
+LS_CACHE_SIZE = 100
+
+# Maximum number of seconds a directory listing is reused, because editing a
+# file in place doesn't change the mtime of its directory
+LS_CACHE_MAX_AGE = 30
+
 
 class RemoteViewMenus:
     Context = "remote_context_menu"
@@ -131,6 +140,20 @@ class RemoteExplorer(QWidget, SpyderWidgetMixin):
     sig_start_spinner_requested = Signal()
     sig_stop_spinner_requested = Signal()
 
+    sig_transfer_progress = Signal(str, object, object)
+    """
+    This signal is emitted while a file is downloaded or uploaded.
+
+    Parameters
+    ----------
+    path: str
+        Remote path of the file being transferred.
+    transferred: int
+        Number of bytes transferred so far.
+    total: int
+        Total size of the file in bytes.
+    """
+
     def __init__(self, parent=None, class_parent=None, files=None):
         super().__init__(parent=parent, class_parent=parent)
 
@@ -143,6 +166,12 @@ def __init__(self, parent=None, class_parent=None, files=None):
         self.extra_files = []
         self.more_files_available = False
 
+        # Directory listings per (server_id, path), with the mtime of the
+        # directory and the time when they were obtained.
+        self._ls_cache: OrderedDict[
+            tuple[str, str], tuple[float, float, list[dict]]
+        ] = OrderedDict()
+
         self.filter_on = False
         self.name_filters = []
 
@@ -156,6 +185,10 @@ def __init__(self, parent=None, class_parent=None, files=None):
         self._files_to_rename: dict[str, int] = {}
         self._files_to_upload: dict[str, int] = {}
 
+        # Bytes transferred and total size of the files being downloaded or
+        # uploaded, per remote path
+        self._transfers: dict[str, tuple[int, int]] = {}
+
         # Model, actions and widget setup
         self.context_menu = self.create_menu(RemoteViewMenus.Context)
         new_submenu = self.create_menu(
@@ -307,9 +340,15 @@ def __init__(self, parent=None, class_parent=None, files=None):
         self.view.sortByColumn(0, Qt.AscendingOrder)
         self.view.entered.connect(self._on_entered_item)
 
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+        self.sig_transfer_progress.connect(self._on_transfer_progress)
+
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.view)
+        layout.addWidget(self.progress_bar)
 
     @on_conf_change(
         option=[
@@ -412,6 +451,32 @@ def _operation_in_progress(self):
             or self._files_to_upload.get(self.server_id, 0) > 0
         )
 
+    def _on_transfer_progress(self, path, transferred, total):
+        self._transfers[path] = (transferred, total)
+
+        # Sizes are added up in Python because QProgressBar only takes C ints
+        transferred = sum(t[0] for t in self._transfers.values())
+        total = sum(t[1] for t in self._transfers.values())
+
+        if len(self._transfers) == 1:
+            name = posixpath.basename(path)
+        else:
+            name = _("{} files").format(len(self._transfers))
+
+        self.progress_bar.setFormat(_("Transferring {}: %p%").format(name))
+        self.progress_bar.setValue(
+            int(100 * transferred / total) if total else 100
+        )
+        self.progress_bar.show()
+
+    def _finish_transfer(self):
+        if (
+            self._files_to_download.get(self.server_id, 0) == 0
+            and self._files_to_upload.get(self.server_id, 0) == 0
+        ):
+            self._transfers.clear()
+            self.progress_bar.hide()
+
     def _handle_future_response_error(
         self, response, error_title, error_message
     ):
@@ -467,7 +532,10 @@ async def _do_remote_new_module(self, new_path, file_content):
         async with await self.remote_files_manager.open(
             new_path, mode="w"
         ) as file_manager:
-            return await file_manager.write(file_content)
+            result = await file_manager.write(file_content)
+
+        self._invalidate_ls_cache(new_path)
+        return result
 
     @AsyncDispatcher.QtSlot
     def _on_remote_new(self, future):
@@ -514,7 +582,9 @@ async def _do_remote_paste(self, old_path, new_path):
             self.sig_stop_spinner_requested.emit()
             return
 
-        return await self.remote_files_manager.copy(old_path, new_path)
+        result = await self.remote_files_manager.copy(old_path, new_path)
+        self._invalidate_ls_cache(new_path)
+        return result
 
     @AsyncDispatcher.QtSlot
     def _on_remote_rename(self, future):
@@ -566,14 +636,10 @@ async def _do_remote_delete(self, path, is_file=False):
         return response
 
     @AsyncDispatcher.QtSlot
-    def _on_remote_download_file(
-        self, future, remote_filename, local_directory, is_file
-    ):
-        download_error = False
+    def _on_remote_download_file(self, future, remote_filename, is_file):
         try:
-            data = future.result()
+            future.result()
         except (RemoteFileServicesError, ClientResponseError) as error:
-            download_error = True
             logger.debug(error)
 
             if is_file:
@@ -604,55 +670,42 @@ def _on_remote_download_file(
                         remote_dir, self._get_server_name(), error.message
                     )
 
-        if download_error:
             QMessageBox.critical(self, _("Download error"), message)
-        elif os.path.isdir(local_directory):
-            # Local filename
-            local_filename = os.path.join(local_directory, remote_filename)
-
-            # Write remote contents to local file
-            try:
-                with open(local_filename, "w") as download_file:
-                    download_file.write(data)
-            except TypeError:
-                with open(local_filename, "wb") as download_file:
-                    download_file.write(data)
 
         if self._files_to_download[self.server_id] > 0:
             self._files_to_download[self.server_id] -= 1
 
+        self._finish_transfer()
+
         if not self._operation_in_progress:
             self.sig_stop_spinner_requested.emit()
 
     @AsyncDispatcher(loop="explorer")
-    async def _do_remote_download_directory(self, path):
+    async def _do_remote_download_directory(self, path, local_filename):
         if not self.remote_files_manager:
             self.sig_stop_spinner_requested.emit()
             return
 
-        zip_generator = self.remote_files_manager.zip_directory(path)
-        zip_data = io.BytesIO()
-        async for data in zip_generator:
-            zip_data.write(data)
-        zip_data.seek(0)
-        return zip_data.getbuffer()
+        # Write the zip stream straight to disk to not hold it in memory
+        partial_filename = local_filename + ".part"
+        with open(partial_filename, "wb") as zip_file:
+            async for data in self.remote_files_manager.zip_directory(path):
+                zip_file.write(data)
+        os.replace(partial_filename, local_filename)
 
     @AsyncDispatcher(loop="explorer")
-    async def _do_remote_download_file(self, path):
+    async def _do_remote_download_file(self, path, local_filename):
         if not self.remote_files_manager:
             self.sig_stop_spinner_requested.emit()
             return
 
-        try:
-            async with await self.remote_files_manager.open(
-                path, mode="r"
-            ) as file_manager:
-                return await file_manager.read()
-        except RemoteFileServicesError:
-            async with await self.remote_files_manager.open(
-                path, mode="rb"
-            ) as file_manager:
-                return await file_manager.read()
+        return await self.remote_files_manager.download(
+            path,
+            local_filename,
+            progress_callback=functools.partial(
+                self.sig_transfer_progress.emit, path
+            ),
+        )
 
     @AsyncDispatcher.QtSlot
     def _on_remote_upload_file(self, future):
@@ -665,6 +718,8 @@ def _on_remote_upload_file(self, future):
         if self._files_to_upload[self.server_id] > 0:
             self._files_to_upload[self.server_id] -= 1
 
+        self._finish_transfer()
+
         self.refresh(force_current=True)
 
     @AsyncDispatcher(loop="explorer")
@@ -673,25 +728,22 @@ async def _do_remote_upload_file(self, local_path):
             self.sig_stop_spinner_requested.emit()
             return
 
-        file_content = None
         remote_file = posixpath.join(
             self.root_prefix[self.server_id], os.path.basename(local_path)
         )
 
         try:
-            with open(local_path, mode="r") as local_file:
-                file_content = local_file.read()
-            mode = "w"
-        except UnicodeDecodeError:
-            with open(local_path, mode="rb") as local_file:
-                file_content = local_file.read()
-            mode="wb"
-
-        if file_content:
-            async with await self.remote_files_manager.open(
-                remote_file, mode=mode
-            ) as file_manager:
-                return await file_manager.write(file_content)
+            return await self.remote_files_manager.upload(
+                local_path,
+                remote_file,
+                progress_callback=functools.partial(
+                    self.sig_transfer_progress.emit, remote_file
+                ),
+            )
+        finally:
+            # Uploads can replace files, which doesn't change the mtime of
+            # their directory.
+            self._invalidate_ls_cache(remote_file)
 
     @AsyncDispatcher.QtSlot
     def _on_remote_ls(self, future):
@@ -730,7 +782,7 @@ async def _do_remote_ls(self, path, server_id):
         files = []
         try:
             init_files_display = self.get_conf("init_files_display")
-            generator = self.remote_files_manager.ls(path)
+            generator = await self._cached_ls(path, server_id)
             async for file in generator:
                 file_name = os.path.relpath(
                     file["name"], self.root_prefix[self.server_id]
@@ -768,6 +820,55 @@ async def _do_remote_ls(self, path, server_id):
 
         return files
 
+    async def _cached_ls(self, path, server_id):
+        """
+        Get an async generator over the contents of a remote directory.
+
+        A listing is reused as long as the mtime of the directory (which
+        changes when entries are added, removed or renamed) stays the same,
+        so going back to a directory only needs a single info request.
+        Listings older than LS_CACHE_MAX_AGE seconds are obtained again to
+        show changes to the size and date of files.
+        """
+        key = (server_id, posixpath.normpath(path))
+        mtime = (await self.remote_files_manager.info(path))["mtime"]
+
+        cached = self._ls_cache.get(key)
+        if (
+            cached is not None
+            and cached[0] == mtime
+            and time.monotonic() - cached[1] < LS_CACHE_MAX_AGE
+        ):
+            self._ls_cache.move_to_end(key)
+            return self._iter_entries(cached[2])
+
+        return self._ls_and_cache(key, mtime)
+
+    async def _ls_and_cache(self, key, mtime):
+        start_time = time.monotonic()
+        entries = []
+        async for entry in self.remote_files_manager.ls(key[1]):
+            entries.append(entry)
+            yield entry
+
+        # Only complete listings are cached
+        self._ls_cache[key] = (mtime, start_time, entries)
+        self._ls_cache.move_to_end(key)
+        while len(self._ls_cache) > LS_CACHE_SIZE:
+            self._ls_cache.popitem(last=False)
+
+    @staticmethod
+    async def _iter_entries(entries):
+        for entry in entries:
+            yield entry
+
+    def _invalidate_ls_cache(self, path):
+        """Remove the cached listing of the directory that contains path."""
+        self._ls_cache.pop(
+            (self.server_id, posixpath.normpath(posixpath.dirname(path))),
+            None
+        )
+
     def _on_check_if_remote_files_exist(
         self, future, operation: RemoteExistenceOperations
     ):
@@ -907,18 +1008,20 @@ def remote_package(future):
     @AsyncDispatcher(loop="explorer")
     async def _check_if_remote_files_exist(self, paths: list[str]):
         """Check if remote files exist in the remote cwd."""
-        paths_existence = []
-
-        for path in paths:
-            remote_file = posixpath.join(
+        remote_files = [
+            posixpath.join(
                 self.root_prefix[self.server_id], os.path.basename(path)
             )
+            for path in paths
+        ]
 
-            paths_existence.append(
-                (path, await self.remote_files_manager.exists(remote_file))
-            )
+        # All paths are checked in a single request
+        existence = await self.remote_files_manager.exists_many(remote_files)
 
-        return paths_existence
+        return [
+            (path, {"exists": exists})
+            for path, exists in zip(paths, existence)
+        ]
 
     async def _get_extra_files(self, generator, already_added):
         self.extra_files = []
@@ -1622,12 +1725,11 @@ def download_items(self):
                     if is_file
                     else self._do_remote_download_directory
                 )
-                method(path).connect(
+                method(path, local_filename).connect(
                     AsyncDispatcher.QtSlot(
                         functools.partial(
                             self._on_remote_download_file,
                             remote_filename=remote_filename,
-                            local_directory=directory,
                             is_file=is_file,
                         )
                     )
@@ -1650,41 +1752,17 @@ def upload_files(self):
         self._files_to_upload[self.server_id] += len(local_paths)
         self.sig_start_spinner_requested.emit()
 
-        check_for_files_existence = True
-        if len(local_paths) > 50:
-            answer = QMessageBox.warning(
-                self,
-                _("Existence check"),
-                _(
-                    "You are about to upload more than 50 files to server "
-                    "<b>{}</b>."
-                    "<br><br>"
-                    "Do you prefer to skip checking whether they exist on the "
-                    "server to upload them more quickly?"
-                ).format(self._get_server_name()),
-                QMessageBox.Yes | QMessageBox.No,
-            )
-
-            if answer == QMessageBox.Yes:
-                check_for_files_existence = False
-
-        if check_for_files_existence:
-            # Check if the remote files exist first. If some of them do, then
-            # ask the user if they want to overwrite them with the local files
-            # to be uploaded.
-            self._check_if_remote_files_exist(local_paths).connect(
-                AsyncDispatcher.QtSlot(
-                    functools.partial(
-                        self._on_check_if_remote_files_exist,
-                        operation=RemoteExistenceOperations.Upload,
-                    )
+        # Check if the remote files exist first. If some of them do, then
+        # ask the user if they want to overwrite them with the local files
+        # to be uploaded.
+        self._check_if_remote_files_exist(local_paths).connect(
+            AsyncDispatcher.QtSlot(
+                functools.partial(
+                    self._on_check_if_remote_files_exist,
+                    operation=RemoteExistenceOperations.Upload,
                 )
             )
-        else:
-            for path in local_paths:
-                self._do_remote_upload_file(path).connect(
-                    self._on_remote_upload_file
-                )
+        )
 
     def reset(self, server_id):
         self.root_prefix[server_id] = None
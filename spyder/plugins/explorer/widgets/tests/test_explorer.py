@@ -22,6 +22,8 @@
 # Local imports
 from spyder.plugins.explorer.widgets.main_widget import FileExplorerTest
 from spyder.plugins.projects.widgets.main_widget import ProjectExplorerTest
+from spyder.utils import programs
+from spyder.utils.palette import SpyderPalette
 
 
 HERE = osp.abspath(osp.dirname(__file__))
@@ -402,5 +404,36 @@ def interact():
     assert not idx1.isValid()
 
 
+@pytest.mark.skipif(not programs.find_git(), reason="Git is not installed")
+def test_vcs_status(file_explorer, qtbot, tmp_path):
+    """Test that the VCS status of files is shown and updated."""
+    programs.run_program('git', ['init'], cwd=str(tmp_path)).wait()
+    subdir = tmp_path / 'subdir'
+    subdir.mkdir()
+    (subdir / 'untracked.py').write_text('a = 1\n')
+
+    widget = file_explorer.explorer.treewidget
+    vcs_status = widget.vcs_status
+    widget.chdir(str(tmp_path))
+    qtbot.waitUntil(
+        lambda: vcs_status.get_status(str(subdir)) == '??', timeout=5000)
+    assert vcs_status.get_status(str(tmp_path)) == ' M'
+
+    # Only the status of changed files is updated
+    new_file = tmp_path / 'new.py'
+    new_file.write_text('b = 1\n')
+    vcs_status.file_created(str(new_file), False)
+    qtbot.waitUntil(
+        lambda: vcs_status.get_status(str(new_file)) == '??', timeout=5000)
+    assert vcs_status.get_status(str(subdir)) == '??'
+
+    # Conflicts are shown as errors, even if they contain an A
+    delegate = widget.itemDelegate()
+    for status in ('UU', 'AA', 'AU', 'UA', 'DD'):
+        assert delegate.get_vcs_status_color(status) == (
+            SpyderPalette.COLOR_ERROR_2)
+    assert delegate.get_vcs_status_color('A ') == SpyderPalette.COLOR_SUCCESS_2
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -14,13 +14,26 @@
 import sys
 
 # Third-party imports
-from qtpy.QtCore import QFileInfo, Slot
+from qtpy.QtCore import QFileInfo, QObject, QTimer, Signal, Slot
 from qtpy.QtWidgets import QFileIconProvider, QMessageBox
 
 # Local imports
 from spyder.api.translations import _
 from spyder.utils import encoding
 from spyder.utils.icon_manager import ima
+from spyder.utils.vcs import git_state_cache
+from spyder.utils.workers import WorkerManager
+
+
+# Milliseconds to wait for more changes before updating the VCS status
+VCS_STATUS_UPDATE_DELAY = 500
+
+# Milliseconds between checks for changes in the state of the repository
+VCS_STATUS_CHECK_INTERVAL = 5000
+
+# Maximum number of changed files whose status is updated on their own,
+# instead of computing the status of the whole repository again
+MAX_INCREMENTAL_PATHS = 50
 
 
 def open_file_in_external_explorer(filename):
@@ -112,3 +125,185 @@ def icon(self, icontype_or_qfileinfo):
                 icon = ima.icon('binary')
 
             return icon
+
+
+def get_dirs_status(root, status):
+    """
+    Return the status of the directories of root from the status of its
+    files.
+
+    Directories that contain changed files have the ' M' status, unless they
+    have their own status (e.g. because they are untracked).
+    """
+    dirs_status = {}
+    for path in status:
+        dirname = osp.dirname(path)
+        while dirname not in dirs_status and len(dirname) >= len(root):
+            dirs_status[dirname] = ' M'
+            if dirname == root:
+                break
+            dirname = osp.dirname(dirname)
+    return dirs_status
+
+
+class VCSStatusSnapshot(QObject):
+    """
+    Snapshot of the VCS status of the files of a Git repository.
+
+    The status of the whole repository is computed in a thread with a single
+    'git status' and stored in dictionaries indexed by path, so getting the
+    status of a file doesn't depend on the size of the repository. Changes
+    to a few files only update the status of those files.
+
+    The methods to report changes have the same names as the ones used by
+    the project watcher, so they can be connected with its
+    ``connect_signals`` method.
+    """
+
+    sig_updated = Signal()
+    """This signal is emitted when the status of some files changed."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.root = None
+
+        self._status = {}
+        self._dirs_status = {}
+        self._pending_paths = set()
+        self._full_update_pending = False
+        self._worker = None
+        self._worker_manager = WorkerManager(self, max_threads=1)
+
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(VCS_STATUS_UPDATE_DELAY)
+        self._update_timer.timeout.connect(self._start_update)
+
+        self._check_timer = QTimer(self)
+        self._check_timer.setInterval(VCS_STATUS_CHECK_INTERVAL)
+        self._check_timer.timeout.connect(self._check_repository)
+
+    # ---- Public API
+    # ------------------------------------------------------------------------
+    def get_status(self, path):
+        """
+        Return the two letters status of path or None if it didn't change.
+        """
+        return self._status.get(path) or self._dirs_status.get(path)
+
+    def set_root_path(self, path):
+        """Show the status of the repository that contains path."""
+        root = git_state_cache.get_root(path) if path else None
+        if root == self.root:
+            return
+
+        self.root = root
+        self._status = {}
+        self._dirs_status = {}
+        self._pending_paths = set()
+        self.sig_updated.emit()
+
+        if root is None:
+            self._check_timer.stop()
+            self._update_timer.stop()
+        else:
+            self._check_timer.start()
+            self._schedule_update()
+
+    def update(self, paths=None):
+        """
+        Update the status of paths, or of the whole repository if paths is
+        None.
+        """
+        if self.root is None:
+            return
+
+        if paths is None:
+            self._full_update_pending = True
+        else:
+            self._pending_paths.update(
+                osp.normpath(path) for path in paths
+                if osp.normpath(path).startswith(self.root + os.sep)
+            )
+            if len(self._pending_paths) > MAX_INCREMENTAL_PATHS:
+                self._full_update_pending = True
+
+        if self._full_update_pending or self._pending_paths:
+            self._schedule_update()
+
+    def close(self):
+        """Stop updating the status."""
+        self._check_timer.stop()
+        self._update_timer.stop()
+        self._worker_manager.terminate_all()
+
+    # ---- Project watcher API
+    # ------------------------------------------------------------------------
+    @Slot(str, bool)
+    def file_created(self, path, is_dir):
+        self.update(None if is_dir else [path])
+
+    @Slot(str, str, bool)
+    def file_moved(self, src_path, dest_path, is_dir):
+        self.update(None if is_dir else [src_path, dest_path])
+
+    @Slot(str, bool)
+    def file_deleted(self, path, is_dir):
+        self.update(None if is_dir else [path])
+
+    @Slot(str, bool)
+    def file_modified(self, path, is_dir):
+        self.update(None if is_dir else [path])
+
+    # ---- Private API
+    # ------------------------------------------------------------------------
+    def _schedule_update(self):
+        """Update the status once no more changes arrive for a while."""
+        if self._worker is None:
+            self._update_timer.start()
+
+    def _check_repository(self):
+        """Get the status again if the repository changed."""
+        parent = self.parent()
+        if parent is None or parent.isVisible():
+            self.update()
+
+    def _start_update(self):
+        """Start computing the status in a thread."""
+        if self.root is None or self._worker is not None:
+            return
+
+        # Changes saved in Spyder or done to the refs and index are detected
+        # by the cache, so the status is only computed again when needed.
+        paths = None
+        if not self._full_update_pending:
+            paths = sorted(self._pending_paths)
+        self._pending_paths = set()
+        self._full_update_pending = False
+
+        self._worker = self._worker_manager.create_python_worker(
+            self._compute_status, self.root, paths, self._status
+        )
+        self._worker.sig_finished.connect(self._on_status_computed)
+        self._worker.start()
+
+    def _compute_status(self, root, paths, current_status):
+        """Compute the status of root. This runs in a thread."""
+        if paths is None:
+            status = git_state_cache.get_status(root)
+        else:
+            status = git_state_cache.update_status(root, paths)
+
+        if status is current_status:
+            return None
+        return root, status, get_dirs_status(root, status)
+
+    def _on_status_computed(self, worker, output, error):
+        """Show the status computed in a thread."""
+        self._worker = None
+        if output is not None and output[0] == self.root:
+            __, self._status, self._dirs_status = output
+            self.sig_updated.emit()
+
+        if self._full_update_pending or self._pending_paths:
+            self._schedule_update()
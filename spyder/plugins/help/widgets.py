@@ -8,6 +8,7 @@
 """
 
 # Standard library imports
+import functools
 import os
 import re
 import socket
@@ -21,7 +22,10 @@
                             QMessageBox, QSizePolicy, QStackedWidget,
                             QVBoxLayout, QWidget)
 
+from spyder_kernels.comms.commbase import CommError
+
 # Local imports
+from spyder.api.asyncdispatcher import AsyncDispatcher
 from spyder.api.config.decorators import on_conf_change
 from spyder.api.translations import _
 from spyder.api.widgets.comboboxes import SpyderComboBox
@@ -303,6 +307,7 @@ def __init__(self, name=None, plugin=None, parent=None):
         self._last_editor_doc = None
         self._last_console_cb = None
         self._last_editor_cb = None
+        self._help_request_id = 0
         self.css_path = self.get_conf('css_path', CSS_PATH, 'appearance')
         self.no_docs = _("No documentation available")
         self.docstring = True  # TODO: What is this used for?
@@ -929,7 +934,18 @@ def set_object_text(self, text, force_refresh=False, ignore_unknown=False):
             text = str(self.object_combo.currentText())
             add_to_combo = False
 
-        found = self.show_help(text, ignore_unknown=ignore_unknown)
+        self.show_help(
+            text,
+            ignore_unknown=ignore_unknown,
+            callback=functools.partial(
+                self._on_object_help_shown, text, add_to_combo,
+                ignore_unknown
+            )
+        )
+
+    def _on_object_help_shown(self, text, add_to_combo, ignore_unknown,
+                              found):
+        """Update the object combobox after showing help for text."""
         if ignore_unknown and not found:
             return
 
@@ -1023,7 +1039,7 @@ def render_sphinx_doc(self, help_data, context=None, css_path=CSS_PATH):
                                    dname, css_path=self.css_path)
         self.show_loading_message()
 
-    def show_help(self, obj_text, ignore_unknown=False):
+    def show_help(self, obj_text, ignore_unknown=False, callback=None):
         """
         Show help for an object's name.
 
@@ -1033,6 +1049,14 @@ def show_help(self, obj_text, ignore_unknown=False):
             Object's name.
         ignore_unknown: bool, optional
             Ignore unknown object's name.
+        callback: callable, optional
+            Function called with True if help was found for the object or
+            False otherwise, once it's shown.
+
+        Notes
+        -----
+        Help from a Spyder kernel is requested without blocking the
+        interface, so it's shown after this method returns.
         """
         # TODO: This method makes active use of the shells. It would be better
         # to use signals and pass information this way for better decoupling.
@@ -1041,8 +1065,61 @@ def show_help(self, obj_text, ignore_unknown=False):
             return
 
         obj_text = str(obj_text)
+        self._help_request_id += 1
+
+        if getattr(shell, 'spyder_kernel_ready', False):
+            try:
+                remote_call = shell.call_kernel_future()
+
+                # Both requests are sent before any reply arrives
+                futures = [
+                    remote_call.get_doc(obj_text),
+                    remote_call.get_source(obj_text),
+                ]
+            except CommError:
+                pass
+            else:
+                request_id = self._help_request_id
+
+                @AsyncDispatcher.QtSlot
+                def help_received(future):
+                    # Only show the last requested help, once
+                    if (
+                        request_id != self._help_request_id
+                        or not all(future.done() for future in futures)
+                    ):
+                        return
+                    self._help_request_id += 1
+
+                    doc, source_text = [
+                        None if future.cancelled() or future.exception()
+                        else future.result()
+                        for future in futures
+                    ]
+                    if doc is None and source_text is None:
+                        # Maybe the object can be imported
+                        self._show_shell_help(
+                            None, obj_text, ignore_unknown, callback)
+                    else:
+                        found = self._show_help_data(
+                            doc, source_text, ignore_unknown)
+                        if callback is not None:
+                            callback(found)
+
+                for future in futures:
+                    future.connect(help_received)
+                return
+
+        return self._show_shell_help(shell, obj_text, ignore_unknown, callback)
+
+    def _show_shell_help(self, shell, obj_text, ignore_unknown, callback):
+        """
+        Show help for an object's name got from shell.
 
-        if not shell.is_defined(obj_text):
+        If shell is None or the object is not defined there, the internal
+        shell is used if automatic import is enabled.
+        """
+        if shell is None or not shell.is_defined(obj_text):
             if (self.get_conf('automatic_import')
                     and self.internal_shell.is_defined(obj_text,
                                                        force_import=True)):
@@ -1056,6 +1133,17 @@ def show_help(self, obj_text, ignore_unknown=False):
             doc = shell.get_doc(obj_text)
             source_text = shell.get_source(obj_text)
 
+        found = self._show_help_data(doc, source_text, ignore_unknown)
+        if callback is not None:
+            callback(found)
+        return found
+
+    def _show_help_data(self, doc, source_text, ignore_unknown):
+        """
+        Show the documentation or source code of an object.
+
+        Return True if there was something to show.
+        """
         is_code = False
 
         if self.get_conf('rich_mode'):
@@ -7,14 +7,17 @@
 """
 In addition to the remote_call mechanism implemented in CommBase:
  - Send a message to a debugging kernel
+ - Make remote calls that return a future instead of blocking
 """
 from contextlib import contextmanager
 import logging
 
 from qtpy.QtCore import QEventLoop, QObject, QTimer, Signal
 
-from spyder_kernels.comms.commbase import CommBase, CommsErrorWrapper
+from spyder_kernels.comms.commbase import (
+    CommBase, CommError, CommsErrorWrapper, RemoteCallFactory)
 
+from spyder.api.asyncdispatcher import DispatcherFuture
 from spyder.config.base import (
     get_debug_level, running_under_pytest)
 
@@ -36,6 +39,13 @@ def __init__(self):
         super().__init__()
         self.kernel_client = None
 
+        # Futures of the calls waiting for a reply, by call id, with the
+        # comm they were sent to and the timer of their deadline
+        self._reply_futures = {}
+
+        # Futures of the calls being sent, by call id
+        self._sent_futures = {}
+
         # Register handlers
         self.register_call_handler('_async_error', self._async_error)
         self.register_call_handler('_comm_ready', self._comm_ready)
@@ -90,11 +100,15 @@ def remove(self, comm_id=None, only_closing=False):
             if only_closing and self._comms[comm_id]['status'] != 'closing':
                 continue
             del self._comms[comm_id]
+            self._fail_reply_futures(
+                comm_id, CommError("The comm is not connected."))
 
     def close(self, comm_id=None):
         """Ask kernel to close comm and send confirmation."""
         id_list = self.get_comm_id_list(comm_id)
         for comm_id in id_list:
+            self._fail_reply_futures(
+                comm_id, CommError("The comm is not connected."))
             # Send comm_close directly to avoid really closing the comm
             self._comms[comm_id]['comm']._send_msg(
                 'comm_close', {}, None, None, None)
@@ -126,6 +140,44 @@ def remote_call(self, interrupt=False, blocking=False, callback=None,
             interrupt=interrupt, blocking=blocking, callback=callback,
             comm_id=comm_id, timeout=timeout, display_error=display_error)
 
+    def remote_call_future(self, interrupt=False, comm_id=None, timeout=None,
+                           display_error=False):
+        """
+        Get a handler for remote calls that return a future.
+
+        Calls don't wait for the reply of the kernel, so they don't block
+        the GUI. Instead, they return a DispatcherFuture that gets the
+        return value or the error of the call when the reply arrives.
+        Several calls can be waiting for their reply at the same time.
+
+        Parameters
+        ----------
+        interrupt: bool
+            Interrupt the kernel while running or in Pdb to perform
+            the call.
+        comm_id: str or None
+            Comm to send the call to. If None, it's sent to all comms.
+        timeout: float or None
+            Time in seconds after which the future fails with a TimeoutError
+            if the reply didn't arrive. If None, there's no deadline.
+        display_error: bool
+            If an error occurs, should it be printed to the console.
+
+        Notes
+        -----
+        * Calls must be made from the main thread, but their futures can be
+          waited on from any thread or awaited in an async loop with
+          asyncio.wrap_future.
+        * Cancelling a future discards the reply of its call, but the call
+          still runs in the kernel.
+        """
+        if not self.is_open(comm_id):
+            raise CommError("The comm is not connected.")
+
+        return RemoteCallFactory(
+            self, comm_id, None, interrupt=interrupt, timeout=timeout,
+            display_error=display_error, future=True)
+
     def on_incoming_call(self, call_dict):
         """A call was received"""
         super().on_incoming_call(call_dict)
@@ -139,12 +191,61 @@ def _comm_ready(self):
             self._comms[self.calling_comm_id]['status'] = 'ready'
             self.sig_comm_ready.emit()
 
+    def _register_call(self, call_dict, callback=None):
+        """Create a future for the call if needed."""
+        settings = call_dict['settings']
+        if not settings.get('future', False):
+            return super()._register_call(call_dict, callback)
+
+        # The future gets the reply
+        settings['send_reply'] = True
+        call_id = call_dict['call_id']
+        future = DispatcherFuture()
+        self._sent_futures[call_id] = future
+
+        timer = None
+        if settings.get('timeout') is not None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(
+                lambda: self._resolve_reply_future(
+                    call_id,
+                    error=TimeoutError(
+                        "Timeout while waiting for {}".format(
+                            call_dict['call_name']))
+                )
+            )
+            timer.start(int(settings['timeout'] * 1000))
+
+        self._reply_futures[call_id] = [future, None, timer]
+
+        # Forget about cancelled calls
+        future.add_done_callback(
+            lambda future: self._resolve_reply_future(call_id))
+
     def _send_call(self, call_dict, comm_id, buffers):
         """Send call and interupt the kernel if needed."""
         settings = call_dict['settings']
         blocking = 'blocking' in settings and settings['blocking']
         interrupt = 'interrupt' in settings and settings['interrupt']
-        queue_message = not interrupt and not blocking
+        future = 'future' in settings and settings['future']
+
+        # Calls with a future are sent like blocking ones, so they get a
+        # reply even if the kernel is busy.
+        queue_message = not interrupt and not blocking and not future
+
+        call_id = call_dict['call_id']
+        if future:
+            self._reply_futures[call_id][1] = comm_id
+            try:
+                if not self.kernel_client.is_alive():
+                    raise RuntimeError("Kernel is dead")
+                with self.comm_channel_manager(
+                        comm_id, queue_message=queue_message):
+                    return super()._send_call(call_dict, comm_id, buffers)
+            except Exception as error:
+                self._resolve_reply_future(call_id, error=error)
+                return
 
         if not self.kernel_client.is_alive():
             if blocking:
@@ -166,7 +267,13 @@ def _send_call(self, call_dict, comm_id, buffers):
     def _get_call_return_value(self, call_dict, comm_id):
         """
         Catch exception if call is not blocking.
+
+        Return the future of the call if it has one.
         """
+        future = self._sent_futures.pop(call_dict['call_id'], None)
+        if future is not None:
+            return future
+
         try:
             return super()._get_call_return_value(
                 call_dict, comm_id)
@@ -237,13 +344,57 @@ def _wait(self, condition, signal, timeout_msg, timeout):
         self.kernel_client.hb_channel.kernel_died.disconnect(
             wait_loop.quit)
 
-    def _handle_remote_call_reply(self, *args, **kwargs):
+    def _handle_remote_call_reply(self, msg_dict, buffers):
         """
         A blocking call received a reply.
         """
-        super()._handle_remote_call_reply(*args, **kwargs)
+        content = msg_dict['content']
+        call_id = content['call_id']
+        if call_id in self._reply_futures:
+            return_value = content['call_return_value']
+            if content['is_error']:
+                error_wrapper = CommsErrorWrapper.from_json(return_value)
+                self._resolve_reply_future(
+                    call_id, error=error_wrapper.etype(error_wrapper))
+            elif buffers:
+                self._resolve_reply_future(call_id, result=buffers[0])
+            else:
+                self._resolve_reply_future(call_id, result=return_value)
+            return
+
+        super()._handle_remote_call_reply(msg_dict, buffers)
         self._sig_got_reply.emit()
 
+    def _resolve_reply_future(self, call_id, result=None, error=None):
+        """
+        Set the result or error of the future of a call.
+
+        If the future is already done, e.g. because it was cancelled, the
+        call is just forgotten.
+        """
+        entry = self._reply_futures.pop(call_id, None)
+        if entry is None:
+            return
+        future, __, timer = entry
+
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _fail_reply_futures(self, comm_id, error):
+        """Fail the futures of the calls sent to a comm that is closing."""
+        for call_id, (__, call_comm_id, __) in list(
+                self._reply_futures.items()):
+            if call_comm_id is None or call_comm_id == comm_id:
+                self._resolve_reply_future(call_id, error=error)
+
     def _async_error(self, error_wrapper):
         """
         Handle an error that was raised on the other side and sent back.
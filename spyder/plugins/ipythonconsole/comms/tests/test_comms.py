@@ -112,7 +112,7 @@ class DummyKernelClient():
         shell_channel = 0
         control_channel = 0
 
-        def is_alive():
+        def is_alive(self):
             return True
 
     kernel_comm.kernel_client = DummyKernelClient()
@@ -177,5 +177,89 @@ def handler(a, b):
     assert res == 'ab'
 
 
+@pytest.mark.skipif(os.name == 'nt', reason="Hangs on Windows")
+def test_request_batch(comms):
+    """Test sending several calls in a single message."""
+    kernel_comm, frontend_comm = comms
+
+    sent_calls = []
+    send_call = frontend_comm._send_call
+
+    def count_calls(call_dict, *args, **kwargs):
+        sent_calls.append(call_dict['call_name'])
+        return send_call(call_dict, *args, **kwargs)
+
+    frontend_comm._send_call = count_calls
+    kernel_comm.register_call_handler('add', lambda a, b: a + b)
+    kernel_comm.register_call_handler('upper', lambda a: a.upper())
+
+    res = frontend_comm.remote_call_batch(
+        [('add', ('a',), {'b': 'b'}), ('upper', ('c',), {})],
+        blocking=True
+    )
+    assert res == ['ab', 'C']
+    assert sent_calls == ['_batch_call']
+
+    # If a call fails, the error is raised
+    with pytest.raises(Exception, match="unknown"):
+        frontend_comm.remote_call_batch(
+            [('add', ('a',), {'b': 'b'}), ('unknown', (), {})],
+            blocking=True
+        )
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Hangs on Windows")
+def test_request_future(comms, qtbot):
+    """Test requests that return a future."""
+    kernel_comm, frontend_comm = comms
+
+    def handler(a, b):
+        return a + b
+
+    def error_handler():
+        raise ValueError("error")
+
+    frontend_comm.register_call_handler('test_request', handler)
+    frontend_comm.register_call_handler('test_error', error_handler)
+
+    # Several calls can be waiting for their reply
+    remote_call = kernel_comm.remote_call_future()
+    future_1 = remote_call.test_request('a', b='b')
+    future_2 = remote_call.test_request('c', b='d')
+    assert future_1.result(timeout=1) == 'ab'
+    assert future_2.result(timeout=1) == 'cd'
+
+    # Errors are set in the future
+    future = kernel_comm.remote_call_future().test_error()
+    with pytest.raises(ValueError):
+        future.result(timeout=1)
+    assert not kernel_comm._reply_futures
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Hangs on Windows")
+def test_request_future_timeout(comms, qtbot):
+    """Test that futures fail after their deadline or can be cancelled."""
+    kernel_comm, frontend_comm = comms
+
+    # Send replies later
+    replies = []
+    kernel_comm._register_message_handler(
+        'remote_call_reply', lambda *args: replies.append(args))
+
+    future = kernel_comm.remote_call_future(timeout=0.1).get_value('a')
+    qtbot.waitUntil(future.done)
+    assert isinstance(future.exception(), TimeoutError)
+    assert not kernel_comm._reply_futures
+
+    future = kernel_comm.remote_call_future().get_value('a')
+    assert future.cancel()
+    assert not kernel_comm._reply_futures
+
+    # Late replies are ignored
+    for reply in replies:
+        kernel_comm._handle_remote_call_reply(*reply)
+    assert future.cancelled()
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -145,6 +145,20 @@ def setup_page(self):
                 "down Spyder."
             ),
         )
+        rate_spin = self.create_spinbox(
+            _("Output rate limit:"),
+            _(" lines per second"),
+            'output_rate_limit',
+            min_=0,
+            max_=100_000,
+            step=100,
+            tip=_(
+                "The maximum number of output lines per second that are "
+                "shown in the console.\n"
+                "Lines above it are saved to a file, which can be opened "
+                "from the console. Set it to 0 to show all lines."
+            ),
+        )
         sympy_box = newcb(
             _("Render SymPy symbolic math"),
             "symbolic_math",
@@ -157,6 +171,7 @@ def setup_page(self):
 
         output_layout = QVBoxLayout()
         output_layout.addWidget(self.buffer_spin)
+        output_layout.addWidget(rate_spin)
         output_layout.addWidget(sympy_box)
         output_group.setLayout(output_layout)
 
@@ -216,12 +216,12 @@ def get_plugin(name):
     console.get_widget().matplotlib_status.register_ipythonconsole(console)
 
     # Register handlers to run cells.
-    def get_file_code(fname, save_all=True):
+    def get_file_code(fname, save_all=True, known_hash=None):
         """
         Get code from a file.
 
-        save_all is necessary to keep consistency with the handler registered
-        in the editor.
+        save_all and known_hash are necessary to keep consistency with the
+        handler registered in the editor.
         """
         path = Path(fname)
         return path.read_text()
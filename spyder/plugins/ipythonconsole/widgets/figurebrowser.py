@@ -32,6 +32,20 @@ def set_mute_inline_plotting(self, mute_inline_plotting):
         """Set mute_inline_plotting"""
         self._mute_inline_plotting = mute_inline_plotting
 
+        # Figures can only be sent as binary buffers when they are not shown
+        # in the console, which needs them in display messages.
+        self.set_kernel_configuration(
+            "binary_figures", bool(mute_inline_plotting)
+        )
+
+    def show_inline_figure(self, fig, fmt):
+        """
+        Show a figure sent by the kernel as a binary buffer in the Plots pane.
+        """
+        # Buffers arrive as memoryviews
+        self.sig_new_inline_figure.emit(bytes(fig), fmt)
+        self._show_mute_inline_plotting_message()
+
     # ---- Private API (overrode by us)
     def _handle_display_data(self, msg):
         """
@@ -55,15 +69,19 @@ def _handle_display_data(self, msg):
         if img is not None:
             self.sig_new_inline_figure.emit(img, fmt)
             if self._mute_inline_plotting:
-                if not self.sended_render_message:
-                    self._append_html("<br>", before_prompt=True)
-                    self.append_html_message(
-                        _('Figures are displayed in the Plots pane by '
-                          'default. To make them also appear inline in the '
-                          'console, you need to uncheck "Mute inline '
-                          'plotting" under the options menu of Plots.'),
-                        before_prompt=True
-                    )
-                    self.sended_render_message = True
+                self._show_mute_inline_plotting_message()
                 return
         return super()._handle_display_data(msg)
+
+    def _show_mute_inline_plotting_message(self):
+        """Explain once why figures are not shown in the console."""
+        if not self.sended_render_message:
+            self._append_html("<br>", before_prompt=True)
+            self.append_html_message(
+                _('Figures are displayed in the Plots pane by '
+                  'default. To make them also appear inline in the '
+                  'console, you need to uncheck "Mute inline '
+                  'plotting" under the options menu of Plots.'),
+                before_prompt=True
+            )
+            self.sended_render_message = True
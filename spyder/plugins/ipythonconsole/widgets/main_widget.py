@@ -921,6 +921,14 @@ def change_clients_buffer_size(self, value):
                 client.shellwidget.set_buffer_size,
                 value)
 
+    @on_conf_change(option='output_rate_limit')
+    def change_clients_output_rate_limit(self, value):
+        for idx, client in enumerate(self.clients):
+            self._change_client_conf(
+                client,
+                client.shellwidget.set_output_rate_limit,
+                value)
+
     @on_conf_change(option='completion_type')
     def change_clients_completion_type(self, value):
         for idx, client in enumerate(self.clients):
@@ -58,6 +58,10 @@
     "https://docs.spyder-ide.org/5/faq.html#using-packages-installer"
 )
 
+# Characters per line used to derive the maximum output rate in characters
+# from the one in lines
+OUTPUT_CHARS_PER_LINE = 100
+
 
 class ShellWidget(NamepaceBrowserWidget, HelpWidget, DebuggingWidget,
                   FigureBrowserWidget, SpyderWidgetMixin):
@@ -219,6 +223,7 @@ def __init__(
             'show_pdb_output': self.show_pdb_output,
             'pdb_input': self.pdb_input,
             'update_state': self.update_state,
+            'show_inline_figure': self.show_inline_figure,
         })
         self.kernel_comm_handlers = handlers
 
@@ -408,6 +413,66 @@ def call_kernel(self, interrupt=False, blocking=False, callback=None,
             display_error=display_error
         )
 
+    def call_kernel_batch(self, calls, interrupt=False, blocking=False,
+                          callback=None, timeout=None, display_error=False):
+        """
+        Send several calls to the Spyder kernel in a single message.
+
+        The kernel runs them one after the other and sends back the list of
+        their return values in a single reply.
+
+        Parameters
+        ----------
+        calls: list
+            List of (call_name, args, kwargs) tuples.
+        interrupt: bool
+            Interrupt the kernel while running or in Pdb to perform
+            the calls.
+        blocking: bool
+            Wait on this side until the kernel sends its response.
+        callback: callable
+            Callable to process the list of return values sent from the
+            kernel on the Spyder side.
+        timeout: int or None
+            Maximum time (in seconds) before giving up when making a
+            blocking call to the kernel.
+        display_error: bool
+            If an error occurs, should it be printed to the console.
+        """
+        return self.kernel_handler.kernel_comm.remote_call_batch(
+            calls,
+            interrupt=interrupt,
+            blocking=blocking,
+            callback=callback,
+            timeout=timeout,
+            display_error=display_error
+        )
+
+    def call_kernel_future(self, interrupt=False, timeout=None,
+                           display_error=False):
+        """
+        Send message to Spyder kernel without blocking until it replies.
+
+        Calls return a DispatcherFuture with the response sent from the
+        kernel, so several calls can be sent before getting their responses.
+
+        Parameters
+        ----------
+        interrupt: bool
+            Interrupt the kernel while running or in Pdb to perform
+            the call.
+        timeout: int or None
+            Maximum time (in seconds) before the future fails with a
+            TimeoutError. If None, it waits until the kernel replies or dies.
+        display_error: bool
+            If an error occurs, should it be printed to the console.
+        """
+        return self.kernel_handler.kernel_comm.remote_call_future(
+            interrupt=interrupt,
+            timeout=timeout,
+            display_error=display_error
+        )
+
     @property
     def is_external_kernel(self):
         """Check if this is an external kernel."""
@@ -473,6 +538,9 @@ def send_spyder_kernel_configuration(self):
         # Enable faulthandler
         self.set_kernel_configuration("faulthandler", True)
 
+        # Limit the rate of output sent by the kernel
+        self.set_output_rate_limit(self.get_conf('output_rate_limit'))
+
         # Give a chance to plugins to configure the kernel
         self.sig_config_spyder_kernel.emit()
 
@@ -847,6 +915,21 @@ def set_autocall(self, autocall):
             "autocall", autocall
         )
 
+    def set_output_rate_limit(self, max_lines_rate):
+        """
+        Set the maximum number of output lines per second.
+
+        The maximum number of characters per second is set proportionally,
+        so 0 disables both limits.
+        """
+        self.set_kernel_configuration(
+            "output_limits",
+            {
+                "max_lines_rate": max_lines_rate,
+                "max_bytes_rate": max_lines_rate * OUTPUT_CHARS_PER_LINE,
+            }
+        )
+
     # --- To handle the banner
     def long_banner(self):
         """Banner for clients with additional content."""
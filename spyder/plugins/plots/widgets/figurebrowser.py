@@ -42,6 +42,7 @@
 from spyder.api.translations import _
 from spyder.api.shellconnect.mixins import ShellConnectWidgetForStackMixin
 from spyder.api.widgets.mixins import SpyderWidgetMixin
+from spyder.plugins.plots.widgets.figurestore import FigureStore
 from spyder.utils.misc import getcwd_or_home
 from spyder.utils.palette import SpyderPalette
 from spyder.utils.stylesheet import AppStyle
@@ -50,6 +51,9 @@
 # TODO:
 # - [ ] Generalize style updates, handle dark_interface with widget option
 
+# Maximum width and height of the pixmaps kept in memory for thumbnails
+THUMBNAIL_MAX_SIZE = 400
+
 
 def save_figure_tofile(fig, fmt, fname):
     """Save fig to fname in the format specified by fmt."""
@@ -339,6 +343,11 @@ def showEvent(self, event):
 
         super().showEvent(event)
 
+    def closeEvent(self, event):
+        """Remove the data of figures saved to disk when closing."""
+        self.thumbnails_sb.figure_store.clear()
+        super().closeEvent(event)
+
 
 class FigureViewer(QScrollArea, SpyderWidgetMixin):
     """
@@ -730,6 +739,9 @@ def __init__(
         self._max_plots = max_plots
         self._thumbnails = []
 
+        # Full resolution data of the figures shown by the thumbnails
+        self.figure_store = FigureStore()
+
         self.background_color = background_color
         self.save_dir = getcwd_or_home()
         self.current_thumbnail = None
@@ -1000,7 +1012,9 @@ def add_thumbnail(self, fig, fmt):
             stick_at_end = True
 
         thumbnail = FigureThumbnail(
-            parent=self, background_color=self.background_color
+            parent=self,
+            background_color=self.background_color,
+            figure_store=self.figure_store,
         )
         thumbnail.canvas.load_figure(fig, fmt)
         thumbnail.sig_canvas_clicked.connect(self.set_current_thumbnail)
@@ -1056,8 +1070,10 @@ def remove_all_thumbnails(self):
             thumbnail.setParent(None)
             thumbnail.hide()
             thumbnail.close()
+            thumbnail.canvas.clear_canvas()
 
         self._thumbnails = []
+        self.figure_store.clear()
         self.current_thumbnail = None
         self.figure_viewer.auto_fit_plotting = False
         self.figure_viewer.figcanvas.clear_canvas()
@@ -1093,6 +1109,7 @@ def remove_thumbnail(self, thumbnail):
         self.layout().removeWidget(thumbnail)
         thumbnail.hide()
         thumbnail.close()
+        thumbnail.canvas.clear_canvas()
 
         # See: spyder-ide/spyder#12459
         QTimer.singleShot(
@@ -1115,6 +1132,17 @@ def _free_memory(self):
         """Request to free memory."""
         self.sig_free_memory_requested.emit()
 
+    def get_memory_used(self):
+        """
+        Get the number of bytes used in memory by the figures, including
+        their data and the pixmaps of the thumbnails.
+        """
+        pixmaps_memory = sum(
+            thumbnail.canvas.get_pixmaps_memory()
+            for thumbnail in self._thumbnails
+        )
+        return self.figure_store.memory_used + pixmaps_memory
+
     def set_current_index(self, index):
         """Set the currently selected thumbnail by its index."""
         self.set_current_thumbnail(self._thumbnails[index])
@@ -1246,7 +1274,8 @@ class FigureThumbnail(QWidget):
         The QPoint in global coordinates where the menu was requested.
     """
 
-    def __init__(self, parent=None, background_color=None, auto_fit=True):
+    def __init__(self, parent=None, background_color=None, auto_fit=True,
+                 figure_store=None):
         super().__init__(parent)
 
         self.auto_fit = auto_fit
@@ -1256,7 +1285,8 @@ def __init__(self, parent=None, background_color=None, auto_fit=True):
 
         self.canvas = FigureCanvas(
             parent=self,
-            background_color=background_color
+            background_color=background_color,
+            figure_store=figure_store,
         )
         self.canvas.sig_context_menu_requested.connect(
             self.sig_context_menu_requested)
@@ -1336,6 +1366,10 @@ def mouseMoveEvent(self, event):
 class FigureCanvas(QFrame, SpyderConfigurationAccessor):
     """
     A basic widget on which can be painted a custom png, jpg, or svg image.
+
+    If a figure store is given, the data of the figure is saved there and
+    only a scaled down pixmap of it is kept by the canvas. That's what
+    thumbnails use to not keep all figures at full resolution in memory.
     """
 
     sig_context_menu_requested = Signal(QPoint)
@@ -1348,7 +1382,7 @@ class FigureCanvas(QFrame, SpyderConfigurationAccessor):
         The QPoint in global coordinates where the menu was requested.
     """
 
-    def __init__(self, parent=None, background_color=None):
+    def __init__(self, parent=None, background_color=None, figure_store=None):
         super().__init__(parent)
         self.setLineWidth(2)
         self.setMidLineWidth(1)
@@ -1356,15 +1390,30 @@ def __init__(self, parent=None, background_color=None):
         self.setStyleSheet(
             "#figcanvas {background-color:" + str(background_color) + "}")
 
-        self.fig = None
         self.fmt = None
         self.fwidth, self.fheight = 200, 200
         self._blink_flag = False
 
+        self._fig = None
+        self._figure_store = figure_store
+        self._figure_key = None
+        self._qpix_orig = None
+        self._qpix_scaled = None
+
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(
             self.sig_context_menu_requested)
 
+    @property
+    def fig(self):
+        """
+        Data of the figure, which is read from the figure store if the canvas
+        uses one.
+        """
+        if self._figure_key is not None:
+            return self._figure_store.get(self._figure_key)
+        return self._fig
+
     @Slot()
     def copy_figure(self):
         """Copy figure to clipboard."""
@@ -1381,7 +1430,7 @@ def copy_figure(self):
 
     def blink_figure(self):
         """Blink figure once."""
-        if self.fig:
+        if self.fmt is not None:
             self._blink_flag = not self._blink_flag
             self.repaint()
             if self._blink_flag:
@@ -1390,8 +1439,9 @@ def blink_figure(self):
 
     def clear_canvas(self):
         """Clear the figure that was painted on the widget."""
-        self.fig = None
+        self._release_figure()
         self.fmt = None
+        self._qpix_orig = None
         self._qpix_scaled = None
         self.repaint()
 
@@ -1400,18 +1450,51 @@ def load_figure(self, fig, fmt):
         Load the figure from a png, jpg, or svg image, convert it in
         a QPixmap, and force a repaint of the widget.
         """
-        self.fig = fig
+        self._release_figure()
         self.fmt = fmt
 
         if fmt in ['image/png', 'image/jpeg']:
-            self._qpix_orig = QPixmap()
-            self._qpix_orig.loadFromData(fig, fmt.upper())
+            qpixmap = QPixmap()
+            qpixmap.loadFromData(fig, fmt.upper())
         elif fmt == 'image/svg+xml':
-            self._qpix_orig = QPixmap(svg_to_image(fig))
+            qpixmap = QPixmap(svg_to_image(fig))
+
+        self.fwidth = qpixmap.width()
+        self.fheight = qpixmap.height()
+
+        if self._figure_store is None:
+            self._fig = fig
+        else:
+            self._figure_key = self._figure_store.add(fig)
+            if max(self.fwidth, self.fheight) > THUMBNAIL_MAX_SIZE:
+                qpixmap = qpixmap.scaled(
+                    THUMBNAIL_MAX_SIZE,
+                    THUMBNAIL_MAX_SIZE,
+                    Qt.KeepAspectRatio,
+                    Qt.SmoothTransformation
+                )
+
+        self._qpix_orig = qpixmap
+        self._qpix_scaled = qpixmap
 
-        self._qpix_scaled = self._qpix_orig
-        self.fwidth = self._qpix_orig.width()
-        self.fheight = self._qpix_orig.height()
+    def get_pixmaps_memory(self):
+        """Get the number of bytes used by the pixmaps of the figure."""
+        pixmaps = [self._qpix_orig]
+        if self._qpix_scaled is not self._qpix_orig:
+            pixmaps.append(self._qpix_scaled)
+
+        return sum(
+            qpixmap.width() * qpixmap.height() * qpixmap.depth() // 8
+            for qpixmap in pixmaps
+            if qpixmap is not None
+        )
+
+    def _release_figure(self):
+        """Remove the data of the current figure, including from the store."""
+        if self._figure_key is not None:
+            self._figure_store.remove(self._figure_key)
+            self._figure_key = None
+        self._fig = None
 
     def paintEvent(self, event):
         """Qt method override to paint a custom image on the Widget."""
@@ -1432,13 +1515,18 @@ def paintEvent(self, event):
                      self.size().width() - 2 * fw,
                      self.size().height() - 2 * fw)
 
-        if self.fig is None or self._blink_flag:
+        if self.fmt is None or self._blink_flag:
             return
 
         # Prepare the scaled qpixmap to paint on the widget.
+        # Figures in a store are always painted from their scaled down pixmap
+        # to not read their data again.
         if (self._qpix_scaled is None or
                 self._qpix_scaled.size().width() != rect.width()):
-            if self.fmt in ['image/png', 'image/jpeg']:
+            if (
+                self.fmt in ['image/png', 'image/jpeg']
+                or self._figure_store is not None
+            ):
                 if scale_factor == 1:
                     target_width = rect.width()
                 else:
@@ -1449,7 +1537,7 @@ def paintEvent(self, event):
                 )
             elif self.fmt == 'image/svg+xml':
                 self._qpix_scaled = QPixmap(svg_to_image(
-                    self.fig, rect.size()))
+                    self._fig, rect.size()))
 
         if self._qpix_scaled is not None:
             # Paint the image on the widget.
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Store for the full resolution data of the figures shown in the Plots pane.
+"""
+
+# Standard library imports
+from collections import OrderedDict
+import itertools
+import logging
+import os
+import os.path as osp
+import shutil
+import tempfile
+
+# Local imports
+from spyder.utils.programs import get_temp_dir
+
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of bytes of figure data kept in memory by each store
+DEFAULT_MEMORY_BUDGET = 50_000_000
+
+
+def get_figure_size(fig):
+    """Get the number of bytes used by the data of a figure."""
+    if isinstance(fig, str):
+        return len(fig.encode('utf-8'))
+    return len(fig)
+
+
+class FigureStore:
+    """
+    Store for the data of figures, which are identified by a key.
+
+    The most recently used figures are kept in memory up to a byte budget.
+    Older ones are saved to a temporary directory and read back when they
+    are requested again.
+
+    Parameters
+    ----------
+    memory_budget: int
+        Maximum number of bytes of figure data kept in memory.
+    """
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+
+        # Figures in memory, from the least to the most recently used one
+        self._cache = OrderedDict()
+        self._memory_used = 0
+
+        # Figures saved to disk, with their file names
+        self._spilled = {}
+        self._spill_dir = None
+
+        self._keys = itertools.count()
+
+    def __contains__(self, key):
+        return key in self._cache or key in self._spilled
+
+    def __len__(self):
+        return len(self._cache.keys() | self._spilled.keys())
+
+    # ---- Public API
+    # -------------------------------------------------------------------------
+    @property
+    def memory_used(self):
+        """Number of bytes of figure data kept in memory."""
+        return self._memory_used
+
+    def add(self, fig):
+        """Add the data of a figure to the store and return its key."""
+        key = next(self._keys)
+        self._cache[key] = fig
+        self._memory_used += get_figure_size(fig)
+        self._enforce_budget()
+        return key
+
+    def get(self, key):
+        """
+        Get the data of a figure, reading it from disk if necessary.
+
+        Return None if the key is not in the store.
+        """
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        if key not in self._spilled:
+            return None
+
+        fig = self._load(key)
+        if fig is not None:
+            self._cache[key] = fig
+            self._memory_used += get_figure_size(fig)
+            self._enforce_budget()
+        return fig
+
+    def remove(self, key):
+        """Remove a figure from the store."""
+        if key in self._cache:
+            fig = self._cache.pop(key)
+            self._memory_used -= get_figure_size(fig)
+
+        filename = self._spilled.pop(key, None)
+        if filename is not None:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove all figures from the store and its temporary directory."""
+        self._cache.clear()
+        self._memory_used = 0
+        self._spilled.clear()
+
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _enforce_budget(self):
+        """
+        Save the least recently used figures to disk until the data in
+        memory fits the budget.
+
+        The most recently used figure is always kept in memory.
+        """
+        while self._memory_used > self.memory_budget and len(self._cache) > 1:
+            key, fig = next(iter(self._cache.items()))
+            if key not in self._spilled and not self._spill(key, fig):
+                # Keep figures in memory rather than losing them
+                break
+
+            del self._cache[key]
+            self._memory_used -= get_figure_size(fig)
+
+    def _spill(self, key, fig):
+        """Save the data of a figure to disk and return if it was saved."""
+        if self._spill_dir is None:
+            try:
+                self._spill_dir = tempfile.mkdtemp(
+                    prefix='plots-', dir=get_temp_dir()
+                )
+            except OSError:
+                logger.debug("Could not create directory to save figures")
+                return False
+
+        is_text = isinstance(fig, str)
+        filename = osp.join(
+            self._spill_dir, '{}.{}'.format(key, 'svg' if is_text else 'bin')
+        )
+        try:
+            if is_text:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(fig)
+            else:
+                with open(filename, 'wb') as f:
+                    f.write(fig)
+        except OSError:
+            logger.debug("Could not save figure %s to disk", key)
+            return False
+
+        self._spilled[key] = filename
+        return True
+
+    def _load(self, key):
+        """Read the data of a figure from disk."""
+        filename = self._spilled[key]
+        try:
+            if filename.endswith('.svg'):
+                with open(filename, 'r', encoding='utf-8') as f:
+                    return f.read()
+            else:
+                with open(filename, 'rb') as f:
+                    return f.read()
+        except OSError:
+            logger.debug("Could not read figure %s from disk", key)
+            return None
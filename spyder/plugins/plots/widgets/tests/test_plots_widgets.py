@@ -24,8 +24,8 @@
 from qtpy.QtCore import Qt
 
 # Local imports
-from spyder.plugins.plots.widgets.figurebrowser import (FigureBrowser,
-                                                        FigureThumbnail)
+from spyder.plugins.plots.widgets.figurebrowser import (
+    FigureBrowser, FigureThumbnail, THUMBNAIL_MAX_SIZE)
 from spyder.plugins.plots.widgets.figurebrowser import get_unique_figname
 
 
@@ -501,5 +501,48 @@ def test_autofit_figure_viewer(figbrowser, tmpdir, fmt):
             round(figcanvas.width() / fwidth * 100))
 
 
+@pytest.mark.parametrize("fmt", ['image/png', 'image/svg+xml'])
+def test_figure_store_memory_budget(figbrowser, tmpdir, fmt):
+    """
+    Test that only the data of the most recent figures is kept in memory and
+    that the rest is read back from disk when needed.
+    """
+    thumbnails_sb = figbrowser.thumbnails_sb
+    figure_store = thumbnails_sb.figure_store
+    figure_store.memory_budget = 1
+
+    figs = add_figures_to_browser(figbrowser, 3, tmpdir, fmt)
+
+    # Only the last figure is kept in memory and thumbnails keep scaled
+    # down pixmaps.
+    assert figure_store.memory_used == len(figs[-1])
+    assert len(figure_store) == 3
+    assert thumbnails_sb.get_memory_used() < sum(len(fig) for fig in figs) + (
+        3 * THUMBNAIL_MAX_SIZE ** 2 * 4
+    )
+    for thumbnail in thumbnails_sb._thumbnails:
+        assert thumbnail.canvas._qpix_orig.width() <= THUMBNAIL_MAX_SIZE
+        assert thumbnail.canvas._qpix_orig.height() <= THUMBNAIL_MAX_SIZE
+
+    # Selecting a figure reads its data from disk
+    thumbnails_sb.set_current_index(0)
+    assert figbrowser.figviewer.figcanvas.fig == figs[0]
+    assert figure_store.memory_used == len(figs[0])
+
+    # Saving figures reads their data too
+    fignames = thumbnails_sb.save_all_figures_todir(str(tmpdir))
+    for figname, fig in zip(fignames, figs):
+        with open(figname, 'rb') as f:
+            assert f.read() == fig
+
+    # Closing figures removes their data from the store
+    figbrowser.close_figure()
+    assert len(figure_store) == 2
+    figbrowser.close_all_figures()
+    assert len(figure_store) == 0
+    assert figure_store.memory_used == 0
+    assert figure_store._spill_dir is None
+
+
 if __name__ == "__main__":
     pytest.main()
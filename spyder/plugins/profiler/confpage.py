@@ -32,8 +32,55 @@ def setup_page(self):
             step=1
         )
 
+        sampling_cb = self.create_checkbox(
+            _("Use a sampling profiler"),
+            "sampling",
+            tip=_(
+                "Instead of recording every function call, sample the code "
+                "that is running at regular intervals. This has a much lower "
+                "overhead, which is useful to profile long running code, but "
+                "call counts are replaced by the number of samples."
+            ),
+        )
+        sampling_spin = self.create_spinbox(
+            _("Sampling interval:"),
+            _("ms"),
+            'sampling_interval',
+            min_=1,
+            max_=1000,
+            step=1
+        )
+        sampling_cb.checkbox.toggled.connect(sampling_spin.setEnabled)
+        sampling_spin.setEnabled(self.get_option('sampling'))
+
+        line_profiling_cb = self.create_checkbox(
+            _("Profile lines when profiling files or cells"),
+            "line_profiling",
+            tip=_(
+                "Measure the number of hits and time of each line of the "
+                "file or cell being profiled, and show them next to the line "
+                "numbers of the editor. Code from other modules is not "
+                "measured."
+            ),
+        )
+
+        memory_profiling_cb = self.create_checkbox(
+            _("Profile memory allocations instead of time"),
+            "memory_profiling",
+            tip=_(
+                "Show where the memory that is still in use after running "
+                "the code was allocated, grouped by the lines in the "
+                "traceback of each allocation. This uses tracemalloc, which "
+                "makes the code run slower and use more memory."
+            ),
+        )
+
         vlayout = QVBoxLayout()
         vlayout.addWidget(switch_to_plugin_cb)
         vlayout.addWidget(slow_spin)
+        vlayout.addWidget(sampling_cb)
+        vlayout.addWidget(sampling_spin)
+        vlayout.addWidget(line_profiling_cb)
+        vlayout.addWidget(memory_profiling_cb)
         vlayout.addStretch(1)
         self.setLayout(vlayout)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+"""
+This module contains the LineProfilerPanel panel
+"""
+
+# Third party imports
+from qtpy.QtCore import QRect, QSize, Qt
+from qtpy.QtGui import QColor, QPainter
+
+# Local imports
+from spyder.api.config.decorators import on_conf_change
+from spyder.api.config.mixins import SpyderConfigurationObserver
+from spyder.api.translations import _
+from spyder.plugins.editor.api.panel import Panel
+from spyder.plugins.editor.utils.editor import BlockUserData
+from spyder.plugins.profiler.widgets.profiler_data_tree import (
+    ProfilerTreeItem
+)
+from spyder.utils.palette import SpyderPalette
+
+
+class LineProfilerPanel(Panel, SpyderConfigurationObserver):
+    """
+    Panel to show the hits and time of each line measured by the profiler.
+
+    Results are saved in the user data of each block, so they follow the
+    lines when the file is edited.
+    """
+
+    CONF_SECTION = 'profiler'
+
+    # Text used to compute the panel width
+    WIDTH_TEXT = "999.99 ms"
+
+    def __init__(self):
+        """Initialize panel."""
+        Panel.__init__(self)
+        SpyderConfigurationObserver.__init__(self)
+
+        self.setMouseTracking(True)
+        self.scrollable = True
+
+        self._blocks = []
+        self._max_time = 0.
+
+    # ---- Public API
+    # -------------------------------------------------------------------------
+    def set_line_stats(self, line_stats):
+        """
+        Set the results of line profiling.
+
+        Parameters
+        ----------
+        line_stats: dict
+            Number of hits and time, in seconds, by line number.
+        """
+        self.clear(hide=False)
+
+        document = self.editor.document()
+        for line_number, (hits, time) in line_stats.items():
+            block = document.findBlockByNumber(line_number - 1)
+            if not block.isValid():
+                continue
+
+            data = block.userData()
+            if not data:
+                data = BlockUserData(self.editor)
+            data.line_profile = (hits, time)
+            block.setUserData(data)
+            self._blocks.append(block)
+
+            self._max_time = max(self._max_time, time)
+
+        self.setVisible(bool(self._blocks))
+        self.update()
+
+    def clear(self, hide=True):
+        """Remove the results of line profiling."""
+        for block in self._blocks:
+            data = block.userData()
+            if block.isValid() and data:
+                data.line_profile = None
+        self._blocks = []
+        self._max_time = 0.
+
+        if hide:
+            self.setVisible(False)
+
+    # ---- Qt methods
+    # -------------------------------------------------------------------------
+    def sizeHint(self):
+        """Override Qt method."""
+        width = self.fontMetrics().width(self.WIDTH_TEXT) + 6
+        return QSize(width, 0)
+
+    def paintEvent(self, event):
+        """Override Qt method.
+
+        Paint the time of each line over a color that shows how slow it is.
+        """
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.editor.sideareas_color)
+        painter.setPen(QColor(SpyderPalette.COLOR_TEXT_1))
+        self.paint_cell(painter)
+
+        font_height = self.editor.fontMetrics().height()
+        for top, __, block in self.editor.visible_blocks:
+            data = block.userData()
+            if not data or data.line_profile is None:
+                continue
+
+            __, time = data.line_profile
+            rect = QRect(0, top, self.width(), font_height)
+            painter.fillRect(rect, self._heat_color(time))
+
+            if time > 1e-9:
+                painter.drawText(
+                    rect.adjusted(0, 0, -3, 0),
+                    Qt.AlignRight | Qt.AlignVCenter,
+                    ProfilerTreeItem.format_measure(time)
+                )
+
+    def mouseMoveEvent(self, event):
+        """Override Qt method.
+
+        Show the results of the line under the mouse.
+        """
+        line_number = self.editor.get_linenumber_from_mouse_event(event)
+        block = self.editor.document().findBlockByNumber(line_number - 1)
+        data = block.userData()
+
+        if data and data.line_profile is not None:
+            hits, time = data.line_profile
+            text = _("Hits: {}").format(hits)
+            if time > 1e-9:
+                # Lines include the time of the functions they call, so times
+                # are compared to the slowest line instead of their sum.
+                text += "<br>" + _("Time: {} ({:.1f}% of slowest line)")
+                text = text.format(
+                    ProfilerTreeItem.format_measure(time),
+                    100 * time / self._max_time
+                )
+                text += "<br>" + _("Time per hit: {}").format(
+                    ProfilerTreeItem.format_measure(time / max(hits, 1))
+                )
+
+            self.editor.show_tooltip(
+                title=_("Line profiler"),
+                text=text,
+                at_line=line_number,
+            )
+        else:
+            self.editor.hide_tooltip()
+
+    def leaveEvent(self, event):
+        """Override Qt method."""
+        self.editor.hide_tooltip()
+
+    def wheelEvent(self, event):
+        """Override Qt method.
+
+        Needed for scroll down the editor when scrolling over the panel.
+        """
+        self.editor.wheelEvent(event)
+
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _heat_color(self, time):
+        """Get a color from yellow to red for the given time."""
+        fraction = time / self._max_time if self._max_time else 0
+        return QColor.fromHsv(
+            int(60 * (1 - fraction)), 200, 230, int(40 + 160 * fraction)
+        )
+
+    @on_conf_change(option='line_profiling')
+    def on_line_profiling_update(self, value):
+        if not value:
+            self.clear()
@@ -22,6 +22,9 @@
 from spyder.api.translations import _
 from spyder.plugins.mainmenu.api import ApplicationMenus, RunMenuSections
 from spyder.plugins.profiler.confpage import ProfilerConfigPage
+from spyder.plugins.profiler.panels.lineprofilerpanel import (
+    LineProfilerPanel
+)
 from spyder.plugins.profiler.widgets.main_widget import ProfilerWidget
 from spyder.plugins.toolbar.api import ApplicationToolbars
 from spyder.plugins.ipythonconsole.api import IPythonConsolePyConfiguration
@@ -213,6 +216,7 @@ def on_editor_available(self):
         )
 
         widget.sig_edit_goto_requested.connect(editor.load)
+        widget.sig_show_line_profile.connect(self._show_line_profile)
 
     @on_plugin_teardown(plugin=Plugins.Editor)
     def on_editor_teardown(self):
@@ -224,6 +228,7 @@ def on_editor_teardown(self):
         )
 
         widget.sig_edit_goto_requested.disconnect(editor.load)
+        widget.sig_show_line_profile.disconnect(self._show_line_profile)
 
     @on_plugin_available(plugin=Plugins.Preferences)
     def on_preferences_available(self):
@@ -258,7 +263,10 @@ def profile_file(
 
         exec_params = conf['params']
         params: IPythonConsolePyConfiguration = exec_params['executor_params']
-        params["run_method"] = "profilefile"
+        params["run_method"] = (
+            "memprofilefile" if self.get_conf("memory_profiling")
+            else "profilefile"
+        )
 
         return console.exec_files(input, conf)
 
@@ -279,12 +287,15 @@ def profile_cell(
                 # Empty cell
                 return
 
-            console.run_selection("%%profile\n" + code)
+            console.run_selection(self._get_profile_magic() + code)
             return
 
         exec_params = conf['params']
         params: IPythonConsolePyConfiguration = exec_params['executor_params']
-        params["run_method"] = "profilecell"
+        params["run_method"] = (
+            "memprofilecell" if self.get_conf("memory_profiling")
+            else "profilecell"
+        )
 
         return console.exec_cell(input, conf)
 
@@ -305,6 +316,31 @@ def profile_selection(
             # No selection
             return
 
-        run_input['selection'] = "%%profile\n" + code
+        run_input['selection'] = self._get_profile_magic() + code
 
         return console.exec_selection(input, conf)
+
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _get_profile_magic(self):
+        """Get the cell magic used to profile code."""
+        if self.get_conf("memory_profiling"):
+            return "%%memprofile\n"
+        return "%%profile\n"
+
+    def _show_line_profile(self, filename, line_stats):
+        """Show line profiling results in the editor of filename."""
+        editor = self.get_plugin(Plugins.Editor)
+        codeeditor = editor.get_codeeditor_for_filename(filename)
+        if codeeditor is None:
+            return
+
+        try:
+            panel = codeeditor.panels.get(LineProfilerPanel)
+        except KeyError:
+            panel = codeeditor.panels.register(LineProfilerPanel())
+
+            # Show it to the left of line numbers
+            panel.order_in_zone = 3
+
+        panel.set_line_stats(line_stats)
@@ -11,9 +11,18 @@
 
 # Third party imports
 import pytest
+from qtpy.QtGui import QFont
 
 # Local imports
-from spyder.plugins.profiler.widgets.profiler_data_tree import TreeWidgetItem
+from spyder.plugins.editor.widgets.codeeditor import CodeEditor
+from spyder.plugins.profiler.panels.lineprofilerpanel import (
+    LineProfilerPanel
+)
+from spyder.plugins.profiler.widgets.flame_graph import FlameGraph
+from spyder.plugins.profiler.widgets.profiler_data_tree import (
+    ProfilerStats,
+    ProfilerTreeItem,
+)
 from spyder.utils.palette import SpyderPalette
 
 
@@ -25,7 +34,7 @@
 # -----------------------------------------------------------------------------
 def test_format_measure():
     """ Test ProfilerDataTree.format_measure()."""
-    fm = TreeWidgetItem.format_measure
+    fm = ProfilerTreeItem.format_measure
     assert fm(125) == '125'
     assert fm(1.25e-8) == '12.50 ns'
     assert fm(1.25e-5) == u'12.50 \u03BCs'
@@ -43,9 +52,22 @@ def test_format_measure():
     assert fm(-12555.5) == '3h:29min'
 
 
+def test_format_size():
+    """ Test ProfilerTreeItem.format_size()."""
+    fs = ProfilerTreeItem.format_size
+    assert fs(125) == '125 B'
+    assert fs(125.) == '125 B'
+    assert fs(2048) == '2.00 KiB'
+    assert fs(-2.5 * 1024 ** 2) == '2.50 MiB'
+    assert fs(3 * 1024 ** 4) == '3072.00 GiB'
+
+    cs = ProfilerTreeItem.color_diff
+    assert cs(2048, fs) == ('+2.00 KiB', ERROR)
+
+
 def test_color_string():
     """ Test ProfilerDataTree.color_diff()."""
-    cs = TreeWidgetItem.color_diff
+    cs = ProfilerTreeItem.color_diff
     assert cs(0.) == ('', 'black')
     assert cs(1.) == ('+1000.00 ms', ERROR)
     assert cs(-1.) == ('-1000.00 ms', SUCESS)
@@ -54,5 +76,138 @@ def test_color_string():
     assert cs(-1) == ('-1', SUCESS)
 
 
+def test_profiler_stats():
+    """Test the columnar representation of the profiler data."""
+    main = ("file.py", 1, "main")
+    foo = ("file.py", 5, "foo")
+    bar = ("file.py", 10, "bar")
+    stats = ProfilerStats({
+        main: (1, 1, 1.0, 10.0, {}),
+        foo: (2, 2, 2.0, 6.0, {main: (2, 2, 2.0, 6.0)}),
+        bar: (
+            3, 4, 4.0, 7.0,
+            {main: (1, 1, 1.0, 3.0), foo: (2, 2, 3.0, 4.0),
+             bar: (1, 1, 0.0, 1.0)}
+        ),
+    })
+
+    assert len(stats) == 3
+    assert stats.get_values(foo) == (2, 2.0, 6.0)
+    assert stats.get_values(("file.py", 20, "baz")) == (0, 0, 0)
+    assert list(stats.sorted_by_total_time()) == [main, bar, foo]
+    assert stats.find("ba") == [bar]
+
+    # Callers and callees are found from the index arrays
+    assert stats.callers(main) == []
+    assert stats.callers(bar) == [main, foo, bar]
+    assert stats.callees(main) == [foo, bar]
+    assert stats.callees(foo) == [bar]
+    assert stats.callees(bar) == [bar]
+    assert stats.callees(("file.py", 20, "baz")) == []
+
+
+def test_flame_graph():
+    """Test building a FlameGraph from pstats data."""
+    main = ("file.py", 1, "main")
+    foo = ("file.py", 5, "foo")
+    bar = ("file.py", 10, "bar")
+    stats = {
+        main: (1, 1, 1.0, 10.0, {}),
+        foo: (2, 2, 2.0, 6.0, {main: (2, 2, 2.0, 6.0)}),
+        bar: (
+            3, 4, 4.0, 7.0,
+            {main: (1, 1, 1.0, 3.0), foo: (2, 2, 3.0, 4.0),
+             bar: (1, 1, 0.0, 1.0)}
+        ),
+    }
+    graph = FlameGraph(stats)
+
+    assert graph.total == 10.0
+    assert graph.depth == 3
+    assert [node.key for node in graph.levels[0]] == [main]
+
+    # Callees are sorted by time and recursive calls are skipped
+    foo_node, bar_node = graph.levels[1]
+    assert (foo_node.key, bar_node.key) == (foo, bar)
+    assert bar_node.children == []
+    assert foo_node.value == 6.0
+    assert foo_node.x == 0
+    assert bar_node.x == pytest.approx(0.6)
+
+    # The time of bar called from foo is scaled to the time of foo
+    assert graph.levels[2][0].value == pytest.approx(6.0 * 4.0 / 6.0)
+    assert foo_node.self_value == pytest.approx(2.0)
+
+    # Find nodes by position
+    assert graph.node_at(2, 0.7) is bar_node
+    assert graph.node_at(3, 0.7) is None
+    assert graph.node_at(4, 0.1) is None
+
+
+def test_flame_graph_stacks():
+    """Test building a FlameGraph from the stacks of a sampled profile."""
+    main = ("file.py", 1, "main")
+    foo = ("file.py", 5, "foo")
+    bar = ("file.py", 10, "bar")
+    stacks = {
+        (bar, foo, main): (3, 3.0),
+        (foo, main): (1, 1.0),
+        (bar, main): (4, 4.0),
+        (bar, bar, main): (1, 1.0),
+        (main,): (1, 1.0),
+    }
+
+    # Stats that would give other paths if the stacks were reconstructed
+    stats = {main: (1, 1, 1.0, 10.0, {})}
+    graph = FlameGraph(stats, stacks)
+
+    assert graph.total == 10.0
+    assert graph.depth == 3
+    assert [node.key for node in graph.levels[0]] == [main]
+    assert graph.levels[0][0].self_value == pytest.approx(1.0)
+
+    # Children are sorted by value and recursive calls are kept
+    bar_node, foo_node = graph.levels[1]
+    assert (bar_node.key, foo_node.key) == (bar, foo)
+    assert (bar_node.value, foo_node.value) == (5.0, 4.0)
+    assert [node.key for node in bar_node.children] == [bar]
+    assert [node.value for node in foo_node.children] == [3.0]
+    assert foo_node.x == pytest.approx(0.5)
+
+
+def test_line_profiler_panel(qtbot):
+    """Test that line profiling results follow the lines when editing."""
+    editor = CodeEditor(None)
+    editor.setup_editor(
+        linenumbers=True, font=QFont("Courier New", 10), language='Python'
+    )
+    editor.set_text("a = 1\nb = 2\nc = a + b\n")
+    editor.resize(640, 480)
+    editor.show()
+    qtbot.addWidget(editor)
+
+    panel = editor.panels.register(LineProfilerPanel())
+    assert not panel.isVisible()
+
+    panel.set_line_stats({1: (1, 0.5), 3: (2, 1.0), 10: (1, 1.0)})
+    assert panel.isVisible()
+    assert panel.width() > 0
+
+    # Add a line after the first one
+    editor.go_to_line(1)
+    editor.moveCursor(editor.textCursor().EndOfBlock)
+    editor.insert_text("\nb = 0")
+    results = {
+        block.blockNumber() + 1: block.userData().line_profile
+        for block in panel._blocks
+    }
+    assert results == {1: (1, 0.5), 4: (2, 1.0)}
+
+    panel.clear()
+    assert not panel.isVisible()
+    assert all(data.line_profile is None
+               for data in editor.blockuserdata_list())
+
+
 if __name__ == "__main__":
     pytest.main()
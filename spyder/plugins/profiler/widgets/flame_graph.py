@@ -0,0 +1,587 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Flame graph and icicle views of profiler results.
+
+Call stacks are aggregated in a prefix tree whose layout is computed once,
+so painting only needs to walk the nodes that are visible and wide enough to
+be seen at the current zoom level.
+"""
+
+# Standard library imports
+import bisect
+import os.path as osp
+import zlib
+
+# Third party imports
+from qtpy.QtCore import QRectF, Qt, Signal
+from qtpy.QtGui import QColor, QFontMetrics, QPainter, QPen
+from qtpy.QtWidgets import QToolTip, QWidget
+
+# Local imports
+from spyder.api.translations import _
+from spyder.utils.palette import SpyderPalette
+
+
+# Maximum depth of the tree
+MAX_DEPTH = 256
+
+# Maximum number of nodes in the tree, to bound memory and build time
+MAX_NODES = 200000
+
+# Nodes taking less than this fraction of the total time are not added
+MIN_FRACTION = 1e-5
+
+# Nodes narrower than this (in pixels) are not painted, and neither are their
+# children because they can't be wider.
+MIN_NODE_WIDTH = 1.0
+
+# Minimum width of a node (in pixels) to paint its name
+MIN_TEXT_WIDTH = 30.0
+
+# Zoom factor applied for every wheel step
+ZOOM_STEP = 1.25
+
+
+class FlameGraphNode:
+    """Node of the call tree, i.e. a function called through a stack."""
+
+    __slots__ = (
+        "key", "value", "self_value", "depth", "x", "parent", "children"
+    )
+
+    def __init__(self, key, value, depth=0, parent=None):
+        self.key = key
+        self.value = value
+        self.self_value = value
+        self.depth = depth
+        self.x = 0.0
+        self.parent = parent
+        self.children = []
+
+    def add_child(self, key, value):
+        """Add a child for key with value."""
+        child = FlameGraphNode(key, value, self.depth + 1, self)
+        self.children.append(child)
+        self.self_value -= value
+        return child
+
+    def is_ancestor(self, key):
+        """Check if key is this node or one of its ancestors."""
+        node = self
+        while node is not None:
+            if node.key == key:
+                return True
+            node = node.parent
+        return False
+
+
+class FlameGraph:
+    """
+    Prefix tree of the call stacks found in profiler results.
+
+    The tree is built from the stacks recorded by the sampling and memory
+    profilers if they are available. Otherwise, e.g. for cProfile results,
+    it's reconstructed from pstats data, which only has the time spent in
+    each call from a caller to a callee.
+    """
+
+    def __init__(self, stats=None, stacks=None):
+        self.root = FlameGraphNode(None, 0.0)
+        self.levels = []
+        self.n_nodes = 0
+        self._level_x = []
+        if stacks is not None:
+            self.build_from_stacks(stacks)
+        elif stats is not None:
+            self.build(stats)
+
+    @property
+    def total(self):
+        return self.root.value
+
+    @property
+    def depth(self):
+        return len(self.levels)
+
+    def build_from_stacks(self, stacks):
+        """
+        Build the tree from recorded stacks.
+
+        Parameters
+        ----------
+        stacks: dict
+            Number of samples and weight by stack of pstats keys, from the
+            innermost frame to the outermost one, as saved by the sampling
+            and memory profilers.
+        """
+        # Add up stacks in nested dicts of [value, children], starting from
+        # the outermost frame. Frames deeper than MAX_DEPTH are added to
+        # their ancestor at that depth.
+        tree = {}
+        total = 0.0
+        for stack, (__, weight) in stacks.items():
+            if weight <= 0:
+                continue
+            total += weight
+            children = tree
+            for key in reversed(stack[-MAX_DEPTH:]):
+                entry = children.get(key)
+                if entry is None:
+                    entry = children[key] = [0.0, {}]
+                entry[0] += weight
+                children = entry[1]
+
+        self.root = FlameGraphNode(None, total)
+        self.n_nodes = 0
+        if total <= 0:
+            self.levels = []
+            self._level_x = []
+            return
+
+        min_value = total * MIN_FRACTION
+        pending = [(self.root, tree)]
+        while pending and self.n_nodes < MAX_NODES:
+            parent, children = pending.pop()
+            expanded = []
+            for key, (value, grandchildren) in sorted(
+                children.items(), key=lambda child: -child[1][0]
+            ):
+                if value < min_value or self.n_nodes >= MAX_NODES:
+                    break
+                node = parent.add_child(key, value)
+                self.n_nodes += 1
+                if grandchildren:
+                    expanded.append((node, grandchildren))
+
+            # Expand the largest children first
+            pending.extend(reversed(expanded))
+
+        self._layout()
+
+    def build(self, stats, callees=None):
+        """
+        Build the tree from pstats data.
+
+        This is a fallback for deterministic profiles (e.g. cProfile), which
+        don't have the stacks that were run. They are reconstructed from the
+        calls between functions, splitting the time of each function among
+        its callees in proportion to the time each of them took overall, so
+        the paths shown can differ from the real ones.
+
+        Parameters
+        ----------
+        stats: dict
+            Stats in the format used by pstats.Stats.stats.
+        callees: dict, optional
+            Callees of each function, in the format used by
+            pstats.Stats.all_callees. Computed from stats if not given.
+        """
+        if callees is None:
+            callees = {}
+            for func, (__, __, __, __, callers) in stats.items():
+                for caller, values in callers.items():
+                    callees.setdefault(caller, {})[func] = values
+
+        # Stacks start in calls done without a profiled caller. Those calls
+        # are the outermost ones for their function, so they take a share of
+        # its cumulative time according to their number.
+        roots = []
+        for func, values in stats.items():
+            primitive_calls, calls, __, cumulative_time, callers = values
+            uncalled = calls - sum(edge[0] for edge in callers.values())
+            if uncalled > 0 and cumulative_time > 0:
+                share = min(uncalled / max(primitive_calls, 1), 1)
+                roots.append((func, cumulative_time * share))
+
+        total = sum(value for __, value in roots)
+        self.root = FlameGraphNode(None, total)
+        self.n_nodes = 0
+        if total <= 0:
+            self.levels = []
+            self._level_x = []
+            return
+
+        min_value = total * MIN_FRACTION
+        roots = [root for root in roots if root[1] >= min_value]
+        roots.sort(key=lambda root: root[1])
+        pending = [(self.root, func, value) for func, value in roots]
+        while pending and self.n_nodes < MAX_NODES:
+            parent, func, value = pending.pop()
+            node = parent.add_child(func, value)
+            self.n_nodes += 1
+            if node.depth >= MAX_DEPTH:
+                continue
+
+            cumulative_time = stats[func][3]
+            if cumulative_time <= 0:
+                continue
+
+            # Split the time of this node among its callees, skipping
+            # recursive calls, which are already accounted in the time of
+            # their ancestor.
+            children = []
+            scale = value / cumulative_time
+            for callee, values in callees.get(func, {}).items():
+                child_value = values[3] * scale
+                if child_value >= min_value and not node.is_ancestor(callee):
+                    children.append((callee, child_value))
+
+            # Don't let callees take more time than their caller
+            children_value = sum(child[1] for child in children)
+            if children_value > value:
+                children = [
+                    (callee, child_value * value / children_value)
+                    for callee, child_value in children
+                ]
+
+            children.sort(key=lambda child: child[1])
+            for callee, child_value in children:
+                pending.append((node, callee, child_value))
+
+        self._layout()
+
+    def _layout(self):
+        """Compute the position of the nodes and index them by depth."""
+        self.levels = []
+        total = self.root.value
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.depth > 0:
+                if node.depth > len(self.levels):
+                    self.levels.append([])
+                self.levels[node.depth - 1].append(node)
+
+            offset = node.x
+            for child in node.children:
+                child.x = offset
+                offset += child.value / total
+            stack.extend(reversed(node.children))
+
+        # Nodes are visited in order, so levels are sorted by position
+        self._level_x = [[node.x for node in level] for level in self.levels]
+
+    def node_at(self, depth, x):
+        """Get the node at depth (starting from 1) that contains x."""
+        if not 0 < depth <= len(self.levels):
+            return None
+
+        level = self.levels[depth - 1]
+        index = bisect.bisect_right(self._level_x[depth - 1], x) - 1
+        if index < 0:
+            return None
+
+        node = level[index]
+        if x <= node.x + node.value / self.root.value:
+            return node
+        return None
+
+
+class FlameGraphWidget(QWidget):
+    """
+    Widget to paint a flame graph or, in icicle mode, an upside-down one.
+
+    Use the mouse wheel to zoom, drag to pan, double-click on a function to
+    zoom into it and double-click on an empty area to reset the view.
+    Ctrl + double-click on a function goes to its definition.
+    """
+
+    sig_edit_goto_requested = Signal(str, int)
+    """Request to go to the definition of a function."""
+
+    ROW_HEIGHT = 18
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.graph = FlameGraph()
+        self.icicle = False
+
+        # Whether values are sizes from the memory profiler instead of times
+        self.memory = False
+
+        # Visible interval of the graph, as fractions of the total time
+        self._view_start = 0.0
+        self._view_end = 1.0
+
+        # Vertical scroll, in pixels
+        self._scroll = 0
+        self._drag_pos = None
+
+        self.setMouseTracking(True)
+        self.setMinimumHeight(self.ROW_HEIGHT * 4)
+
+    # ---- Public API
+    # -------------------------------------------------------------------------
+    def set_data(self, profdata, stacks=None, memory=False):
+        """
+        Show the flame graph of a pstats.Stats object.
+
+        The recorded stacks are used if given, because pstats data doesn't
+        have them. If memory is True, profdata has the results of the memory
+        profiler.
+        """
+        self.memory = memory
+        self.graph = FlameGraph()
+        if stacks:
+            self.graph.build_from_stacks(stacks)
+        elif profdata is not None:
+            self.graph.build(
+                profdata.stats, getattr(profdata, "all_callees", None)
+            )
+        self.reset_view()
+
+    def set_icicle(self, icicle):
+        """Show the root at the top (icicle) or at the bottom (flame)."""
+        self.icicle = icicle
+        self._scroll = 0
+        self.update()
+
+    def reset_view(self):
+        """Show the whole graph."""
+        self._view_start = 0.0
+        self._view_end = 1.0
+        self._scroll = 0
+        self.update()
+
+    def zoom_to_node(self, node):
+        """Zoom to show node across the whole width."""
+        if node is None or self.graph.total <= 0:
+            self.reset_view()
+            return
+
+        width = node.value / self.graph.total
+        if width <= 0:
+            return
+        self._view_start = node.x
+        self._view_end = node.x + width
+        self.update()
+
+    def node_at(self, pos):
+        """Get the node painted at pos."""
+        if self.graph.total <= 0:
+            return None
+
+        if self.icicle:
+            row = (pos.y() + self._scroll) // self.ROW_HEIGHT
+        else:
+            row = (
+                (self.height() - pos.y() + self._scroll) // self.ROW_HEIGHT
+            )
+        return self.graph.node_at(int(row) + 1, self._to_fraction(pos.x()))
+
+    # ---- Qt methods
+    # -------------------------------------------------------------------------
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(
+            self.rect(), QColor(SpyderPalette.COLOR_BACKGROUND_1)
+        )
+        if not self.graph.levels:
+            painter.setPen(QColor(SpyderPalette.COLOR_TEXT_1))
+            painter.drawText(
+                self.rect(), Qt.AlignCenter, _("No profiling data to show")
+            )
+            return
+
+        scale = self.width() / (self._view_end - self._view_start)
+        first_row = max(self._scroll // self.ROW_HEIGHT, 0)
+        last_row = (self.height() + self._scroll) // self.ROW_HEIGHT
+
+        metrics = QFontMetrics(self.font())
+        painter.setPen(QPen(QColor(SpyderPalette.COLOR_BACKGROUND_1), 1))
+
+        stack = list(self.graph.root.children)
+        while stack:
+            node = stack.pop()
+            row = node.depth - 1
+            if row > last_row:
+                continue
+
+            left = (node.x - self._view_start) * scale
+            width = node.value / self.graph.total * scale
+
+            # Skip nodes outside of the view or too narrow to be seen. Their
+            # children are inside them, so they don't need to be checked.
+            if (
+                width < MIN_NODE_WIDTH
+                or left + width < 0
+                or left > self.width()
+            ):
+                continue
+
+            stack.extend(node.children)
+            if row < first_row:
+                continue
+
+            # Clip to the view, so labels are visible when zooming in
+            right = min(left + width, self.width())
+            left = max(left, 0)
+            rect = QRectF(
+                left, self._row_y(row), right - left, self.ROW_HEIGHT
+            )
+
+            painter.setBrush(self._node_color(node))
+            painter.drawRect(rect)
+
+            if rect.width() >= MIN_TEXT_WIDTH:
+                painter.setPen(QColor(SpyderPalette.COLOR_BACKGROUND_1))
+                text = metrics.elidedText(
+                    self._node_name(node),
+                    Qt.ElideRight,
+                    int(rect.width()) - 6
+                )
+                painter.drawText(
+                    rect.adjusted(3, 0, -3, 0),
+                    Qt.AlignLeft | Qt.AlignVCenter,
+                    text
+                )
+                painter.setPen(
+                    QPen(QColor(SpyderPalette.COLOR_BACKGROUND_1), 1)
+                )
+
+    def wheelEvent(self, event):
+        delta = event.angleDelta().y()
+        if delta == 0:
+            return
+
+        factor = 1 / ZOOM_STEP if delta > 0 else ZOOM_STEP
+        center = self._to_fraction(event.position().x())
+        start = center - (center - self._view_start) * factor
+        end = center + (self._view_end - center) * factor
+
+        # Don't zoom out beyond the whole graph or in beyond a minimum width
+        if end - start >= 1:
+            start, end = 0.0, 1.0
+        elif end - start < 1e-9:
+            return
+
+        self._set_view(start, end)
+        event.accept()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_pos = event.pos()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_pos is not None:
+            dx = event.pos().x() - self._drag_pos.x()
+            dy = event.pos().y() - self._drag_pos.y()
+            self._drag_pos = event.pos()
+
+            shift = dx * (self._view_end - self._view_start) / self.width()
+            self._set_view(self._view_start - shift, self._view_end - shift)
+            self._set_scroll(self._scroll + (-dy if self.icicle else dy))
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_pos = None
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        node = self.node_at(event.pos())
+        if node is not None and event.modifiers() & Qt.ControlModifier:
+            filename, line_number, __ = node.key
+            if osp.isfile(filename):
+                self.sig_edit_goto_requested.emit(filename, line_number)
+        else:
+            self.zoom_to_node(node)
+
+    def event(self, event):
+        if event.type() == event.ToolTip:
+            node = self.node_at(event.pos())
+            if node is None:
+                QToolTip.hideText()
+                event.ignore()
+            else:
+                QToolTip.showText(
+                    event.globalPos(), self._node_tooltip(node), self
+                )
+            return True
+        return super().event(event)
+
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _to_fraction(self, x):
+        """Convert an x coordinate to a fraction of the total time."""
+        return (
+            self._view_start
+            + x / max(self.width(), 1) * (self._view_end - self._view_start)
+        )
+
+    def _row_y(self, row):
+        """Get the y coordinate of a row."""
+        if self.icicle:
+            return row * self.ROW_HEIGHT - self._scroll
+        else:
+            return self.height() - (row + 1) * self.ROW_HEIGHT + self._scroll
+
+    def _set_view(self, start, end):
+        """Set the visible interval, keeping it inside the graph."""
+        width = end - start
+        if start < 0:
+            start, end = 0.0, width
+        elif end > 1:
+            start, end = 1 - width, 1.0
+        self._view_start = start
+        self._view_end = end
+        self.update()
+
+    def _set_scroll(self, scroll):
+        """Set the vertical scroll, keeping some rows visible."""
+        max_scroll = max(
+            self.graph.depth * self.ROW_HEIGHT - self.height(), 0
+        )
+        self._scroll = min(max(scroll, 0), max_scroll)
+        self.update()
+
+    def _node_name(self, node):
+        filename, __, function_name = node.key
+        if function_name == '<module>':
+            return '<' + osp.basename(filename) + '>'
+        return function_name
+
+    def _node_color(self, node):
+        """Get a color for node that is stable across updates."""
+        filename, __, function_name = node.key
+        seed = zlib.crc32(function_name.encode("utf-8", "replace"))
+        if not filename or filename == '~':
+            # Built-in functions use cold colors
+            hue = 180 + seed % 60
+        else:
+            hue = seed % 50
+        return QColor.fromHsv(hue, 140 + seed % 60, 230)
+
+    def _node_tooltip(self, node):
+        # Avoid a circular import
+        from spyder.plugins.profiler.widgets.profiler_data_tree import (
+            ProfilerTreeItem
+        )
+
+        filename, line_number, __ = node.key
+        if not filename or filename == '~':
+            location = _("(built-in)")
+        else:
+            location = f"{filename}:{line_number}"
+
+        if self.memory:
+            format_measure = ProfilerTreeItem.format_size
+            total_text = _("Total size: {} ({:.2f}%)")
+            local_text = _("Local size: {}")
+        else:
+            format_measure = ProfilerTreeItem.format_measure
+            total_text = _("Total time: {} ({:.2f}%)")
+            local_text = _("Local time: {}")
+
+        percent = 100 * node.value / self.graph.total
+        return "<br>".join([
+            "<b>{}</b>".format(self._node_name(node).replace("<", "&lt;")),
+            location,
+            total_text.format(format_measure(node.value), percent),
+            local_text.format(format_measure(max(node.self_value, 0.0))),
+        ])
@@ -47,6 +47,8 @@ class ProfilerWidgetActions:
     Undo = "undo_action"
     Redo = "redo_action"
     Stop = "stop_action"
+    ToggleFlameGraph = "toggle_flame_graph_action"
+    ToggleIcicle = "toggle_icicle_action"
 
 
 class ProfilerWidgetMenus:
@@ -65,6 +67,10 @@ class ProfilerWidgetContextMenuActions:
     ShowCallers = "show_callers_action"
 
 
+class ProfilerWidgetOptionsMenuSections:
+    FlameGraph = "flame_graph_section"
+
+
 class ProfilerWidgetMainToolbarSections:
     # BrowseView = "view_section" # To be added later
     ExpandCollapse = "collapse_section"
@@ -112,6 +118,18 @@ class ProfilerWidget(ShellConnectMainWidget):
         Word to select on given row.
     """
 
+    sig_show_line_profile = Signal(str, dict)
+    """
+    This signal is emitted when line profiling results are available.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the profiled file.
+    line_stats: dict
+        Number of hits and time, in seconds, by line number.
+    """
+
     def __init__(self, name=None, plugin=None, parent=None):
         super().__init__(name, plugin, parent)
 
@@ -191,6 +209,30 @@ def setup(self):
             icon=self.create_icon('stop_profile'),
             triggered=self._stop_profiling,
         )
+        flame_graph_action = self.create_action(
+            ProfilerWidgetActions.ToggleFlameGraph,
+            text=_("Show flame graph"),
+            tip=_("Show results as a flame graph instead of a tree"),
+            icon=self.create_icon('flame_graph'),
+            toggled=True,
+            initial=self.get_conf('show_flame_graph'),
+            option='show_flame_graph',
+        )
+
+        # ---- Options menu actions
+        icicle_action = self.create_action(
+            ProfilerWidgetActions.ToggleIcicle,
+            text=_("Show flame graph upside down (icicle)"),
+            tip=_("Show the first calls at the top of the flame graph"),
+            toggled=True,
+            initial=self.get_conf('flame_graph_icicle'),
+            option='flame_graph_icicle',
+        )
+        self.add_item_to_menu(
+            icicle_action,
+            menu=self.get_options_menu(),
+            section=ProfilerWidgetOptionsMenuSections.FlameGraph,
+        )
 
         # This needs to be workedd out better because right now is confusing
         # and kind of unnecessary
@@ -238,7 +280,8 @@ def setup(self):
             slow_local_action,
             toggle_builtins_action,
             callers_or_callees_action,
-            search_action
+            search_action,
+            flame_graph_action,
         ]:
             self.add_item_to_toolbar(
                 action,
@@ -407,8 +450,10 @@ def update_actions(self):
 
         tree_empty = True
         can_clear = False
+        show_flame_graph = False
         if not widget_inactive:
             tree_empty = widget.profdata is None
+            show_flame_graph = widget.flame_graph_is_visible()
             # can_undo = len(widget.data_tree.history) > 1
             # can_redo = len(widget.data_tree.redo_history) > 0
             can_clear = widget.compare_data is not None
@@ -429,12 +474,17 @@ def update_actions(self):
                 ProfilerWidgetActions.Search,
             ]:
                 action.setEnabled(
-                    not tree_empty and not callers_or_callees_enabled
+                    not tree_empty
+                    and not callers_or_callees_enabled
+                    and not show_flame_graph
                 )
             elif action_name == ProfilerWidgetActions.LoadData:
                 action.setEnabled(not widget_inactive)
-            else:
+            elif action_name == ProfilerWidgetActions.SaveData:
                 action.setEnabled(not tree_empty)
+            else:
+                # These actions only apply to the tree
+                action.setEnabled(not tree_empty and not show_flame_graph)
 
         # undo_action = self.get_action(ProfilerWidgetActions.Undo)
         # redo_action = self.get_action(ProfilerWidgetActions.Redo)
@@ -454,13 +504,24 @@ def create_new_widget(self, shellwidget):
         widget.sig_refresh.connect(self.update_actions)
         widget.set_context_menu(self._context_menu)
         widget.sig_hide_finder_requested.connect(self._hide_finder)
+        widget.flame_graph.sig_edit_goto_requested.connect(
+            self._edit_goto_from_flame_graph
+        )
         widget.sig_show_empty_message_requested.connect(
             self.switch_empty_message
         )
+        widget.sig_show_line_profile.connect(self.sig_show_line_profile)
 
         shellwidget.register_kernel_call_handler(
             "show_profile_file", widget.show_profile_buffer
         )
+        shellwidget.register_kernel_call_handler(
+            "show_memory_profile_file",
+            functools.partial(widget.show_profile_buffer, memory=True)
+        )
+        shellwidget.register_kernel_call_handler(
+            "show_line_profile", widget.show_line_profile
+        )
         shellwidget.register_kernel_call_handler(
             "start_profiling", self._start_profiling
         )
@@ -470,6 +531,9 @@ def create_new_widget(self, shellwidget):
         shellwidget.sig_kernel_is_ready.connect(
             widget.on_kernel_ready_callback
         )
+        shellwidget.sig_config_spyder_kernel.connect(
+            widget.on_config_kernel
+        )
 
         widget.shellwidget = shellwidget
         return widget
@@ -479,13 +543,24 @@ def close_widget(self, widget):
         widget.sig_refresh.disconnect(self.update_actions)
         widget.sig_display_requested.disconnect(self._display_request)
         widget.sig_hide_finder_requested.disconnect(self._hide_finder)
+        widget.flame_graph.sig_edit_goto_requested.disconnect(
+            self._edit_goto_from_flame_graph
+        )
+        widget.sig_show_line_profile.disconnect(self.sig_show_line_profile)
 
         # Unregister
         widget.shellwidget.unregister_kernel_call_handler("show_profile_file")
+        widget.shellwidget.unregister_kernel_call_handler(
+            "show_memory_profile_file"
+        )
+        widget.shellwidget.unregister_kernel_call_handler("show_line_profile")
         widget.shellwidget.unregister_kernel_call_handler("start_profiling")
         widget.shellwidget.sig_kernel_is_ready.disconnect(
             widget.on_kernel_ready_callback
         )
+        widget.shellwidget.sig_config_spyder_kernel.disconnect(
+            widget.on_config_kernel
+        )
         widget.setParent(None)
         widget.close()
 
@@ -646,6 +721,9 @@ def _goto_definition(self):
                 item.filename, item.line_number, ""
             )
 
+    def _edit_goto_from_flame_graph(self, filename, line_number):
+        self.sig_edit_goto_requested.emit(filename, line_number, "")
+
     def _save_data(self):
         """Save data."""
         widget = self.current_widget()
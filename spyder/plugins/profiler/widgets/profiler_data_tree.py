@@ -14,7 +14,9 @@
 """
 
 # Standard library imports
+import array
 from collections.abc import Callable
+import marshal
 import os
 import os.path as osp
 import sys
@@ -23,24 +25,19 @@
 
 # Third party imports
 from qtpy import PYSIDE2
-from qtpy.QtCore import Qt, Signal
+from qtpy.QtCore import QAbstractItemModel, QModelIndex, Qt, Signal
 from qtpy.QtGui import QColor
-from qtpy.QtWidgets import (
-    QMessageBox,
-    QTreeWidget,
-    QTreeWidgetItem,
-    QVBoxLayout,
-    QWidget,
-)
+from qtpy.QtWidgets import QMessageBox, QTreeView, QVBoxLayout, QWidget
 
 # Local imports
+from spyder.api.config.decorators import on_conf_change
 from spyder.api.config.mixins import SpyderConfigurationAccessor
 from spyder.api.shellconnect.mixins import ShellConnectWidgetForStackMixin
 from spyder.api.translations import _
 from spyder.api.widgets.mixins import SpyderWidgetMixin
+from spyder.plugins.profiler.widgets.flame_graph import FlameGraphWidget
 from spyder.utils.icon_manager import ima
 from spyder.utils.palette import SpyderPalette
-from spyder.utils.qthelpers import set_item_user_text
 from spyder.widgets.helperwidgets import FinderWidget
 
 
@@ -77,6 +74,7 @@ class ProfilerSubWidget(
     sig_display_requested = Signal(object)
     sig_hide_finder_requested = Signal()
     sig_refresh = Signal()
+    sig_show_line_profile = Signal(str, dict)
 
     def __init__(self, parent=None):
         if not PYSIDE2:
@@ -87,6 +85,7 @@ def __init__(self, parent=None):
 
         self.data_tree: ProfilerDataTree | None = None
         self.finder: FinderWidget | None = None
+        self.flame_graph: FlameGraphWidget | None = None
         self.is_profiling = False
         self.recreate_custom_view = False
         self.on_kernel_ready_callback: Callable | None = None
@@ -124,9 +123,16 @@ def finder_text(self):
     def setup(self):
         """Setup widget."""
         self.data_tree = ProfilerDataTree(self)
+        self.data_tree.sig_refresh.connect(self._update_flame_graph)
         self.data_tree.sig_refresh.connect(self.sig_refresh)
         self._bind_data_tree_methods()
 
+        # Data shown in the flame graph, which is only updated when visible
+        self._flame_graph_data = None
+        self.flame_graph = FlameGraphWidget(self)
+        self.flame_graph.set_icicle(self.get_conf("flame_graph_icicle"))
+        self.flame_graph.setVisible(False)
+
         self.finder = FinderWidget(self)
         self.finder.setVisible(False)
         self.finder.sig_find_text.connect(self.do_find)
@@ -140,9 +146,24 @@ def setup(self):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
         layout.addWidget(self.data_tree)
+        layout.addWidget(self.flame_graph)
         layout.addWidget(self.finder)
         self.setLayout(layout)
 
+        self.show_flame_graph(self.get_conf("show_flame_graph"))
+
+    def show_flame_graph(self, show):
+        """Show the flame graph instead of the tree."""
+        self.data_tree.setVisible(not show)
+        self.flame_graph.setVisible(show)
+        if show:
+            self.finder.set_visible(False)
+            self._update_flame_graph()
+
+    def flame_graph_is_visible(self):
+        """Check if the flame graph is shown instead of the tree."""
+        return not self.flame_graph.isHidden()
+
     def set_pane_empty(self, empty):
         if empty:
             self.is_empty = True
@@ -151,8 +172,13 @@ def set_pane_empty(self, empty):
             self.is_empty = False
             self.sig_show_empty_message_requested.emit(False)
 
-    def show_profile_buffer(self, prof_buffer, lib_pathlist):
-        """Show profile file."""
+    def show_profile_buffer(self, prof_buffer, lib_pathlist, memory=False):
+        """
+        Show profile file.
+
+        If memory is True, the file has the results of the memory profiler,
+        where times are sizes and calls are memory blocks.
+        """
         if not prof_buffer:
             return
 
@@ -174,16 +200,49 @@ def show_profile_buffer(self, prof_buffer, lib_pathlist):
             with open(filename, "bw") as f:
                 f.write(prof_buffer)
             self.data_tree.lib_pathlist = lib_pathlist
+            self.data_tree.set_memory(memory)
             self.data_tree.load_data(filename)
 
         # Show
+        self._update_flame_graph()
         self.set_pane_empty(False)
         self.data_tree._show_tree()
         self.sig_display_requested.emit(self)
 
+    def show_line_profile(self, filename, line_stats):
+        """Show the hits and time of each line of filename in the editor."""
+        self.is_profiling = False
+        self.sig_show_line_profile.emit(filename, line_stats)
+        self.sig_refresh.emit()
+
     def set_context_menu(self, menu):
         self.data_tree.menu = menu
 
+    def on_config_kernel(self):
+        """Send profiler configuration to the kernel."""
+        self.shellwidget.set_kernel_configuration(
+            "profiler", {
+                "sampling": self.get_conf("sampling"),
+                "sampling_interval": self.get_conf("sampling_interval"),
+                "line_profiling": self.get_conf("line_profiling"),
+            }
+        )
+
+    @on_conf_change(
+        option=["sampling", "sampling_interval", "line_profiling"]
+    )
+    def on_sampling_update(self, option, value):
+        self.on_config_kernel()
+
+    @on_conf_change(option="show_flame_graph")
+    def on_show_flame_graph_update(self, value):
+        self.show_flame_graph(value)
+        self.sig_refresh.emit()
+
+    @on_conf_change(option="flame_graph_icicle")
+    def on_flame_graph_icicle_update(self, value):
+        self.flame_graph.set_icicle(value)
+
     # ---- ProfilerDataTree API
     # -------------------------------------------------------------------------
     @property
@@ -247,6 +306,19 @@ def _bind_data_tree_methods(self):
         ]:
             setattr(self, method, getattr(self.data_tree, method))
 
+    def _update_flame_graph(self):
+        """Update the flame graph if it's visible and data changed."""
+        if (
+            self.flame_graph_is_visible()
+            and self._flame_graph_data is not self.profdata
+        ):
+            self._flame_graph_data = self.profdata
+            self.flame_graph.set_data(
+                self.profdata,
+                stacks=self.data_tree.stacks,
+                memory=self.data_tree.memory,
+            )
+
     def _reset(self):
         """Reset view to its initial state."""
         if self.data_tree.show_slow:
@@ -255,102 +327,172 @@ def _reset(self):
             self.data_tree._show_tree()
 
 
-class TreeWidgetItem(QTreeWidgetItem):
-    """Item to show in the tree. It represent a function call."""
-    def __init__(self, parent, item_key, profile_data, compare_data, icon_list,
-                 index_dict):
-        QTreeWidgetItem.__init__(self, parent)
+class ProfilerStats:
+    """
+    Columnar representation of the data saved by the profiler.
+
+    Number of calls and times are saved in arrays indexed by row, so
+    functions can be sorted and filtered without going through the pstats
+    dictionaries. The callers and callees of each function are saved as
+    rows in compressed sparse row form: the callers of the function in row
+    i are in caller_rows[caller_offsets[i]:caller_offsets[i + 1]], and the
+    same goes for callees.
+    """
 
-        self.item_key = item_key
-        self.index_dict = index_dict
+    def __init__(self, stats):
+        self.keys = list(stats)
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+        values = [stats[key] for key in self.keys]
+        self.calls = array.array(
+            "q", [value[ProfilerKey.TotalCalls] for value in values]
+        )
+        self.local_time = array.array(
+            "d", [value[ProfilerKey.LocalTime] for value in values]
+        )
+        self.total_time = array.array(
+            "d", [value[ProfilerKey.TotalTime] for value in values]
+        )
+        self.names = [key[2] for key in self.keys]
+
+        self.caller_rows = array.array("q")
+        self.caller_offsets = array.array("q", [0])
+        callee_counts = [0] * len(self.keys)
+        for value in values:
+            for caller in value[ProfilerKey.Callers]:
+                caller_row = self.rows.get(caller)
+                if caller_row is not None:
+                    self.caller_rows.append(caller_row)
+                    callee_counts[caller_row] += 1
+            self.caller_offsets.append(len(self.caller_rows))
+
+        # Callees are the inverse of callers, so they are placed in the
+        # ranges given by the number of callees of each function.
+        self.callee_offsets = array.array("q", [0])
+        for count in callee_counts:
+            self.callee_offsets.append(self.callee_offsets[-1] + count)
+        self.callee_rows = array.array("q", bytes(8 * len(self.caller_rows)))
+        next_callee = self.callee_offsets[:-1]
+        for row in range(len(self.keys)):
+            callers = self._rows(self.caller_offsets, self.caller_rows, row)
+            for caller_row in callers:
+                self.callee_rows[next_callee[caller_row]] = row
+                next_callee[caller_row] += 1
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get_values(self, key):
+        """Get the number of calls, local and total time of key."""
+        row = self.rows.get(key)
+        if row is None:
+            return 0, 0, 0
+        return self.calls[row], self.local_time[row], self.total_time[row]
+
+    def callers(self, key):
+        """Get the functions that called key."""
+        return self._related_keys(self.caller_offsets, self.caller_rows, key)
+
+    def callees(self, key):
+        """Get the functions called by key."""
+        return self._related_keys(self.callee_offsets, self.callee_rows, key)
+
+    def find(self, text):
+        """Get the functions whose name contains text."""
+        return [
+            self.keys[row] for row, name in enumerate(self.names)
+            if text in name
+        ]
 
-        # Order is from profile data
-        self.total_calls, self.local_time, self.total_time = profile_data[1:4]
-        (
-            filename,
-            line_number,
-            function_name,
-            file_and_line,
-            node_type,
-        ) = self.function_info(item_key)
+    def sorted_by_local_time(self):
+        """Iterate over functions from the largest local time."""
+        return self._sorted_keys(self.local_time)
 
-        self.function_name = function_name
-        self.filename = filename
-        self.line_number = line_number
+    def sorted_by_total_time(self):
+        """Iterate over functions from the largest total time."""
+        return self._sorted_keys(self.total_time)
 
-        self.set_item_data(filename, line_number)
-        self.setIcon(self.index_dict["function_name"], icon_list[node_type])
-        self.set_tooltips()
+    def _sorted_keys(self, values):
+        rows = sorted(
+            range(len(self.keys)), key=values.__getitem__, reverse=True
+        )
+        return (self.keys[row] for row in rows)
 
-        data = {
-            "function_name": function_name,
-            "total_time": self.format_measure(self.total_time),
-            "local_time": self.format_measure(self.local_time),
-            "number_calls": self.format_measure(self.total_calls),
-            "file:line": file_and_line
-        }
-        self.set_data(data)
-        alignment = {
-            "total_time": Qt.AlignRight,
-            "local_time": Qt.AlignRight,
-            "number_calls": Qt.AlignRight,
-        }
-        self.set_alignment(alignment)
+    @staticmethod
+    def _rows(offsets, rows, row):
+        """Get the rows related to row in offsets and rows."""
+        return rows[offsets[row]:offsets[row + 1]]
 
-        if self.is_recursive():
-            self.setData(
-                self.index_dict["file:line"],
-                Qt.DisplayRole,
-                "(%s)" % _("recursion"),
-            )
-            self.setDisabled(True)
+    def _related_keys(self, offsets, rows, key):
+        row = self.rows.get(key)
+        if row is None:
+            return []
+        return [self.keys[i] for i in self._rows(offsets, rows, row)]
 
-        if compare_data is None:
-            return
 
-        diff_data = {}
-        diff_colors = {}
-        # Keep same order as profile data
-        compare_keys = [
-            "unused",
-            "number_calls_diff",
-            "local_time_diff",
-            "total_time_diff"
-        ]
-        for i in range(1, 4):
-            diff_str, color = self.color_diff(
-                profile_data[i] - compare_data[i]
-            )
-            diff_data[compare_keys[i]] = diff_str
-            diff_colors[compare_keys[i]] = color
-
-        self.set_data(diff_data)
-        self.set_color(diff_colors)
-        diff_alignment = {
-            "total_time_diff": Qt.AlignLeft,
-            "local_time_diff": Qt.AlignLeft,
-            "number_calls_diff": Qt.AlignLeft
-        }
-        self.set_alignment(diff_alignment)
+class ProfilerTreeItem:
+    """Item to show in the tree. It represents a function call."""
+
+    __slots__ = ("item_key", "parent", "row", "children", "_children_keys")
+
+    def __init__(self, item_key, parent=None, row=0):
+        self.item_key = item_key
+        self.parent = parent
+        self.row = row
+
+        # Children are only created when the item is expanded
+        self.children = None
+        self._children_keys = None
+
+    @property
+    def filename(self):
+        return self.item_key[0]
+
+    @property
+    def line_number(self):
+        return self.item_key[1]
+
+    @property
+    def function_name(self):
+        return self.function_info(self.item_key)[2]
+
+    def is_recursive(self):
+        """Returns True is a function is a descendant of itself."""
+        ancestor = self.parent
+        while ancestor is not None and ancestor.item_key is not None:
+            if ancestor.item_key == self.item_key:
+                return True
+            ancestor = ancestor.parent
+        return False
 
-    def set_data(self, data):
-        """Set data in columns."""
-        for k, v in data.items():
-            self.setData(self.index_dict[k], Qt.DisplayRole, v)
+    @staticmethod
+    def function_info(functionKey):
+        """Returns processed information about the function's name and file."""
+        node_type = 'function'
+        filename, line_number, function_name = functionKey
+
+        if function_name == '<module>':
+            module_path, module_name = osp.split(filename)
+            node_type = 'module'
+            if module_name == '__init__.py':
+                module_path, module_name = osp.split(module_path)
+            function_name = '<' + module_name + '>'
 
-    def set_color(self, colors):
-        """Set colors"""
-        for k, v in colors.items():
-            self.setForeground(self.index_dict[k], QColor(v))
+        if not filename or filename == '~':
+            file_and_line = '(built-in)'
+            node_type = 'builtin'
+        else:
+            if function_name == '__init__':
+                node_type = 'constructor'
+            file_and_line = '%s : %d' % (filename, line_number)
 
-    def set_alignment(self, alignment):
-        """Set alignment."""
-        for k, v in alignment.items():
-            self.setTextAlignment(self.index_dict[k], v)
+        return filename, line_number, function_name, file_and_line, node_type
 
     @staticmethod
-    def color_diff(difference):
+    def color_diff(difference, format_measure=None):
         """Color difference."""
+        if format_measure is None:
+            format_measure = ProfilerTreeItem.format_measure
+
         diff_str = ""
         color = "black"
         if difference:
@@ -359,9 +501,7 @@ def color_diff(difference):
                 if difference < 0
                 else (SpyderPalette.COLOR_ERROR_1, '+')
             )
-            diff_str = '{}{}'.format(
-                sign, TreeWidgetItem.format_measure(difference)
-            )
+            diff_str = '{}{}'.format(sign, format_measure(difference))
         return diff_str, color
 
     @staticmethod
@@ -396,77 +536,283 @@ def format_measure(measure):
             measure = u"{0:.0f}h:{1:.0f}min".format(h, m)
         return measure
 
-    def __lt__(self, otherItem):
-        column = self.treeWidget().sortColumn()
-        try:
-            if column == self.index_dict["total_time"]:
-                return self.total_time > otherItem.total_time
-            if column == self.index_dict["local_time"]:
-                return self.local_time > otherItem.local_time
-
-            return float(self.text(column)) > float(otherItem.text(column))
-        except ValueError:
-            return self.text(column) > otherItem.text(column)
-
-    def set_item_data(self, filename, line_number):
-        """Set tree item user data: filename (string) and line_number (int)"""
-        # separator between filename and linenumber
-        SEP = r"<[=]>"
-        # (must be improbable as a filename)
-        set_item_user_text(self, '%s%s%d' % (filename, SEP, line_number))
-
-    def function_info(self, functionKey):
-        """Returns processed information about the function's name and file."""
-        node_type = 'function'
-        filename, line_number, function_name = functionKey
+    @staticmethod
+    def format_size(size):
+        """Get format and units for sizes, in bytes, from memory profiling."""
+        size = abs(size)
+        if size < 1024:
+            return "{0:.0f} B".format(size)
 
-        if function_name == '<module>':
-            module_path, module_name = osp.split(filename)
-            node_type = 'module'
-            if module_name == '__init__.py':
-                module_path, module_name = osp.split(module_path)
-            function_name = '<' + module_name + '>'
+        for unit in ["KiB", "MiB", "GiB"]:
+            size /= 1024
+            if size < 1024:
+                break
+        return "{0:.2f} {1}".format(size, unit)
 
-        if not filename or filename == '~':
-            file_and_line = '(built-in)'
-            node_type = 'builtin'
-        else:
-            if function_name == '__init__':
-                node_type = 'constructor'
-            file_and_line = '%s : %d' % (filename, line_number)
 
-        return filename, line_number, function_name, file_and_line, node_type
+class ProfilerTreeModel(QAbstractItemModel):
+    """
+    Model to show profiler data in a tree.
 
-    def is_recursive(self):
-        """Returns True is a function is a descendant of itself."""
-        ancestor = self.parent()
-        while ancestor:
-            if (
-                self.function_name == ancestor.function_name
-                and self.filename == ancestor.filename
-                and self.line_number == ancestor.line_number
-            ):
-                return True
+    Items are only created for the functions that are shown and their
+    contents are formatted when the view asks for them, so the size of the
+    profile doesn't affect how fast the tree is populated.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.tree = parent
+        self.stats: ProfilerStats | None = None
+        self.compare_stats: ProfilerStats | None = None
+        self.root = ProfilerTreeItem(None)
+        self.root.children = []
+
+        self._columns = sorted(
+            self.tree.index_dict, key=self.tree.index_dict.get
+        )
+        self._sort_column = self.tree.index_dict["total_time"]
+        self._sort_order = Qt.AscendingOrder
+
+    # ---- Public API
+    # -------------------------------------------------------------------------
+    def set_items(self, keys):
+        """Show keys at the top level of the tree."""
+        self.beginResetModel()
+        self.root.children = self._create_children(self.root, keys)
+        self.endResetModel()
+
+    def item(self, index):
+        """Get the item of index."""
+        if not index.isValid():
+            return self.root
+        return index.internalPointer()
+
+    def index_of(self, item):
+        """Get the index of item."""
+        if item is None or item is self.root:
+            return QModelIndex()
+        return self.createIndex(item.row, 0, item)
+
+    # ---- Qt methods
+    # -------------------------------------------------------------------------
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column, self.item(parent).children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        children = self.item(parent).children
+        return 0 if children is None else len(children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self._columns)
+
+    def hasChildren(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return False
+        item = self.item(parent)
+        if item.children is not None:
+            return len(item.children) > 0
+        return len(self._get_children_keys(item)) > 0
+
+    def canFetchMore(self, parent):
+        if not parent.isValid() or parent.column() > 0:
+            return False
+        item = self.item(parent)
+        return item.children is None and self.hasChildren(parent)
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+
+        item = self.item(parent)
+        children = self._create_children(item, self._get_children_keys(item))
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        item.children = children
+        self.endInsertRows()
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.internalPointer().is_recursive():
+            # Recursive calls are shown disabled
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal:
+            return None
+
+        if role == Qt.DisplayRole:
+            return self.tree.header_list[section]
+        elif section in self.tree.header_tooltips:
+            if role == Qt.DecorationRole:
+                return ima.icon('question_tip_hover')
+            elif role == Qt.ToolTipRole:
+                return self.tree.header_tooltips[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or self.stats is None:
+            return None
+
+        item = index.internalPointer()
+        column = self._columns[index.column()]
+        (
+            filename,
+            line_number,
+            function_name,
+            file_and_line,
+            node_type,
+        ) = item.function_info(item.item_key)
+
+        if role == Qt.DisplayRole:
+            if column == "function_name":
+                return function_name
+            elif column == "file:line":
+                if item.is_recursive():
+                    return "(%s)" % _("recursion")
+                return file_and_line
+            elif column.endswith("_diff"):
+                diff = self._get_diff(item, column)
+                if diff is not None:
+                    return item.color_diff(diff, self._formatter(column))[0]
             else:
-                ancestor = ancestor.parent()
-        return False
+                return self._formatter(column)(self._get_value(item, column))
+        elif role == Qt.DecorationRole:
+            if column == "function_name":
+                return self.tree.icon_list[node_type]
+        elif role == Qt.ToolTipRole:
+            if column == "function_name":
+                return function_name
+            elif column == "file:line":
+                if not filename or filename == '~':
+                    return "(built-in)"
+                return f"{filename}:{line_number}"
+        elif role == Qt.ForegroundRole:
+            if column.endswith("_diff"):
+                diff = self._get_diff(item, column)
+                if diff:
+                    return QColor(item.color_diff(diff)[1])
+        elif role == Qt.TextAlignmentRole:
+            if column in ["total_time", "local_time", "number_calls"]:
+                return int(Qt.AlignRight)
+            elif column.endswith("_diff"):
+                return int(Qt.AlignLeft)
+
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_items = [
+            (index.internalPointer(), index.column()) for index in old_indexes
+        ]
 
-    def set_tooltips(self):
-        """Set item tooltips."""
-        self.setToolTip(self.index_dict["function_name"], self.function_name)
+        # Only items that were already created need to be sorted
+        pending = [self.root]
+        while pending:
+            item = pending.pop()
+            if item.children:
+                self._sort_children(item.children)
+                pending.extend(item.children)
+
+        self.changePersistentIndexList(
+            old_indexes,
+            [
+                self.createIndex(item.row, column, item)
+                for item, column in old_items
+            ]
+        )
+        self.layoutChanged.emit()
 
-        if not self.filename or self.filename == '~':
-            fname_tip = "(built-in)"
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _get_children_keys(self, item):
+        """Get the keys of the children of item, without creating them."""
+        if item._children_keys is None:
+            if item.item_key is None or item.is_recursive():
+                item._children_keys = []
+            else:
+                item._children_keys = [
+                    key for key in self.tree.find_children(item.item_key)
+                    if key not in self.tree.FUNCTIONS_TO_EXCLUDE
+                ]
+        return item._children_keys
+
+    def _create_children(self, parent, keys):
+        """Create the children of parent for keys."""
+        children = [
+            ProfilerTreeItem(key, parent)
+            for key in keys
+            if key not in self.tree.FUNCTIONS_TO_EXCLUDE
+        ]
+        self._sort_children(children)
+        return children
+
+    def _sort_children(self, children):
+        """Sort children in place according to the current sort column."""
+        column = self._columns[self._sort_column]
+        if column == "function_name":
+            def sort_key(item):
+                return item.function_name
+        elif column == "file:line":
+            def sort_key(item):
+                return (item.filename, item.line_number)
+        elif column.endswith("_diff"):
+            def sort_key(item):
+                return self._get_diff(item, column) or 0
         else:
-            fname_tip = f"{self.filename}:{self.line_number}"
+            def sort_key(item):
+                return self._get_value(item, column)
 
-        self.setToolTip(self.index_dict["file:line"], fname_tip)
+        # The largest values are shown first in ascending order
+        children.sort(
+            key=sort_key, reverse=self._sort_order == Qt.AscendingOrder
+        )
+        for row, child in enumerate(children):
+            child.row = row
+
+    def _formatter(self, column):
+        """Get the function used to format the values of column."""
+        if self.tree.memory and not column.startswith("number_calls"):
+            return ProfilerTreeItem.format_size
+        return ProfilerTreeItem.format_measure
+
+    def _get_value(self, item, column, stats=None):
+        """Get the value of column for item."""
+        stats = self.stats if stats is None else stats
+        calls, local_time, total_time = stats.get_values(item.item_key)
+        if column.startswith("number_calls"):
+            return calls
+        elif column.startswith("local_time"):
+            return local_time
+        else:
+            return total_time
+
+    def _get_diff(self, item, column):
+        """Get the difference of column between profile and compare data."""
+        if self.compare_stats is None:
+            return None
+        return (
+            self._get_value(item, column)
+            - self._get_value(item, column, self.compare_stats)
+        )
 
 
-class ProfilerDataTree(QTreeWidget, SpyderConfigurationAccessor):
+class ProfilerDataTree(QTreeView, SpyderConfigurationAccessor):
     """
-    Convenience tree widget (with built-in model)
-    to store and view profiler data.
+    Tree view to show profiler data.
 
     The quantities calculated by the profiler are as follows
     (from profile.Profile):
@@ -496,7 +842,7 @@ def __init__(self, parent=None):
         if not PYSIDE2:
             super().__init__(parent)
         else:
-            QTreeWidget.__init__(self, parent)
+            QTreeView.__init__(self, parent)
 
         self.header_list = [
             _("Function/Module"),
@@ -508,6 +854,7 @@ def __init__(self, parent=None):
             _("Diff"),
             _("File:line"),
         ]
+        self.header_tooltips = {}
         self.icon_list = {
             'module': parent.create_icon('python'),
             'function': parent.create_icon('function'),
@@ -525,7 +872,10 @@ def __init__(self, parent=None):
             "file:line": 7
         }
         self.profdata = None   # To be filled by self.load_data()
-        self.items_to_be_shown = None
+
+        # Stacks recorded by the sampling and memory profilers
+        self.stacks = None
+        self.memory = False
         self.current_view_depth = None
         self.compare_data = None
         self.inverted_tree = False
@@ -535,14 +885,17 @@ def __init__(self, parent=None):
         self.root_key = None
         self.menu = None
         self._last_children = None
-        self.setColumnCount(len(self.header_list))
-        self.setHeaderLabels(self.header_list)
-        self.initialize_view()
-        self.itemExpanded.connect(self.item_expanded)
+        self._builtins = {}
         self.lib_pathlist = None
         self.history = []
         self.redo_history = []
 
+        self.tree_model = ProfilerTreeModel(self)
+        self.setModel(self.tree_model)
+        self.setUniformRowHeights(True)
+        self.setSortingEnabled(True)
+        self.initialize_view()
+
         self.set_tooltips()
 
     def contextMenuEvent(self, event):
@@ -555,8 +908,7 @@ def contextMenuEvent(self, event):
 
     def initialize_view(self):
         """Clean the tree and view parameters"""
-        self.clear()
-        self.items_to_be_shown = {}
+        self.tree_model.set_items([])
         self.current_view_depth = 0
         if (
             self.compare_data is not None
@@ -570,34 +922,34 @@ def load_data(self, profdatafile):
         """Load profiler data saved by profile/cProfile module"""
         self.history = []
         self.redo_history = []
+        self._builtins = {}
         if not os.path.isfile(profdatafile):
-            self.profdata = None
+            self._set_profdata(None)
             return
         import pstats
 
         # Fixes spyder-ide/spyder#6220.
         try:
-            self.profdata = pstats.Stats(profdatafile)
-            self.profdata.calc_callees()
+            self._set_profdata(pstats.Stats(profdatafile))
             self.root_key = self.find_root()
+            self.stacks = self._load_stacks(profdatafile)
         except OSError:
-            self.profdata = None
+            self._set_profdata(None)
             return
 
     def compare(self, filename):
         """Load compare file."""
         if filename is None:
-            self.compare_data = None
+            self._set_compare_data(None)
             return
         import pstats
 
         # Fixes spyder-ide/spyder#5587.
         try:
-            self.compare_data = pstats.Stats(filename)
-            self.compare_data.calc_callees()
+            self._set_compare_data(pstats.Stats(filename))
             if self.profdata is None:
                 # Show the compare data as prof_data
-                self.profdata = self.compare_data
+                self._set_profdata(self.compare_data)
                 self.root_key = self.find_root()
         except OSError as e:
             QMessageBox.critical(
@@ -609,7 +961,7 @@ def compare(self, filename):
                     "<tt>{0}</tt>"
                 ).format(e),
             )
-            self.compare_data = None
+            self._set_compare_data(None)
 
     def hide_diff_cols(self, hide):
         """Hide difference columns."""
@@ -620,18 +972,49 @@ def hide_diff_cols(self, hide):
         ):
             self.setColumnHidden(i, hide)
 
+    def set_memory(self, memory):
+        """Show sizes and memory blocks instead of times and calls."""
+        if memory == self.memory:
+            return
+
+        self.memory = memory
+        if memory:
+            headers = {
+                "function_name": _("Line"),
+                "total_time": _("Total Size"),
+                "local_time": _("Local Size"),
+                "number_calls": _("Blocks"),
+            }
+        else:
+            headers = {
+                "function_name": _("Function/Module"),
+                "total_time": _("Total Time"),
+                "local_time": _("Local Time"),
+                "number_calls": _("Calls"),
+            }
+        for column_name, header in headers.items():
+            self.header_list[self.index_dict[column_name]] = header
+
+        self.set_tooltips()
+        self.tree_model.headerDataChanged.emit(
+            Qt.Horizontal, 0, len(self.header_list) - 1
+        )
+
     def save_data(self, filename):
         """Save profiler data."""
         self.profdata.dump_stats(filename)
 
+        # Save stacks after the stats, like the profilers that record them
+        if self.stacks is not None:
+            with open(filename, "ab") as f:
+                marshal.dump(self.stacks, f)
+
     def find_root(self):
         """Find a function without a caller."""
         # Fixes spyder-ide/spyder#8336.
-        if self.profdata is not None:
-            self.profdata.sort_stats("cumulative")
-        else:
+        if self.profdata is None:
             return
-        for func in self.profdata.fcn_list:
+        for func in self.tree_model.stats.sorted_by_total_time():
             if (
                 ('~', 0) != func[0:2]
                 and not func[2].startswith('<built-in method exec>')
@@ -642,32 +1025,21 @@ def find_root(self):
 
     def is_builtin(self, key):
         """Check if key is buit-in."""
-        path = key[0]
-        if not path:
-            return True
-        if path == "~":
-            return True
-        if path.startswith("<"):
-            return True
-
-        path = os.path.normcase(os.path.normpath(path))
-        if self.lib_pathlist is not None:
-            for libpath in self.lib_pathlist:
-                libpath = os.path.normcase(os.path.normpath(libpath))
-                commonpath = os.path.commonpath([libpath, path])
-                if libpath == commonpath:
-                    return True
-
-        return False
+        # Results are cached because this is called for a lot of keys when
+        # filtering the tree.
+        if key not in self._builtins:
+            self._builtins[key] = self._is_builtin(key)
+        return self._builtins[key]
 
     def find_children(self, parent):
         """Find all functions called by (parent) function."""
+        stats = self.tree_model.stats
         if self.inverted_tree:
             # Return callers
-            return self.profdata.stats[parent][ProfilerKey.Callers]
+            return stats.callers(parent)
         else:
             # Return callees
-            callees = self.profdata.all_callees[parent]
+            callees = stats.callees(parent)
             if self.ignore_builtins:
                 callees = [c for c in callees if not self.is_builtin(c)]
             return callees
@@ -683,28 +1055,25 @@ def do_find(self, text):
             children = [c for c in children if text in c[-1]]
             self.show_slow_items(children)
         else:
-            children = self.profdata.fcn_list
-            children = [c for c in children if text in c[-1]]
-            self._show_tree(children)
+            self._show_tree(self.tree_model.stats.find(text))
 
     def get_slow_items(self):
         """Get items with large local time."""
-        children = self.profdata.fcn_list
+        # Only keep top n_slow_children
+        n_children = self.get_conf('n_slow_children')
 
-        # Get slow items
-        children = sorted(
-            children,
-            key=lambda item: self.profdata.stats[item][ProfilerKey.LocalTime],
-            reverse=True
-        )
+        children = []
+        for key in self.tree_model.stats.sorted_by_local_time():
+            if len(children) == n_children:
+                break
 
-        # Ignore builtins
-        if self.ignore_builtins:
-            children = [c for c in children if not self.is_builtin(c)]
+            # Ignore builtins
+            if self.ignore_builtins and self.is_builtin(key):
+                continue
 
-        # Only keep top n_slow_children
-        n_children = self.get_conf('n_slow_children')
-        return children[:n_children]
+            children.append(key)
+
+        return children
 
     def show_slow_items(self, children=None):
         """Show slow items."""
@@ -742,6 +1111,146 @@ def redo(self):
         if len(self.redo_history) > 0:
             self._show_tree(self.redo_history.pop(-1), reset_redo=False)
 
+    def currentItem(self):
+        """Get the current item."""
+        index = self.currentIndex()
+        if not index.isValid():
+            return None
+        return self.tree_model.item(index)
+
+    def setCurrentItem(self, item):
+        """Set the current item."""
+        self.setCurrentIndex(self.tree_model.index_of(item))
+
+    def sortColumn(self):
+        """Get the column used to sort the tree."""
+        return self.header().sortIndicatorSection()
+
+    def get_top_level_items(self):
+        """Iterate over top level items."""
+        return list(self.tree_model.root.children)
+
+    def get_items(self, maxlevel):
+        """Return all items with a level <= `maxlevel`"""
+        itemlist = []
+
+        def add_to_itemlist(item, maxlevel, level=1):
+            level += 1
+            for citem in item.children or []:
+                itemlist.append(citem)
+                if level <= maxlevel:
+                    add_to_itemlist(citem, maxlevel, level)
+
+        for tlitem in self.get_top_level_items():
+            itemlist.append(tlitem)
+            if maxlevel > 0:
+                add_to_itemlist(tlitem, maxlevel=maxlevel)
+
+        return itemlist
+
+    def change_view(self, change_in_depth):
+        """
+        Change the view depth by expand or collapsing all same-level nodes.
+        """
+        self.current_view_depth += change_in_depth
+        if self.current_view_depth < 0:
+            self.current_view_depth = 0
+        self.collapseAll()
+        if self.current_view_depth > 0:
+            for item in self.get_items(maxlevel=self.current_view_depth-1):
+                index = self.tree_model.index_of(item)
+
+                # Create children right away so they can be expanded in the
+                # next iteration.
+                self.tree_model.fetchMore(index)
+                self.expand(index)
+
+    def set_tooltips(self):
+        """Set tooltips."""
+        if self.memory:
+            tooltips = {
+                "function_name": _('Line where memory was allocated'),
+                "total_time": _(
+                    'Memory allocated by the line and the code it calls, '
+                    'which was not freed'
+                ),
+                "local_time": _(
+                    'Memory allocated by the line itself, which was not '
+                    'freed'
+                ),
+                "number_calls": _('Number of memory blocks allocated'),
+                "file:line": _('File and line number')
+            }
+        else:
+            tooltips = {
+                "function_name": _('Function or module name'),
+                "total_time": _(
+                    'Time spent in function (including sub-functions)'
+                ),
+                "local_time": _(
+                    'Local time spent in function (not in sub-functions)'
+                ),
+                "number_calls": _(
+                    'Total number of calls (including recursion)'
+                ),
+                "file:line": _('File and line where the function is defined')
+            }
+
+        for column_name, tip_text in tooltips.items():
+            self.header_tooltips[self.index_dict[column_name]] = '\n'.join(
+                textwrap.wrap(tip_text, 50)
+            )
+
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _load_stacks(self, profdatafile):
+        """
+        Load the stacks saved after the stats by the sampling and memory
+        profilers, if any.
+        """
+        with open(profdatafile, "rb") as f:
+            try:
+                marshal.load(f)
+                stacks = marshal.load(f)
+            except (EOFError, ValueError, TypeError):
+                return None
+        return stacks if isinstance(stacks, dict) else None
+
+    def _set_profdata(self, profdata):
+        """Set profiler data and its columnar representation."""
+        self.profdata = profdata
+        self.stacks = None
+        self.tree_model.stats = (
+            None if profdata is None else ProfilerStats(profdata.stats)
+        )
+
+    def _set_compare_data(self, compare_data):
+        """Set compare data and its columnar representation."""
+        self.compare_data = compare_data
+        self.tree_model.compare_stats = (
+            None if compare_data is None
+            else ProfilerStats(compare_data.stats)
+        )
+
+    def _is_builtin(self, key):
+        path = key[0]
+        if not path:
+            return True
+        if path == "~":
+            return True
+        if path.startswith("<"):
+            return True
+
+        path = os.path.normcase(os.path.normpath(path))
+        if self.lib_pathlist is not None:
+            for libpath in self.lib_pathlist:
+                libpath = os.path.normcase(os.path.normpath(libpath))
+                commonpath = os.path.commonpath([libpath, path])
+                if libpath == commonpath:
+                    return True
+
+        return False
+
     def _show_tree(
         self,
         children=None,
@@ -757,16 +1266,17 @@ def _show_tree(
         self._last_children = children
 
         # List of frames to hide at the top
+        stats = self.tree_model.stats
         head_list = [self.root_key, ]
-        head_list += list(
-            self.profdata.stats[self.root_key][ProfilerKey.Callers])
+        head_list += stats.callers(self.root_key)
 
         if children is None:
             if self.inverted_tree:
                 # Show all callees
                 self.tree_state = None
                 children = []
-                for key, value in self.profdata.all_callees.items():
+                for key in stats.keys:
+                    value = stats.callees(key)
                     if key in self.FUNCTIONS_TO_EXCLUDE or key in head_list:
                         continue
                     if self.ignore_builtins:
@@ -796,7 +1306,6 @@ def _show_tree(
 
         self.initialize_view()  # Clear before re-populating
         self.setItemsExpandable(True)
-        self.setSortingEnabled(False)
         if children is not None:
             if len(self.history) == 0 or self.history[-1] != children:
                 # Do not add twice the same element
@@ -805,112 +1314,8 @@ def _show_tree(
                     self.redo_history = []
 
             # Populate the tree
-            self.populate_tree(self, children)
-            self.setSortingEnabled(True)
-            self.sortItems(self.index_dict[sort_time], Qt.AscendingOrder)
+            self.tree_model.set_items(children)
+            self.sortByColumn(self.index_dict[sort_time], Qt.AscendingOrder)
             self.resizeColumnToContents(0)
 
         self.sig_refresh.emit()
-
-    def populate_tree(self, parentItem, children_list):
-        """
-        Recursive method to create each item (and associated data)
-        in the tree.
-        """
-        children_list = [
-            c for c in children_list if c not in self.FUNCTIONS_TO_EXCLUDE
-        ]
-
-        for child_key in children_list:
-            item_profdata, item_compdata = self.get_item_data(child_key)
-            child_item = TreeWidgetItem(
-                parentItem,
-                child_key,
-                item_profdata,
-                item_compdata,
-                self.icon_list,
-                self.index_dict
-            )
-            if not child_item.is_recursive():
-                grandchildren_list = self.find_children(child_key)
-                if grandchildren_list:
-                    child_item.setChildIndicatorPolicy(
-                        child_item.ShowIndicator
-                    )
-                    self.items_to_be_shown[id(child_item)] = grandchildren_list
-
-    def get_item_data(self, item_key):
-        """Return the profile and compare data for the item_key."""
-        item_profdata = self.profdata.stats.get(item_key, [0, 0, 0, 0, {}])
-        item_compdata = None
-        if self.compare_data is not None:
-            item_compdata = self.compare_data.stats.get(
-                item_key, [0, 0, 0, 0, {}]
-            )
-        return item_profdata, item_compdata
-
-    def item_expanded(self, item):
-        """Fill item children."""
-        if item.childCount() == 0 and id(item) in self.items_to_be_shown:
-            children_list = self.items_to_be_shown[id(item)]
-            self.populate_tree(item, children_list)
-
-    def get_top_level_items(self):
-        """Iterate over top level items."""
-        return [self.topLevelItem(_i)
-                for _i in range(self.topLevelItemCount())]
-
-    def get_items(self, maxlevel):
-        """Return all items with a level <= `maxlevel`"""
-        itemlist = []
-
-        def add_to_itemlist(item, maxlevel, level=1):
-            level += 1
-            for index in range(item.childCount()):
-                citem = item.child(index)
-                itemlist.append(citem)
-                if level <= maxlevel:
-                    add_to_itemlist(citem, maxlevel, level)
-
-        for tlitem in self.get_top_level_items():
-            itemlist.append(tlitem)
-            if maxlevel > 0:
-                add_to_itemlist(tlitem, maxlevel=maxlevel)
-
-        return itemlist
-
-    def change_view(self, change_in_depth):
-        """
-        Change the view depth by expand or collapsing all same-level nodes.
-        """
-        self.current_view_depth += change_in_depth
-        if self.current_view_depth < 0:
-            self.current_view_depth = 0
-        self.collapseAll()
-        if self.current_view_depth > 0:
-            for item in self.get_items(maxlevel=self.current_view_depth-1):
-                item.setExpanded(True)
-
-    def set_tooltips(self):
-        """Set tooltips."""
-        tooltips = {
-            "function_name": _('Function or module name'),
-            "total_time": _(
-                'Time spent in function (including sub-functions)'
-            ),
-            "local_time": _(
-                'Local time spent in function (not in sub-functions)'
-            ),
-            "number_calls": _('Total number of calls (including recursion)'),
-            "file:line": _('File and line where the function is defined')
-        }
-
-        for column_name, tip_text in tooltips.items():
-            self.headerItem().setIcon(
-                self.index_dict[column_name], ima.icon('question_tip_hover')
-            )
-
-            tip_text = '\n'.join(textwrap.wrap(tip_text, 50))
-            self.headerItem().setToolTip(
-                self.index_dict[column_name], tip_text
-            )
@@ -202,6 +202,7 @@ def __init__(self, name, plugin, parent=None):
         # -- Watcher
         self.watcher = WorkspaceWatcher(self)
         self.watcher.connect_signals(self)
+        self.watcher.connect_signals(self.treewidget.vcs_status)
 
         # -- Worker manager for calls to fzf
         self._worker_manager = WorkerManager(self)
@@ -308,6 +309,7 @@ def update_actions(self):
 
     def on_close(self):
         self._worker_manager.terminate_all()
+        self.treewidget.vcs_status.close()
 
     # ---- Public API
     # -------------------------------------------------------------------------
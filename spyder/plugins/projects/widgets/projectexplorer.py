@@ -171,6 +171,7 @@ def set_root_path(self, root_path):
         """
         self.root_path = root_path
         self.install_model()
+        self.vcs_status.set_root_path(None)
         index = self.fsmodel.setRootPath(root_path)
         self.proxymodel.setup_filter(self.root_path, [])
         self.setRootIndex(self.proxymodel.mapFromSource(index))
@@ -203,6 +204,7 @@ def set_folder_names(self, folder_names):
         ]
         self.proxymodel.setup_filter(self.root_path, path_list)
         self.itemDelegate().set_project_dir(self.proxymodel.path_list[0])
+        self.vcs_status.set_root_path(self.proxymodel.path_list[0])
 
     def get_filename(self, index):
         """
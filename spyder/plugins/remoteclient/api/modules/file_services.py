@@ -6,11 +6,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
 import json
+import mmap
+import os
+import posixpath
 import typing
 from http import HTTPStatus
 from io import RawIOBase
+import zlib
 
 import aiohttp
 
@@ -28,6 +34,241 @@
     from pathlib import Path
 
 
+# Binary frames starting with this byte carry raw file data instead of JSON.
+# This must be kept in sync with spyder-remote-services.
+STREAM_DATA_PREFIX = b"\x00"
+STREAM_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+# Modulus of the adler32 checksum used to find unchanged blocks in delta
+# transfers
+ADLER32_MOD = 65521
+
+# Files bigger than this are uploaded whole instead of through a delta
+DELTA_MAX_SIZE = 4 * 1024 * 1024 * 1024  # 4 GB
+
+# Number of bytes the weak checksum can be rolled over per file to find
+# blocks that were moved by insertions or deletions. Rolling is done one byte
+# at a time in Python, so past this the data is compared block by block.
+DELTA_ROLL_MAX_BYTES = 1024 * 1024  # 1 MB
+
+# Deltas with more literal data than this are replaced by a whole upload,
+# which streams the file instead of sending it in a single request.
+DELTA_MAX_LITERAL_SIZE = 16 * 1024 * 1024  # 16 MB
+
+# Names of files and directories skipped when synchronizing directories
+SYNC_EXCLUDED_NAMES = frozenset({
+    ".git",
+    ".hg",
+    ".svn",
+    "__pycache__",
+    ".ipynb_checkpoints",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".spyproject",
+})
+
+
+def _hash_file(file, size=None):
+    """
+    Compute the sha256 of the first size bytes of an open binary file.
+
+    Returns the hash object and the number of bytes read.
+    """
+    hasher = hashlib.sha256()
+    file.seek(0)
+    read = 0
+    while size is None or read < size:
+        n = (
+            STREAM_CHUNK_SIZE
+            if size is None
+            else min(STREAM_CHUNK_SIZE, size - read)
+        )
+        chunk = file.read(n)
+        if not chunk:
+            break
+        hasher.update(chunk)
+        read += len(chunk)
+    return hasher, read
+
+
+def _strong_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _roll_adler32(checksum, out_byte, in_byte, block_size):
+    """Slide the adler32 checksum of a block_size window by one byte."""
+    a = checksum & 0xFFFF
+    b = checksum >> 16
+    a = (a - out_byte + in_byte) % ADLER32_MOD
+    b = (b - block_size * out_byte + a - 1) % ADLER32_MOD
+    return (b << 16) | a
+
+
+def _compute_delta(data, signature, max_literal_size=None):
+    """
+    Compute the delta that turns the remote file into data.
+
+    This is the sender side of the rsync algorithm: a window slides over
+    data, and blocks whose weak and strong checksums match a block of the
+    remote file are replaced by a reference to it. After a match the window
+    jumps a whole block, so unchanged data is checked at the speed of the
+    hash functions. The window is only moved one byte at a time after a
+    mismatch, and for at most DELTA_ROLL_MAX_BYTES per file.
+
+    Parameters
+    ----------
+    data : bytes or mmap.mmap
+        New content of the file.
+    signature : dict
+        Signature of the remote file, as returned by
+        SpyderRemoteFileServicesAPI.signature.
+    max_literal_size : int, optional
+        Maximum number of bytes to send as literal data.
+
+    Returns
+    -------
+    list
+        Operations that are either [start, count] (copy count blocks
+        starting at the block start of the remote file) or a base64 string
+        with literal data.
+    int
+        Number of bytes sent as literal data.
+
+    Or None if the delta would have more than max_literal_size bytes of
+    literal data.
+    """
+    size = len(data)
+    if max_literal_size is None:
+        max_literal_size = size
+
+    blocks = signature["blocks"]
+    if not blocks:
+        # No block can match, e.g. because the remote file doesn't exist
+        if not data:
+            return [], 0
+        if size > max_literal_size:
+            return None
+        return [base64.b64encode(data[:]).decode("ascii")], size
+
+    block_size = signature["block_size"]
+    full_blocks, tail_size = divmod(signature["size"], block_size)
+
+    index = {}
+    for i, (weak, strong) in enumerate(blocks[:full_blocks]):
+        index.setdefault(weak, {}).setdefault(strong, i)
+
+    ops = []
+    literal_bytes = 0
+    literal_start = 0
+
+    def add_literal(end):
+        nonlocal literal_bytes
+        if end > literal_start:
+            ops.append(
+                base64.b64encode(data[literal_start:end]).decode("ascii")
+            )
+            literal_bytes += end - literal_start
+
+    def add_copy(block):
+        if ops and not isinstance(ops[-1], str) and sum(ops[-1]) == block:
+            ops[-1][1] += 1
+        else:
+            ops.append([block, 1])
+
+    pos = 0
+    weak = None
+    roll_budget = DELTA_ROLL_MAX_BYTES
+    while pos + block_size <= size:
+        if weak is None:
+            weak = zlib.adler32(data[pos:pos + block_size])
+
+        matches = index.get(weak)
+        if matches:
+            block = matches.get(_strong_hash(data[pos:pos + block_size]))
+            if block is not None:
+                add_literal(pos)
+                add_copy(block)
+                pos += block_size
+                literal_start = pos
+                weak = None
+                continue
+
+        if roll_budget > 0 and pos + block_size < size:
+            weak = _roll_adler32(
+                weak, data[pos], data[pos + block_size], block_size
+            )
+            roll_budget -= 1
+            pos += 1
+        else:
+            # Blocks after this one are still found if no data was inserted
+            # or removed before them
+            pos += block_size
+            weak = None
+
+        if literal_bytes + pos - literal_start > max_literal_size:
+            return None
+
+    # The last block of the remote file can be shorter than block_size
+    if tail_size and size - tail_size >= literal_start:
+        tail = data[size - tail_size:]
+        if [zlib.adler32(tail), _strong_hash(tail)] == blocks[full_blocks]:
+            add_literal(size - tail_size)
+            add_copy(full_blocks)
+            literal_start = size
+
+    if literal_bytes + size - literal_start > max_literal_size:
+        return None
+
+    add_literal(size)
+    return ops, literal_bytes
+
+
+def _file_delta(local_path, signature, max_literal_size=None):
+    """
+    Compute the delta and sha256 of local_path.
+
+    The file is mapped in memory instead of read, so only the parts that
+    are needed are loaded. Returns None if the delta has too much literal
+    data.
+    """
+    with open(local_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be mapped
+            data = b""
+        else:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            delta = _compute_delta(data, signature, max_literal_size)
+            if delta is None:
+                return None
+            ops, literal_bytes = delta
+            return ops, literal_bytes, hashlib.sha256(data).hexdigest()
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+def _scan_local_files(local_dir, exclude=SYNC_EXCLUDED_NAMES):
+    """Get the size and mtime of the files in local_dir, by relative path."""
+    files = {}
+    for root, dirs, filenames in os.walk(local_dir):
+        dirs[:] = [d for d in dirs if d not in exclude]
+        for filename in filenames:
+            if filename in exclude:
+                continue
+            full_path = os.path.join(root, filename)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            files[os.path.relpath(full_path, local_dir)] = (
+                st.st_size,
+                st.st_mtime,
+            )
+    return files
+
+
 class RemoteFileServicesError(SpyderRemoteAPIError):
     """
     Exception for errors related to remote file services.
@@ -44,6 +285,19 @@ def __str__(self):
         )
 
 
+class RemoteChecksumError(RemoteFileServicesError):
+    """
+    Exception for transferred files that don't match their source.
+    """
+    def __init__(self, filename, url):
+        super().__init__(
+            "ChecksumError",
+            f"The transferred data of {filename} is corrupted",
+            url,
+            [],
+        )
+
+
 class RemoteOSError(OSError, RemoteFileServicesError):
     """
     Exception for OSErrors raised on the remote server.
@@ -219,10 +473,13 @@ async def _send_request(self, method: str, **args):
         await self._websocket.send_json({"method": method, **args})
 
     async def _get_response(self, timeout=None):
-        message = json.loads(
+        return self._parse_response(
             await self._websocket.receive_bytes(timeout=timeout)
         )
 
+    def _parse_response(self, raw_message: bytes):
+        message = json.loads(raw_message)
+
         if message["status"] > 400:
             if message["status"] == HTTPStatus.EXPECTATION_FAILED:
                 raise RemoteOSError.from_json(
@@ -336,6 +593,139 @@ async def writable(self) -> bool:
         await self._send_request("writable")
         return await self._get_response()
 
+    async def download_to(
+        self,
+        local_path: str,
+        *,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        progress_callback=None,
+    ) -> int:
+        """
+        Stream the file to local_path in chunks, as raw binary frames.
+
+        If local_path already contains the first bytes of the file (e.g.
+        because a previous download was interrupted), only the rest of the
+        file is transferred.
+
+        Parameters
+        ----------
+        local_path : str
+            Local file where the data is written.
+        chunk_size : int, optional
+            Size of the chunks sent by the server.
+        progress_callback : callable, optional
+            Called with the number of bytes transferred so far and the total
+            size of the file after every chunk.
+
+        Returns
+        -------
+        int
+            Size of the downloaded file.
+
+        Raises
+        ------
+        RemoteChecksumError
+            If the downloaded file doesn't match the remote one.
+        """
+        with open(local_path, "a+b") as local_file:
+            hasher, offset = _hash_file(local_file)
+            await self._send_request(
+                "read_stream",
+                offset=offset,
+                checksum=hasher.hexdigest() if offset else None,
+                chunk_size=chunk_size,
+            )
+            header = await self._get_response()
+
+            if header["offset"] != offset:
+                # The local data doesn't match the remote file
+                offset = header["offset"]
+                local_file.truncate(offset)
+                hasher = hashlib.sha256()
+
+            size = header["size"]
+            while True:
+                frame = await self._websocket.receive_bytes()
+                if frame[:1] != STREAM_DATA_PREFIX:
+                    result = self._parse_response(frame)
+                    break
+
+                chunk = memoryview(frame)[1:]
+                local_file.write(chunk)
+                hasher.update(chunk)
+                offset += len(chunk)
+                if progress_callback is not None:
+                    progress_callback(offset, size)
+
+        if result["checksum"] != hasher.hexdigest():
+            raise RemoteChecksumError(
+                self.name, url=self._websocket._response.url
+            )
+
+        return offset
+
+    async def upload_from(
+        self,
+        local_path: str,
+        *,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        progress_callback=None,
+        mtime: float | None = None,
+    ) -> int:
+        """
+        Stream local_path to the file in chunks, as raw binary frames.
+
+        The file must be opened in "a+b" mode. If it already contains the
+        first bytes of local_path (e.g. because a previous upload was
+        interrupted), only the rest of the data is transferred.
+
+        Parameters
+        ----------
+        local_path : str
+            Local file to upload.
+        chunk_size : int, optional
+            Size of the chunks sent to the server.
+        progress_callback : callable, optional
+            Called with the number of bytes transferred so far and the total
+            size of the file after every chunk.
+        mtime : float, optional
+            Modification time given to the file once the transfer is done.
+
+        Returns
+        -------
+        int
+            Size of the uploaded file.
+        """
+        size = os.path.getsize(local_path)
+
+        await self._send_request("stream_checksum")
+        remote = await self._get_response()
+
+        with open(local_path, "rb") as local_file:
+            offset = 0
+            hasher = hashlib.sha256()
+            if 0 < remote["size"] <= size:
+                prefix_hash, __ = _hash_file(local_file, remote["size"])
+                if prefix_hash.hexdigest() == remote["checksum"]:
+                    hasher, offset = prefix_hash, remote["size"]
+
+            await self._send_request("write_stream", offset=offset)
+            await self._get_response()
+
+            local_file.seek(offset)
+            while chunk := local_file.read(chunk_size):
+                hasher.update(chunk)
+                await self._websocket.send_bytes(STREAM_DATA_PREFIX + chunk)
+                offset += len(chunk)
+                if progress_callback is not None:
+                    progress_callback(offset, size)
+
+        end_args = {"checksum": hasher.hexdigest()}
+        if mtime is not None:
+            end_args["mtime"] = mtime
+        await self._send_request("end_write_stream", **end_args)
+        return (await self._get_response())["size"]
+
 
 @SpyderRemoteAPIManagerBase.register_api
 class SpyderRemoteFileServicesAPI(SpyderBaseJupyterAPI):
@@ -414,6 +804,27 @@ async def exists(self, path: Path):
         ) as response:
             return await response.json()
 
+    async def stat_many(self, paths: list[Path]):
+        """
+        Get info about several paths in a single request.
+
+        Entries of paths that can't be accessed contain an "error" key with
+        the errno, strerror and filename of the error.
+        """
+        async with self.session.post(
+            self.api_url / "stat_many",
+            json={"paths": [f"file://{path}" for path in paths]},
+        ) as response:
+            return await response.json()
+
+    async def exists_many(self, paths: list[Path]) -> list[bool]:
+        """Check if several paths exist in a single request."""
+        async with self.session.post(
+            self.api_url / "exists_many",
+            json={"paths": [f"file://{path}" for path in paths]},
+        ) as response:
+            return await response.json()
+
     async def is_file(self, path: Path):
         async with self.session.get(
             self.api_url / "isfile",
@@ -507,6 +918,210 @@ async def open(
         await file.connect()
         return file
 
+    async def download(
+        self,
+        path: Path,
+        local_path: str,
+        *,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        progress_callback=None,
+    ) -> int:
+        """
+        Download a remote file to local_path in chunks.
+
+        Data is first written to local_path + ".part", which is renamed to
+        local_path once the transfer is complete. An interrupted download is
+        resumed from that file the next time it's requested.
+
+        See SpyderRemoteFileIOAPI.download_to for the parameters.
+        """
+        partial_path = local_path + ".part"
+        async with await self.open(path, mode="rb") as file:
+            size = await file.download_to(
+                partial_path,
+                chunk_size=chunk_size,
+                progress_callback=progress_callback,
+            )
+        os.replace(partial_path, local_path)
+        return size
+
+    async def upload(
+        self,
+        local_path: str,
+        path: Path,
+        *,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        progress_callback=None,
+        mtime: float | None = None,
+    ) -> int:
+        """
+        Upload local_path to a remote file in chunks.
+
+        If a previous upload of the same file was interrupted, only the data
+        that didn't reach the server is sent.
+
+        See SpyderRemoteFileIOAPI.upload_from for the parameters.
+        """
+        async with await self.open(path, mode="a+b") as file:
+            return await file.upload_from(
+                local_path,
+                chunk_size=chunk_size,
+                progress_callback=progress_callback,
+                mtime=mtime,
+            )
+
+    async def signature(self, path: Path, block_size: int | None = None):
+        """
+        Get the block signatures of a remote file for a delta transfer.
+
+        If block_size is not given, the server chooses it from the size of
+        the file.
+        """
+        async with self.session.get(
+            self.api_url / "signature",
+            params={"path": f"file://{path}", "block_size": block_size or 0},
+        ) as response:
+            return await response.json()
+
+    async def patch(
+        self,
+        path: Path,
+        delta: list,
+        block_size: int,
+        checksum: str,
+        mtime: float | None = None,
+    ):
+        """
+        Rebuild a remote file from its current content and a delta.
+
+        The file is only replaced if the result matches checksum (its
+        sha256), otherwise {"success": False} is returned.
+        """
+        async with self.session.post(
+            self.api_url / "patch",
+            params={"path": f"file://{path}"},
+            json={
+                "delta": delta,
+                "block_size": block_size,
+                "checksum": checksum,
+                "mtime": mtime,
+            },
+        ) as response:
+            return await response.json()
+
+    async def sync_file(self, local_path: str, path: Path) -> dict:
+        """
+        Make a remote file equal to local_path, sending only changed blocks.
+
+        The remote file gets the same mtime as local_path, which allows
+        sync_directory to skip it until it changes again.
+
+        Returns
+        -------
+        dict
+            "size" of the file and number of "sent" bytes of file data.
+        """
+        st = os.stat(local_path)
+        if st.st_size > DELTA_MAX_SIZE:
+            size = await self.upload(local_path, path, mtime=st.st_mtime)
+            return {"size": size, "sent": size}
+
+        signature = await self.signature(path)
+        delta = await asyncio.to_thread(
+            _file_delta,
+            local_path,
+            signature,
+            min(st.st_size // 2, DELTA_MAX_LITERAL_SIZE),
+        )
+        if delta is None:
+            # Most of the file changed, so it's faster to send it whole
+            size = await self.upload(local_path, path, mtime=st.st_mtime)
+            return {"size": size, "sent": size}
+
+        delta, sent, checksum = delta
+        result = await self.patch(
+            path, delta, signature["block_size"], checksum, mtime=st.st_mtime
+        )
+        if not result["success"]:
+            # The remote file changed after getting its signature
+            size = await self.upload(local_path, path, mtime=st.st_mtime)
+            return {"size": size, "sent": size}
+
+        return {"size": st.st_size, "sent": sent}
+
+    async def _sync_files(self, local_dir, path, local_files):
+        relpaths = list(local_files)
+        if not relpaths:
+            return []
+
+        remote_paths = [
+            posixpath.join(path, *relpath.split(os.sep))
+            for relpath in relpaths
+        ]
+        remote_info = await self.stat_many(remote_paths)
+
+        synced = []
+        created_dirs = set()
+        for relpath, remote_path, info in zip(
+            relpaths, remote_paths, remote_info
+        ):
+            size, mtime = local_files[relpath]
+            if (
+                "error" not in info
+                and info["size"] == size
+                and abs(info["mtime"] - mtime) < 1e-3
+            ):
+                continue
+
+            parent = posixpath.dirname(remote_path)
+            if "error" in info and parent not in created_dirs:
+                await self.mkdir(parent, exist_ok=True)
+                created_dirs.add(parent)
+
+            try:
+                await self.sync_file(
+                    os.path.join(local_dir, relpath), remote_path
+                )
+            except FileNotFoundError:
+                # Removed locally after scanning the directory
+                continue
+            synced.append(relpath)
+
+        return synced
+
+    async def sync_directory(
+        self,
+        local_dir: str,
+        path: Path,
+        *,
+        exclude=SYNC_EXCLUDED_NAMES,
+    ) -> list[str]:
+        """
+        Copy the files of local_dir to a remote directory, rsync-like.
+
+        Files whose remote copy has the same size and mtime are skipped, and
+        only the changed blocks of the others are sent. Remote files that
+        don't exist locally are kept.
+
+        Parameters
+        ----------
+        local_dir : str
+            Local directory to synchronize.
+        path : Path
+            Remote directory.
+        exclude : set of str, optional
+            Names of files and directories to skip.
+
+        Returns
+        -------
+        list of str
+            Paths, relative to local_dir, of the files that were sent.
+        """
+        local_files = await asyncio.to_thread(
+            _scan_local_files, local_dir, exclude
+        )
+        return await self._sync_files(local_dir, path, local_files)
+
     async def zip_directory(
         self, path: Path, *, compression_level: int = 5
     ):
@@ -0,0 +1,127 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2009- Spyder Project Contributors
+#
+# Distributed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+"""Tests for the deltas computed to synchronize files."""
+
+# Standard library imports
+import base64
+import hashlib
+import os
+import zlib
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.remoteclient.api.modules import file_services
+from spyder.plugins.remoteclient.api.modules.file_services import (
+    _compute_delta,
+    _file_delta,
+    _strong_hash,
+)
+
+
+BLOCK_SIZE = 1024
+
+
+def signature(data, block_size=BLOCK_SIZE):
+    """Signature of a remote file with the given content."""
+    return {
+        "size": len(data),
+        "block_size": block_size,
+        "blocks": [
+            [zlib.adler32(block), _strong_hash(block)]
+            for block in (
+                data[i:i + block_size]
+                for i in range(0, len(data), block_size)
+            )
+        ],
+    }
+
+
+def apply_delta(old, ops, block_size=BLOCK_SIZE):
+    """Rebuild a file from the content of the remote one and a delta."""
+    new = b""
+    for op in ops:
+        if isinstance(op, str):
+            new += base64.b64decode(op)
+        else:
+            start, count = op
+            new += old[start * block_size:(start + count) * block_size]
+    return new
+
+
+@pytest.fixture
+def old():
+    return os.urandom(100 * BLOCK_SIZE + 100)
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        # Data changed in place
+        lambda data: data[:5000] + b"changed" + data[5007:],
+        # Data inserted, which moves the blocks after it
+        lambda data: data[:5000] + b"inserted" + data[5000:],
+        # Data removed
+        lambda data: data[:5000] + data[6000:],
+        # Data appended
+        lambda data: data + b"appended",
+    ]
+)
+def test_compute_delta(old, edit):
+    """Check that only the changed blocks are sent."""
+    new = edit(old)
+    ops, literal_bytes = _compute_delta(new, signature(old))
+    assert apply_delta(old, ops) == new
+    assert literal_bytes <= 2 * BLOCK_SIZE + 100
+
+
+def test_compute_delta_roll_budget(old, monkeypatch):
+    """
+    Check that unchanged blocks are found without rolling the checksum if
+    they stay in place.
+    """
+    monkeypatch.setattr(file_services, "DELTA_ROLL_MAX_BYTES", 0)
+
+    new = old[:5000] + b"changed" + old[5007:]
+    ops, literal_bytes = _compute_delta(new, signature(old))
+    assert apply_delta(old, ops) == new
+    assert literal_bytes <= 2 * BLOCK_SIZE + 100
+
+    # Inserted data can only be found up to the budget
+    new = old[:5000] + b"inserted" + old[5000:]
+    ops, literal_bytes = _compute_delta(new, signature(old))
+    assert apply_delta(old, ops) == new
+    assert literal_bytes > len(old) // 2
+
+
+def test_compute_delta_max_literal_size(old):
+    """Check that no delta is computed if most of the file changed."""
+    new = os.urandom(len(old))
+    assert _compute_delta(new, signature(old), len(old) // 2) is None
+    assert _compute_delta(new, signature(b""), len(old) // 2) is None
+
+    ops, literal_bytes = _compute_delta(new, signature(b""))
+    assert apply_delta(b"", ops) == new
+    assert literal_bytes == len(new)
+
+
+@pytest.mark.parametrize("content", [b"", os.urandom(10 * BLOCK_SIZE)])
+def test_file_delta(tmp_path, content):
+    """Check the delta and checksum of a file."""
+    path = tmp_path / "data.bin"
+    path.write_bytes(content)
+
+    ops, literal_bytes, checksum = _file_delta(str(path), signature(content))
+    assert apply_delta(content, ops) == content
+    assert literal_bytes == 0
+    assert checksum == hashlib.sha256(content).hexdigest()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -7,6 +7,7 @@
 
 """Tests for the remote files API."""
 import io
+import os
 import zipfile
 
 # Third party imports
@@ -14,6 +15,7 @@
 
 from spyder.api.asyncdispatcher import AsyncDispatcher
 from spyder.plugins.remoteclient.plugin import RemoteClient
+from spyder.plugins.remoteclient.api.modules import file_services
 from spyder.plugins.remoteclient.api.modules.file_services import RemoteOSError
 from spyder.plugins.remoteclient.tests.conftest import mark_remote_test
 
@@ -80,6 +82,29 @@ async def test_list_directories(
                 assert ls_content["ino"] > 0
                 assert ls_content["nlink"] == 1
 
+    @AsyncDispatcher(early_return=False)
+    async def test_stat_exists_many(
+        self,
+        remote_client: RemoteClient,
+        remote_client_id: str,
+    ):
+        """Test that several paths can be checked in a single request."""
+        file_api_class = remote_client.get_file_api(remote_client_id)
+        assert file_api_class is not None
+
+        paths = [
+            self.remote_temp_dir + "/test.txt",
+            self.remote_temp_dir + "/missing.txt",
+        ]
+        async with file_api_class() as file_api:
+            assert await file_api.exists_many(paths) == [True, False]
+
+            info, missing = await file_api.stat_many(paths)
+            assert info["name"] == paths[0]
+            assert info["size"] == 13
+            assert missing["name"] == paths[1]
+            assert missing["error"]["errno"] == 2
+
     @AsyncDispatcher(early_return=False)
     async def test_copy_file(
         self,
@@ -140,6 +165,144 @@ async def test_zip_dir(
             ) as file:
                 assert file.read() == b"Hello, world!"
 
+    @AsyncDispatcher(early_return=False)
+    async def test_upload_download_file(
+        self,
+        remote_client: RemoteClient,
+        remote_client_id: str,
+        tmp_path,
+    ):
+        """Test that files can be transferred in chunks and resumed."""
+        file_api_class = remote_client.get_file_api(remote_client_id)
+        assert file_api_class is not None
+
+        content = bytes(range(256)) * 1000
+        local_file = tmp_path / "test.bin"
+        local_file.write_bytes(content)
+        remote_file = self.remote_temp_dir + "/test.bin"
+        downloaded_file = tmp_path / "downloaded.bin"
+
+        progress = []
+        async with file_api_class() as file_api:
+            assert await file_api.upload(
+                str(local_file),
+                remote_file,
+                chunk_size=65536,
+                progress_callback=lambda *args: progress.append(args),
+            ) == len(content)
+            assert progress[-1] == (len(content), len(content))
+
+            assert await file_api.download(
+                remote_file, str(downloaded_file), chunk_size=65536
+            ) == len(content)
+            assert downloaded_file.read_bytes() == content
+
+            # Resume an interrupted download
+            partial_file = tmp_path / "downloaded.bin.part"
+            partial_file.write_bytes(content[:1000])
+            progress = []
+            await file_api.download(
+                remote_file,
+                str(downloaded_file),
+                progress_callback=lambda *args: progress.append(args),
+            )
+            assert downloaded_file.read_bytes() == content
+            assert not partial_file.exists()
+            assert len(progress) == 1
+
+            # Data that doesn't match the remote file is downloaded again
+            partial_file.write_bytes(b"x" * 1000)
+            await file_api.download(remote_file, str(downloaded_file))
+            assert downloaded_file.read_bytes() == content
+
+            assert await file_api.unlink(remote_file) == {"success": True}
+
+    @AsyncDispatcher(early_return=False)
+    async def test_sync_directory(
+        self,
+        remote_client: RemoteClient,
+        remote_client_id: str,
+        tmp_path,
+    ):
+        """Test that only changed files and blocks are synchronized."""
+        file_api_class = remote_client.get_file_api(remote_client_id)
+        assert file_api_class is not None
+
+        content = bytes(range(256)) * 1000
+        local_dir = tmp_path / "project"
+        (local_dir / "pkg").mkdir(parents=True)
+        (local_dir / "pkg" / "data.bin").write_bytes(content)
+        (local_dir / "main.py").write_text("print('Hello')\n")
+        (local_dir / "__pycache__").mkdir()
+        (local_dir / "__pycache__" / "main.pyc").write_bytes(b"x")
+        remote_dir = self.remote_temp_dir + "/project"
+
+        async with file_api_class() as file_api:
+            synced = await file_api.sync_directory(str(local_dir), remote_dir)
+            assert sorted(synced) == ["main.py", os.path.join("pkg", "data.bin")]
+            assert not await file_api.exists(
+                remote_dir + "/__pycache__/main.pyc"
+            )
+
+            # Nothing is sent if no file changed
+            assert await file_api.sync_directory(
+                str(local_dir), remote_dir
+            ) == []
+
+            # Only the changed block is sent
+            new_content = content[:5000] + b"changed" + content[5007:]
+            (local_dir / "pkg" / "data.bin").write_bytes(new_content)
+            result = await file_api.sync_file(
+                str(local_dir / "pkg" / "data.bin"),
+                remote_dir + "/pkg/data.bin",
+            )
+            assert result["size"] == len(new_content)
+            assert 0 < result["sent"] < 10000
+
+            async with await file_api.open(
+                remote_dir + "/pkg/data.bin", "rb"
+            ) as file:
+                assert await file.read() == new_content
+
+            assert await file_api.rmdir(remote_dir, non_empty=True) == {
+                "success": True
+            }
+
+    @AsyncDispatcher(early_return=False)
+    async def test_sync_directory_upload(
+        self,
+        remote_client: RemoteClient,
+        remote_client_id: str,
+        tmp_path,
+        monkeypatch,
+    ):
+        """Test that files uploaded whole are not synchronized again."""
+        file_api_class = remote_client.get_file_api(remote_client_id)
+        assert file_api_class is not None
+
+        # Upload files instead of sending a delta
+        monkeypatch.setattr(file_services, "DELTA_MAX_SIZE", 1000)
+
+        content = bytes(range(256)) * 100
+        local_dir = tmp_path / "project"
+        local_dir.mkdir()
+        (local_dir / "data.bin").write_bytes(content)
+        remote_dir = self.remote_temp_dir + "/project"
+
+        async with file_api_class() as file_api:
+            assert await file_api.sync_directory(
+                str(local_dir), remote_dir
+            ) == ["data.bin"]
+
+            # The remote file got the local mtime, so nothing is sent
+            assert await file_api.sync_directory(
+                str(local_dir), remote_dir
+            ) == []
+
+            assert await file_api.rmdir(remote_dir, non_empty=True) == {
+                "success": True
+            }
+
     @AsyncDispatcher(early_return=False)
     async def test_rm_file(
         self,
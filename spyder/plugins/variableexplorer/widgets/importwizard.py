@@ -23,19 +23,62 @@
                             QPushButton, QMessageBox, QRadioButton,
                             QSizePolicy, QSpacerItem, QTableView, QTabWidget,
                             QTextEdit, QVBoxLayout, QWidget)
+from spyder_kernels.utils.iofuncs import load_text
 from spyder_kernels.utils.lazymodules import (
     FakeObject, numpy as np, pandas as pd)
 
 # Local import
 from spyder.api.translations import _
 from spyder.api.widgets.menus import SpyderMenu
-from spyder.utils import programs
+from spyder.utils import encoding, programs
 from spyder.utils.icon_manager import ima
 from spyder.utils.qthelpers import add_actions, create_action
 from spyder.plugins.variableexplorer.widgets.basedialog import BaseDialog
 from spyder.utils.palette import SpyderPalette
 
 
+# Maximum number of lines and bytes shown in the contents and preview of the
+# data. Data with more lines is parsed with load_text instead of the preview.
+MAX_PREVIEW_LINES = 1000
+MAX_PREVIEW_BYTES = 1_000_000
+
+
+def read_text_sample(filename):
+    """
+    Read the start of a text file to preview it.
+
+    Returns the text, its encoding and whether it's the whole file.
+    """
+    lines = []
+    size = 0
+    with open(filename, 'rb') as f:
+        while len(lines) < MAX_PREVIEW_LINES and size < MAX_PREVIEW_BYTES:
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line)
+            size += len(line)
+        complete = not f.read(1)
+
+    text, coding = encoding.decode(b''.join(lines))
+
+    # Names of the encodings used by Python
+    coding = coding.replace('-guessed', '').replace('utf-8-bom', 'utf-8-sig')
+    return text, coding, complete
+
+
+def get_text_sample(text):
+    """Return the start of text to preview it and whether it's all of it."""
+    end = 0
+    for __ in range(MAX_PREVIEW_LINES):
+        newline = text.find('\n', end, MAX_PREVIEW_BYTES)
+        if newline == -1:
+            end = min(len(text), MAX_PREVIEW_BYTES)
+            break
+        end = newline + 1
+    return text[:end], end == len(text)
+
+
 def try_to_parse(value):
     _types = ('int', 'float')
     for _t in _types:
@@ -110,7 +153,7 @@ def __init__(self, parent, text):
         data_btn.setChecked(True)
         self._as_data= True
         type_layout.addWidget(data_btn)
-        code_btn = QRadioButton(_("code"))
+        self.code_btn = code_btn = QRadioButton(_("code"))
         self._as_code = False
         type_layout.addWidget(code_btn)
         txt_btn = QRadioButton(_("text"))
@@ -492,9 +535,17 @@ def get_data(self):
 
 
 class ImportWizard(BaseDialog):
-    """Text data import wizard"""
+    """
+    Text data import wizard
+
+    If filename is given, text is not used and only the start of the file is
+    read to preview it. When the file is too big to be previewed in full, the
+    data is not parsed by the wizard and get_import_options returns the
+    options to load it with load_text instead.
+    """
     def __init__(self, parent, text,
-                 title=None, icon=None, contents_title=None, varname=None):
+                 title=None, icon=None, contents_title=None, varname=None,
+                 filename=None):
         super().__init__(parent)
 
         # Destroying the C++ object right after closing the dialog box,
@@ -515,12 +566,38 @@ def __init__(self, parent, text,
             varname = _("variable_name")
 
         self.var_name, self.clip_data = None, None
+        self.import_options = None
+
+        # Only the start of the data is shown and previewed
+        self._text = text
+        self._filename = None
+        self._encoding = None
+        if filename is not None:
+            sample, self._encoding, self._complete = read_text_sample(
+                filename)
+            if self._complete:
+                self._text = sample
+            else:
+                self._filename = filename
+        elif pd.read_csv is FakeObject:
+            # All the data needs to be previewed to parse it without pandas
+            sample, self._complete = text, True
+        else:
+            sample, self._complete = get_text_sample(text)
 
         # Setting GUI
         self.tab_widget = QTabWidget(self)
-        self.text_widget = ContentsWidget(self, text)
+        self.text_widget = ContentsWidget(self, sample)
         self.table_widget = PreviewWidget(self)
 
+        if not self._complete:
+            # Conversions done in the preview can't be applied to the rest of
+            # the data
+            self.table_widget._table_view.setContextMenuPolicy(
+                Qt.NoContextMenu)
+            if self._filename is not None:
+                self.text_widget.code_btn.setEnabled(False)
+
         self.tab_widget.addTab(self.text_widget, _("text"))
         self.tab_widget.setTabText(0, contents_title)
         self.tab_widget.addTab(self.table_widget, _("table"))
@@ -547,7 +624,7 @@ def __init__(self, parent, text,
         btns_layout.addWidget(self.back_btn)
         self.back_btn.clicked.connect(ft_partial(self._set_step, step=-1))
         self.fwd_btn = QPushButton(_("Next"))
-        if not text:
+        if not sample:
             self.fwd_btn.setEnabled(False)
         btns_layout.addWidget(self.fwd_btn)
         self.fwd_btn.clicked.connect(ft_partial(self._set_step, step=1))
@@ -561,6 +638,12 @@ def __init__(self, parent, text,
         layout = QVBoxLayout()
         layout.addLayout(name_layout)
         layout.addWidget(self.tab_widget)
+        if not self._complete:
+            sample_label = QLabel(
+                _("Only the first lines of the data are shown. All of it "
+                  "will be imported when pressing <i>Done</i>.")
+            )
+            layout.addWidget(sample_label)
         layout.addLayout(btns_layout)
         self.setLayout(layout)
 
@@ -577,7 +660,7 @@ def _set_step(self, step):
         assert new_tab < self.tab_widget.count() and new_tab >= 0
         if new_tab == self.tab_widget.count()-1:
             try:
-                self.table_widget.open_data(self._get_plain_text(),
+                self.table_widget.open_data(self._get_preview_text(),
                                         self.text_widget.get_col_sep(),
                                         self.text_widget.get_row_sep(),
                                         self.text_widget.trnsp_box.isChecked(),
@@ -605,6 +688,14 @@ def get_data(self):
         # already been destroyed, due to the Qt.WA_DeleteOnClose attribute
         return self.var_name, self.clip_data
 
+    def get_import_options(self):
+        """
+        Return the options to load the data from the file with load_text.
+
+        This is None if the data was already processed by the wizard.
+        """
+        return self.import_options
+
     def _simplify_shape(self, alist, rec=0):
         """Reduce the alist dimension if needed"""
         if rec != 0:
@@ -615,8 +706,36 @@ def _simplify_shape(self, alist, rec=0):
             return self._simplify_shape(alist[-1], 1)
         return [self._simplify_shape(al, 1) for al in alist]
 
+    def _get_import_options(self):
+        """Return the options to process the data with load_text"""
+        if not self.text_widget.get_as_data():
+            as_type = 'text'
+        elif self.table_widget.array_btn.isChecked():
+            as_type = 'array'
+        elif pd and self.table_widget.df_btn.isChecked():
+            as_type = 'dataframe'
+        else:
+            as_type = 'list'
+
+        options = dict(
+            as_type=as_type,
+            colsep=self.text_widget.get_col_sep(),
+            rowsep=self.text_widget.get_row_sep(),
+            skiprows=self.text_widget.get_skiprows(),
+            comments=self.text_widget.get_comments(),
+            transpose=self.text_widget.trnsp_box.isChecked(),
+        )
+        if self._encoding is not None:
+            options['encoding'] = self._encoding
+        return options
+
     def _get_table_data(self):
         """Return clipboard processed as data"""
+        if not self._complete:
+            # The preview only has the start of the data
+            return load_text(
+                io.StringIO(self._text), **self._get_import_options())
+
         data = self._simplify_shape(
                 self.table_widget.get_data())
         if self.table_widget.array_btn.isChecked():
@@ -630,6 +749,10 @@ def _get_table_data(self):
 
     def _get_plain_text(self):
         """Return clipboard as text"""
+        return self._text
+
+    def _get_preview_text(self):
+        """Return the text shown in the wizard"""
         return self.text_widget.text_editor.toPlainText()
 
     @Slot()
@@ -640,7 +763,10 @@ def process(self):
             self.var_name = str(var_name)
         except UnicodeEncodeError:
             self.var_name = str(var_name)
-        if self.text_widget.get_as_data():
+        if self._filename is not None:
+            # The data is too big to be processed here
+            self.import_options = self._get_import_options()
+        elif self.text_widget.get_as_data():
             self.clip_data = self._get_table_data()
         elif self.text_widget.get_as_code():
             self.clip_data = try_to_eval(
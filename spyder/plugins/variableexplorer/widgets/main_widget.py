@@ -540,6 +540,9 @@ def create_new_widget(self, shellwidget):
         shellwidget.sig_config_spyder_kernel.connect(
             nsb.set_namespace_view_settings
         )
+        shellwidget.register_kernel_call_handler(
+            "update_import_progress", nsb.update_import_progress
+        )
         return nsb
 
     def close_widget(self, nsb):
@@ -554,6 +557,9 @@ def close_widget(self, nsb):
         nsb.shellwidget.sig_config_spyder_kernel.disconnect(
             nsb.set_namespace_view_settings
         )
+        nsb.shellwidget.unregister_kernel_call_handler(
+            "update_import_progress"
+        )
 
         nsb.close()
         nsb.setParent(None)
@@ -12,6 +12,7 @@
 
 # Standard library imports
 from __future__ import annotations
+from concurrent.futures import CancelledError
 import os
 import os.path as osp
 from pickle import UnpicklingError
@@ -24,20 +25,20 @@
 from qtpy.QtCore import Qt, Signal, Slot
 from qtpy.QtGui import QCursor
 from qtpy.QtWidgets import (QApplication, QInputDialog, QMessageBox,
-                            QVBoxLayout, QWidget)
+                            QProgressDialog, QVBoxLayout, QWidget)
 from spyder_kernels.comms.commbase import CommError
 from spyder_kernels.utils.iofuncs import iofunctions
 from spyder_kernels.utils.misc import fix_reference_name
 from spyder_kernels.utils.nsview import REMOTE_SETTINGS
 
 # Local imports
+from spyder.api.asyncdispatcher import AsyncDispatcher
 from spyder.api.translations import _
 from spyder.api.shellconnect.mixins import ShellConnectWidgetForStackMixin
 from spyder.api.widgets.mixins import SpyderWidgetMixin
 from spyder.config.utils import IMPORT_EXT
 from spyder.widgets.collectionseditor import RemoteCollectionsEditorTableView
 from spyder.plugins.variableexplorer.widgets.importwizard import ImportWizard
-from spyder.utils import encoding
 from spyder.utils.misc import getcwd_or_home, remove_backslashes
 from spyder.widgets.helperwidgets import FinderWidget
 
@@ -45,7 +46,7 @@
 # Constants
 VALID_VARIABLE_CHARS = r"[^\w+*=¡!¿?'\"#$%&()/<>\-\[\]{}^`´;,|¬]*\w"
 
-# Max time before giving up when making a blocking call to the kernel
+# Max time before giving up when waiting for a reply from the kernel
 CALL_KERNEL_TIMEOUT = 30
 
 # Types
@@ -93,6 +94,9 @@ def __init__(self, parent):
         self.filename = None
         self.plots_plugin_enabled = False
 
+        # Dialogs that show the progress of the files imported by the kernel
+        self._import_progress_dialogs = {}
+
         # Widgets
         self.editor = None
         self.shellwidget = None
@@ -217,15 +221,22 @@ def refresh_namespacebrowser(self, *, interrupt=True):
         """Refresh namespace browser"""
         if not self.shellwidget.spyder_kernel_ready:
             return
-        self.shellwidget.call_kernel(
-            interrupt=interrupt,
-            callback=self.process_remote_view
-        ).get_namespace_view()
 
-        self.shellwidget.call_kernel(
+        # Get both in a single call, so the namespace is filtered only once
+        self.shellwidget.call_kernel_batch(
+            [
+                ("get_namespace_view", (), {}),
+                ("get_var_properties", (), {}),
+            ],
             interrupt=interrupt,
-            callback=self.set_var_properties
-        ).get_var_properties()
+            callback=self._process_namespace_batch
+        )
+
+    def _process_namespace_batch(self, results):
+        """Process the namespace view and variable properties."""
+        remote_view, properties = results
+        self.process_remote_view(remote_view)
+        self.set_var_properties(properties)
 
     def set_namespace_view_settings(self):
         """Set the namespace view settings"""
@@ -319,32 +330,37 @@ def import_data(self, filenames=None):
                 # Import data with import wizard
                 error_message = None
                 try:
-                    text, _encoding = encoding.read(self.filename)
                     base_name = osp.basename(self.filename)
-                    editor = ImportWizard(self, text, title=base_name,
-                                  varname=fix_reference_name(base_name))
+                    editor = ImportWizard(self, None, title=base_name,
+                                  varname=fix_reference_name(base_name),
+                                  filename=self.filename)
                     if editor.exec_():
                         var_name, clip_data = editor.get_data()
+                        import_options = editor.get_import_options()
+                        if import_options is not None:
+                            # The table is refreshed when the data is loaded
+                            self.import_text_data(
+                                self.filename, var_name, import_options)
+                            continue
                         self.editor.new_value(var_name, clip_data)
                 except Exception as error:
                     error_message = str(error)
             else:
-                QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
-                QApplication.processEvents()
-                error_message = self.load_data(self.filename, extension)
-                QApplication.restoreOverrideCursor()
-                QApplication.processEvents()
+                # The table is refreshed when the data is loaded
+                self.load_data(self.filename, extension)
+                continue
 
             if error_message is not None:
-                QMessageBox.critical(self, title,
-                                     _("<b>Unable to load '%s'</b>"
-                                       "<br><br>"
-                                       "The error message was:<br>%s"
-                                       ) % (self.filename, error_message))
+                self._show_load_data_error(self.filename, error_message)
             self.refresh_table()
 
     def load_data(self, filename, ext):
-        """Load data from a file."""
+        """
+        Load data from a file.
+
+        This doesn't wait for the kernel to load it, so the interface is not
+        blocked while doing it.
+        """
         if not self.shellwidget.spyder_kernel_ready:
             return
         overwrite = False
@@ -356,12 +372,85 @@ def load_data(self, filename, ext):
             result = QMessageBox.question(
                 self, _('Data loading'), message, buttons)
             overwrite = result == QMessageBox.Yes
+
         try:
-            return self.shellwidget.call_kernel(
-                blocking=True,
+            future = self.shellwidget.call_kernel_future(
                 display_error=True,
                 timeout=CALL_KERNEL_TIMEOUT).load_data(
                     filename, ext, overwrite=overwrite)
+        except CommError:
+            return
+
+        QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
+        self.sig_start_spinner_requested.emit()
+
+        @AsyncDispatcher.QtSlot
+        def data_loaded(future):
+            self._on_data_loaded(future, filename)
+
+        future.connect(data_loaded)
+
+    def import_text_data(self, filename, varname, options):
+        """
+        Import data from a text file in the kernel.
+
+        The kernel parses the file in chunks, so its contents are not read
+        here. The progress is shown in a dialog while it's done.
+        """
+        if not self.shellwidget.spyder_kernel_ready:
+            return
+
+        try:
+            future = self.shellwidget.call_kernel_future(
+                display_error=True).import_text_data(
+                    filename, varname, options)
+        except CommError:
+            return
+
+        dialog = QProgressDialog(
+            _("Importing data from {}...").format(osp.basename(filename)),
+            None, 0, 100, self
+        )
+        dialog.setWindowTitle(_("Import data"))
+        dialog.setMinimumDuration(500)
+        self._import_progress_dialogs[filename] = dialog
+        self.sig_start_spinner_requested.emit()
+
+        @AsyncDispatcher.QtSlot
+        def data_imported(future):
+            dialog = self._import_progress_dialogs.pop(filename, None)
+            if dialog is not None:
+                dialog.close()
+                dialog.deleteLater()
+            self.sig_stop_spinner_requested.emit()
+
+            error_message = self._get_load_data_error(future)
+            if error_message is not None:
+                self._show_load_data_error(filename, error_message)
+            self.refresh_table()
+
+        future.connect(data_imported)
+
+    def update_import_progress(self, filename, fraction):
+        """Show the fraction of filename that was imported by the kernel."""
+        dialog = self._import_progress_dialogs.get(filename)
+        if dialog is not None:
+            dialog.setValue(int(fraction * 100))
+
+    def _on_data_loaded(self, future, filename):
+        """Show the data loaded from filename or the error to load it."""
+        QApplication.restoreOverrideCursor()
+        self.sig_stop_spinner_requested.emit()
+
+        error_message = self._get_load_data_error(future)
+        if error_message is not None:
+            self._show_load_data_error(filename, error_message)
+        self.refresh_table()
+
+    def _get_load_data_error(self, future):
+        """Get the error message to show if loading data failed."""
+        try:
+            return future.result()
         except ImportError as msg:
             module = str(msg).split("'")[1]
             msg = _("Spyder is unable to open the file "
@@ -390,9 +479,19 @@ def load_data(self, filename, ext):
                 "compatibility between them (e.g. that you're using Numpy 2.x "
                 "in both environments).<br>"
             )
-        except (UnpicklingError, RuntimeError, CommError, OSError):
+            return msg
+        except (UnpicklingError, RuntimeError, CommError, OSError,
+                CancelledError):
             return None
 
+    def _show_load_data_error(self, filename, error_message):
+        """Show error_message for data that couldn't be loaded."""
+        QMessageBox.critical(self, _("Import data"),
+                             _("<b>Unable to load '%s'</b>"
+                               "<br><br>"
+                               "The error message was:<br>%s"
+                               ) % (filename, error_message))
+
     def reset_namespace(self):
         warning = self.get_conf(
             section='ipython_console',
@@ -421,13 +520,39 @@ def save_data(self):
         else:
             return False
 
-        QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
-        QApplication.processEvents()
+        self.save_namespace(self.filename)
 
-        error_message = self.save_namespace(self.filename)
+    def save_namespace(self, filename):
+        """
+        Save the namespace to filename.
+
+        This doesn't wait for the kernel to save it, so the interface is not
+        blocked while doing it.
+        """
+        try:
+            future = self.shellwidget.call_kernel_future(
+                display_error=True,
+                timeout=CALL_KERNEL_TIMEOUT).save_namespace(filename)
+        except CommError:
+            return
 
+        QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
+        self.sig_start_spinner_requested.emit()
+        future.connect(self._on_namespace_saved)
+
+    @AsyncDispatcher.QtSlot
+    def _on_namespace_saved(self, future):
+        """Show the error to save the namespace, if any."""
         QApplication.restoreOverrideCursor()
-        QApplication.processEvents()
+        self.sig_stop_spinner_requested.emit()
+
+        try:
+            error_message = future.result()
+        except TimeoutError:
+            error_message = _("Data is too big to be saved")
+        except (UnpicklingError, RuntimeError, CommError, CancelledError):
+            error_message = None
+
         if error_message is not None:
             if 'Some objects could not be saved:' in error_message:
                 save_data_message = (
@@ -442,18 +567,6 @@ def save_data(self):
 
             QMessageBox.critical(self, _("Save data"), save_data_message)
 
-    def save_namespace(self, filename):
-        try:
-            return self.shellwidget.call_kernel(
-                blocking=True,
-                display_error=True,
-                timeout=CALL_KERNEL_TIMEOUT).save_namespace(filename)
-        except TimeoutError:
-            msg = _("Data is too big to be saved")
-            return msg
-        except (UnpicklingError, RuntimeError, CommError):
-            return None
-
     def plot(self, plot_function: Callable[[Figure], None]):
         """
         Make a plot.
@@ -11,7 +11,11 @@
 # Test library imports
 import pytest
 
+# Third party imports
+import numpy as np
+
 # Local imports
+from spyder.plugins.variableexplorer.widgets import importwizard as iw
 from spyder.plugins.variableexplorer.widgets.importwizard import ImportWizard
 
 
@@ -30,5 +34,47 @@ def test_importwizard(importwizard):
     assert importwizard
 
 
+def test_importwizard_big_text(qtbot, monkeypatch):
+    """Check that only the start of big texts is previewed."""
+    monkeypatch.setattr(iw, "MAX_PREVIEW_LINES", 5)
+    text = "".join(f"{i}\t{i / 2}\n" for i in range(20))
+    importwizard = ImportWizard(None, text)
+    qtbot.addWidget(importwizard)
+
+    assert importwizard._get_preview_text().count("\n") == 5
+
+    # Go to the preview and import all the data
+    importwizard.text_widget.tab_btn.setChecked(True)
+    importwizard._set_step(1)
+    assert importwizard.table_widget.get_data()[-1] == [4, 2.0]
+    importwizard.process()
+
+    var_name, data = importwizard.get_data()
+    assert isinstance(data, np.ndarray)
+    assert data.shape == (20, 2)
+    assert importwizard.get_import_options() is None
+
+
+def test_importwizard_big_file(qtbot, monkeypatch, tmp_path):
+    """Check that big files are not processed by the wizard."""
+    monkeypatch.setattr(iw, "MAX_PREVIEW_LINES", 5)
+    filename = tmp_path / "data.csv"
+    filename.write_text("".join(f"{i},{i / 2}\n" for i in range(20)))
+    importwizard = ImportWizard(None, None, filename=str(filename))
+    qtbot.addWidget(importwizard)
+
+    assert not importwizard.text_widget.code_btn.isEnabled()
+
+    importwizard._set_step(1)
+    importwizard.process()
+
+    var_name, data = importwizard.get_data()
+    assert data is None
+    options = importwizard.get_import_options()
+    assert options["as_type"] == "array"
+    assert options["colsep"] == ","
+    assert options["encoding"] == "ascii"
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -372,6 +372,7 @@ def __init__(self):
             # --- Profiler ------------------------------------------------
             'hide':                    [('mdi.eye-off',), {'color': self.MAIN_FG_COLOR}],
             'slow':                    [('mdi.speedometer-slow',), {'color': self.MAIN_FG_COLOR}],
+            'flame_graph':             [('mdi.fire',), {'color': self.MAIN_FG_COLOR}],
             'stop_profile':            [('mdi.stop',), {'color': SpyderPalette.ICON_7}],
             'callers_or_callees':      [('mdi6.call-made', 'mdi6.call-received'), {'options': [{'color': self.MAIN_FG_COLOR, 'offset': (-0.2, -0.2)}, {'color': self.MAIN_FG_COLOR, 'offset': (0.2, 0.2)}]}],
             'callers':                 [('mdi6.call-received',), {'color': self.MAIN_FG_COLOR}],
@@ -11,9 +11,11 @@
 
 # Standard library imports
 import builtins
+from collections import namedtuple, OrderedDict
 import keyword
 import os
 import re
+import time
 
 # Third party imports
 from pygments.lexer import RegexLexer, bygroups
@@ -94,6 +96,22 @@
 
 COLOR_SCHEME_NAMES = CONF.get('appearance', 'names')
 
+# Documents with at least this number of blocks are highlighted in slices
+# by highlighters that support it (see BaseSH.SLICED_HIGHLIGHTING).
+SLICED_HIGHLIGHTING_MIN_BLOCKS = 5000
+
+# Maximum time spent highlighting blocks per slice.
+HIGHLIGHT_SLICE_TIME = 0.02  # seconds
+
+# Number of blocks highlighted together during a slice.
+HIGHLIGHT_SLICE_BLOCKS = 100
+
+# Number of blocks at the top of a document that are highlighted right away.
+HIGHLIGHT_FIRST_BLOCKS = 200
+
+# Maximum number of blocks whose tokens are kept by PythonSH.
+TOKENS_CACHE_SIZE = 100000
+
 # Mapping for file extensions that use Pygments highlighting but should use
 # different lexers than Pygments' autodetection suggests.  Keys are file
 # extensions or tuples of extensions, values are Pygments lexer names.
@@ -130,6 +148,15 @@ def get_span(match, key=None):
     return start16, end16
 
 
+# Result of tokenizing a block of text.
+# - formats: tuple of (start, length, format key)
+# - state: state of the block
+# - oedata: dict of OutlineExplorerData attributes, or None
+# - import_stmt: import statement in the block, or None
+BlockTokens = namedtuple(
+    'BlockTokens', ['formats', 'state', 'oedata', 'import_stmt'])
+
+
 def get_color_scheme(name):
     """Get a color scheme from config using its name"""
     name = name.lower()
@@ -181,9 +208,16 @@ class BaseSH(QSyntaxHighlighter):
     BLANKPROG = re.compile(r"\s+")
     # Syntax highlighting states (from one text block to another):
     NORMAL = 0
+    # State of blocks left to be highlighted later
+    PENDING = 0xFFFF
     # Syntax highlighting parameters.
     BLANK_ALPHA_FACTOR = 0.31
 
+    # Whether to highlight large documents in time-bounded slices, starting
+    # with the visible blocks. This requires highlight_block to handle a
+    # previous block in the PENDING state as if it were NORMAL.
+    SLICED_HIGHLIGHTING = False
+
     sig_outline_explorer_data_changed = Signal()
 
     # Use to signal font change
@@ -217,6 +251,21 @@ def __init__(self, parent, font=None, color_scheme='Spyder'):
         # List of cells
         self._cell_list = []
 
+        # Sliced highlighting: blocks before _highlighted_upto and the ones
+        # in _visible_blocks are highlighted right away, the rest are left
+        # in the PENDING state for _highlight_slice.
+        self._highlighted_upto = HIGHLIGHT_FIRST_BLOCKS
+        self._visible_blocks = (0, -1)
+        self._slice_timer = QTimer(self)
+        self._slice_timer.setSingleShot(True)
+        self._slice_timer.setInterval(0)
+        self._slice_timer.timeout.connect(self._highlight_slice)
+
+        # Whether blocks are being highlighted by the methods above. Changes
+        # to the layout can scroll the editor, which calls
+        # highlight_visible_blocks again.
+        self._highlighting_blocks = False
+
     def get_background_color(self):
         return QColor(self.background_color)
 
@@ -319,8 +368,104 @@ def highlightBlock(self, text):
 
         :param text: text to highlight.
         """
+        if self.SLICED_HIGHLIGHTING:
+            block = self.currentBlock()
+            if not self._is_block_ready(block):
+                # Leave it for later to not block the interface
+                tbh.set_state(block, self.PENDING)
+                if not self._slice_timer.isActive():
+                    self._slice_timer.start()
+                return
+
         self.highlight_block(text)
 
+    def _is_block_ready(self, block):
+        """Whether a block can be highlighted right away."""
+        if self.document().blockCount() < SLICED_HIGHLIGHTING_MIN_BLOCKS:
+            return True
+
+        number = block.blockNumber()
+        first, last = self._visible_blocks
+        return number < self._highlighted_upto or first <= number <= last
+
+    def restart_sliced_highlighting(self):
+        """
+        Start sliced highlighting again from the top of the document.
+
+        This needs to be called before replacing the whole text of the
+        document, so only the first and visible blocks are highlighted
+        right away.
+        """
+        self._highlighted_upto = HIGHLIGHT_FIRST_BLOCKS
+        if self.editor is not None:
+            self._visible_blocks = self.editor.get_buffer_block_numbers()
+
+    def highlight_visible_blocks(self):
+        """Highlight visible blocks that were left for later, if any."""
+        if (
+            not self.SLICED_HIGHLIGHTING
+            or self.editor is None
+            or self._highlighting_blocks
+            or self.document().blockCount() < SLICED_HIGHLIGHTING_MIN_BLOCKS
+        ):
+            return
+
+        first, last = self.editor.get_buffer_block_numbers()
+        self._visible_blocks = (first, last)
+
+        self._highlighting_blocks = True
+        try:
+            block = self.document().findBlockByNumber(first)
+            while block.isValid() and block.blockNumber() <= last:
+                if tbh.get_state(block) == self.PENDING:
+                    # This also highlights the next blocks while their state
+                    # changes
+                    self.rehighlightBlock(block)
+                block = block.next()
+        finally:
+            self._highlighting_blocks = False
+
+    def _highlight_slice(self):
+        """
+        Highlight pending blocks for at most HIGHLIGHT_SLICE_TIME.
+
+        Visible blocks go first. Then blocks are highlighted in order, so
+        their states are correct, and the timer is restarted to continue
+        from the event loop.
+        """
+        document = self.document()
+        if document is None:
+            return
+
+        deadline = time.perf_counter() + HIGHLIGHT_SLICE_TIME
+        self.highlight_visible_blocks()
+
+        self._highlighting_blocks = True
+        try:
+            self._highlight_pending_blocks(deadline)
+        finally:
+            self._highlighting_blocks = False
+
+    def _highlight_pending_blocks(self, deadline):
+        """Highlight pending blocks in order until the deadline."""
+        document = self.document()
+        block = document.findBlockByNumber(self._highlighted_upto)
+        while block.isValid():
+            if time.perf_counter() > deadline:
+                self._slice_timer.start()
+                return
+
+            number = block.blockNumber()
+            self._highlighted_upto = max(self._highlighted_upto, number + 1)
+            if tbh.get_state(block) == self.PENDING:
+                # Highlight several blocks at once because the document
+                # layout is updated after each call to rehighlightBlock.
+                self._highlighted_upto = number + HIGHLIGHT_SLICE_BLOCKS
+                self.rehighlightBlock(block)
+            block = block.next()
+
+        self._highlighted_upto = document.blockCount()
+
     def highlight_block(self, text):
         """
         Abstract method. Override this to apply syntax highlighting.
@@ -380,6 +525,15 @@ def highlight_extras(self, text, offset=0):
         self.highlight_patterns(text, offset=offset)
 
     def rehighlight(self):
+        if (
+            self.SLICED_HIGHLIGHTING
+            and self.document().blockCount() >= SLICED_HIGHLIGHTING_MIN_BLOCKS
+        ):
+            # Only the first and visible blocks are highlighted now
+            self.restart_sliced_highlighting()
+            QSyntaxHighlighter.rehighlight(self)
+            return
+
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
         QSyntaxHighlighter.rehighlight(self)
         QApplication.restoreOverrideCursor()
@@ -524,86 +678,99 @@ class PythonSH(BaseSH):
     # Comments suitable for Outline Explorer
     OECOMMENT = re.compile(r'^(# ?--[-]+|##[#]+ )[ -]*[^- ]+')
 
+    # Unknown states are handled as NORMAL in _prefix_text
+    SLICED_HIGHLIGHTING = True
+
     def __init__(self, parent, font=None, color_scheme='Spyder'):
         BaseSH.__init__(self, parent, font, color_scheme)
         self.cell_separators = CELL_LANGUAGES['Python']
+
+        # Tokens of blocks by (text, state of the previous block)
+        self._tokens_cache = OrderedDict()
+        self._block_tokens = []
+
         # Avoid updating the outline explorer with every single letter typed
         self.outline_explorer_data_update_timer = QTimer()
         self.outline_explorer_data_update_timer.setSingleShot(True)
 
     def highlight_match(self, text, match, key, value, offset,
                         state, import_stmt, oedata):
-        """Highlight a single match."""
+        """
+        Tokenize a single match.
+
+        Formats are added to self._block_tokens as (start, length, key)
+        tuples, and outline explorer data is returned as a dict of
+        OutlineExplorerData attributes, so results don't depend on the
+        current block and can be cached.
+        """
+        tokens = self._block_tokens
         start, end = get_span(match, key)
         start = max([0, start + offset])
         end = max([0, end + offset])
         length = end - start
 
         if key == "uf_sq3string":
-            self.setFormat(start, length, self.formats["string"])
+            tokens.append((start, length, "string"))
             state = self.INSIDE_SQ3STRING
         elif key == "uf_dq3string":
-            self.setFormat(start, length, self.formats["string"])
+            tokens.append((start, length, "string"))
             state = self.INSIDE_DQ3STRING
         elif key == "uf_sqstring":
-            self.setFormat(start, length, self.formats["string"])
+            tokens.append((start, length, "string"))
             state = self.INSIDE_SQSTRING
         elif key == "uf_dqstring":
-            self.setFormat(start, length, self.formats["string"])
+            tokens.append((start, length, "string"))
             state = self.INSIDE_DQSTRING
         elif key in ["ufe_sqstring", "ufe_dqstring"]:
-            self.setFormat(start, length, self.formats["string"])
+            tokens.append((start, length, "string"))
             state = self.INSIDE_NON_MULTILINE_STRING
         elif key in ["match_kw", "case_kw"]:
-            self.setFormat(start, length, self.formats["keyword"])
+            tokens.append((start, length, "keyword"))
         else:
-            self.setFormat(start, length, self.formats[key])
+            tokens.append((start, length, key))
             if key == "comment":
                 if text.lstrip().startswith(self.cell_separators):
-                    oedata = OutlineExplorerData(self.currentBlock())
-                    oedata.text = str(text).strip()
+                    oedata = {}
+                    oedata["text"] = str(text).strip()
                     # cell_head: string containing the first group
                     # of '%'s in the cell header
                     cell_head = re.search(r"%+|$", text.lstrip()).group()
                     if cell_head == '':
-                        oedata.cell_level = 0
+                        oedata["cell_level"] = 0
                     else:
-                        oedata.cell_level = qstring_length(cell_head) - 2
-                    oedata.fold_level = start
-                    oedata.def_type = OutlineExplorerData.CELL
+                        oedata["cell_level"] = qstring_length(cell_head) - 2
+                    oedata["fold_level"] = start
+                    oedata["def_type"] = OutlineExplorerData.CELL
                     def_name = get_code_cell_name(text)
-                    oedata.def_name = def_name
-                    # Keep list of cells for performence reasons
-                    self._cell_list.append(oedata)
+                    oedata["def_name"] = def_name
                 elif self.OECOMMENT.match(text.lstrip()):
-                    oedata = OutlineExplorerData(self.currentBlock())
-                    oedata.text = str(text).strip()
-                    oedata.fold_level = start
-                    oedata.def_type = OutlineExplorerData.COMMENT
-                    oedata.def_name = text.strip()
+                    oedata = {}
+                    oedata["text"] = str(text).strip()
+                    oedata["fold_level"] = start
+                    oedata["def_type"] = OutlineExplorerData.COMMENT
+                    oedata["def_name"] = text.strip()
             elif key == "keyword":
                 if value in ("def", "class"):
                     match1 = self.IDPROG.match(text, end)
                     if match1:
                         start1, end1 = get_span(match1, 1)
-                        self.setFormat(start1, end1-start1,
-                                       self.formats["definition"])
-                        oedata = OutlineExplorerData(self.currentBlock())
-                        oedata.text = str(text)
-                        oedata.fold_level = (qstring_length(text)
-                                             - qstring_length(text.lstrip()))
-                        oedata.def_type = self.DEF_TYPES[str(value)]
-                        oedata.def_name = text[start1:end1]
-                        oedata.color = self.formats["definition"]
+                        tokens.append((start1, end1-start1, "definition"))
+                        oedata = {}
+                        oedata["text"] = str(text)
+                        oedata["fold_level"] = (qstring_length(text)
+                                                - qstring_length(text.lstrip()))
+                        oedata["def_type"] = self.DEF_TYPES[str(value)]
+                        oedata["def_name"] = text[start1:end1]
+                        oedata["color"] = "definition"
                 elif value in ("elif", "else", "except", "finally",
                                "for", "if", "try", "while",
                                "with"):
                     if text.lstrip().startswith(value):
-                        oedata = OutlineExplorerData(self.currentBlock())
-                        oedata.text = str(text).strip()
-                        oedata.fold_level = start
-                        oedata.def_type = OutlineExplorerData.STATEMENT
-                        oedata.def_name = text.strip()
+                        oedata = {}
+                        oedata["text"] = str(text).strip()
+                        oedata["fold_level"] = start
+                        oedata["def_type"] = OutlineExplorerData.STATEMENT
+                        oedata["def_name"] = text.strip()
                 elif value == "import":
                     import_stmt = text.strip()
                     # color all the "as" words on same line, except
@@ -618,34 +785,48 @@ def highlight_match(self, text, match, key, value, offset,
                         if not match1:
                             break
                         start, end = get_span(match1, 1)
-                        self.setFormat(start, length, self.formats["keyword"])
+                        tokens.append((start, length, "keyword"))
 
         return state, import_stmt, oedata
 
-    def highlight_block(self, text):
-        """Implement specific highlight for Python."""
-        text = str(text)
-        prev_state = tbh.get_state(self.currentBlock().previous())
+    def _prefix_text(self, text, prev_state):
+        """
+        Prefix text with the string opened in the previous block, if any.
+
+        Returns the prefixed text, the offset to apply to match positions
+        and the state of the previous block.
+        """
         if prev_state == self.INSIDE_DQ3STRING:
-            offset = -4
-            text = r'""" '+text
+            return r'""" ' + text, -4, prev_state
         elif prev_state == self.INSIDE_SQ3STRING:
-            offset = -4
-            text = r"''' "+text
+            return r"''' " + text, -4, prev_state
         elif prev_state == self.INSIDE_DQSTRING:
-            offset = -2
-            text = r'" '+text
+            return r'" ' + text, -2, prev_state
         elif prev_state == self.INSIDE_SQSTRING:
-            offset = -2
-            text = r"' "+text
+            return r"' " + text, -2, prev_state
         else:
-            offset = 0
-            prev_state = self.NORMAL
+            return text, 0, self.NORMAL
+
+    def tokenize_block(self, text, prev_state):
+        """
+        Get the tokens of a block of text.
+
+        Results are cached by text and state of the previous block, so
+        blocks are only tokenized again when one of them changes.
+        """
+        prefixed_text, offset, prev_state = self._prefix_text(
+            text, prev_state)
+
+        cache_key = (text, prev_state)
+        tokens = self._tokens_cache.get(cache_key)
+        if tokens is not None:
+            self._tokens_cache.move_to_end(cache_key)
+            return tokens
 
+        text = prefixed_text
         oedata = None
         import_stmt = None
-
-        self.setFormat(0, qstring_length(text), self.formats["normal"])
+        self._block_tokens = []
 
         state = self.NORMAL
         for match in self.PROG.finditer(text):
@@ -655,6 +836,43 @@ def highlight_block(self, text):
                         text, match, key, value, offset,
                         state, import_stmt, oedata)
 
+        tokens = BlockTokens(
+            tuple(self._block_tokens), state, oedata, import_stmt)
+        self._block_tokens = []
+
+        self._tokens_cache[cache_key] = tokens
+        if len(self._tokens_cache) > TOKENS_CACHE_SIZE:
+            self._tokens_cache.popitem(last=False)
+        return tokens
+
+    def _make_oedata(self, attributes):
+        """Create outline explorer data for the current block."""
+        oedata = OutlineExplorerData(self.currentBlock())
+        for name, value in attributes.items():
+            if name == "color":
+                value = self.formats[value]
+            setattr(oedata, name, value)
+
+        if oedata.def_type == OutlineExplorerData.CELL:
+            # Keep list of cells for performence reasons
+            self._cell_list.append(oedata)
+        return oedata
+
+    def highlight_block(self, text):
+        """Implement specific highlight for Python."""
+        text = str(text)
+        prev_state = tbh.get_state(self.currentBlock().previous())
+        tokens = self.tokenize_block(text, prev_state)
+        text, offset, prev_state = self._prefix_text(text, prev_state)
+
+        self.setFormat(0, qstring_length(text), self.formats["normal"])
+        for start, length, key in tokens.formats:
+            self.setFormat(start, length, self.formats[key])
+
+        state = tokens.state
+        import_stmt = tokens.import_stmt
+        oedata = self._make_oedata(tokens.oedata) if tokens.oedata else None
+
         tbh.set_state(self.currentBlock(), state)
 
         # Use normal format for indentation and trailing spaces
@@ -6,10 +6,13 @@
 """Tests for syntaxhighlighters.py"""
 
 import pytest
+from qtpy.QtCore import QObject
 from qtpy.QtWidgets import QApplication
 from qtpy.QtGui import QTextDocument
 
-from spyder.utils.syntaxhighlighters import HtmlSH, PythonSH, MarkdownSH
+from spyder.plugins.editor.utils.editor import TextBlockHelper
+from spyder.utils.syntaxhighlighters import (
+    HtmlSH, PythonSH, MarkdownSH, SLICED_HIGHLIGHTING_MIN_BLOCKS)
 
 def compare_formats(actualFormats, expectedFormats, sh):
     assert len(actualFormats) == len(expectedFormats)
@@ -111,6 +114,67 @@ def test_Markdown_basic():
     compare_formats(doc.firstBlock().layout().formats(), res, sh)
 
 
+def test_PythonSH_sliced_highlighting():
+    """Large documents are highlighted in slices with the right states."""
+    lines = ['x = 1', 's = """', 'text', '"""', "# %% Cell"]
+    txt = '\n'.join(lines * (SLICED_HIGHLIGHTING_MIN_BLOCKS // 5 + 1))
+    doc = QTextDocument(txt)
+    sh = PythonSH(doc, color_scheme='Spyder')
+    sh.rehighlight()
+    last_block = doc.lastBlock()
+
+    # Only the first blocks are highlighted right away
+    assert TextBlockHelper.get_state(last_block) == sh.PENDING
+    assert TextBlockHelper.get_state(doc.findBlockByNumber(2)) == (
+        sh.INSIDE_DQ3STRING)
+
+    while sh._highlighted_upto < doc.blockCount():
+        sh._highlight_slice()
+
+    for number in range(doc.blockCount()):
+        block = doc.findBlockByNumber(number)
+        expected = sh.INSIDE_DQ3STRING if number % 5 in (1, 2) else sh.NORMAL
+        assert TextBlockHelper.get_state(block) == expected
+
+    res = [(0, 9, 'comment')]
+    compare_formats(last_block.layout().formats(), res, sh)
+
+    # Blocks with the same text and previous state are tokenized once
+    assert len(sh._tokens_cache) == len(lines)
+
+
+def test_PythonSH_sliced_highlighting_reentry():
+    """Scrolling while a slice is highlighted doesn't highlight again."""
+    class Editor(QObject):
+        calls = 0
+
+        def get_buffer_block_numbers(self):
+            self.calls += 1
+            return (0, 10)
+
+    txt = '\n'.join(['x = 1'] * SLICED_HIGHLIGHTING_MIN_BLOCKS)
+    doc = QTextDocument(txt)
+    sh = PythonSH(doc, color_scheme='Spyder')
+    sh.rehighlight()
+    editor = Editor()
+    sh.editor = editor
+
+    blocked = []
+    rehighlight_block = sh.rehighlightBlock
+
+    def rehighlight_and_scroll(block):
+        # Editor signals are not blocked and the visible blocks are not
+        # highlighted again while highlighting a slice.
+        blocked.append(editor.signalsBlocked())
+        sh.highlight_visible_blocks()
+        rehighlight_block(block)
+
+    sh.rehighlightBlock = rehighlight_and_scroll
+    sh._highlight_slice()
+    assert blocked and not any(blocked)
+    assert editor.calls == 1
+
+
 @pytest.mark.parametrize('line', ['# --- First variant',
                                   '#------ 2nd variant',
                                   '### 3rd variant'])
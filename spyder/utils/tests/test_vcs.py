@@ -18,8 +18,9 @@
 
 # Local imports
 from spyder.config.base import running_in_ci
-from spyder.utils.vcs import (ActionToolNotFound, get_git_refs,
-                              get_git_remotes, get_git_revision, get_vcs_root,
+from spyder.utils.vcs import (ActionToolNotFound, GitStateCache,
+                              get_git_refs, get_git_remotes, get_git_revision,
+                              get_vcs_root, parse_git_status, read_git_refs,
                               remote_to_url, run_vcs_tool)
 
 
@@ -80,6 +81,120 @@ def test_get_git_remotes():
     assert 'origin' in remotes
 
 
+def test_read_git_refs(tmpdir):
+    """Test reading refs from the files of a repository."""
+    git_dir = tmpdir.mkdir('.git')
+    git_dir.join('HEAD').write('ref: refs/heads/main\n')
+    git_dir.join('packed-refs').write(
+        '# pack-refs with: peeled fully-peeled sorted\n'
+        '1111111111111111111111111111111111111111 refs/heads/old\n'
+        '2222222222222222222222222222222222222222 refs/tags/v1.0\n'
+        '^3333333333333333333333333333333333333333\n'
+    )
+    sha = '4444444444444444444444444444444444444444\n'
+    git_dir.mkdir('refs').mkdir('heads').join('main').write(sha)
+    git_dir.join('refs', 'heads').mkdir('feature').join('x').write(sha)
+    remote = git_dir.join('refs').mkdir('remotes').mkdir('origin')
+    remote.join('main').write(sha)
+    remote.join('HEAD').write('ref: refs/remotes/origin/main\n')
+
+    refs, branch, refs_dirs = read_git_refs(str(git_dir))
+    assert branch == 'main'
+    assert refs == [
+        'feature/x', 'main', 'old', 'remotes/origin/HEAD -> origin/main',
+        'remotes/origin/main', 'v1.0'
+    ]
+    assert str(git_dir.join('refs', 'heads', 'feature')) in refs_dirs
+
+    # Detached HEAD
+    git_dir.join('HEAD').write(sha)
+    refs, branch, refs_dirs = read_git_refs(str(git_dir))
+    assert branch == '(HEAD detached at 4444444)'
+    assert refs[0] == branch
+
+
+def test_parse_git_status(tmpdir):
+    """Test parsing the status of a repository."""
+    root = str(tmpdir)
+    output = ' M a.py\0R  new.py\0old.py\0?? dir/\0'
+    assert parse_git_status(root, output) == {
+        osp.join(root, 'a.py'): ' M',
+        osp.join(root, 'new.py'): 'R ',
+        osp.join(root, 'dir'): '??',
+    }
+
+
+@pytest.mark.skipif(not programs.find_git(), reason="Git is not installed")
+def test_git_state_cache(tmpdir, monkeypatch):
+    """Test that the state of repositories is only computed when needed."""
+    root = str(tmpdir)
+    programs.run_program('git', ['init', '-b', 'main'], cwd=root).wait()
+    tmpdir.join('a.py').write('a = 1\n')
+
+    cache = GitStateCache()
+    assert cache.get_root(str(tmpdir.join('a.py'))) == root
+    assert cache.get_refs(root) == ([], 'main')
+
+    calls = []
+    run_git_status = cache._run_git_status
+
+    def counted_run_git_status(root):
+        calls.append(root)
+        return run_git_status(root)
+
+    monkeypatch.setattr(cache, '_run_git_status', counted_run_git_status)
+    assert cache.get_status(root) == {osp.join(root, 'a.py'): '??'}
+    assert cache.get_status(root) == {osp.join(root, 'a.py'): '??'}
+    assert len(calls) == 1
+
+    # Changing the index or saving a file computes the status again
+    programs.run_program('git', ['add', 'a.py'], cwd=root).wait()
+    assert cache.get_status(root) == {osp.join(root, 'a.py'): 'A '}
+    assert len(calls) == 2
+    cache.invalidate_status(str(tmpdir.join('a.py')))
+    cache.get_status(root)
+    assert len(calls) == 3
+
+    # New branches are read again
+    programs.run_program(
+        'git',
+        ['-c', 'user.name=test', '-c', 'user.email=test@test.com',
+         'commit', '-m', 'test'],
+        cwd=root
+    ).wait()
+    programs.run_program('git', ['branch', 'other'], cwd=root).wait()
+    assert cache.get_refs(root) == (['main', 'other'], 'main')
+
+
+@pytest.mark.skipif(not programs.find_git(), reason="Git is not installed")
+def test_git_state_cache_worktree(tmpdir):
+    """Test getting the state of a worktree, where .git is a file."""
+    root = str(tmpdir.mkdir('repo'))
+    programs.run_program('git', ['init', '-b', 'main'], cwd=root).wait()
+    programs.run_program(
+        'git',
+        ['-c', 'user.name=test', '-c', 'user.email=test@test.com',
+         'commit', '--allow-empty', '-m', 'test'],
+        cwd=root
+    ).wait()
+    worktree = str(tmpdir.join('worktree'))
+    programs.run_program(
+        'git', ['worktree', 'add', '-b', 'feat', worktree], cwd=root
+    ).wait()
+    assert osp.isfile(osp.join(worktree, '.git'))
+    tmpdir.join('worktree', 'a.py').write('a = 1\n')
+
+    cache = GitStateCache()
+    assert cache.get_root(osp.join(worktree, 'a.py')) == worktree
+    assert cache.get_refs(worktree) == (['feat', 'main'], 'feat')
+    assert cache.get_refs(worktree)[1] == get_git_refs(worktree)[1]
+    assert cache.get_status(worktree) == {osp.join(worktree, 'a.py'): '??'}
+
+    # Branches created from the main repository are seen in the worktree
+    programs.run_program('git', ['branch', 'other'], cwd=root).wait()
+    assert cache.get_refs(worktree) == (['feat', 'main', 'other'], 'feat')
+
+
 @pytest.mark.parametrize(
     'input_text, expected_output',
     [
@@ -10,6 +10,8 @@
 import os.path as osp
 import subprocess
 import sys
+import threading
+import time
 
 # Local imports
 from spyder.config.base import running_under_pytest
@@ -36,6 +38,11 @@
 }]
 
 
+# Maximum number of seconds the status of a Git repository is reused, because
+# changes done outside Spyder to its files can't be detected from its metadata
+GIT_STATUS_MAX_AGE = 30
+
+
 class ActionToolNotFound(RuntimeError):
     """Exception to transmit information about supported tools for
        failed attempt to execute given action"""
@@ -50,8 +57,9 @@ def __init__(self, vcsname, action, tools):
 def get_vcs_info(path):
     """Return support status dict if path is under VCS root"""
     for info in SUPPORTED:
+        # .git is a file in Git worktrees and submodules
         vcs_path = osp.join(path, info['rootdir'])
-        if osp.isdir(vcs_path):
+        if osp.exists(vcs_path):
             return info
 
 
@@ -203,6 +211,322 @@ def get_git_refs(repopath):
     return branches + tags, branch, files_modifed
 
 
+def get_git_dirs(root):
+    """
+    Return the Git directory of the repository or worktree in root and the
+    common directory of its repository, or None if root doesn't have one.
+
+    In worktrees and submodules, .git is a file with the path of the Git
+    directory, which has the HEAD and index of the worktree. Its refs are in
+    the common directory given by its commondir file, if there is one.
+    """
+    git_dir = osp.join(root, '.git')
+    if osp.isfile(git_dir):
+        try:
+            with open(git_dir, encoding='utf-8') as f:
+                content = f.read().strip()
+        except OSError:
+            return None
+        if not content.startswith('gitdir:'):
+            return None
+        git_dir = osp.normpath(
+            osp.join(root, content[len('gitdir:'):].strip()))
+
+    if not osp.isdir(git_dir):
+        return None
+
+    common_dir = git_dir
+    try:
+        with open(osp.join(git_dir, 'commondir'), encoding='utf-8') as f:
+            common_dir = osp.normpath(osp.join(git_dir, f.read().strip()))
+    except OSError:
+        pass
+
+    return git_dir, common_dir
+
+
+def read_git_refs(git_dir, common_dir=None):
+    """
+    Read the active branch, branches and tags of a Git repository directly
+    from the files in git_dir, without running git.
+
+    Returns the same branches plus tags and active branch as get_git_refs,
+    and the directories with loose refs. If given, refs are read from
+    common_dir instead of git_dir, like in worktrees.
+    """
+    if common_dir is None:
+        common_dir = git_dir
+
+    # Refs in packed-refs and in their own files
+    refs = set()
+    try:
+        with open(osp.join(common_dir, 'packed-refs'), encoding='utf-8') as f:
+            for line in f:
+                if line.startswith(('#', '^')):
+                    continue
+                parts = line.split()
+                if len(parts) == 2:
+                    refs.add(parts[1])
+    except OSError:
+        pass
+
+    refs_dirs = []
+    remote_heads = {}
+    for dirpath, __, filenames in os.walk(osp.join(common_dir, 'refs')):
+        refs_dirs.append(dirpath)
+        for filename in filenames:
+            if filename.endswith('.lock'):
+                continue
+            ref = osp.relpath(
+                osp.join(dirpath, filename), common_dir).replace(os.sep, '/')
+            refs.add(ref)
+            if ref.startswith('refs/remotes/') and filename == 'HEAD':
+                try:
+                    with open(osp.join(dirpath, filename)) as f:
+                        remote_heads[ref] = f.read().strip()
+                except OSError:
+                    pass
+
+    # Active branch
+    try:
+        with open(osp.join(git_dir, 'HEAD')) as f:
+            head = f.read().strip()
+    except OSError:
+        head = ''
+    if head.startswith('ref: refs/heads/'):
+        branch = head[len('ref: refs/heads/'):]
+        branches = []
+    elif head:
+        branch = '(HEAD detached at {})'.format(head[:7])
+        branches = [branch]
+    else:
+        branch = ''
+        branches = []
+
+    # Names with the same format as 'git branch -a' and 'git tag'
+    tags = []
+    remotes = []
+    for ref in sorted(refs):
+        if ref.startswith('refs/heads/'):
+            branches.append(ref[len('refs/heads/'):])
+        elif ref.startswith('refs/remotes/'):
+            name = 'remotes/' + ref[len('refs/remotes/'):]
+            target = remote_heads.get(ref, '')
+            if target.startswith('ref: refs/remotes/'):
+                name += ' -> ' + target[len('ref: refs/remotes/'):]
+            remotes.append(name)
+        elif ref.startswith('refs/tags/'):
+            tags.append(ref[len('refs/tags/'):])
+
+    return branches + remotes + tags, branch, refs_dirs
+
+
+def parse_git_status(root, output):
+    """
+    Parse the output of 'git status --porcelain -z' run in root.
+
+    Returns a dictionary with the absolute path of each file as key and its
+    two letters status as value.
+    """
+    status = {}
+    entries = iter(output.split('\0'))
+    for entry in entries:
+        if len(entry) < 4:
+            continue
+        code, path = entry[:2], entry[3:]
+        if code[0] in 'RC':
+            # The original path of renamed and copied files comes next
+            next(entries, None)
+        status[osp.normpath(osp.join(root, path))] = code
+    return status
+
+
+class GitStateCache:
+    """
+    Cache of the state of Git repositories.
+
+    The active branch and refs are read from the files of the repository
+    and only read again when their modification time changes. The status is
+    obtained by running git, but it's reused until the refs or the index
+    change, a file is saved in the repository or GIT_STATUS_MAX_AGE seconds
+    pass. Requests for a repository that arrive while its status is being
+    computed wait for it instead of running git again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._git = None
+        self._roots = {}
+        self._git_dirs = {}
+        self._repo_locks = {}
+        self._refs = {}
+        self._status = {}
+
+    # ---- Public API
+    # -------------------------------------------------------------------------
+    def get_root(self, path):
+        """Return the root of the Git repository of path, or None."""
+        if osp.isfile(path):
+            path = osp.dirname(path)
+        root = self._roots.get(path)
+        if root is None:
+            root = get_vcs_root(path)
+            if root is None:
+                return None
+            git_dirs = get_git_dirs(root)
+            if git_dirs is None:
+                return None
+            self._git_dirs[root] = git_dirs
+            self._roots[path] = root
+        return root
+
+    def get_refs(self, root):
+        """Return the branches plus tags and the active branch of root."""
+        with self._get_repo_lock(root):
+            return self._get_refs(root)[:2]
+
+    def get_status(self, root, force=False):
+        """
+        Return the status of the files of root.
+
+        See parse_git_status for its format. If force is True, the cached
+        status is not used.
+        """
+        with self._get_repo_lock(root):
+            return self._get_status(root, force)
+
+    def update_status(self, root, paths):
+        """
+        Update the status of some files of root and return the status of all
+        of them.
+
+        Only the status of paths is computed, so this is faster than
+        get_status when few files changed.
+        """
+        with self._get_repo_lock(root):
+            cached = self._status.get(root)
+            if cached is None or cached[0] != self._get_status_signature(root):
+                return self._get_status(root, force=True)
+
+            changes = self._run_git_status(root, paths)
+
+            paths = {osp.normpath(path) for path in paths}
+            status = {
+                path: code for path, code in cached[2].items()
+                if path not in paths
+            }
+            status.update(changes)
+            self._status[root] = cached[:2] + (status,)
+            return status
+
+    def invalidate_status(self, path):
+        """Compute again the status of the repository of path when needed."""
+        root = self.get_root(path)
+        if root is not None:
+            self._status.pop(root, None)
+
+    # ---- Private API
+    # -------------------------------------------------------------------------
+    def _get_repo_lock(self, root):
+        """Return the lock used to compute the state of root."""
+        with self._lock:
+            return self._repo_locks.setdefault(root, threading.Lock())
+
+    def _get_mtime(self, path):
+        """Return the modification time of path or None if it's missing."""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _get_refs(self, root):
+        """
+        Return the branches plus tags, the active branch and the modification
+        times of the files they were read from.
+        """
+        git_dir, common_dir = self._get_git_dirs(root)
+        cached = self._refs.get(root)
+        if cached is not None:
+            refs, branch, refs_dirs, signature = cached
+            if signature == self._get_refs_signature(
+                    git_dir, common_dir, refs_dirs):
+                return refs, branch, signature
+
+        # Refs are written by renaming lock files, which updates the
+        # modification time of their directories.
+        refs, branch, refs_dirs = read_git_refs(git_dir, common_dir)
+        signature = self._get_refs_signature(git_dir, common_dir, refs_dirs)
+        self._refs[root] = (refs, branch, refs_dirs, signature)
+        return refs, branch, signature
+
+    def _get_git_dirs(self, root):
+        """Return the Git and common directories of root."""
+        git_dirs = self._git_dirs.get(root)
+        if git_dirs is None:
+            git_dirs = get_git_dirs(root) or (osp.join(root, '.git'),) * 2
+            self._git_dirs[root] = git_dirs
+        return git_dirs
+
+    def _get_refs_signature(self, git_dir, common_dir, refs_dirs):
+        """Return the modification times of the files with refs."""
+        paths = [
+            osp.join(git_dir, 'HEAD'),
+            osp.join(common_dir, 'packed-refs')
+        ]
+        return tuple(self._get_mtime(path) for path in paths + refs_dirs)
+
+    def _get_status(self, root, force):
+        """Return the status of root, computing it again if needed."""
+        signature = self._get_status_signature(root)
+        cached = self._status.get(root)
+        if (
+            not force
+            and cached is not None
+            and cached[0] == signature
+            and time.monotonic() - cached[1] < GIT_STATUS_MAX_AGE
+        ):
+            return cached[2]
+
+        status = self._run_git_status(root)
+        self._status[root] = (signature, time.monotonic(), status)
+        return status
+
+    def _get_status_signature(self, root):
+        """Return the modification times of the refs and index of root."""
+        git_dir = self._get_git_dirs(root)[0]
+        return self._get_refs(root)[2] + (
+            self._get_mtime(osp.join(git_dir, 'index')),
+        )
+
+    def _run_git_status(self, root, paths=None):
+        """
+        Run git to get the status of the files of root, or only of paths if
+        given.
+        """
+        if self._git is None:
+            self._git = programs.find_git() or ''
+        if not self._git:
+            return {}
+
+        args = ['--literal-pathspecs', 'status', '--porcelain', '-z']
+        if paths is not None:
+            args += ['--'] + [osp.relpath(path, root) for path in paths]
+
+        try:
+            out, __ = programs.run_program(
+                self._git, args,
+                cwd=root,
+            ).communicate()
+        except (subprocess.CalledProcessError, AttributeError, OSError,
+                programs.ProgramError):
+            return {}
+
+        return parse_git_status(root, os.fsdecode(out))
+
+
+git_state_cache = GitStateCache()
+
+
 def get_git_remotes(fpath):
     """Return git remotes for repo on fpath."""
     remote_data = {}